@@ -0,0 +1,109 @@
+"""
+Admission control load test: queue-wait latency of accepted tasks when producers push past capacity.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_admission [--workers 8] [--task-ms 5] [--overload 2.0] [--duration 5] [--json]
+
+A fixed pool of --workers threads runs tasks that sleep --task-ms, so capacity is workers / task time. Producer threads
+offer --overload x that rate (open loop, paced) for --duration seconds, under three policies:
+- unlimited : no depth limit (the old behaviour) - the backlog and every task's wait grow for as long as the spike lasts.
+- reject    : PYQUEUE_MAX_DEPTH = capacity * --target-wait, PYQUEUE_ADMISSION_MODE=reject - excess is shed with QueueFullError (429).
+- block     : same limit, PYQUEUE_ADMISSION_MODE=block - producers are slowed down to the service rate instead.
+Reported: accepted/rejected counts, throughput, queue-wait (enqueue -> start) percentiles for accepted tasks, and the
+producer-side enqueue() call latency.
+"""
+import argparse
+import json
+import time
+from threading import Lock, Thread
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.queue import Queue, QueueFullError
+from models.task import Task
+
+PRODUCERS: int = 8
+
+def percentile(values: list[float], p: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+def run(mode: str, workers: int, task_ms: float, overload: float, duration: float, target_wait: float) -> dict:
+    capacity = workers / (task_ms / 1000)
+    waits: list[float] = []
+    waits_lock = Lock()
+
+    def factory(task: Task, queue: Queue):
+        def run_task() -> None:
+            with waits_lock:
+                waits.append(time.perf_counter() - task.enqueued_at)
+            time.sleep(task_ms / 1000)
+            queue.set_status(task, TaskStatus.COMPLETED)
+        return run_task
+
+    limit = None if mode == "unlimited" else max(1, int(capacity * target_wait))
+    config = QueueConfig(min_workers=workers, max_workers=workers, max_depth=limit,
+                         admission_mode="block" if mode == "block" else "reject", admission_timeout=duration)
+    queue = Queue(worker_factory=factory, config=config)
+    accepted = [0] * PRODUCERS
+    rejected = [0] * PRODUCERS
+    call_latency: list[list[float]] = [[] for _ in range(PRODUCERS)]
+    interval = PRODUCERS / (capacity * overload)
+
+    def produce(i: int) -> None:
+        next_at = time.perf_counter()
+        stop_at = next_at + duration
+        while next_at < stop_at:
+            now = time.perf_counter()
+            if now < next_at:
+                time.sleep(next_at - now)
+            started = time.perf_counter()
+            try:
+                queue.enqueue(Task.create("bench", TaskType.TEST))
+                accepted[i] += 1
+            except QueueFullError:
+                rejected[i] += 1
+            call_latency[i].append(time.perf_counter() - started)
+            next_at += interval
+
+    threads = [Thread(target=produce, args=(i,)) for i in range(PRODUCERS)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    queue.shutdown()    # Drains the backlog.
+    elapsed = time.perf_counter() - start
+    calls = [c for per in call_latency for c in per]
+    return {
+        "mode": mode, "capacity_tps": round(capacity), "offered_tps": round(capacity * overload), "max_depth": limit,
+        "accepted": sum(accepted), "rejected": sum(rejected), "completed_tps": round(sum(accepted) / elapsed, 1),
+        "wait_p50_ms": round(percentile(waits, 50) * 1000, 2), "wait_p99_ms": round(percentile(waits, 99) * 1000, 2),
+        "wait_max_ms": round(max(waits, default=0.0) * 1000, 2),
+        "enqueue_p99_ms": round(percentile(calls, 99) * 1000, 3),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--task-ms", type=float, default=5.0)
+    parser.add_argument("--overload", type=float, default=2.0, help="Offered load as a multiple of capacity.")
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--target-wait", type=float, default=0.1, help="Depth limit expressed as seconds of backlog.")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(mode, args.workers, args.task_ms, args.overload, args.duration, args.target_wait)
+               for mode in ("unlimited", "reject", "block")]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['mode']:>9} accepted={r['accepted']:<7} rejected={r['rejected']:<7} wait p50={r['wait_p50_ms']}ms "
+              f"p99={r['wait_p99_ms']}ms max={r['wait_max_ms']}ms  enqueue p99={r['enqueue_p99_ms']}ms")
+
+if __name__ == "__main__":
+    main()
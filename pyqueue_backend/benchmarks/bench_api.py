@@ -0,0 +1,148 @@
+"""
+HTTP API benchmark: request rate and latency of the main routes, as the job registry grows.
+
+Run from pyqueue_backend/ (needs httpx - see benchmarks/requirements.txt):
+    python -m benchmarks.bench_api [--transport asgi|uvicorn] [--concurrency 16] [--requests 2000]
+                                   [--registry-sizes 1000 100000] [--mix SMS=5,EMAIL=3] [--json]
+
+The real router is mounted on a fresh app + Queue (zero-duration handlers) per registry size, pre-filled with that many
+finished Tasks. --concurrency clients then issue --requests requests per scenario:
+- enqueue    : POST /api/enqueue, TaskTypes drawn from --mix
+- job        : GET /api/jobs/{id}
+- jobs_page  : GET /api/jobs?limit=100 (cursor pagination - shouldn't care about registry size)
+- jobs_type  : GET /api/jobs?type=<most common type>&limit=100
+- jobs_all   : GET /api/jobs (the whole registry - --full-requests requests only, it's the expensive one)
+- jobs_304   : GET /api/jobs with If-None-Match from the previous jobs_all response (an unchanged dashboard poll)
+--transport asgi calls the app in-process through httpx's ASGI transport (no sockets - framework + queue cost only);
+--transport uvicorn runs a real uvicorn server on a local port in a background thread (adds HTTP parsing + the network stack).
+"""
+import argparse
+import asyncio
+import json
+import socket
+import time
+from threading import Thread
+from typing import Callable
+
+import httpx
+from fastapi import FastAPI
+
+from benchmarks.common import DEFAULT_MIX, complete_factory, draw_types, parse_mix, prefill, summarize
+from models.config import QueueConfig
+from models.queue import Queue
+from system.producer import router
+
+def build_app(registry_size: int, mix: str) -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    app.state.queue = Queue(worker_factory=complete_factory, config=QueueConfig())
+    prefill(app.state.queue, registry_size, parse_mix(mix))
+    return app
+
+class UvicornThread:
+    """
+    uvicorn.Server on 127.0.0.1:<free port>, in a daemon thread (start() returns once it accepts connections).
+    """
+    def __init__(self, app: FastAPI) -> None:
+        import uvicorn
+        with socket.socket() as s:
+            s.bind(("127.0.0.1", 0))
+            self.port = s.getsockname()[1]
+        self.server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=self.port, log_level="warning"))
+        self.thread = Thread(target=self.server.run, daemon=True)
+
+    def start(self) -> str:
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return f"http://127.0.0.1:{self.port}"
+
+    def stop(self) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+async def drive(client: httpx.AsyncClient, make_request: Callable[[int], tuple[str, str, dict]], requests: int,
+                concurrency: int) -> dict:
+    latencies: list[float] = []
+    errors = 0
+    counter = iter(range(requests))
+
+    async def client_loop() -> None:
+        nonlocal errors
+        for i in counter:   # Shared iterator - each request index is taken by exactly one client.
+            method, url, kwargs = make_request(i)
+            started = time.perf_counter()
+            resp = await client.request(method, url, **kwargs)
+            latencies.append(time.perf_counter() - started)
+            if resp.status_code >= 400:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client_loop() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    return {"requests": requests, "errors": errors, "rps": round(requests / elapsed, 1), "latency": summarize(latencies)}
+
+async def run_size(transport: str, registry_size: int, mix: str, requests: int, full_requests: int,
+                   concurrency: int) -> list[dict]:
+    app = build_app(registry_size, mix)
+    queue: Queue = app.state.queue
+    server = None
+    if transport == "uvicorn":
+        server = UvicornThread(app)
+        client = httpx.AsyncClient(base_url=server.start(), timeout=60,
+                                   limits=httpx.Limits(max_connections=concurrency))
+    else:
+        client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bench", timeout=60)
+
+    types = draw_types(parse_mix(mix), requests)
+    common_type = max(set(types), key=types.count).value
+    ids = [t.t_id for t in queue.get_jobs()[:1000]] or ["missing"]
+    scenarios = [
+        ("enqueue", requests, lambda i: ("POST", "/api/enqueue", {"json": {"payload": f"p{i}", "t_type": types[i].value}})),
+        ("job", requests, lambda i: ("GET", f"/api/jobs/{ids[i % len(ids)]}", {})),
+        ("jobs_page", requests, lambda i: ("GET", "/api/jobs", {"params": {"limit": 100}})),
+        ("jobs_type", requests, lambda i: ("GET", "/api/jobs", {"params": {"type": common_type, "limit": 100}})),
+        ("jobs_all", full_requests, lambda i: ("GET", "/api/jobs", {})),
+        ("jobs_304", requests, lambda i: ("GET", "/api/jobs", {"headers": {"If-None-Match": etag}})),
+    ]
+    etag = ""
+    results = []
+    try:
+        async with client:
+            for name, n, make_request in scenarios:
+                if name == "jobs_304":
+                    etag = (await client.get("/api/jobs")).headers.get("etag", "")
+                await drive(client, make_request, max(1, n // 10), concurrency)   # Warm-up (not reported).
+                r = await drive(client, make_request, n, concurrency)
+                results.append({"scenario": name, "transport": transport, "registry_size": registry_size,
+                                "concurrency": concurrency, **r})
+    finally:
+        if server is not None:
+            server.stop()
+        queue.shutdown()
+    return results
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--transport", choices=("asgi", "uvicorn"), default="asgi")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--full-requests", type=int, default=20, help="Requests for the unpaginated jobs_all scenario.")
+    parser.add_argument("--registry-sizes", type=int, nargs="+", default=[1000, 100_000])
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Relative TaskType weights for enqueue, e.g. SMS=5,EMAIL=3.")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = []
+    for size in args.registry_sizes:
+        results += asyncio.run(run_size(args.transport, size, args.mix, args.requests, args.full_requests, args.concurrency))
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        lat = r["latency"]
+        print(f"{r['scenario']:>10} registry={r['registry_size']:<8} {r['rps']:>9} req/s  p50={lat['p50_ms']}ms "
+              f"p99={lat['p99_ms']}ms  errors={r['errors']}")
+
+if __name__ == "__main__":
+    main()
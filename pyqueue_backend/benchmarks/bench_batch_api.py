@@ -0,0 +1,74 @@
+"""
+Enqueue API benchmark: tasks/sec through POST /api/enqueue (one task per request) vs. POST /api/enqueue/batch.
+
+Run from pyqueue_backend/ (needs httpx for FastAPI's TestClient - see benchmarks/requirements.txt):
+    python -m benchmarks.bench_batch_api [--tasks 5000] [--batch-sizes 100 1000] [--json]
+
+Drives the real router in-process over ASGI (no network), against a Queue with no-op handlers, so the numbers are the
+HTTP + validation + registration cost per task.
+"""
+import argparse
+import json
+import time
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.config import QueueConfig
+from models.queue import Queue
+from models.task import Task
+from system.producer import router
+
+def noop_factory(task: Task, queue: Queue):
+    return lambda: None
+
+def build_client() -> tuple[TestClient, Queue]:
+    app = FastAPI()
+    app.include_router(router)
+    app.state.queue = Queue(worker_factory=noop_factory, config=QueueConfig())
+    return TestClient(app), app.state.queue
+
+def bench_single(client: TestClient, tasks: int) -> float:
+    start = time.perf_counter()
+    for i in range(tasks):
+        client.post("/api/enqueue", json={"payload": f"p{i}", "t_type": "EMAIL"}).raise_for_status()
+    return time.perf_counter() - start
+
+def bench_batch(client: TestClient, tasks: int, batch_size: int, ndjson: bool) -> float:
+    start = time.perf_counter()
+    for offset in range(0, tasks, batch_size):
+        items = [{"payload": f"p{i}", "t_type": "EMAIL"} for i in range(offset, min(tasks, offset + batch_size))]
+        if ndjson:
+            body = "\n".join(json.dumps(i) for i in items)
+            resp = client.post("/api/enqueue/batch", content=body, headers={"Content-Type": "application/x-ndjson"})
+        else:
+            resp = client.post("/api/enqueue/batch", json=items)
+        resp.raise_for_status()
+    return time.perf_counter() - start
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=5000)
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[100, 1000])
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    client, queue = build_client()
+    results = [{"mode": "single", "batch_size": 1, "tasks": args.tasks, "elapsed_s": bench_single(client, args.tasks)}]
+    for size in args.batch_sizes:
+        for ndjson in (False, True):
+            results.append({"mode": "batch-ndjson" if ndjson else "batch-json", "batch_size": size, "tasks": args.tasks,
+                            "elapsed_s": bench_batch(client, args.tasks, size, ndjson)})
+    queue.shutdown()
+
+    for r in results:
+        r["tasks_per_s"] = round(r["tasks"] / r["elapsed_s"], 1)
+        r["elapsed_s"] = round(r["elapsed_s"], 4)
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['mode']:>13} batch_size={r['batch_size']:<6} {r['tasks_per_s']:>10} tasks/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+Broker benchmark: CPU-bound throughput as consumer processes are added to one shared broker.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_broker [--tasks 2000] [--work-ms 2] [--processes 1 2 4] [--workers 4]
+                                      [--redis-url redis://localhost:6379/15] [--json]
+
+Per (backend, --processes) run: that many processes are spawned (like uvicorn --workers N), each running a Queue on the
+same broker with --workers worker threads and a handler that spins the CPU for --work-ms. Once every process is up,
+--tasks Tasks are submitted from the parent and the clock runs until the broker reports all of them done. Backends:
+- local  : one Queue, no broker (the in-process baseline - only run for processes=1).
+- sqlite : a fresh SQLite file in a temp directory.
+- redis  : --redis-url, if given (its keys live under a per-run prefix, deleted afterwards).
+Reported: tasks_per_s, each process's share of the Tasks (share_min/share_max - how evenly the leases spread) and
+redelivered (should be 0: no process dies here). A CPU-bound handler doesn't scale with threads (GIL) - it does with
+processes, which is what the broker is for.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+import uuid
+from typing import Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.broker import open_broker
+from models.config import QueueConfig
+from models.queue import Queue
+from models.task import Task
+
+def spin_factory(work: float):
+    def factory(task: Task, queue: Queue):
+        def run() -> None:
+            task.attempts += 1
+            queue.set_status(task, TaskStatus.INPROGRESS)
+            end = time.perf_counter() + work
+            while time.perf_counter() < end:
+                pass
+            queue.set_status(task, TaskStatus.COMPLETED)
+        return run
+    return factory
+
+def config(workers: int, broker_url: Optional[str] = None) -> QueueConfig:
+    return QueueConfig(min_workers=workers, max_workers=workers, broker_url=broker_url, broker_poll_interval=0.01)
+
+# Runs in each spawned process: a Queue consuming from the broker until the parent says stop, then its completed count.
+def consume(broker_url: str, work: float, workers: int, ready, stop, results) -> None:
+    done = 0
+    def factory(task: Task, queue: Queue):
+        run = spin_factory(work)(task, queue)
+        def counted() -> None:
+            nonlocal done
+            run()
+            done += 1
+        return counted
+    queue = Queue(worker_factory=factory, config=config(workers, broker_url))
+    ready.wait()
+    stop.wait()
+    queue.shutdown()
+    results.put(done)
+
+def wait_done(broker, tasks: int, timeout: float = 600.0) -> None:
+    deadline = time.time() + timeout
+    while broker.count(TaskStatus.COMPLETED) < tasks:
+        if time.time() > deadline:
+            raise SystemExit(f"timed out with {broker.stats()}")
+        time.sleep(0.005)
+
+def run_local(tasks: int, work: float, workers: int) -> dict:
+    queue = Queue(worker_factory=spin_factory(work), config=config(workers))
+    start = time.perf_counter()
+    queue.enqueue_many([Task.create(f"t{i}", TaskType.TEST) for i in range(tasks)])
+    wait_done(queue.jobs, tasks)
+    elapsed = time.perf_counter() - start
+    queue.shutdown()
+    return {"backend": "local", "processes": 1, "tasks_per_s": round(tasks / elapsed, 1),
+            "share_min": 1.0, "share_max": 1.0, "redelivered": 0}
+
+def run_broker(backend: str, url: str, tasks: int, work: float, workers: int, processes: int) -> dict:
+    ctx = multiprocessing.get_context("spawn")
+    ready, stop, results = ctx.Barrier(processes + 1), ctx.Event(), ctx.Queue()
+    procs = [ctx.Process(target=consume, args=(url, work, workers, ready, stop, results)) for _ in range(processes)]
+    for p in procs:
+        p.start()
+    broker = open_broker(url)
+    ready.wait()
+    start = time.perf_counter()
+    broker.submit([Task.create(f"t{i}", TaskType.TEST) for i in range(tasks)])
+    wait_done(broker, tasks)
+    elapsed = time.perf_counter() - start
+    stop.set()
+    shares = [results.get() / tasks for _ in procs]
+    for p in procs:
+        p.join()
+    redelivered = broker.stats().get("redelivered", 0)
+    broker.clear()
+    broker.close()
+    return {"backend": backend, "processes": processes, "tasks_per_s": round(tasks / elapsed, 1),
+            "share_min": round(min(shares), 3), "share_max": round(max(shares), 3), "redelivered": redelivered}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--work-ms", type=float, default=2.0, help="CPU time each Task spins for.")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--workers", type=int, default=4, help="Worker threads per process.")
+    parser.add_argument("--redis-url", help="Also run against this Redis (e.g. redis://localhost:6379/15).")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    work = args.work_ms / 1000
+    results = [run_local(args.tasks, work, args.workers)]
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.processes:
+            url = f"sqlite://{os.path.join(tmp, f'broker-{n}.db')}"
+            results.append(run_broker("sqlite", url, args.tasks, work, args.workers, n))
+    if args.redis_url:
+        sep = "&" if "?" in args.redis_url else "?"
+        for n in args.processes:
+            url = f"{args.redis_url}{sep}prefix=bench-{uuid.uuid4().hex[:8]}"
+            results.append(run_broker("redis", url, args.tasks, work, args.workers, n))
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['backend']:>7} processes={r['processes']:<3} {r['tasks_per_s']:>9} tasks/s  "
+              f"share {r['share_min']}-{r['share_max']}  redelivered={r['redelivered']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+"""
+Dispatch benchmark: p99 queue-wait per TaskType under a mixed load, FIFO executor vs. the Scheduler.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_dispatch [--scale 0.01] [--workers 3] [--json]
+
+The load mirrors the problem case: a burst of TAKESLONG jobs lands first, then a stream of short SMS/EMAIL jobs.
+Handler durations are Worker's simulated durations multiplied by --scale (so 0.01 turns 10s into 100ms).
+"""
+import argparse
+import json
+import random
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from threading import Lock
+from typing import Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.queue import Queue
+from models.task import Task
+
+DURATIONS_MS: dict[TaskType, int] = {
+    TaskType.EMAIL: 2000, TaskType.REPORT: 5000, TaskType.DATACLEANUP: 3000, TaskType.SMS: 1000,
+    TaskType.NEWSLETTER: 4000, TaskType.TAKESLONG: 10000,
+}
+
+def build_load(n_long: int, n_short: int, seed: int) -> list[tuple[TaskType, int]]:
+    rng = random.Random(seed)
+    load = [(TaskType.TAKESLONG, 0) for _ in range(n_long)]
+    load += [(rng.choice([TaskType.SMS, TaskType.EMAIL, TaskType.REPORT]), 0) for _ in range(n_short)]
+    return load
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class Recorder:
+    def __init__(self, scale: float) -> None:
+        self.scale = scale
+        self.waits: dict[TaskType, list[float]] = {}
+        self.lock = Lock()
+        self.done = 0
+
+    def runnable(self, task: Task, queue: Optional[Queue] = None):
+        def run() -> None:
+            wait = time.perf_counter() - task.enqueued_at
+            time.sleep(DURATIONS_MS[task.t_type] * self.scale / 1000)
+            if queue is not None:
+                queue.set_status(task, TaskStatus.COMPLETED)
+            else:
+                task.status = TaskStatus.COMPLETED
+            with self.lock:
+                self.waits.setdefault(task.t_type, []).append(wait)
+                self.done += 1
+        return run
+
+def run_fifo(load, workers: int, scale: float) -> tuple[Recorder, float]:
+    rec = Recorder(scale)
+    executor = ThreadPoolExecutor(max_workers=workers)
+    start = time.perf_counter()
+    for t_type, priority in load:
+        task = Task.create("bench", t_type, priority)
+        task.enqueued_at = time.perf_counter()
+        executor.submit(rec.runnable(task))
+    executor.shutdown(wait=True)
+    return rec, time.perf_counter() - start
+
+def run_scheduler(load, workers: int, scale: float) -> tuple[Recorder, float]:
+    rec = Recorder(scale)
+    # Fixed-size pool so the comparison against the executor is apples-to-apples:
+    config = QueueConfig(min_workers=workers, max_workers=workers)
+    queue = Queue(worker_factory=rec.runnable, config=config)
+    start = time.perf_counter()
+    for t_type, priority in load:
+        queue.enqueue(Task.create("bench", t_type, priority))
+    queue.shutdown()
+    return rec, time.perf_counter() - start
+
+def summarize(name: str, rec: Recorder, elapsed: float) -> dict:
+    return {
+        "mode": name,
+        "tasks": rec.done,
+        "elapsed_s": round(elapsed, 4),
+        "throughput_tps": round(rec.done / elapsed, 2),
+        "wait_ms": {
+            t.value: {
+                "p50": round(statistics.median(w) * 1000, 2),
+                "p99": round(percentile(w, 99) * 1000, 2),
+            }
+            for t, w in sorted(rec.waits.items(), key=lambda kv: kv[0].value)
+        },
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=float, default=0.01)
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--long", type=int, default=30)
+    parser.add_argument("--short", type=int, default=120)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    load = build_load(args.long, args.short, args.seed)
+    results = [
+        summarize("fifo-executor", *run_fifo(load, args.workers, args.scale)),
+        summarize("scheduler", *run_scheduler(load, args.workers, args.scale)),
+    ]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['mode']:>14}: {r['tasks']} tasks in {r['elapsed_s']}s ({r['throughput_tps']} tasks/s)")
+        for t_type, w in r["wait_ms"].items():
+            print(f"{'':>16}{t_type:<12} wait p50={w['p50']:>9}ms  p99={w['p99']:>9}ms")
+
+if __name__ == "__main__":
+    main()
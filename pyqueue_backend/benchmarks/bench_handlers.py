@@ -0,0 +1,70 @@
+"""
+Handler micro-batching benchmark: throughput of a handler with a fixed per-call overhead, one Task per call vs batched.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_handlers [--tasks 2000] [--call-ms 5] [--task-ms 0.1] [--batch-sizes 1 10 50]
+                                        [--max-wait-ms 5] [--workers 4] [--json]
+
+The handler sleeps --call-ms once per call (connection / auth / request round trip to a downstream service) plus --task-ms
+per Task in the call. Per --batch-sizes entry, a fresh Queue gets the handler registered with that batch_size (1 = not
+batched) and --tasks Tasks are enqueued in one go; the clock runs until all of them are COMPLETED.
+Reported: tasks_per_s and calls (handler invocations - tasks / calls is the average batch that formed).
+"""
+import argparse
+import json
+import time
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.handlers import HandlerRegistry
+from models.queue import Queue
+from models.task import Task
+from system.worker import BatchWorker, Worker
+
+def worker_factory(task: Task, queue: Queue):
+    return Worker(task, queue).run
+
+def batch_worker_factory(tasks: list[Task], queue: Queue):
+    return BatchWorker(tasks, queue).run
+
+def run(tasks: int, call: float, per_task: float, batch_size: int, max_wait_ms: float, workers: int) -> dict:
+    calls = 0
+    def handler(batch) -> None:
+        nonlocal calls
+        calls += 1  # (Racy across worker threads, but only ever read after the run.)
+        time.sleep(call + per_task * (len(batch) if isinstance(batch, list) else 1))
+
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, handler, batch_size=batch_size, max_wait_ms=max_wait_ms)
+    queue = Queue(worker_factory=worker_factory, config=QueueConfig(min_workers=workers, max_workers=workers),
+                  handlers=handlers, batch_worker_factory=batch_worker_factory)
+    start = time.perf_counter()
+    queue.enqueue_many([Task.create(f"t{i}", TaskType.EMAIL) for i in range(tasks)])
+    while queue.jobs.count(TaskStatus.COMPLETED) < tasks:
+        time.sleep(0.002)
+    elapsed = time.perf_counter() - start
+    queue.shutdown()
+    return {"batch_size": batch_size, "tasks_per_s": round(tasks / elapsed, 1), "calls": calls}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000)
+    parser.add_argument("--call-ms", type=float, default=5.0, help="Fixed overhead of each handler call.")
+    parser.add_argument("--task-ms", type=float, default=0.1, help="Additional time per Task in a call.")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--max-wait-ms", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(args.tasks, args.call_ms / 1000, args.task_ms / 1000, n, args.max_wait_ms, args.workers)
+               for n in args.batch_sizes]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"batch_size={r['batch_size']:<4} {r['tasks_per_s']:>9} tasks/s  calls={r['calls']}")
+
+if __name__ == "__main__":
+    main()
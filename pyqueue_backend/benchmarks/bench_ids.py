@@ -0,0 +1,96 @@
+"""
+Task ID benchmark: cost per ID, uniqueness across threads/processes and sort order of the ID schemes.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_ids [--ids 200000] [--threads 1 8] [--processes 4] [--json]
+
+Schemes:
+- perf_counter : the old f"Task-{time.perf_counter_ns()}".
+- snowflake    : models.ids.new_id() (epoch ms + node + sequence - what Task.create() uses).
+- uuid4        : f"Task-{uuid.uuid4().hex}", the usual "just use a UUID" answer (random, not time-sortable).
+Per (scheme, --threads) run, each thread generates --ids IDs as fast as it can. Reported:
+- ns_per_id  : wall time / IDs generated across all threads (GIL-bound, so more threads don't make it cheaper).
+- duplicates : IDs generated more than once among the run's threads.
+- ordered    : share of consecutive IDs from one thread that compare greater than the one before (1.0 = string order is
+               generation order).
+Then --processes processes (spawned, like uvicorn --workers) each generate --ids IDs and the union is checked for
+duplicates (cross_process_duplicates). On a single Linux host perf_counter_ns() reads a system-wide clock, so the old
+scheme rarely collides here - it's across hosts (each counting from its own boot) that it has nothing to keep IDs apart.
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import uuid
+from threading import Barrier, Thread
+from typing import Callable
+
+from models.ids import new_id
+
+def perf_counter_id() -> str:
+    return f"Task-{time.perf_counter_ns()}"
+
+def uuid4_id() -> str:
+    return f"Task-{uuid.uuid4().hex}"
+
+SCHEMES: dict[str, Callable[[], str]] = {"perf_counter": perf_counter_id, "snowflake": new_id, "uuid4": uuid4_id}
+
+def generate(scheme: str, n: int) -> list[str]:
+    gen = SCHEMES[scheme]
+    return [gen() for _ in range(n)]
+
+def run(scheme: str, ids: int, threads: int) -> dict:
+    out: list[list[str]] = [[] for _ in range(threads)]
+    barrier = Barrier(threads + 1)
+
+    def work(i: int) -> None:
+        barrier.wait()
+        out[i] = generate(scheme, ids)
+
+    workers = [Thread(target=work, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in workers:
+        t.join()
+    elapsed = time.perf_counter() - start
+    total = ids * threads
+    in_order = sum(a < b for per_thread in out for a, b in zip(per_thread, per_thread[1:]))
+    return {
+        "scheme": scheme, "threads": threads, "ids": ids,
+        "ns_per_id": round(elapsed / total * 1e9, 1),
+        "duplicates": total - len({x for per_thread in out for x in per_thread}),
+        "ordered": round(in_order / max(1, total - threads), 4),
+    }
+
+def cross_process(scheme: str, ids: int, processes: int) -> int:
+    with multiprocessing.get_context("spawn").Pool(processes) as pool:
+        results = pool.starmap(generate, [(scheme, ids)] * processes)
+    return ids * processes - len({x for per_process in results for x in per_process})
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ids", type=int, default=200_000, help="IDs generated per thread / process.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--processes", type=int, default=4, help="0 = skip the cross-process check.")
+    parser.add_argument("--schemes", nargs="+", choices=list(SCHEMES), default=list(SCHEMES))
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(scheme, args.ids, n) for n in args.threads for scheme in args.schemes]
+    if args.processes:
+        for scheme in args.schemes:
+            dup = cross_process(scheme, args.ids, args.processes)
+            for r in results:
+                if r["scheme"] == scheme:
+                    r["processes"], r["cross_process_duplicates"] = args.processes, dup
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['scheme']:>12} threads={r['threads']:<3} {r['ns_per_id']:>7} ns/id  duplicates={r['duplicates']}  "
+              f"ordered={r['ordered']}  cross-process duplicates={r.get('cross_process_duplicates', '-')}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,116 @@
+"""
+Logging benchmark: what one task lifecycle log line costs the worker thread that emits it.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_logging [--calls 50000] [--threads 1 8] [--write-latency-us 0 100] [--json]
+
+--threads threads each emit --calls lines as fast as they can, all going to a line-buffered temp file standing in for
+stdout (a terminal, or a pipe with PYTHONUNBUFFERED=1 - the usual container setting). --write-latency-us adds a sleep to
+every line written, standing in for a log collector that reads the pipe slower than we write it.
+Modes:
+- print      : the old f-string print() per line.
+- blocking   : JSON lines written directly by the calling thread (configure_logging(background=False)).
+- queued     : JSON lines via the bounded queue + writer thread (configure_logging() - what main.py uses).
+- sampled    : queued, with the type sampled at 1% (PYQUEUE_LOG_SAMPLE).
+- filtered   : queued, with the type's level set to WARNING (PYQUEUE_TYPE_LOG_LEVEL) - the INFO line is skipped.
+Reported per run: emit_us (calling-thread time per line - what a worker pays) and total_s (including the time the
+writer thread needed afterwards to flush the backlog). Lines dropped because the buffer was full are counted too.
+"""
+import argparse
+import contextlib
+import json
+import logging
+import tempfile
+import time
+from threading import Barrier, Lock, Thread
+
+from enums.TaskType import TaskType
+from models.log import configure_logging, dropped_records, stop_logging, task_log
+from models.task import Task
+
+MODES: tuple[str, ...] = ("print", "blocking", "queued", "sampled", "filtered")
+
+class SlowSink:
+    """
+    Line-buffered file whose every line takes `latency` seconds to write (the sleep releases the GIL, like blocked I/O).
+    Writes hold a lock, like the one sys.stdout's buffer holds around each write.
+    """
+    def __init__(self, f, latency: float) -> None:
+        self.f = f
+        self.latency = latency
+        self.lock = Lock()
+
+    def write(self, s: str) -> int:
+        with self.lock:
+            n = self.f.write(s)
+            if self.latency and "\n" in s:
+                time.sleep(self.latency)
+        return n
+
+    def flush(self) -> None:
+        self.f.flush()
+
+def run(mode: str, calls: int, threads: int, buffer: int, latency_us: float) -> dict:
+    # 100 Tasks per thread, used in turn - sampling is per Task ID, so a single Task would be all-or-nothing.
+    tasks = [[Task.create("bench", TaskType.SMS) for _ in range(100)] for _ in range(threads)]
+    barrier = Barrier(threads + 1)
+
+    def emit(own: list[Task]) -> None:
+        barrier.wait()
+        if mode == "print":
+            for i in range(calls):
+                task = own[i % 100]
+                print(f"[Worker] Task {task.t_id} (Type: {task.t_type}) complete")
+        else:
+            for i in range(calls):
+                task = own[i % 100]
+                task_log(logging.INFO, "completed", task, "Task %s complete", task.t_id)
+
+    with tempfile.TemporaryFile("w", buffering=1) as f, contextlib.redirect_stdout(SlowSink(f, latency_us / 1e6)) as sink:
+        if mode != "print":
+            configure_logging(
+                "INFO",
+                type_levels={TaskType.SMS: "WARNING"} if mode == "filtered" else None,
+                sample={TaskType.SMS: 0.01} if mode == "sampled" else None,
+                buffer=buffer, background=mode != "blocking",
+            )
+        workers = [Thread(target=emit, args=(own,)) for own in tasks]
+        for t in workers:
+            t.start()
+        barrier.wait()
+        start = time.perf_counter()
+        for t in workers:
+            t.join()
+        emitted = time.perf_counter()
+        dropped = dropped_records()
+        stop_logging()  # (Waits for the writer thread to drain the queue.)
+        sink.flush()
+        finished = time.perf_counter()
+    return {
+        "mode": mode, "threads": threads, "calls": calls, "write_latency_us": latency_us,
+        "emit_us": round((emitted - start) / calls * 1e6, 3),     # Per line, per thread (threads run concurrently).
+        "total_s": round(finished - start, 3),
+        "dropped": dropped,
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=50_000, help="Lines emitted per thread.")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8])
+    parser.add_argument("--buffer", type=int, default=10_000, help="Queued modes: records buffered before dropping.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--write-latency-us", type=float, nargs="+", default=[0.0, 100.0], help="Per-line sink latency.")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(mode, args.calls, n, args.buffer, lat)
+               for lat in args.write_latency_us for n in args.threads for mode in args.modes]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['mode']:>9} threads={r['threads']:<3} sink+{r['write_latency_us']}us {r['emit_us']:>8} us/line in the worker  "
+              f"total {r['total_s']}s  dropped={r['dropped']}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,114 @@
+"""
+Metrics overhead benchmark: what the GET /metrics instrumentation costs on the enqueue and run hot paths.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_metrics [--tasks 100000] [--repeat 3] [--json]
+
+Two parts:
+- micro : ns per call of each recording primitive (Metrics.transition / observe_* / worker_error), single thread.
+- queue : --tasks zero-duration Tasks pushed through a real Queue (enqueue -> worker -> INPROGRESS -> COMPLETED, the same
+          calls Worker makes), once with the real Metrics and once with NoopMetrics below swapped in. Workers are held back
+          until everything is enqueued, so enqueue() cost per Task and run throughput (4 workers) are measured separately.
+          Best of --repeat interleaved runs each; the difference is the instrumentation overhead.
+"""
+import argparse
+import json
+import time
+from threading import Event
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.metrics import Metrics
+from models.queue import Queue
+from models.task import Task
+
+class NoopMetrics(Metrics):
+    """
+    Same interface, records nothing (the "no instrumentation" baseline).
+    """
+    def transition(self, t_type, old, new) -> None:
+        pass
+
+    def observe_wait(self, t_type, seconds) -> None:
+        pass
+
+    def observe_execution(self, t_type, seconds) -> None:
+        pass
+
+    def observe_end_to_end(self, t_type, seconds) -> None:
+        pass
+
+    def worker_error(self, t_type, kind) -> None:
+        pass
+
+def micro(calls: int) -> dict:
+    metrics = Metrics()
+    t_type, old, new = TaskType.SMS, TaskStatus.QUEUED, TaskStatus.INPROGRESS   # (Enum class attribute lookups aren't free.)
+    cases = {
+        "transition": lambda: metrics.transition(t_type, old, new),
+        "observe_wait": lambda: metrics.observe_wait(t_type, 0.003),
+        "observe_execution": lambda: metrics.observe_execution(t_type, 0.003),
+        "worker_error": lambda: metrics.worker_error(t_type, "runtime"),
+        "empty_call": lambda: None,     # Loop + lambda call cost, for reference.
+    }
+    out = {}
+    for name, fn in cases.items():
+        start = time.perf_counter_ns()
+        for _ in range(calls):
+            fn()
+        out[name] = round((time.perf_counter_ns() - start) / calls, 1)
+    return out
+
+def run_queue(metrics_cls: type, tasks: int) -> dict:
+    gate = Event()  # Workers hold off until every Task is enqueued, so the two phases are timed separately.
+
+    def factory(task: Task, queue: Queue):
+        def run_task() -> None:
+            gate.wait()
+            task.attempts += 1
+            queue.set_status(task, TaskStatus.INPROGRESS)
+            queue.set_status(task, TaskStatus.COMPLETED)
+        return run_task
+
+    queue = Queue(worker_factory=factory, config=QueueConfig(min_workers=4, max_workers=4))
+    queue.metrics = metrics_cls()
+    batch = [Task.create("bench", TaskType.SMS) for _ in range(tasks)]
+    start = time.perf_counter()
+    for task in batch:
+        queue.enqueue(task, dedup=False)
+    enqueued = time.perf_counter()
+    gate.set()
+    queue.shutdown()    # Drains everything.
+    finished = time.perf_counter()
+    return {"enqueue_us": round((enqueued - start) / tasks * 1e6, 3), "tasks_per_s": round(tasks / (finished - enqueued))}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--micro-calls", type=int, default=1_000_000)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results: dict = {"micro_ns": micro(args.micro_calls)}
+    runs: dict[str, list[dict]] = {"noop": [], "metrics": []}
+    for _ in range(args.repeat):    # Interleaved, so drift in machine load hits both sides alike.
+        for name, cls in (("noop", NoopMetrics), ("metrics", Metrics)):
+            runs[name].append(run_queue(cls, args.tasks))
+    for name, rs in runs.items():
+        results[name] = {"enqueue_us": min(r["enqueue_us"] for r in rs), "tasks_per_s": max(r["tasks_per_s"] for r in rs)}
+    results["enqueue_overhead_pct"] = round((results["metrics"]["enqueue_us"] / results["noop"]["enqueue_us"] - 1) * 100, 1)
+    results["throughput_overhead_pct"] = round((1 - results["metrics"]["tasks_per_s"] / results["noop"]["tasks_per_s"]) * 100, 1)
+    if args.json:
+        print(json.dumps(results))
+        return
+    for name, ns in results["micro_ns"].items():
+        print(f"{name:>18} {ns:>7} ns/call")
+    for name in ("noop", "metrics"):
+        r = results[name]
+        print(f"{name:>18} enqueue {r['enqueue_us']}us/task  run {r['tasks_per_s']} tasks/s")
+    print(f"overhead: enqueue {results['enqueue_overhead_pct']}%  run throughput {results['throughput_overhead_pct']}%")
+
+if __name__ == "__main__":
+    main()
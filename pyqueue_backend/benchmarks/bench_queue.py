@@ -0,0 +1,109 @@
+"""
+In-process Queue benchmark: enqueue throughput, dispatch latency and drain rate with zero-duration handlers.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_queue [--tasks 50000] [--mix SMS=5,EMAIL=3] [--producers 1 4] [--workers 4]
+                                     [--registry-sizes 0 100000] [--batch 0] [--rate 0] [--json]
+
+One run per (--producers, --registry-sizes) combination. Each run builds a fresh Queue with a fixed pool of --workers,
+pre-fills the registry with that many finished Tasks, then --producers threads enqueue --tasks Tasks between them (drawn
+from --mix; --batch N uses enqueue_many() in chunks of N instead of enqueue()). Handlers do nothing but the INPROGRESS ->
+COMPLETED status calls Worker makes, so what's measured is the queue's own overhead.
+By default producers go flat out, so the backlog (and dispatch latency) mostly reflects how far enqueue outruns the workers.
+--rate N paces them to N tasks/s in total (open loop) - below capacity, dispatch latency is the queue's own hand-off time.
+Reported per run:
+- enqueue_tps    : Tasks accepted per second across all producers (wall time of the enqueue phase).
+- dispatch       : enqueue -> handler start latency percentiles (what a Task waits when workers keep up... or don't).
+- drain_tps      : Tasks completed per second, first enqueue to last completion.
+"""
+import argparse
+import json
+import time
+from threading import Barrier, Lock, Thread
+
+from benchmarks.common import DEFAULT_MIX, draw_types, parse_mix, prefill, summarize
+from enums.TaskStatus import TaskStatus
+from models.config import QueueConfig
+from models.queue import Queue
+from models.task import Task
+
+def run(tasks: int, mix: str, producers: int, workers: int, registry_size: int, batch: int, rate: float = 0.0) -> dict:
+    waits: list[float] = []
+    waits_lock = Lock()
+
+    def factory(task: Task, queue: Queue):
+        def run_task() -> None:
+            wait = time.perf_counter() - task.enqueued_at
+            task.attempts += 1
+            queue.set_status(task, TaskStatus.INPROGRESS)
+            queue.set_status(task, TaskStatus.COMPLETED)
+            with waits_lock:
+                waits.append(wait)
+        return run_task
+
+    weights = parse_mix(mix)
+    queue = Queue(worker_factory=factory, config=QueueConfig(min_workers=workers, max_workers=workers))
+    prefill(queue, registry_size, weights)
+    types = draw_types(weights, tasks)
+    shares = [types[i::producers] for i in range(producers)]
+    barrier = Barrier(producers + 1)
+
+    def produce(share: list) -> None:
+        batch_tasks = [Task.create("bench", t) for t in share]
+        step = max(1, batch)
+        interval = step * producers / rate if rate else 0.0
+        barrier.wait()
+        next_at = time.perf_counter()
+        for i in range(0, len(batch_tasks), step):
+            if interval:
+                next_at += interval
+                delay = next_at - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            if batch:
+                queue.enqueue_many(batch_tasks[i:i + batch])
+            else:
+                queue.enqueue(batch_tasks[i], dedup=False)
+
+    threads = [Thread(target=produce, args=(share,)) for share in shares]
+    for t in threads:
+        t.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for t in threads:
+        t.join()
+    enqueued = time.perf_counter()
+    queue.shutdown()    # Drains everything.
+    finished = time.perf_counter()
+    return {
+        "tasks": tasks, "mix": mix, "producers": producers, "workers": workers, "registry_size": registry_size,
+        "batch": batch, "rate": rate,
+        "enqueue_tps": round(tasks / (enqueued - start)),
+        "drain_tps": round(tasks / (finished - start)),
+        "dispatch": summarize(waits),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=50_000)
+    parser.add_argument("--mix", default=DEFAULT_MIX, help="Relative TaskType weights, e.g. SMS=5,EMAIL=3.")
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 4])
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--registry-sizes", type=int, nargs="+", default=[0, 100_000])
+    parser.add_argument("--batch", type=int, default=0, help="Use enqueue_many() with this chunk size (0 = enqueue()).")
+    parser.add_argument("--rate", type=float, default=0.0, help="Total enqueue rate in tasks/s (0 = as fast as possible).")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(args.tasks, args.mix, p, args.workers, size, args.batch, args.rate)
+               for size in args.registry_sizes for p in args.producers]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        d = r["dispatch"]
+        print(f"registry={r['registry_size']:<8} producers={r['producers']:<3} enqueue {r['enqueue_tps']:>7} tasks/s  "
+              f"drain {r['drain_tps']:>7} tasks/s  dispatch p50={d['p50_ms']}ms p99={d['p99_ms']}ms")
+
+if __name__ == "__main__":
+    main()
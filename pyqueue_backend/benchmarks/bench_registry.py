@@ -0,0 +1,135 @@
+"""
+Registry contention benchmark: status-change throughput/latency next to concurrent API-style reads of the job registry.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_registry [--registry-size 100000] [--writers 4] [--readers 0 4 16] [--dashboards 1]
+                                        [--shards 16] [--duration 3] [--json]
+
+Per run, a Queue pre-filled with --registry-size Tasks (no workers running) gets, for --duration seconds:
+- --writers threads calling set_status() on their own Tasks (what workers do twice per attempt),
+- --readers threads doing what API requests do: get_job_by_id (60%), a 100-Task query_jobs page (30%), get_job_count (10%),
+  each followed by building the response models the route would return (so a read isn't just a spin on the lock),
+- --dashboards threads reading the whole registry in creation order (query_jobs() without a limit - what an unpaginated
+  GET /api/jobs does before serializing) in a loop.
+Layouts compared:
+- global   : every read also holds Queue.lock, on a 1-shard registry (how it worked before the registry was sharded).
+- shards=1 : reads only take the registry's own lock (a single stripe).
+- shards=N : the registry striped over --shards locks (PYQUEUE_REGISTRY_SHARDS=N; the default is one per CPU, max 16).
+Reported: writes/s with the p99 / max set_status() latency (how long a writer got held up), reads/s and dashboard copies/s.
+"""
+import argparse
+import json
+import random
+import time
+from threading import Event, Thread
+
+from benchmarks.common import DEFAULT_MIX, noop_factory, parse_mix, percentile, prefill
+from enums.TaskStatus import TaskStatus
+from models.config import QueueConfig
+from models.queue import Queue
+from schemas.mappers import task_to_response
+
+CYCLE: dict[TaskStatus, TaskStatus] = {
+    TaskStatus.COMPLETED: TaskStatus.INPROGRESS, TaskStatus.INPROGRESS: TaskStatus.COMPLETED,
+}
+
+def run(layout: str, shards: int, registry_size: int, writers: int, readers: int, dashboards: int, duration: float) -> dict:
+    queue = Queue(worker_factory=noop_factory, config=QueueConfig(min_workers=1, max_workers=1, registry_shards=shards))
+    prefill(queue, registry_size, parse_mix(DEFAULT_MIX))
+    tasks = queue.get_jobs()
+    ids = [t.t_id for t in tasks]
+    hold_lock = layout == "global"
+    stop = Event()
+    write_lat: list[list[float]] = [[] for _ in range(writers)]
+    reads = [0] * readers
+    copies = [0] * dashboards
+
+    def write(n: int) -> None:
+        own = tasks[n::writers]
+        lat = write_lat[n]
+        i = 0
+        while not stop.is_set():
+            task = own[i % len(own)]
+            started = time.perf_counter()
+            queue.set_status(task, CYCLE[task.status])
+            lat.append(time.perf_counter() - started)
+            i += 1
+
+    def read(n: int) -> None:
+        rng = random.Random(n)
+        count = 0
+        while not stop.is_set():
+            r = rng.random()
+            if hold_lock:
+                queue.lock.acquire()
+            try:
+                if r < 0.6:
+                    found = [queue.get_job_by_id(rng.choice(ids))]
+                elif r < 0.9:
+                    found, _, _ = queue.query_jobs(limit=100)
+                else:
+                    queue.get_job_count()
+                    found = []
+            finally:
+                if hold_lock:
+                    queue.lock.release()
+            for task in found:
+                task_to_response(task)
+            count += 1
+        reads[n] = count
+
+    def dashboard(n: int) -> None:
+        count = 0
+        while not stop.is_set():
+            if hold_lock:
+                with queue.lock:
+                    queue.query_jobs()
+            else:
+                queue.query_jobs()
+            count += 1
+        copies[n] = count
+
+    threads = [Thread(target=write, args=(n,)) for n in range(writers)]
+    threads += [Thread(target=read, args=(n,)) for n in range(readers)]
+    threads += [Thread(target=dashboard, args=(n,)) for n in range(dashboards)]
+    for t in threads:
+        t.start()
+    time.sleep(duration)
+    stop.set()
+    for t in threads:
+        t.join()
+    queue.shutdown()
+    lat = [x for per_thread in write_lat for x in per_thread]
+    return {
+        "layout": layout, "shards": shards, "registry_size": registry_size,
+        "writers": writers, "readers": readers, "dashboards": dashboards,
+        "writes_per_s": round(len(lat) / duration),
+        "write_p99_ms": round(percentile(lat, 99) * 1000, 3),
+        "write_max_ms": round(max(lat, default=0.0) * 1000, 3),
+        "reads_per_s": round(sum(reads) / duration),
+        "dashboard_copies_per_s": round(sum(copies) / duration, 1),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--registry-size", type=int, default=100_000)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--readers", type=int, nargs="+", default=[0, 4, 16])
+    parser.add_argument("--dashboards", type=int, default=1)
+    parser.add_argument("--shards", type=int, default=16)
+    parser.add_argument("--duration", type=float, default=3.0, help="Seconds per run.")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    layouts = [("global", 1), ("shards=1", 1), (f"shards={args.shards}", args.shards)]
+    results = [run(layout, shards, args.registry_size, args.writers, readers, args.dashboards, args.duration)
+               for readers in args.readers for layout, shards in layouts]
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['layout']:>10} readers={r['readers']:<3} writes {r['writes_per_s']:>7}/s (p99 {r['write_p99_ms']}ms, "
+              f"max {r['write_max_ms']}ms)  reads {r['reads_per_s']:>7}/s  dashboard copies {r['dashboard_copies_per_s']}/s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Shutdown benchmark: how long Queue.shutdown() takes with a backlog - running it all vs draining + handoff.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_shutdown [--backlog 2000 20000] [--work-ms 5] [--workers 4] [--grace 1] [--json]
+
+Per --backlog entry, a Queue whose handler sleeps --work-ms per Task gets that many Tasks and is shut down right away:
+- finish : no grace period (the default) - shutdown() returns once the whole backlog has run.
+- drain  : shutdown(grace=--grace) - running Tasks get the grace period, the rest goes to a handoff file.
+Reported: shutdown_s, handed_off (Tasks written to the handoff file) and, for drain, load_s - how long the next Queue's
+load_handoff() takes to pick them all back up (the part of a restart that still scales with the backlog).
+"""
+import argparse
+import json
+import tempfile
+import time
+
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.handlers import HandlerRegistry
+from models.queue import Queue
+from models.task import Task
+from system.worker import Worker
+
+def worker_factory(task: Task, queue: Queue):
+    return Worker(task, queue).run
+
+def run(mode: str, backlog: int, work: float, workers: int, grace: float) -> dict:
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, lambda task: time.sleep(work))
+    with tempfile.TemporaryDirectory() as tmp:
+        config = QueueConfig(min_workers=workers, max_workers=workers, handoff_dir=tmp)
+        queue = Queue(worker_factory=worker_factory, config=config, handlers=handlers)
+        queue.enqueue_many([Task.create(f"t{i}", TaskType.EMAIL) for i in range(backlog)])
+        start = time.perf_counter()
+        queue.shutdown(grace if mode == "drain" else None)
+        shutdown_s = time.perf_counter() - start
+        result = {"mode": mode, "backlog": backlog, "shutdown_s": round(shutdown_s, 3), "handed_off": 0, "load_s": None}
+        if mode == "drain":
+            restarted = Queue(worker_factory=worker_factory, config=config, handlers=handlers)
+            start = time.perf_counter()
+            result["handed_off"] = restarted.load_handoff()
+            result["load_s"] = round(time.perf_counter() - start, 3)
+            restarted.shutdown(0)   # (Hands them off again - the directory is deleted right after.)
+    return result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backlog", type=int, nargs="+", default=[2000, 20000])
+    parser.add_argument("--work-ms", type=float, default=5.0, help="Time each Task's handler takes.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--grace", type=float, default=1.0, help="Drain grace period in seconds.")
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = []
+    for n in args.backlog:
+        for mode in ("finish", "drain"):
+            results.append(run(mode, n, args.work_ms / 1000, args.workers, args.grace))
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        load = f"  load {r['load_s']}s" if r["load_s"] is not None else ""
+        print(f"{r['mode']:>6} backlog={r['backlog']:<7} shutdown {r['shutdown_s']:>8}s  handed_off={r['handed_off']}{load}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Task memory benchmark: bytes per retained Task, old representation vs. the current models/task.py.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_task_memory [--tasks 1000000] [--distinct-payloads 100] [--json]
+
+Representations:
+- legacy  : the previous Task (@dataclass with a per-instance __dict__ and a datetime created_at), built the way the old
+            Task.create() built it. Defined below so the comparison doesn't depend on git history.
+- current : Task.create() as it is now (slots, epoch-int timestamp, shared payload strings).
+Payloads cycle through --distinct-payloads values (built fresh per Task, like request bodies are); 0 makes every payload unique.
+Measured with tracemalloc (everything allocated for the Task list, IDs and payloads included), then divided by --tasks.
+"""
+import argparse
+import datetime
+import gc
+import json
+import time
+import tracemalloc
+from dataclasses import dataclass
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.task import Task
+
+@dataclass
+class LegacyTask:
+    t_id: str
+    payload: str
+    t_type: TaskType
+    status: TaskStatus
+    attempts: int
+    max_retries: int
+    created_at: datetime.datetime
+    priority: int = 0
+    enqueued_at: float = 0.0
+
+def make_legacy(payload: str) -> LegacyTask:
+    return LegacyTask(t_id=f"Task-{time.perf_counter_ns()}", payload=payload, t_type=TaskType.EMAIL,
+                      status=TaskStatus.QUEUED, attempts=0, max_retries=3, created_at=datetime.datetime.now())
+
+def make_current(payload: str) -> Task:
+    return Task.create(payload, TaskType.EMAIL)
+
+def measure(factory, tasks: int, distinct: int) -> dict:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    kept = [factory("".join(("payload-", str(i % distinct if distinct else i)))) for i in range(tasks)]
+    elapsed = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del kept
+    return {"tasks": tasks, "bytes_per_task": round(size / tasks, 1), "total_mb": round(size / 2**20, 1),
+            "create_s": round(elapsed, 3)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=1_000_000)
+    parser.add_argument("--distinct-payloads", type=int, default=100)
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = []
+    for name, factory in (("legacy", make_legacy), ("current", make_current)):
+        r = measure(factory, args.tasks, args.distinct_payloads)
+        r["repr"] = name
+        r["distinct_payloads"] = args.distinct_payloads
+        results.append(r)
+    if args.json:
+        print(json.dumps(results))
+        return
+    for r in results:
+        print(f"{r['repr']:>8} {r['bytes_per_task']:>8} bytes/task  ({r['total_mb']} MB for {r['tasks']} tasks)")
+    print(f"current uses {results[1]['bytes_per_task'] / results[0]['bytes_per_task']:.0%} of legacy")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+WAL overhead benchmark: enqueue throughput with the in-memory registry vs. the write-ahead log (models/journal.py).
+
+Run from pyqueue_backend/:
+    python -m benchmarks.bench_wal [--tasks 20000] [--producers 1 8 32] [--json]
+
+Modes:
+- memory      : PYQUEUE_WAL_DIR unset (the old behaviour).
+- wal-async   : WAL on, enqueue() doesn't wait for fsync (records are durable within one flush interval).
+- wal-sync    : WAL on, enqueue() waits for its group commit (the default) - concurrent producers share each fsync.
+Handlers are no-ops, so this isolates the enqueue path.
+"""
+import argparse
+import json
+import tempfile
+import time
+from threading import Thread
+
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.queue import Queue
+from models.task import Task
+
+def noop_factory(task: Task, queue: Queue):
+    return lambda: queue.set_status(task, task.status)
+
+def run(mode: str, tasks: int, producers: int) -> dict:
+    with tempfile.TemporaryDirectory() as wal_dir:
+        config = QueueConfig(
+            wal_dir=None if mode == "memory" else wal_dir,
+            wal_sync_enqueue=(mode == "wal-sync"),
+        )
+        queue = Queue(worker_factory=noop_factory, config=config)
+        per_producer = tasks // producers
+
+        def produce() -> None:
+            for _ in range(per_producer):
+                queue.enqueue(Task.create("bench", TaskType.TEST))
+
+        threads = [Thread(target=produce) for _ in range(producers)]
+        start = time.perf_counter()
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - start
+        queue.shutdown()
+    total = per_producer * producers
+    return {"mode": mode, "producers": producers, "tasks": total, "elapsed_s": round(elapsed, 4),
+            "enqueue_tps": round(total / elapsed, 1)}
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--producers", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--json", action="store_true", help="Emit machine-readable results only.")
+    args = parser.parse_args()
+
+    results = [run(mode, args.tasks, p) for p in args.producers for mode in ("memory", "wal-async", "wal-sync")]
+    if args.json:
+        print(json.dumps(results))
+        return
+    baseline = {r["producers"]: r["enqueue_tps"] for r in results if r["mode"] == "memory"}
+    for r in results:
+        factor = baseline[r["producers"]] / r["enqueue_tps"]
+        print(f"{r['mode']:>10} producers={r['producers']:<3} {r['enqueue_tps']:>10} tasks/s  ({factor:.2f}x slower than memory)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Shared helpers for the benchmark suite (bench_queue, bench_api, run_all). Not a benchmark itself.
+"""
+import random
+import statistics
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import parse_type_map
+from models.queue import Queue
+from models.task import Task
+
+DEFAULT_MIX: str = "SMS=5,EMAIL=3,REPORT=1,NEWSLETTER=1"
+
+# "SMS=5,EMAIL=3" -> relative weights per TaskType (same syntax as the PYQUEUE_TYPE_* env vars):
+def parse_mix(raw: str) -> dict[TaskType, float]:
+    mix = {t: float(w) for t, w in parse_type_map(raw).items()}
+    if not mix or any(w < 0 for w in mix.values()) or sum(mix.values()) <= 0:
+        raise SystemExit(f"invalid --mix {raw!r} (expected e.g. {DEFAULT_MIX})")
+    return mix
+
+# A reproducible sequence of n TaskTypes drawn from the mix:
+def draw_types(mix: dict[TaskType, float], n: int, seed: int = 42) -> list[TaskType]:
+    rng = random.Random(seed)
+    return rng.choices(list(mix), weights=list(mix.values()), k=n)
+
+def noop_factory(task: Task, queue: Queue):
+    return lambda: None
+
+# Zero-duration handler that goes through the same status calls Worker makes:
+def complete_factory(task: Task, queue: Queue):
+    def run() -> None:
+        task.attempts += 1
+        queue.set_status(task, TaskStatus.INPROGRESS)
+        queue.set_status(task, TaskStatus.COMPLETED)
+    return run
+
+# Grow the registry to `size` finished Tasks without running them (to measure costs that scale with registry size):
+def prefill(queue: Queue, size: int, mix: dict[TaskType, float], seed: int = 7) -> None:
+    tasks = [Task.create(f"prefill-{i}", t) for i, t in enumerate(draw_types(mix, size, seed))]
+    with queue.lock:
+        for task in tasks:
+            task.status = TaskStatus.COMPLETED
+            queue.jobs.add(task)
+
+def percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+# Latency summary in milliseconds (samples in seconds):
+def summarize(samples: list[float]) -> dict:
+    return {
+        "n": len(samples),
+        "mean_ms": round(statistics.fmean(samples) * 1000, 3) if samples else 0.0,
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples, default=0.0) * 1000, 3),
+    }
@@ -0,0 +1,169 @@
+"""
+Benchmark suite runner: runs the benchmarks with a fixed profile, saves one JSON report, and compares it with an earlier one.
+
+Run from pyqueue_backend/:
+    python -m benchmarks.run_all [--profile quick|full] [--only queue api ...] [--out results.json]
+                                 [--compare baseline.json] [--threshold 10]
+
+Each benchmark runs in its own subprocess (`python -m benchmarks.<name> ... --json`) so no state leaks between them. The report
+records the git commit, Python version and profile next to the raw results, so two reports from different commits can be
+diffed. With --compare, every tracked metric (SUITE below) is matched by its key fields against the baseline report and
+printed with its change; the exit status is 1 if any of them got worse by more than --threshold percent (handy in CI:
+save a report on main, --compare against it on a branch).
+"""
+import argparse
+import datetime
+import json
+import platform
+import subprocess
+import sys
+from typing import Optional
+
+HIGHER, LOWER = "higher", "lower"   # Which direction is better for a metric.
+
+# name -> (module, {profile: args}, key fields identifying a row, {metric path: direction})
+SUITE: dict[str, tuple[str, dict[str, list[str]], tuple[str, ...], dict[str, str]]] = {
+    "queue": ("benchmarks.bench_queue", {
+        "quick": ["--tasks", "20000", "--producers", "1", "4", "--registry-sizes", "0", "50000"],
+        "full": [],
+    }, ("producers", "registry_size", "batch"), {"enqueue_tps": HIGHER, "drain_tps": HIGHER}),
+    # Paced below capacity, so dispatch latency is hand-off time rather than backlog:
+    "queue_latency": ("benchmarks.bench_queue", {
+        "quick": ["--tasks", "10000", "--rate", "5000", "--producers", "1", "--registry-sizes", "0"],
+        "full": ["--tasks", "50000", "--rate", "5000", "--producers", "1", "4", "--registry-sizes", "0", "100000"],
+    }, ("producers", "registry_size", "rate"), {"dispatch.p50_ms": LOWER, "dispatch.p99_ms": LOWER}),
+    "api": ("benchmarks.bench_api", {
+        "quick": ["--requests", "500", "--full-requests", "5", "--registry-sizes", "1000", "20000"],
+        "full": [],
+    }, ("scenario", "transport", "registry_size"), {"rps": HIGHER, "latency.p99_ms": LOWER}),
+    "batch_api": ("benchmarks.bench_batch_api", {
+        "quick": ["--tasks", "2000"],
+        "full": [],
+    }, ("mode", "batch_size"), {"tasks_per_s": HIGHER}),
+    "wal": ("benchmarks.bench_wal", {
+        "quick": ["--tasks", "5000", "--producers", "1", "8"],
+        "full": [],
+    }, ("mode", "producers"), {"enqueue_tps": HIGHER}),
+    "logging": ("benchmarks.bench_logging", {
+        "quick": ["--calls", "5000", "--threads", "8", "--write-latency-us", "100", "--modes", "print", "queued", "filtered"],
+        "full": [],
+    }, ("mode", "threads", "write_latency_us"), {"emit_us": LOWER}),
+    "registry": ("benchmarks.bench_registry", {
+        "quick": ["--registry-size", "50000", "--readers", "4", "--duration", "2"],
+        "full": [],
+    }, ("layout", "readers"), {"writes_per_s": HIGHER, "write_p99_ms": LOWER}),
+    "ids": ("benchmarks.bench_ids", {
+        "quick": ["--ids", "50000", "--threads", "1", "--processes", "0"],
+        "full": [],
+    }, ("scheme", "threads"), {"ns_per_id": LOWER}),
+    "broker": ("benchmarks.bench_broker", {
+        "quick": ["--tasks", "500", "--processes", "1", "2"],
+        "full": [],
+    }, ("backend", "processes"), {"tasks_per_s": HIGHER}),
+    "handlers": ("benchmarks.bench_handlers", {
+        "quick": ["--tasks", "500"],
+        "full": [],
+    }, ("batch_size",), {"tasks_per_s": HIGHER}),
+    "shutdown": ("benchmarks.bench_shutdown", {
+        "quick": ["--backlog", "2000"],
+        "full": [],
+    }, ("mode", "backlog"), {"shutdown_s": LOWER}),
+    "task_memory": ("benchmarks.bench_task_memory", {
+        "quick": ["--tasks", "200000"],
+        "full": [],
+    }, ("repr",), {"bytes_per_task": LOWER}),
+}
+
+def git_commit() -> Optional[str]:
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True).stdout.strip()
+        dirty = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True).stdout
+        return commit + ("-dirty" if dirty.strip() else "")
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def run_benchmark(module: str, args: list[str]) -> list[dict]:
+    proc = subprocess.run([sys.executable, "-m", module, *args, "--json"], capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"{module} failed:\n{proc.stderr}")
+    # Handlers may print; the result is the last line.
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+def metric(row: dict, path: str) -> Optional[float]:
+    value = row
+    for part in path.split("."):
+        if not isinstance(value, dict) or part not in value:
+            return None
+        value = value[part]
+    return value
+
+# Rows of `name` in both reports matched by key fields -> (label, metric, old, new, change % where + = better):
+def compare(name: str, current: list[dict], baseline: list[dict]) -> list[tuple[str, str, float, float, float]]:
+    _, _, keys, metrics = SUITE[name]
+    old_rows = {tuple(r.get(k) for k in keys): r for r in baseline}
+    out = []
+    for row in current:
+        key = tuple(row.get(k) for k in keys)
+        old_row = old_rows.get(key)
+        if old_row is None:
+            continue
+        label = name + " " + " ".join(f"{k}={v}" for k, v in zip(keys, key))
+        for path, direction in metrics.items():
+            old, new = metric(old_row, path), metric(row, path)
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            out.append((label, path, old, new, change if direction == HIGHER else -change))
+    return out
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--profile", choices=("quick", "full"), default="quick")
+    parser.add_argument("--only", nargs="+", choices=list(SUITE), help="Run just these benchmarks.")
+    parser.add_argument("--out", help="Write the report here (default: stdout).")
+    parser.add_argument("--compare", help="Earlier report to compare against.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    args = parser.parse_args()
+
+    names = args.only or list(SUITE)
+    report = {
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "profile": args.profile,
+        "started_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        "results": {},
+    }
+    for name in names:
+        module, profiles, _, _ = SUITE[name]
+        print(f"[bench] {name} ...", file=sys.stderr)
+        report["results"][name] = run_benchmark(module, profiles[args.profile])
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"[bench] report written to {args.out}", file=sys.stderr)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if not args.compare:
+        return
+    with open(args.compare) as f:
+        baseline = json.load(f)
+    if baseline.get("profile") != args.profile:
+        print(f"[bench] warning: baseline profile is {baseline.get('profile')!r}, this run is {args.profile!r}", file=sys.stderr)
+    regressions = 0
+    print(f"[bench] {baseline.get('commit')} -> {report['commit']} (+ = better)", file=sys.stderr)
+    for name in names:
+        for label, path, old, new, change in compare(name, report["results"][name], baseline.get("results", {}).get(name, [])):
+            flag = ""
+            if change < -args.threshold:
+                flag = "  REGRESSION"
+                regressions += 1
+            print(f"  {label:<60} {path:<16} {old:>12} -> {new:<12} {change:+6.1f}%{flag}", file=sys.stderr)
+    if regressions:
+        print(f"[bench] {regressions} metric(s) regressed by more than {args.threshold}%", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
@@ -6,3 +6,4 @@ class TaskStatus(Enum):
     INPROGRESS = "INPROGRESS"
     COMPLETED = "COMPLETED"
     FAILED = "FAILED"
+    CANCELLED = "CANCELLED"    # 2026-10-17: Final - set by POST /api/jobs/{id}/cancel (see models/cancel.py).
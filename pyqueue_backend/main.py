@@ -1,10 +1,17 @@
+import logging
 import os
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from dotenv import load_dotenv
+from models.config import QueueConfig
+from models.handlers import HandlerRegistry
+from models.ids import configure_ids
+from models.log import configure_logging, stop_logging
 from models.queue import Queue
+from schemas.mappers import configure_response_cache
 from system.producer import router
-from system.worker import Worker
+from system.worker import Worker, AsyncWorker, BatchWorker
 from contextlib import asynccontextmanager
 
 # 2026-02-18: Just a test comment merged in from branch master-practice-for-git-refresh
@@ -29,21 +36,47 @@ FRONTEND_ORIGIN = os.getenv("FRONTEND_ORIGIN", "http://localhost:5173").rstrip("
 if not FRONTEND_ORIGIN:
     raise RuntimeError("FRONTEND_ORIGIN is not set")
 
-print("FRONTEND_ORIGIN =", os.getenv("FRONTEND_ORIGIN"))
+# 2026-10-17: Worker pool bounds, autoscaler tuning and Scheduler weights all come from PYQUEUE_* env vars (see models/config.py):
+QUEUE_CONFIG = QueueConfig.from_env()
+
+# 2026-10-17: JSON log lines written by a background thread (see models/log.py) instead of print() - set up before anything logs:
+configure_logging(QUEUE_CONFIG.log_level, QUEUE_CONFIG.type_log_levels, QUEUE_CONFIG.log_sample, QUEUE_CONFIG.log_buffer)
+logging.getLogger("pyqueue").info("FRONTEND_ORIGIN = %s", os.getenv("FRONTEND_ORIGIN"))
+configure_ids(QUEUE_CONFIG.node_id)    # 2026-10-17: Task ID node bits (random per process unless PYQUEUE_NODE_ID is set).
+configure_response_cache(QUEUE_CONFIG.response_cache_size)  # 2026-10-17: Serialized-Task cache for job lists.
+
+# 2026-10-17: Real task handlers, per TaskType (see models/handlers.py). Types with none keep Worker's simulated work, e.g.:
+#     @HANDLERS.register(TaskType.EMAIL, batch_size=50, max_wait_ms=20)
+#     def send_emails(tasks: list[Task]) -> None: ...
+HANDLERS = HandlerRegistry()
 
 def worker_factory(task, queue):
     return Worker(task, queue).run
 
+# 2026-10-17: ...and for a micro-batch of Tasks of a type registered with batch_size > 1:
+def batch_worker_factory(tasks, queue):
+    return BatchWorker(tasks, queue).run
+
+# 2026-10-17: Same idea for TaskTypes routed to the asyncio lane (PYQUEUE_BACKENDS="EMAIL=async,...") - returns a coroutine function:
+def async_worker_factory(task, queue):
+    return AsyncWorker(task, queue).run
+
 @asynccontextmanager
 async def lifespan(the_app: FastAPI):
     # 2026-02-01-NOTE: FastAPI DI Refactor.
     # On startup:
-    the_app.state.queue = Queue(worker_factory=worker_factory)
+    the_app.state.queue = Queue(worker_factory=worker_factory, config=QUEUE_CONFIG, async_worker_factory=async_worker_factory,
+                                handlers=HANDLERS, batch_worker_factory=batch_worker_factory)
+    # 2026-10-17: If PYQUEUE_WAL_DIR is set, replay it and re-dispatch unfinished Tasks before accepting traffic (no-op otherwise):
+    the_app.state.queue.recover()
+    # 2026-10-17: ...and pick up what the previous process handed off when it drained (PYQUEUE_HANDOFF_DIR, no-op otherwise):
+    the_app.state.queue.load_handoff()
     try:
         yield
     finally:
         # shutdown
         the_app.state.queue.shutdown()
+        stop_logging()  # Flushes whatever the workers logged on the way out.
 
     # [EDIT: Pre-DI Legacy Code] on startup:
     """
@@ -58,10 +91,15 @@ async def lifespan(the_app: FastAPI):
     """
 
 app = FastAPI(lifespan=lifespan)
-app.add_middleware(CORSMiddleware, allow_origins=[FRONTEND_ORIGIN],allow_credentials=True,allow_methods=["*"],allow_headers=["*"],)
+app.add_middleware(CORSMiddleware, allow_origins=[FRONTEND_ORIGIN],allow_credentials=True,allow_methods=["*"],allow_headers=["*"],expose_headers=["X-Next-Cursor", "X-Total-Count"],)
 # ^ TO-DO: ^ I should 100% externalize the origins destination to an environmental variable (need this for Railway deployment later anyways).
 app.include_router(router)
 
+# 2026-10-17: Prometheus scrape endpoint (at the root, outside /api, where scrapers look by default - see models/metrics.py):
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics(request: Request) -> PlainTextResponse:
+    return PlainTextResponse(request.app.state.queue.render_metrics(), media_type="text/plain; version=0.0.4")
+
 @app.get("/")
 async def root():
     return {"message": "Hello World"}
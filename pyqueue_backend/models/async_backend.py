@@ -0,0 +1,111 @@
+import asyncio
+import logging
+import time
+from concurrent.futures import Future, wait
+from functools import partial
+from threading import Lock, Semaphore, Thread
+from typing import TYPE_CHECKING, Awaitable, Callable, Optional
+
+from models.task import Task
+
+if TYPE_CHECKING:
+    from models.queue import Queue
+
+"""
+2026-10-17-NOTE:
+asyncio execution lane for I/O-shaped TaskTypes (PYQUEUE_BACKENDS="EMAIL=async,SMS=async,NEWSLETTER=async").
+A thread-lane Worker blocks a whole OS thread in time.sleep() for 1-10 seconds, so throughput is capped by thread count.
+Here each in-flight Task is a coroutine on ONE dedicated event loop thread instead, so thousands of waiting Tasks cost
+coroutines (a few KB each), not threads.
+
+Same shape as the process lane (models/process_backend.py):
+- A bridge thread pulls from the Scheduler's "async" lane, but only while fewer than async_concurrency coroutines are in
+  flight - so everything beyond the limit waits in the Scheduler (priority + fairness still apply).
+- Each Task is handed to the loop with run_coroutine_threadsafe(); the coroutine is whatever async_worker_factory returns
+  (main.py wires in AsyncWorker(task, queue).run, which keeps Worker's retry/fail semantics).
+
+I went with a dedicated loop thread rather than FastAPI's own loop so that a slow/buggy handler can never stall request
+handling, and so Queue keeps working the same way outside of FastAPI (benchmarks, scripts).
+"""
+
+log = logging.getLogger("pyqueue.queue")
+LANE: str = "async"
+AsyncWorkerFactory = Callable[[Task, "Queue"], Callable[[], Awaitable[None]]]
+
+class AsyncBackend:
+    """
+    Dedicated event loop thread + bridge thread (Scheduler -> loop) with a cap on in-flight coroutines.
+    """
+
+    # 0. Constructor:
+    def __init__(self, queue: "Queue", async_worker_factory: AsyncWorkerFactory, concurrency: int,
+                 on_finished: Optional[Callable[[Task, float], None]] = None) -> None:
+        self.queue = queue
+        self.async_worker_factory = async_worker_factory
+        self.on_finished = on_finished
+        self._slots: Semaphore = Semaphore(concurrency)
+        self._inflight: set[Future] = set()
+        self._inflight_lock: Lock = Lock()
+
+        self.loop: asyncio.AbstractEventLoop = asyncio.new_event_loop()
+        self._loop_thread: Thread = Thread(target=self.loop.run_forever, name="pyqueue-async-loop", daemon=True)
+        self._bridge: Thread = Thread(target=self._dispatch_loop, name="pyqueue-async-dispatcher", daemon=True)
+        self._loop_thread.start()
+        self._bridge.start()
+
+    # 1. Scheduler -> event loop:
+    def _dispatch_loop(self) -> None:
+        while True:
+            self._slots.acquire()
+            task = self.queue.scheduler.pop(lane=LANE)
+            if task is None:
+                self._slots.release()
+                return
+            token = self.queue.start_attempt(task)
+            if token is None:   # Cancelled between pop() and here.
+                self._slots.release()
+                self.queue.scheduler.done(task.t_type)
+                continue
+            started = [time.perf_counter()]
+            future = asyncio.run_coroutine_threadsafe(self._run(task, started), self.loop)
+            with self._inflight_lock:
+                self._inflight.add(future)
+            # 2026-10-17: Registered before bind_future() - a future cancelled before its coroutine ever ran (token already
+            # set, a racing cancel_job(), a drain's _cancel_running()) never enters _run(), so the slot, the handle and the
+            # type's concurrency count are given back here, exactly once per future, however it ended:
+            future.add_done_callback(partial(self._on_done, task, started))
+            token.bind_future(future)   # Cancelling the Task cancels the coroutine at its current await.
+
+    # 2. Coroutine wrapper around one Task attempt (runs on the loop thread):
+    async def _run(self, task: Task, started: list[float]) -> None:
+        started[0] = time.perf_counter()
+        try:
+            await self.async_worker_factory(task, self.queue)()
+        except Exception as e:
+            log.error("Async worker raised while running task %s: %s", task.t_id, e, extra={"task_id": task.t_id}, exc_info=e)
+            self.queue.fail_escaped(task)
+
+    def _on_done(self, task: Task, started: list[float], future: Future) -> None:
+        self.queue.end_attempt(task)
+        self._slots.release()
+        if self.on_finished is not None:
+            self.on_finished(task, time.perf_counter() - started[0])
+        with self._inflight_lock:
+            self._inflight.discard(future)
+
+    # 3. Shutdown (the Scheduler is already closed by Queue.shutdown()) - let in-flight coroutines finish, then stop the loop:
+    # (2026-10-17: With a deadline - a drain that ran out of time and cancelled what was still running - only wait until then.)
+    def shutdown(self, deadline: Optional[float] = None) -> None:
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        self._bridge.join(remaining)
+        with self._inflight_lock:
+            pending = list(self._inflight)
+        wait(pending, remaining)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._loop_thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+        if not self._loop_thread.is_alive():
+            self.loop.close()
+
+    def in_flight(self) -> int:
+        with self._inflight_lock:
+            return len(self._inflight)
@@ -0,0 +1,354 @@
+import copy
+import heapq
+import itertools
+import logging
+import os
+import secrets
+import socket
+import time
+from abc import ABC, abstractmethod
+from threading import Event, Lock, Thread
+from typing import Callable, Optional
+from urllib.parse import urlparse
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.registry import JobRegistry
+from models.retention import is_terminal
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Broker - shared dispatch + shared registry under Queue, for running several processes (uvicorn --workers N) or several
+replicas against the same jobs. Without one (PYQUEUE_BROKER_URL unset) nothing changes: every Queue keeps its Tasks in its
+own JobRegistry and /api/jobs/{id} only finds the Tasks that happened to be enqueued through the same process.
+
+With a broker, Queue.enqueue() hands new Tasks to the broker instead of its own Scheduler, and the API's registry reads
+(jobs, job by ID, counts) go to the broker, so every process sees every Task. Execution works like SQS / Redis reliable queues:
+- Each Queue runs a BrokerConsumer thread that *leases* ready Tasks (highest priority first, then oldest) and pushes them
+  into its local Scheduler, so priorities, per-type fairness and rate limits still apply locally. A lease is held for
+  `visibility` seconds and renewed by a heartbeat while the process is alive.
+- When an attempt finishes, the Task is acked (final) or released (retry; back to ready at its run_at, for any consumer).
+- A consumer that dies stops renewing its leases. Once they expire, another consumer leases those Tasks again and the
+  cut-off attempt is rerun, like WAL recovery does after a crash.
+- Consumers only lease up to `prefetch` Tasks beyond what they're running, so an idle process takes work and a busy one
+  doesn't hoard it. Throughput scales with the number of processes / nodes.
+- A consumer that loses a lease (cancelled, deleted, or expired and taken by someone else) finds out on its next status
+  write or heartbeat and stops the attempt. Its late writes are ignored: every write checks that the lease is still held.
+
+Implementations (PYQUEUE_BROKER_URL):
+- memory://            MemoryBroker, in-process. The stand-in for trying the lease/ack flow on one machine (several Queues
+                       sharing one MemoryBroker object act like several nodes).
+- sqlite:///path.db    SQLiteBroker (models/sqlite_broker.py). Any number of processes on one host.
+- redis://host:6379/0  RedisBroker (models/redis_broker.py). Any number of nodes. Speaks RESP directly, no client library.
+Every implementation returns its own Task copies - a Task object is never shared between a broker and a Queue.
+Cursors for page() are broker-assigned creation sequence numbers, like JobRegistry's.
+"""
+
+log = logging.getLogger("pyqueue.queue")
+
+READY, LEASED, DONE = "ready", "leased", "done"     # A Task's broker-side state (separate from its TaskStatus).
+
+class Broker(ABC):
+    """
+    What Queue needs from a broker. `consumer` arguments identify the lease holder (one per Queue - see consumer_id()).
+    Writes on a leased Task (save/ack/release) return False if `consumer` no longer holds its lease.
+    """
+
+    # 1. New Tasks - ready at their run_at:
+    @abstractmethod
+    def submit(self, tasks: list[Task]) -> None:
+        ...
+
+    # 2. Lease up to `limit` due Tasks for `visibility` seconds (expired leases are handed out again):
+    @abstractmethod
+    def lease(self, consumer: str, limit: int, visibility: float) -> list[Task]:
+        ...
+
+    # Renew every lease `consumer` holds; returns the IDs it still holds:
+    @abstractmethod
+    def heartbeat(self, consumer: str, visibility: float) -> set[str]:
+        ...
+
+    # 3. Status/attempts of a leased Task (still leased):
+    @abstractmethod
+    def save(self, consumer: str, task: Task) -> bool:
+        ...
+
+    # Final state - the lease ends:
+    @abstractmethod
+    def ack(self, consumer: str, task: Task) -> bool:
+        ...
+
+    # Back to ready at task.run_at, for any consumer (retries):
+    @abstractmethod
+    def release(self, consumer: str, task: Task) -> bool:
+        ...
+
+    # 4. Registry operations (the API's reads and deletes):
+    @abstractmethod
+    def cancel(self, t_id: str) -> bool:
+        ...     # False if there's no such Task or it already finished.
+
+    @abstractmethod
+    def delete(self, t_id: str) -> bool:
+        ...
+
+    @abstractmethod
+    def clear(self) -> None:
+        ...
+
+    @abstractmethod
+    def get(self, t_id: str) -> Optional[Task]:
+        ...
+
+    @abstractmethod
+    def page(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int]]:
+        ...
+
+    @abstractmethod
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        ...
+
+    @abstractmethod
+    def stats(self) -> dict[str, int]:
+        ...     # Tasks per broker-side state (ready / leased / done) + anything implementation-specific.
+
+    def close(self) -> None:
+        pass
+
+def consumer_id() -> str:
+    return f"{socket.gethostname()}:{os.getpid()}:{secrets.token_hex(3)}"
+
+def open_broker(url: str) -> Broker:
+    scheme = urlparse(url).scheme
+    if scheme == "memory":
+        return MemoryBroker()
+    if scheme == "sqlite":
+        from models.sqlite_broker import SQLiteBroker
+        return SQLiteBroker(url)
+    if scheme == "redis":
+        from models.redis_broker import RedisBroker
+        return RedisBroker(url)
+    raise ValueError(f"unsupported broker URL {url!r} (memory://, sqlite:///path or redis://host:port/db)")
+
+class MemoryBroker(Broker):
+    """
+    In-process broker: one lock around a JobRegistry of the broker's own Task copies, a ready heap, a delayed heap and a
+    lease-expiry heap (heap entries are checked against the Task's current state when popped, so nothing is removed
+    from a heap early).
+    """
+
+    # 0. Constructor:
+    def __init__(self) -> None:
+        self._lock: Lock = Lock()
+        self._jobs: JobRegistry = JobRegistry(1)
+        self._state: dict[str, str] = {}
+        self._leases: dict[str, tuple[str, float]] = {}    # t_id -> (consumer, expires at)
+        self._ready: list[tuple[int, int, str]] = []        # (-priority, order, t_id)
+        self._delayed: list[tuple[float, int, str]] = []    # (run_at, order, t_id)
+        self._expiry: list[tuple[float, str]] = []          # (lease expiry, t_id)
+        self._order = itertools.count()
+        self.redelivered: int = 0
+
+    def submit(self, tasks: list[Task]) -> None:
+        with self._lock:
+            for task in tasks:
+                task = copy.copy(task)
+                self._jobs.add(task)
+                self._make_ready(task)
+
+    def lease(self, consumer: str, limit: int, visibility: float) -> list[Task]:
+        now = time.time()
+        out: list[Task] = []
+        with self._lock:
+            while self._expiry and self._expiry[0][0] < now:
+                expires, t_id = heapq.heappop(self._expiry)
+                held = self._leases.get(t_id)
+                if held is not None and held[1] == expires:
+                    del self._leases[t_id]
+                    self._make_ready(self._jobs.get(t_id))
+                    self.redelivered += 1
+            while self._delayed and self._delayed[0][0] <= now:
+                _, _, t_id = heapq.heappop(self._delayed)
+                task = self._jobs.get(t_id)
+                if task is not None and self._state.get(t_id) == READY and task.run_at <= now:
+                    heapq.heappush(self._ready, (-task.priority, next(self._order), t_id))
+            until = now + visibility
+            while self._ready and len(out) < limit:
+                _, _, t_id = heapq.heappop(self._ready)
+                task = self._jobs.get(t_id)
+                if task is None or self._state.get(t_id) != READY or task.run_at > now:
+                    continue    # Stale entry (cancelled, deleted, or re-queued under a later run_at).
+                self._state[t_id] = LEASED
+                self._leases[t_id] = (consumer, until)
+                heapq.heappush(self._expiry, (until, t_id))
+                out.append(copy.copy(task))
+        return out
+
+    def heartbeat(self, consumer: str, visibility: float) -> set[str]:
+        until = time.time() + visibility
+        held: set[str] = set()
+        with self._lock:
+            for t_id, (owner, _) in list(self._leases.items()):
+                if owner == consumer:
+                    self._leases[t_id] = (consumer, until)
+                    heapq.heappush(self._expiry, (until, t_id))
+                    held.add(t_id)
+        return held
+
+    def save(self, consumer: str, task: Task) -> bool:
+        with self._lock:
+            return self._write(consumer, task) is not None
+
+    def ack(self, consumer: str, task: Task) -> bool:
+        with self._lock:
+            stored = self._write(consumer, task)
+            if stored is None:
+                return False
+            del self._leases[task.t_id]
+            self._state[task.t_id] = DONE
+            return True
+
+    def release(self, consumer: str, task: Task) -> bool:
+        with self._lock:
+            stored = self._write(consumer, task)
+            if stored is None:
+                return False
+            del self._leases[task.t_id]
+            self._make_ready(stored)
+            return True
+
+    def cancel(self, t_id: str) -> bool:
+        with self._lock:
+            task = self._jobs.get(t_id)
+            if task is None or is_terminal(task):
+                return False
+            old_status = task.status
+            task.status = TaskStatus.CANCELLED
+            self._jobs.move(task, old_status)
+            self._state[t_id] = DONE
+            self._leases.pop(t_id, None)
+            return True
+
+    def delete(self, t_id: str) -> bool:
+        with self._lock:
+            if self._jobs.remove(t_id) is None:
+                return False
+            self._state.pop(t_id, None)
+            self._leases.pop(t_id, None)
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._jobs.clear()
+            self._state.clear()
+            self._leases.clear()
+            self._ready.clear()
+            self._delayed.clear()
+            self._expiry.clear()
+
+    def get(self, t_id: str) -> Optional[Task]:
+        with self._lock:
+            task = self._jobs.get(t_id)
+            return copy.copy(task) if task is not None else None
+
+    def page(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int]]:
+        with self._lock:
+            tasks, next_cursor = self._jobs.page(status, t_type, after, limit)
+            return [copy.copy(t) for t in tasks], next_cursor
+
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        return self._jobs.count(status, t_type)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            states = list(self._state.values())
+        return {s: states.count(s) for s in (READY, LEASED, DONE)} | {"redelivered": self.redelivered}
+
+    # Helper methods (caller holds self._lock):
+    def _make_ready(self, task: Task) -> None:
+        self._state[task.t_id] = READY
+        if task.run_at > time.time():
+            heapq.heappush(self._delayed, (task.run_at, next(self._order), task.t_id))
+        else:
+            heapq.heappush(self._ready, (-task.priority, next(self._order), task.t_id))
+
+    # Copy status/attempts/run_at onto the stored Task if `consumer` holds its lease; returns the stored Task (else None):
+    def _write(self, consumer: str, task: Task) -> Optional[Task]:
+        held = self._leases.get(task.t_id)
+        stored = self._jobs.get(task.t_id)
+        if held is None or held[0] != consumer or stored is None:
+            return None
+        old_status = stored.status
+        stored.status, stored.attempts, stored.run_at = task.status, task.attempts, task.run_at
+        self._jobs.move(stored, old_status)
+        return stored
+
+class BrokerConsumer:
+    """
+    Per-Queue thread that leases Tasks from the broker (up to `prefetch` held at a time), hands them to `accept`, and
+    renews the held leases every visibility / 3 seconds. Leases found to be gone are passed to `lost`.
+    """
+
+    # 0. Constructor:
+    def __init__(self, broker: Broker, accept: Callable[[list[Task]], None], lost: Callable[[list[str]], None],
+                 prefetch: int, visibility: float, poll_interval: float) -> None:
+        self.broker = broker
+        self.consumer: str = consumer_id()
+        self._accept = accept
+        self._lost = lost
+        self.prefetch = prefetch
+        self.visibility = visibility
+        self.poll_interval = poll_interval
+        self._held: set[str] = set()    # (Only touched as whole-set add/discard calls - atomic under the GIL.)
+        self._wake: Event = Event()
+        self._stopping: Event = Event()
+        self._thread: Thread = Thread(target=self._run, name="pyqueue-broker", daemon=True)
+        self._thread.start()
+
+    # Something changed that's worth polling for right away (a local enqueue, a freed slot):
+    def wake(self) -> None:
+        self._wake.set()
+
+    # The attempt holding `t_id` is over (acked, released or lost):
+    def done(self, t_id: str) -> None:
+        self._held.discard(t_id)
+        self._wake.set()
+
+    def held(self) -> int:
+        return len(self._held)
+
+    def _run(self) -> None:
+        next_heartbeat = time.monotonic() + self.visibility / 3
+        while not self._stopping.is_set():
+            leased: list[Task] = []
+            try:
+                room = self.prefetch - len(self._held)
+                if room > 0:
+                    leased = self.broker.lease(self.consumer, room, self.visibility)
+                    if leased:
+                        self._held.update(t.t_id for t in leased)
+                        self._accept(leased)
+                if time.monotonic() >= next_heartbeat:
+                    before = set(self._held)
+                    still = self.broker.heartbeat(self.consumer, self.visibility)
+                    gone = [t_id for t_id in before - still if t_id in self._held]
+                    if gone:
+                        self._held.difference_update(gone)
+                        self._lost(gone)
+                    next_heartbeat = time.monotonic() + self.visibility / 3
+            except Exception as e:
+                # Broker unreachable for a moment (restart, network) - keep what we hold, try again after the poll interval.
+                log.warning("Broker call failed: %s", e, extra={"event": "broker_error"})
+            if not leased:
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+
+    # Stop leasing (Tasks already leased stay with the Queue, which finishes and acks them):
+    def stop(self) -> None:
+        self._stopping.set()
+        self._wake.set()
+        self._thread.join()
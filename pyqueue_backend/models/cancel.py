@@ -0,0 +1,51 @@
+from concurrent.futures import Future
+from threading import Event
+from typing import Optional
+
+"""
+2026-10-17-NOTE:
+Cooperative cancellation for running Tasks (POST /api/jobs/{id}/cancel, and delete/clear).
+Queue hands out one CancelToken per running attempt (Queue.start_attempt()) and keeps it in Queue._handles, so cancelling
+can reach a Task that's already on a worker:
+- Thread lane: Worker sleeps/waits through token.sleep() instead of time.sleep(), so a cancel wakes it immediately and
+  Worker abandons the attempt (TaskCancelled) - the worker thread is free again within milliseconds, not after 10s.
+- Async lane: the token is bound to the coroutine's Future, and cancelling it cancels the coroutine at its current await.
+- Process lane: child processes can't see the token; the attempt runs to completion and its result is simply ignored.
+"""
+
+class TaskCancelled(Exception):
+    pass
+
+class CancelToken:
+    __slots__ = ("_event", "_future")
+
+    def __init__(self) -> None:
+        self._event: Event = Event()
+        self._future: Optional[Future] = None
+
+    def cancel(self) -> None:
+        self._event.set()
+        future = self._future
+        if future is not None:
+            future.cancel()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def raise_if_cancelled(self) -> None:
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    # Interruptible time.sleep() - returns True if the token was cancelled while sleeping:
+    def sleep(self, seconds: float) -> bool:
+        return self._event.wait(seconds)
+
+    # Async lane - cancel this Future (run_coroutine_threadsafe's) along with the token:
+    def bind_future(self, future: Future) -> None:
+        self._future = future
+        if self._event.is_set():
+            future.cancel()     # Cancelled before the coroutine was even handed to the loop.
+
+# Token for attempts nobody can cancel (process-lane children, Workers constructed outside of Queue):
+NEVER_CANCELLED: CancelToken = CancelToken()
@@ -0,0 +1,168 @@
+import os
+from dataclasses import dataclass, field
+from typing import Optional
+
+from enums.TaskType import TaskType
+
+"""
+2026-10-17-NOTE:
+Runtime knobs for Queue, read from the environment (main.py already calls load_dotenv(), so a .env file works too).
+Same idea as the application.properties values I used in SpringQueuePro, just without a framework binding them for me:
+QueueConfig.from_env() is the single place that turns PYQUEUE_* strings into typed values, and Queue only ever sees the dataclass.
+"""
+
+def parse_type_map(raw: str) -> dict[TaskType, str]:
+    """
+    Parses "SMS=4,EMAIL=2"-style strings into {TaskType.SMS: "4", TaskType.EMAIL: "2"} (values are left as strings).
+    """
+    parsed: dict[TaskType, str] = {}
+    for pair in filter(None, (p.strip() for p in raw.split(","))):
+        name, _, value = pair.partition("=")
+        parsed[TaskType[name.strip().upper()]] = value.strip()
+    return parsed
+
+BACKENDS: tuple[str, ...] = ("thread", "process", "async")
+ADMISSION_MODES: tuple[str, ...] = ("reject", "block")
+LOG_LEVELS: tuple[str, ...] = ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL")
+BROKERS: tuple[str, ...] = ("memory", "sqlite", "redis")
+
+@dataclass
+class QueueConfig:
+    min_workers: int = 3    # Pool never shrinks below this (3 was the old hard-coded ThreadPoolExecutor size).
+    max_workers: int = 16   # Pool never grows above this.
+    idle_timeout: float = 30.0  # Seconds a worker above min_workers may sit idle before it is released.
+    scale_interval: float = 0.5 # Seconds between autoscaler checks.
+    target_wait: float = 2.0    # Backlog drain time (seconds) the autoscaler tries to stay under.
+    type_weights: dict[TaskType, int] = field(default_factory=dict)  # Scheduler weights (unlisted types default to 1).
+    backends: dict[TaskType, str] = field(default_factory=dict)   # Execution backend per type (unlisted types run on "thread").
+    process_workers: int = os.cpu_count() or 2  # Size of the warm process pool (only started if some type uses "process").
+    async_concurrency: int = 1000   # Max in-flight coroutines on the asyncio engine (only started if some type uses "async").
+    wal_dir: Optional[str] = None   # Directory for the write-ahead log + snapshots (None = in-memory only, the old behaviour).
+    wal_flush_interval: float = 0.005   # Group-commit window (seconds): one fsync covers everything logged within it.
+    wal_sync_enqueue: bool = True   # Whether enqueue() waits for its WAL record to be fsynced before dispatching.
+    wal_compact_every: int = 100_000    # Compact wal.log into a snapshot after this many records.
+    event_history: int = 10_000 # Job events kept for GET /api/events clients resuming with Last-Event-ID.
+    retention_max_terminal: Optional[int] = None    # Keep at most this many finished Tasks (oldest evicted first; None = no limit).
+    retention_ttl: Optional[float] = None   # Evict finished Tasks this many seconds after they finished (None = never).
+    retention_sweep_interval: float = 1.0   # Seconds between TTL sweeps.
+    archive_path: Optional[str] = None  # gzip'd JSON-lines file evicted Tasks are appended to (None = just drop them).
+    max_depth: Optional[int] = None     # Max Tasks waiting to run, all types together (None = unlimited).
+    type_max_depth: dict[TaskType, int] = field(default_factory=dict)   # Same, per TaskType (unlisted types = unlimited).
+    admission_mode: str = "reject"  # At a depth limit: "reject" right away, or "block" for up to admission_timeout first.
+    admission_timeout: float = 5.0  # Seconds a producer may wait for room in "block" mode before it is rejected.
+    type_rate_limit: dict[TaskType, float] = field(default_factory=dict)  # Max Tasks started per second, per type (token bucket)...
+    type_burst: dict[TaskType, float] = field(default_factory=dict)   # ...with bursts up to this many (default: one second's worth).
+    type_max_concurrency: dict[TaskType, int] = field(default_factory=dict)    # Max Tasks of a type running at once.
+    dedup_types: set[TaskType] = field(default_factory=set)    # TaskTypes de-duplicated by content hash (type + payload).
+    dedup_cache_size: int = 100_000     # Max idempotency keys / content hashes remembered...
+    dedup_ttl: float = 300.0    # ...and for how many seconds.
+    retry_base_delay: float = 1.0   # Seconds before a failed Task's first retry (doubles with every attempt, see models/retry.py).
+    retry_max_delay: float = 30.0   # Cap on a single retry delay.
+    retry_jitter: float = 0.5   # Share of each delay that is randomized (0-1).
+    type_retry_base_delay: dict[TaskType, float] = field(default_factory=dict)  # Per-type overrides of retry_base_delay...
+    type_retry_max_delay: dict[TaskType, float] = field(default_factory=dict)   # ...and retry_max_delay.
+    log_level: str = "INFO"     # Level for the "pyqueue" loggers (see models/log.py).
+    type_log_levels: dict[TaskType, str] = field(default_factory=dict)  # Per-type overrides for task lifecycle events.
+    log_sample: dict[TaskType, float] = field(default_factory=dict)     # Share of Tasks (0-1) whose INFO events are logged, per type.
+    log_buffer: int = 10_000    # Log records held for the writer thread before new ones are dropped.
+    registry_shards: int = min(16, os.cpu_count() or 1)   # Lock stripes in the job registry (see models/registry.py).
+    node_id: Optional[int] = None   # Task ID node bits (see models/ids.py; None = random per process).
+    broker_url: Optional[str] = None    # Shared broker (memory:// | sqlite:///path | redis://host:port/db - see models/broker.py).
+    broker_visibility: float = 30.0     # Seconds a lease lasts without a heartbeat (how long a dead process's Tasks wait).
+    broker_prefetch: int = 16   # Leased Tasks a process holds at once (running + waiting in its Scheduler).
+    broker_poll_interval: float = 0.05  # Seconds between lease attempts while the broker has nothing due.
+    response_cache_size: int = 100_000  # Tasks whose serialized API form is cached (see schemas/mappers.py; 0 = no cache).
+    drain_grace: Optional[float] = None     # Seconds running Tasks get on shutdown before the rest is handed off (None = run the whole backlog first).
+    handoff_dir: Optional[str] = None   # Where a drain writes unfinished Tasks, and startup reads them back (see models/handoff.py).
+
+    @classmethod
+    def from_env(cls) -> "QueueConfig":
+        defaults = cls()
+        config = cls(
+            min_workers=int(os.getenv("PYQUEUE_MIN_WORKERS", defaults.min_workers)),
+            max_workers=int(os.getenv("PYQUEUE_MAX_WORKERS", defaults.max_workers)),
+            idle_timeout=float(os.getenv("PYQUEUE_IDLE_TIMEOUT", defaults.idle_timeout)),
+            scale_interval=float(os.getenv("PYQUEUE_SCALE_INTERVAL", defaults.scale_interval)),
+            target_wait=float(os.getenv("PYQUEUE_TARGET_WAIT", defaults.target_wait)),
+            type_weights={t: int(w) for t, w in parse_type_map(os.getenv("PYQUEUE_TYPE_WEIGHTS", "")).items()},
+            backends={t: b.lower() for t, b in parse_type_map(os.getenv("PYQUEUE_BACKENDS", "")).items()},
+            process_workers=int(os.getenv("PYQUEUE_PROCESS_WORKERS", defaults.process_workers)),
+            async_concurrency=int(os.getenv("PYQUEUE_ASYNC_CONCURRENCY", defaults.async_concurrency)),
+            wal_dir=os.getenv("PYQUEUE_WAL_DIR") or None,
+            wal_flush_interval=float(os.getenv("PYQUEUE_WAL_FLUSH_INTERVAL", defaults.wal_flush_interval)),
+            wal_sync_enqueue=os.getenv("PYQUEUE_WAL_SYNC_ENQUEUE", "1").lower() not in ("0", "false", "no"),
+            wal_compact_every=int(os.getenv("PYQUEUE_WAL_COMPACT_EVERY", defaults.wal_compact_every)),
+            event_history=int(os.getenv("PYQUEUE_EVENT_HISTORY", defaults.event_history)),
+            retention_max_terminal=int(os.environ["PYQUEUE_RETENTION_MAX_TERMINAL"]) if os.getenv("PYQUEUE_RETENTION_MAX_TERMINAL") else None,
+            retention_ttl=float(os.environ["PYQUEUE_RETENTION_TTL"]) if os.getenv("PYQUEUE_RETENTION_TTL") else None,
+            retention_sweep_interval=float(os.getenv("PYQUEUE_RETENTION_SWEEP_INTERVAL", defaults.retention_sweep_interval)),
+            archive_path=os.getenv("PYQUEUE_ARCHIVE_PATH") or None,
+            max_depth=int(os.environ["PYQUEUE_MAX_DEPTH"]) if os.getenv("PYQUEUE_MAX_DEPTH") else None,
+            type_max_depth={t: int(d) for t, d in parse_type_map(os.getenv("PYQUEUE_TYPE_MAX_DEPTH", "")).items()},
+            admission_mode=os.getenv("PYQUEUE_ADMISSION_MODE", defaults.admission_mode).lower(),
+            admission_timeout=float(os.getenv("PYQUEUE_ADMISSION_TIMEOUT", defaults.admission_timeout)),
+            type_rate_limit={t: float(r) for t, r in parse_type_map(os.getenv("PYQUEUE_TYPE_RATE_LIMIT", "")).items()},
+            type_burst={t: float(b) for t, b in parse_type_map(os.getenv("PYQUEUE_TYPE_BURST", "")).items()},
+            type_max_concurrency={t: int(c) for t, c in parse_type_map(os.getenv("PYQUEUE_TYPE_MAX_CONCURRENCY", "")).items()},
+            dedup_types={TaskType[n.strip().upper()] for n in os.getenv("PYQUEUE_DEDUP_TYPES", "").split(",") if n.strip()},
+            dedup_cache_size=int(os.getenv("PYQUEUE_DEDUP_CACHE_SIZE", defaults.dedup_cache_size)),
+            dedup_ttl=float(os.getenv("PYQUEUE_DEDUP_TTL", defaults.dedup_ttl)),
+            retry_base_delay=float(os.getenv("PYQUEUE_RETRY_BASE_DELAY", defaults.retry_base_delay)),
+            retry_max_delay=float(os.getenv("PYQUEUE_RETRY_MAX_DELAY", defaults.retry_max_delay)),
+            retry_jitter=float(os.getenv("PYQUEUE_RETRY_JITTER", defaults.retry_jitter)),
+            type_retry_base_delay={t: float(d) for t, d in parse_type_map(os.getenv("PYQUEUE_TYPE_RETRY_BASE_DELAY", "")).items()},
+            type_retry_max_delay={t: float(d) for t, d in parse_type_map(os.getenv("PYQUEUE_TYPE_RETRY_MAX_DELAY", "")).items()},
+            log_level=os.getenv("PYQUEUE_LOG_LEVEL", defaults.log_level).upper(),
+            type_log_levels={t: l.upper() for t, l in parse_type_map(os.getenv("PYQUEUE_TYPE_LOG_LEVEL", "")).items()},
+            log_sample={t: float(r) for t, r in parse_type_map(os.getenv("PYQUEUE_LOG_SAMPLE", "")).items()},
+            log_buffer=int(os.getenv("PYQUEUE_LOG_BUFFER", defaults.log_buffer)),
+            registry_shards=int(os.getenv("PYQUEUE_REGISTRY_SHARDS", defaults.registry_shards)),
+            node_id=int(os.environ["PYQUEUE_NODE_ID"]) if os.getenv("PYQUEUE_NODE_ID") else None,
+            broker_url=os.getenv("PYQUEUE_BROKER_URL") or None,
+            broker_visibility=float(os.getenv("PYQUEUE_BROKER_VISIBILITY", defaults.broker_visibility)),
+            broker_prefetch=int(os.getenv("PYQUEUE_BROKER_PREFETCH", defaults.broker_prefetch)),
+            broker_poll_interval=float(os.getenv("PYQUEUE_BROKER_POLL_INTERVAL", defaults.broker_poll_interval)),
+            response_cache_size=int(os.getenv("PYQUEUE_RESPONSE_CACHE_SIZE", defaults.response_cache_size)),
+            drain_grace=float(os.environ["PYQUEUE_DRAIN_GRACE"]) if os.getenv("PYQUEUE_DRAIN_GRACE") else None,
+            handoff_dir=os.getenv("PYQUEUE_HANDOFF_DIR") or None,
+        )
+        if config.min_workers < 1 or config.max_workers < config.min_workers:
+            raise RuntimeError("PYQUEUE_MIN_WORKERS must be >= 1 and <= PYQUEUE_MAX_WORKERS")
+        if config.registry_shards < 1:
+            raise RuntimeError("PYQUEUE_REGISTRY_SHARDS must be >= 1")
+        if config.response_cache_size < 0:
+            raise RuntimeError("PYQUEUE_RESPONSE_CACHE_SIZE must be >= 0")
+        if config.node_id is not None and not 0 <= config.node_id < 1 << 24:
+            raise RuntimeError("PYQUEUE_NODE_ID must be between 0 and 16777215")
+        if config.broker_url is not None:
+            if config.broker_url.split("://")[0] not in BROKERS:
+                raise RuntimeError(f"PYQUEUE_BROKER_URL must start with one of {tuple(b + '://' for b in BROKERS)}")
+            # The broker's store is the shared registry - a per-process WAL or retention policy would only see leased Tasks:
+            if config.wal_dir or config.retention_max_terminal is not None or config.retention_ttl is not None:
+                raise RuntimeError("PYQUEUE_BROKER_URL can't be combined with PYQUEUE_WAL_DIR or PYQUEUE_RETENTION_*")
+        if config.broker_visibility <= 0 or config.broker_prefetch < 1 or config.broker_poll_interval <= 0:
+            raise RuntimeError("PYQUEUE_BROKER_VISIBILITY / PYQUEUE_BROKER_POLL_INTERVAL must be > 0 and PYQUEUE_BROKER_PREFETCH >= 1")
+        if (config.retention_max_terminal is not None and config.retention_max_terminal < 0) or \
+                (config.retention_ttl is not None and config.retention_ttl <= 0):
+            raise RuntimeError("PYQUEUE_RETENTION_MAX_TERMINAL must be >= 0 and PYQUEUE_RETENTION_TTL must be > 0")
+        if config.drain_grace is not None:
+            if config.drain_grace < 0:
+                raise RuntimeError("PYQUEUE_DRAIN_GRACE must be >= 0")
+            # Unfinished Tasks have to survive the restart somewhere:
+            if not (config.handoff_dir or config.wal_dir or config.broker_url):
+                raise RuntimeError("PYQUEUE_DRAIN_GRACE needs PYQUEUE_HANDOFF_DIR (or PYQUEUE_WAL_DIR / PYQUEUE_BROKER_URL)")
+        if not 0.0 <= config.retry_jitter <= 1.0:
+            raise RuntimeError("PYQUEUE_RETRY_JITTER must be between 0 and 1")
+        if config.admission_mode not in ADMISSION_MODES:
+            raise RuntimeError(f"PYQUEUE_ADMISSION_MODE must be one of {ADMISSION_MODES}")
+        if any(r <= 0 for r in config.type_rate_limit.values()) or any(c < 1 for c in config.type_max_concurrency.values()):
+            raise RuntimeError("PYQUEUE_TYPE_RATE_LIMIT values must be > 0 and PYQUEUE_TYPE_MAX_CONCURRENCY values >= 1")
+        if config.dedup_cache_size < 1 or config.dedup_ttl <= 0:
+            raise RuntimeError("PYQUEUE_DEDUP_CACHE_SIZE must be >= 1 and PYQUEUE_DEDUP_TTL must be > 0")
+        if config.log_level not in LOG_LEVELS or any(l not in LOG_LEVELS for l in config.type_log_levels.values()):
+            raise RuntimeError(f"PYQUEUE_LOG_LEVEL / PYQUEUE_TYPE_LOG_LEVEL values must be one of {LOG_LEVELS}")
+        if any(not 0.0 <= r <= 1.0 for r in config.log_sample.values()) or config.log_buffer < 1:
+            raise RuntimeError("PYQUEUE_LOG_SAMPLE values must be between 0 and 1 and PYQUEUE_LOG_BUFFER must be >= 1")
+        if any(b not in BACKENDS for b in config.backends.values()):
+            raise RuntimeError(f"PYQUEUE_BACKENDS values must be one of {BACKENDS}")
+        return config
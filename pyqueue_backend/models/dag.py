@@ -0,0 +1,98 @@
+from collections import deque
+
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Task dependencies. A Task created with depends_on=(parent IDs...) is registered (QUEUED) right away but only handed to the
+Scheduler once every parent has COMPLETED. Pipelines like DATACLEANUP -> REPORT -> NEWSLETTER used to be chained by the
+client polling each stage; now the whole chain is submitted up front (POST /api/workflows) and each stage starts as soon as
+the one before it finishes.
+
+- DependencyGraph keeps the blocked Tasks with a count of unfinished parents, plus parent -> blocked children lists. When a
+  parent finishes, only its own children are touched (O(out-degree)): each count drops by one, and the ones reaching zero
+  are released. Independent branches are separate Tasks, so they run in parallel like any other work.
+- Failure follows max_retries: a parent's failed attempt that will be retried changes nothing. Once it has failed for good
+  (or is cancelled / deleted), everything blocked behind it - transitively - is cancelled, since it can never run.
+- Dependencies are only checked when a Task is first enqueued; a retry of a Task whose parents already finished doesn't wait.
+- Like JobRegistry and RetentionIndex it isn't thread-safe on its own - Queue only touches it while holding Queue.lock.
+"""
+
+# Raised by Queue.enqueue()/enqueue_many() for dependencies that can't be satisfied (unknown parent, cycle, broker mode) -
+# the API maps it to 400:
+class DependencyError(ValueError):
+    pass
+
+class DependencyGraph:
+    """
+    Blocked Tasks and the parents they're waiting on.
+    """
+
+    # 0. Constructor:
+    def __init__(self) -> None:
+        self._waiting: dict[str, list] = {}     # child t_id -> [Task, unfinished parent count]
+        self._children: dict[str, list[Task]] = {}  # parent t_id -> children blocked on it (may hold discarded ones)
+
+    def __len__(self) -> int:
+        return len(self._waiting)
+
+    def is_blocked(self, t_id: str) -> bool:
+        return t_id in self._waiting
+
+    # 1. Block `task` until every one of `parents` (IDs of unfinished Tasks) has completed:
+    def block(self, task: Task, parents: list[str]) -> None:
+        self._waiting[task.t_id] = [task, len(parents)]
+        for parent in parents:
+            self._children.setdefault(parent, []).append(task)
+
+    # 2. `parent` completed - returns the children that have no unfinished parents left:
+    def release(self, parent: str) -> list[Task]:
+        ready = []
+        for child in self._children.pop(parent, ()):
+            entry = self._waiting.get(child.t_id)
+            if entry is None:
+                continue    # Discarded (or already cancelled through another parent).
+            entry[1] -= 1
+            if entry[1] == 0:
+                del self._waiting[child.t_id]
+                ready.append(child)
+        return ready
+
+    # 3. `parent` failed for good / was cancelled - returns every Task blocked behind it, directly or transitively:
+    def fail(self, parent: str) -> list[Task]:
+        doomed = []
+        pending = deque([parent])
+        while pending:
+            for child in self._children.pop(pending.popleft(), ()):
+                if self._waiting.pop(child.t_id, None) is not None:
+                    doomed.append(child)
+                    pending.append(child.t_id)
+        return doomed
+
+    # A blocked Task left some other way (cancelled, deleted) - stop tracking it (its parents' lists drop it lazily):
+    def discard(self, t_id: str) -> None:
+        self._waiting.pop(t_id, None)
+        if not self._waiting:
+            self._children.clear()  # (Nothing left to release - drop the stale lists in one go.)
+
+    def clear(self) -> None:
+        self._waiting.clear()
+        self._children.clear()
+
+# Orders a workflow's nodes so every node comes after the ones it depends on (Kahn's algorithm). `deps[i]` are indexes
+# into the same list. Raises DependencyError if the graph has a cycle:
+def topological_order(deps: list[list[int]]) -> list[int]:
+    indegree = [len(set(d)) for d in deps]
+    dependents: list[list[int]] = [[] for _ in deps]
+    for i, d in enumerate(deps):
+        for parent in set(d):
+            dependents[parent].append(i)
+    order = [i for i, n in enumerate(indegree) if n == 0]
+    for i in order:     # (Appending while iterating - order doubles as the work queue.)
+        for child in dependents[i]:
+            indegree[child] -= 1
+            if indegree[child] == 0:
+                order.append(child)
+    if len(order) != len(deps):
+        raise DependencyError("workflow has a dependency cycle")
+    return order
@@ -0,0 +1,72 @@
+import hashlib
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from enums.TaskType import TaskType
+
+"""
+2026-10-17-NOTE:
+De-duplication for enqueue. Producers retry POST /api/enqueue on timeouts, and every retry used to create (and run) a
+brand new Task. Two ways to mark requests as "the same":
+- an idempotency key sent by the client (EnqueueRequest.idempotency_key or the Idempotency-Key header), or
+- content-hash mode for whole TaskTypes (PYQUEUE_DEDUP_TYPES): same type + same payload = same Task.
+Either way a duplicate gets the ID of the Task that was already enqueued and nothing new is dispatched.
+
+DedupCache maps key -> t_id in an OrderedDict in insertion order, bounded by size and TTL. Since every entry gets the
+same TTL, the oldest entry is always the first to expire, so expiry and size eviction only ever pop from the front.
+claim() is check-and-insert in one step under the cache's own small lock (never Queue.lock), so two concurrent duplicates
+can't both get through, and the hot path is one dict lookup + one insert.
+"""
+
+def content_key(t_type: TaskType, payload: str) -> bytes:
+    return hashlib.blake2b(payload.encode(), digest_size=16, person=t_type.value.encode()[:16]).digest()
+
+class DedupCache:
+    """
+    Bounded, TTL'd key -> t_id map with an atomic claim().
+    """
+
+    # 0. Constructor:
+    def __init__(self, max_size: int = 100_000, ttl: float = 300.0) -> None:
+        self.max_size = max_size
+        self.ttl = ttl
+        self._lock: Lock = Lock()
+        self._entries: OrderedDict[object, tuple[str, float]] = OrderedDict()
+        self.hits: int = 0
+
+    # 1. Returns the t_id already holding `key` (a duplicate), or None after recording `key` -> t_id (first time):
+    def claim(self, key: object, t_id: str) -> Optional[str]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            if entry is not None:
+                del self._entries[key]
+            self._entries[key] = (t_id, now + self.ttl)
+            self._trim(now)
+            return None
+
+    # 2. Undo a claim whose enqueue didn't go through (e.g. rejected by admission control):
+    def release(self, key: object, t_id: str) -> None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == t_id:
+                del self._entries[key]
+
+    def _trim(self, now: float) -> None:
+        entries = self._entries
+        while len(entries) > self.max_size:
+            entries.popitem(last=False)
+        while entries:
+            _, (_, expires) = next(iter(entries.items()))
+            if expires > now:
+                break
+            entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
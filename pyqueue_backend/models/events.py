@@ -0,0 +1,103 @@
+import asyncio
+from threading import Lock
+from typing import NamedTuple, Optional
+
+from enums.TaskStatus import TaskStatus
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+In-process event bus for registry changes, feeding GET /api/events (Server-Sent Events).
+The dashboard used to re-fetch the whole /api/jobs list to notice state changes; with many dashboards open, that polling was
+a big share of API load. Now a client takes one snapshot and then only receives deltas.
+
+- Queue publishes while it still holds Queue.lock, so event order == mutation order, and a snapshot taken under the same
+  lock lines up exactly with a sequence number ("everything up to seq N is in this snapshot").
+- Events live in a bounded history (a list trimmed in chunks, indexed by seq - base) so a reconnecting client can resume
+  from its last sequence number (SSE's Last-Event-ID). If it fell out of the history, it gets a fresh snapshot instead.
+- Publishers are worker threads, subscribers are coroutines on the FastAPI loop. publish() never hands events over one by
+  one - it only sets each subscriber's asyncio.Event (via call_soon_threadsafe, and only if it isn't already pending), and
+  the subscriber then reads everything new from the history in one go. So a burst of 1000 transitions costs each
+  dashboard one wakeup, not 1000.
+"""
+
+class JobEvent(NamedTuple):
+    seq: int
+    kind: str   # "enqueued" | "status" | "deleted" | "evicted" | "cleared"
+    task: Optional[Task]
+    status: Optional[TaskStatus]    # Status/attempts as of this event (the Task object keeps changing afterwards).
+    old_status: Optional[TaskStatus]
+    attempts: int
+
+class Subscription:
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self.ready: asyncio.Event = asyncio.Event()
+        self.pending: bool = False  # Guarded by EventBus._lock - a wakeup is already scheduled.
+
+    async def wait(self) -> None:
+        await self.ready.wait()
+        self.ready.clear()
+
+class EventBus:
+    """
+    Sequence-numbered, bounded history of JobEvents + wakeups for async subscribers.
+    """
+
+    # 0. Constructor:
+    def __init__(self, history: int = 10_000) -> None:
+        self.history = history
+        self._lock: Lock = Lock()
+        self._events: list[JobEvent] = []
+        self._base: int = 1     # seq of self._events[0]
+        self._last_seq: int = 0
+        self._subscribers: set[Subscription] = set()
+
+    # 1. Publish (Queue calls this while holding Queue.lock):
+    def publish(self, kind: str, task: Optional[Task] = None, old_status: Optional[TaskStatus] = None) -> None:
+        with self._lock:
+            self._last_seq += 1
+            self._events.append(JobEvent(
+                self._last_seq, kind, task, task.status if task else None, old_status, task.attempts if task else 0,
+            ))
+            if len(self._events) > 2 * self.history:
+                drop = len(self._events) - self.history
+                del self._events[:drop]
+                self._base += drop
+            dead: list[Subscription] = []
+            for sub in self._subscribers:
+                if not sub.pending:
+                    sub.pending = True
+                    try:
+                        sub.loop.call_soon_threadsafe(self._wake, sub)
+                    except RuntimeError:
+                        dead.append(sub)    # 2026-10-17: Its loop is closed - nobody will ever read it again, drop it.
+            self._subscribers.difference_update(dead)
+
+    def _wake(self, sub: Subscription) -> None:
+        with self._lock:
+            sub.pending = False
+        sub.ready.set()
+
+    # 2. Everything after `seq`, or None if some of it has already been trimmed from the history:
+    def since(self, seq: int) -> Optional[list[JobEvent]]:
+        with self._lock:
+            if seq + 1 < self._base:
+                return None
+            return self._events[max(0, seq + 1 - self._base):]
+
+    # 3. Subscribers:
+    def subscribe(self, loop: asyncio.AbstractEventLoop) -> Subscription:
+        sub = Subscription(loop)
+        with self._lock:
+            self._subscribers.add(sub)
+        return sub
+
+    def unsubscribe(self, sub: Subscription) -> None:
+        with self._lock:
+            self._subscribers.discard(sub)
+
+    @property
+    def last_seq(self) -> int:
+        with self._lock:
+            return self._last_seq
@@ -0,0 +1,76 @@
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+
+from enums.TaskType import TaskType
+
+"""
+2026-10-17-NOTE:
+Task handler registry. All the actual work used to live in Worker._handle_task_type: a hard-coded match over TaskType with
+simulated sleeps. Real handlers are now registered per TaskType (main.py builds the registry and hands it to Queue):
+
+    handlers = HandlerRegistry()
+
+    @handlers.register(TaskType.SMS)
+    def send_sms(task: Task) -> None: ...
+
+    @handlers.register(TaskType.EMAIL, batch_size=50, max_wait_ms=20)
+    def send_emails(tasks: list[Task]) -> Optional[list[Optional[Exception]]]: ...
+
+- A handler returns to complete the attempt, or raises to fail it. Failed attempts are retried (with backoff) until
+  max_retries, like the simulated FAIL types. Types without a handler keep the simulated behaviour.
+- Micro-batching (batch_size > 1): a worker that pops a Task of that type keeps taking queued Tasks of the same type (up to
+  batch_size, waiting at most max_wait_ms for more to arrive) and passes them all to one handler call, so per-call overhead
+  against a downstream service (connection, auth, request round trip) is paid once per batch. The handler returns None (all
+  succeeded) or one entry per Task in order: None for success, an exception for that Task's failure. Raising fails the
+  whole batch. Every Task still gets its own attempt: attempts, INPROGRESS, then COMPLETED or FAILED (+ retry) on its own.
+- Batches are formed on the "thread" lane. On the async lane a handler may be a coroutine function (a plain function runs
+  in a worker thread via asyncio.to_thread, so it can't stall the loop), and batch handlers are called with one Task at a
+  time there and in the process lane. Process-lane handlers are pickled by reference into
+  the children, so they have to be module-level functions (same rule as worker_factory - only the process lane's own
+  handlers are sent).
+"""
+
+@dataclass(frozen=True, slots=True)
+class HandlerSpec:
+    fn: Callable[..., Any]
+    batch_size: int = 1     # > 1: fn takes a list[Task] (see above).
+    max_wait: float = 0.0   # Seconds a batch waits for more Tasks to arrive before it's handled as it is.
+
+    @property
+    def batched(self) -> bool:
+        return self.batch_size > 1
+
+class HandlerRegistry:
+    """
+    TaskType -> HandlerSpec. Filled in at startup, read by workers and the thread lane's dispatch (no lock needed).
+    """
+
+    # 0. Constructor:
+    def __init__(self) -> None:
+        self._specs: dict[TaskType, HandlerSpec] = {}
+
+    # 1. Register `fn` for `t_type` - called directly, or as a decorator (handlers.register(TaskType.SMS)):
+    def register(self, t_type: TaskType, fn: Optional[Callable[..., Any]] = None, batch_size: int = 1,
+                 max_wait_ms: float = 0.0) -> Callable[..., Any]:
+        if batch_size < 1 or max_wait_ms < 0:
+            raise ValueError("batch_size must be >= 1 and max_wait_ms >= 0")
+
+        def add(handler: Callable[..., Any]) -> Callable[..., Any]:
+            self._specs[t_type] = HandlerSpec(handler, batch_size, max_wait_ms / 1000)
+            return handler
+        return add(fn) if fn is not None else add
+
+    def get(self, t_type: TaskType) -> Optional[HandlerSpec]:
+        return self._specs.get(t_type)
+
+    # Registry with just these types' handlers (what the process lane pickles into its children):
+    def subset(self, types: set[TaskType]) -> "HandlerRegistry":
+        sub = HandlerRegistry()
+        sub._specs = {t: s for t, s in self._specs.items() if t in types}
+        return sub
+
+    def batched(self) -> dict[TaskType, HandlerSpec]:
+        return {t: s for t, s in self._specs.items() if s.batched}
+
+    def __contains__(self, t_type: TaskType) -> bool:
+        return t_type in self._specs
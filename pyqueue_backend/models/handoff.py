@@ -0,0 +1,117 @@
+import json
+import os
+import time
+
+from models.journal import decode_task, encode_task
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Handoff files for fast restarts (PYQUEUE_DRAIN_GRACE + PYQUEUE_HANDOFF_DIR). shutdown() used to run the entire backlog
+before returning, so a deploy either waited minutes on it or killed work mid-run. Draining stops after a grace period
+instead, and every Task that hasn't finished goes into one compact file here: queued, delayed (retry backoff / run_at),
+waiting on dependencies, and attempts still running at the deadline. The next process loads the file in lifespan before
+it accepts traffic (Queue.load_handoff()) and runs those Tasks with their IDs, attempt counts and run_at unchanged.
+
+- One JSON line per Task, in the WAL's record format (models/journal.py). Written to a temp file, fsynced and renamed into
+  place, so a reader never sees half a file.
+- Each draining process writes its own file (handoff-<ms>-<pid>.jsonl), so several processes can share the directory
+  (uvicorn --workers N). A starting process claims files by renaming them first - the rename only succeeds for one
+  process - and deletes each one once its Tasks are back in the registry.
+- 2026-10-17: A process that dies between claiming and deleting leaves a claimed file behind. The claimer holds an
+  exclusive lock on the claimed file (flock(); msvcrt.locking() on Windows) until it deletes it, and the OS drops that
+  lock when the process dies. A starting process takes over any claimed file whose lock it can get, so a replacement
+  with a new hostname or pid (a rescheduled pod) picks up what its predecessor left. Across hosts this needs a
+  filesystem that shares locks (NFSv4, most network volumes) - otherwise every host would see every claim as free.
+- An attempt cut off at the deadline runs again after the restart (the same at-least-once rule as WAL recovery).
+"""
+
+PREFIX: str = "handoff-"
+SUFFIX: str = ".jsonl"
+CLAIMED: str = ".claimed"   # <handoff file>.claimed
+_LOCK_OFFSET: int = 1 << 30  # (Windows locks are mandatory - lock a byte past the end, so readers aren't blocked.)
+
+_held: dict[str, int] = {}  # Claimed path -> the descriptor whose lock marks this process as its owner.
+
+# Writes `tasks` to a new handoff file in `directory` and returns its path:
+def write_handoff(directory: str, tasks: list[Task]) -> str:
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, f"{PREFIX}{int(time.time() * 1000)}-{os.getpid()}{SUFFIX}")
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        for task in tasks:
+            f.write(json.dumps(encode_task(task), separators=(",", ":")) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+    return path
+
+# Claims every handoff file in `directory` (oldest first) and returns the claimed paths - read_handoff() each, then
+# release_handoff() it. Claimed files whose owner has died (nobody holds their lock) are claimed again:
+def claim_handoffs(directory: str) -> list[str]:
+    try:
+        names = os.listdir(directory)
+    except FileNotFoundError:
+        return []
+    claimed = []
+    for name in sorted(names):  # (handoff-<ms>-<pid>: name order is write order.)
+        if not name.startswith(PREFIX):
+            continue
+        path = os.path.join(directory, name)
+        if name.endswith(SUFFIX):
+            try:
+                os.rename(path, path + CLAIMED)
+            except FileNotFoundError:
+                continue    # Another process starting up claimed it first.
+            path += CLAIMED
+        elif not name.endswith(SUFFIX + CLAIMED):
+            continue
+        if _lock(path):     # (Fails for a claim whose owner is alive - including one that renamed it just now.)
+            claimed.append(path)
+    return claimed
+
+# Deletes a loaded handoff file and drops this process's claim on it:
+def release_handoff(path: str) -> None:
+    fd = _held.pop(path)
+    if os.name == "nt":
+        os.close(fd)    # (An open file can't be deleted on Windows.)
+        os.remove(path)
+    else:
+        os.remove(path)
+        os.close(fd)
+
+# Takes the claim lock on `path` and keeps it until release_handoff() (or until this process dies):
+def _lock(path: str) -> bool:
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except FileNotFoundError:
+        return False
+    try:
+        # Still the same file once locked? Its owner may have loaded and deleted it while we waited for the lock:
+        if _try_lock(fd) and os.path.samestat(os.fstat(fd), os.stat(path)):
+            _held[path] = fd
+            return True
+    except FileNotFoundError:
+        pass
+    os.close(fd)
+    return False
+
+def _try_lock(fd: int) -> bool:
+    if os.name == "nt":
+        import msvcrt
+        os.lseek(fd, _LOCK_OFFSET, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+    import fcntl
+    try:
+        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except BlockingIOError:
+        return False
+    return True
+
+def read_handoff(path: str) -> list[Task]:
+    with open(path, encoding="utf-8") as f:
+        return [decode_task(json.loads(line)) for line in f if line.strip()]
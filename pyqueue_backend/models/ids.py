@@ -0,0 +1,99 @@
+import itertools
+import os
+import secrets
+import time
+from threading import Lock
+from typing import Optional
+
+"""
+2026-10-17-NOTE:
+Task IDs, replacing f"Task-{time.perf_counter_ns()}". perf_counter_ns() is only meaningful inside one process (its zero
+point is arbitrary), so two uvicorn workers - or two nodes sharing a WAL/archive - could hand out the same ID, and the
+IDs sorted by nothing in particular. Now an ID is Snowflake-style, 96 bits written as fixed-width hex:
+
+    Task-<12 hex: epoch ms><6 hex: node><6 hex: sequence>      e.g. Task-019a3c5e1f2b00a4c1000007
+
+- epoch ms  : wall-clock time, advanced with the monotonic clock (time moving backwards can't reorder or repeat IDs).
+- node      : 24 bits per process - PYQUEUE_NODE_ID, or random if it isn't set (redrawn in forked children). Unset is the
+              right choice for uvicorn --workers N, since every worker reads the same environment.
+- sequence  : counts IDs within the millisecond (24 bits), so IDs from one process in the same millisecond never repeat.
+              2026-10-17: It used to be one counter with a random start that wrapped - a wrap within a millisecond
+              sorted the next ID before earlier ones. Now it starts at 0 every millisecond, and the 2^24+1st ID in one
+              millisecond waits for the next one.
+Fixed width means string order is creation order (per millisecond, across processes), so IDs can back sorted indexes or
+be range-scanned. The hot path takes no lock: next() on an itertools.count is atomic under the GIL. Only the first ID of
+each millisecond takes one, to swap in that millisecond's counter.
+IDs from before this change ("Task-" + up to 20 decimal digits) still load from the WAL - IDs are opaque strings elsewhere.
+"""
+
+PREFIX: str = "Task-"
+NODE_BITS: int = 24
+SEQ_BITS: int = 24
+_SEQ_MASK: int = (1 << SEQ_BITS) - 1
+
+_pinned_node: Optional[int] = None
+_node_bits: int = secrets.randbits(NODE_BITS) << SEQ_BITS
+# Epoch ms = _anchor_ms + monotonic ms, fixed once per process:
+_anchor_ms: int = time.time_ns() // 1_000_000 - time.monotonic_ns() // 1_000_000
+_lock: Lock = Lock()
+# (monotonic ms, "Task-<time><node>", sequence counter) of the current millisecond - the prefix only changes once a
+# millisecond, so most calls format just the sequence. Replaced as one tuple, so a thread racing the update still reads
+# a matching set:
+_current: tuple[int, str, itertools.count] = (-1, "", itertools.count())
+
+def configure_ids(node_id: Optional[int] = None) -> None:
+    """
+    Pins this process's node ID (0 to 2^24-1), or goes back to a random one with None.
+    """
+    global _pinned_node, _node_bits, _current
+    if node_id is not None and not 0 <= node_id < 1 << NODE_BITS:
+        raise ValueError(f"node_id must be between 0 and {(1 << NODE_BITS) - 1}")
+    _pinned_node = node_id
+    _node_bits = (secrets.randbits(NODE_BITS) if node_id is None else node_id) << SEQ_BITS
+    _current = (-1, "", itertools.count())
+
+def new_id() -> str:
+    while True:
+        ms = time.monotonic_ns() // 1_000_000
+        current = _current
+        if current[0] < ms:
+            current = _next_ms(ms)
+        seq = next(current[2])
+        if seq <= _SEQ_MASK:
+            return f"{current[1]}{seq:06x}"
+        while time.monotonic_ns() // 1_000_000 <= current[0]:
+            pass    # Sequence used up for this millisecond - wait for the next one.
+
+# Starts millisecond `ms` (unless another thread already moved past it) and returns the current state:
+def _next_ms(ms: int) -> tuple[int, str, itertools.count]:
+    global _current
+    with _lock:
+        if _current[0] < ms:
+            _current = (ms, f"{PREFIX}{_anchor_ms + ms:012x}{_node_bits >> SEQ_BITS:06x}", itertools.count())
+        return _current
+
+def id_time_ms(t_id: str) -> Optional[int]:
+    """
+    Epoch ms an ID was generated at (None for IDs not made by new_id()).
+    """
+    if len(t_id) != len(PREFIX) + 24 or not t_id.startswith(PREFIX):
+        return None
+    try:
+        return int(t_id[len(PREFIX):len(PREFIX) + 12], 16)
+    except ValueError:
+        return None
+
+def node_id() -> int:
+    return _node_bits >> SEQ_BITS
+
+def _after_fork() -> None:
+    # A forked child would otherwise share the parent's node ID - unless the node ID is pinned, draw
+    # a new one (a pinned ID is the operator's promise that only one process uses it).
+    global _anchor_ms, _current, _lock
+    _anchor_ms = time.time_ns() // 1_000_000 - time.monotonic_ns() // 1_000_000
+    _current = (-1, "", itertools.count())
+    _lock = Lock()  # (Another thread may have held it at the fork.)
+    if _pinned_node is None:
+        configure_ids(None)
+
+os.register_at_fork(after_in_child=_after_fork)
@@ -0,0 +1,290 @@
+import datetime
+import json
+import logging
+import os
+import re
+from threading import Condition, Lock, Thread
+from typing import Callable, Iterable, Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.task import Task, to_epoch_us
+
+"""
+2026-10-17-NOTE:
+Optional durability for the jobs registry (enabled with PYQUEUE_WAL_DIR). Without it, Queue.jobs only lives in memory and a
+restart drops every queued and in-progress Task.
+
+Layout inside the WAL directory:
+- snapshot.jsonl : {"covers": n} on the first line, then one full Task record per line (the registry as of the last
+                   compaction, which covers every segment up to wal-<n>.log).
+- wal-<n>.log    : closed segments, waiting for a compaction to cover them (normally at most one).
+- wal.log        : the segment being appended to, one compact JSON array per line:
+                   ["E", <task record>]          enqueue (first enqueue and every retry re-enqueue)
+                   ["S", t_id, status, attempts] status transition
+                   ["D", t_id]                   delete
+                   ["C"]                         clear
+Every record carries absolute state (never a delta), so replaying a record twice is harmless - that's what makes
+compaction safe without stopping writers (see _rotate() / _compact()).
+
+Group commit: callers only append to an in-memory buffer. One writer thread writes everything buffered with a single
+write() + a single fsync(), then wakes anyone waiting on that batch. It flushes immediately when someone is waiting (and
+whatever arrives during that fsync becomes the next batch), otherwise every flush_interval. Enqueues from the API wait for
+their batch to be durable (so a 200 means "on disk"); status transitions never wait (worst case after a crash, an attempt
+gets re-run), so workers and the asyncio lane never block on disk.
+
+2026-10-17: Compaction used to run on the writer thread - every enqueue waited on a full snapshot write once every
+compact_every records. Now the writer only rotates wal.log into a closed segment (a rename), and a compactor thread
+writes the snapshot and deletes the segments it covers. A crash at any point leaves either the old snapshot + segments
+or the new snapshot, and replay() reads exactly the segments the snapshot doesn't cover. The constructor also truncates
+a torn tail off wal.log (a crash mid-write), which appends would otherwise land behind.
+"""
+
+SNAPSHOT_FILE: str = "snapshot.jsonl"
+WAL_FILE: str = "wal.log"
+SEGMENT_PATTERN = re.compile(r"wal-(\d+)\.log")
+
+log = logging.getLogger("pyqueue.queue")
+
+def encode_task(task: Task) -> list:
+    record = [task.t_id, task.payload, task.t_type.value, task.status.value, task.attempts, task.max_retries,
+              task.created_at.isoformat(), task.priority, task.run_at]
+    if task.depends_on:
+        record.append(list(task.depends_on))
+    return record
+
+def decode_task(record: list) -> Task:
+    t_id, payload, t_type, status, attempts, max_retries, created_at, priority = record[:8]
+    run_at = record[8] if len(record) > 8 else 0.0   # (Records written before run_at existed have 8 fields.)
+    depends_on = tuple(record[9]) if len(record) > 9 else None  # (Only written for Tasks with dependencies.)
+    return Task(t_id=t_id, payload=payload, t_type=TaskType(t_type), status=TaskStatus(status), attempts=attempts,
+                max_retries=max_retries, created_us=to_epoch_us(datetime.datetime.fromisoformat(created_at)),
+                priority=priority, run_at=run_at, depends_on=depends_on)
+
+class WriteAheadLog:
+    """
+    Append-only, fsync-batched log of registry changes + periodic snapshot compaction.
+    """
+
+    # 0. Constructor:
+    def __init__(self, directory: str, flush_interval: float = 0.005, compact_every: int = 100_000) -> None:
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.compact_every = compact_every
+        os.makedirs(directory, exist_ok=True)
+        self._repair_tail()
+        self._file = open(os.path.join(directory, WAL_FILE), "ab")
+        self._lock: Lock = Lock()
+        self._cond: Condition = Condition(self._lock)   # Callers waiting for durability.
+        self._wake: Condition = Condition(self._lock)   # The writer thread, waiting for work.
+        self._buffer: list[bytes] = []
+        self._appended: int = 0     # Sequence number of the last buffered record.
+        self._durable: int = 0      # Sequence number of the last fsynced record.
+        self._since_compaction: int = 0
+        self._closed: bool = False
+        self._waiting: bool = False     # Someone is blocked in wait_durable() - flush now instead of sleeping out the interval.
+        self._snapshot_source: Optional[Callable[[], list[Task]]] = None
+        self._segment: int = max([self._covered()] + self._segments())     # Number of the last closed segment.
+        self._compactor: Optional[Thread] = None
+        self._writer: Thread = Thread(target=self._write_loop, name="pyqueue-wal-writer", daemon=True)
+        self._writer.start()
+
+    # 1. Append a record to the buffer (cheap - no I/O). Returns its sequence number for wait_durable():
+    def append(self, record: list) -> int:
+        line = json.dumps(record, separators=(",", ":")).encode() + b"\n"
+        with self._cond:
+            if self._closed:
+                return 0
+            self._buffer.append(line)
+            self._appended += 1
+            return self._appended
+
+    def append_many(self, records: list[list]) -> int:
+        lines = [json.dumps(r, separators=(",", ":")).encode() + b"\n" for r in records]
+        with self._lock:
+            if self._closed:
+                return 0
+            self._buffer.extend(lines)
+            self._appended += len(lines)
+            return self._appended
+
+    # Block until the batch containing record `seq` has been fsynced (called *outside* Queue.lock):
+    def wait_durable(self, seq: int) -> None:
+        with self._cond:
+            while self._durable < seq and not self._closed:
+                if not self._waiting:
+                    self._waiting = True
+                    self._wake.notify()     # Wake the writer early - someone is blocked on this batch.
+                self._cond.wait()
+
+    def log_enqueue(self, task: Task) -> int:
+        return self.append(["E", encode_task(task)])
+
+    def log_enqueue_many(self, tasks: list[Task]) -> int:
+        return self.append_many([["E", encode_task(t)] for t in tasks])
+
+    def log_status(self, task: Task) -> int:
+        return self.append(["S", task.t_id, task.status.value, task.attempts])
+
+    def log_delete(self, t_id: str) -> int:
+        return self.append(["D", t_id])
+
+    def log_clear(self) -> int:
+        return self.append(["C"])
+
+    # 2. Writer thread - group commit:
+    def _write_loop(self) -> None:
+        while True:
+            with self._cond:
+                # With nobody waiting, sleep out the interval so the next fsync covers a bigger batch. With a waiter, flush
+                # right away - records that arrive while this fsync is running simply form the next batch (group commit):
+                if not self._closed and not self._waiting:
+                    self._wake.wait(self.flush_interval)
+                self._waiting = False
+                batch, self._buffer = self._buffer, []
+                seq = self._appended
+                closed = self._closed
+            if batch:
+                self._file.write(b"".join(batch))
+                self._file.flush()
+                os.fsync(self._file.fileno())
+                self._since_compaction += len(batch)
+            with self._cond:
+                self._durable = seq
+                self._cond.notify_all()
+            if (self._snapshot_source is not None and self._since_compaction >= self.compact_every and not closed
+                    and (self._compactor is None or not self._compactor.is_alive())):
+                self._rotate()
+            if closed:
+                return
+
+    # 3. Compaction, part 1 (writer thread, right after a flush) - close wal.log as segment wal-<n>.log and hand it to a
+    # compactor thread. Just a rename and a new file, so appends never wait on the snapshot:
+    def _rotate(self) -> None:
+        self._segment += 1
+        self._file.close()
+        os.replace(os.path.join(self.directory, WAL_FILE), self._segment_path(self._segment))
+        self._file = open(os.path.join(self.directory, WAL_FILE), "ab")
+        self._fsync_directory()
+        self._since_compaction = 0
+        self._compactor = Thread(target=self._compact, args=(self._segment,), name="pyqueue-wal-compactor", daemon=True)
+        self._compactor.start()
+
+    # Part 2 (compactor thread) - a registry snapshot replaces segments 1..`segment`:
+    def _compact(self, segment: int) -> None:
+        """
+        Every record in those segments has its effect applied to the registry already (Queue mutates first, then logs), so
+        a snapshot taken after the rotation covers all of them. Changes made while the snapshot is taken and written land in
+        the new wal.log; if their effect is also in the snapshot, replaying them again is a no-op.
+        """
+        try:
+            tasks = self._snapshot_source()
+            lines = [json.dumps({"covers": segment}).encode() + b"\n"]
+            lines += [json.dumps(encode_task(t), separators=(",", ":")).encode() + b"\n" for t in tasks]
+            tmp_path = os.path.join(self.directory, SNAPSHOT_FILE + ".tmp")
+            with open(tmp_path, "wb") as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, os.path.join(self.directory, SNAPSHOT_FILE))
+            self._fsync_directory()
+            for n in self._segments():
+                if n <= segment:
+                    os.remove(self._segment_path(n))
+        except OSError as e:
+            # The segments stay put (replay() still reads them) and the next rotation tries again:
+            log.error("WAL compaction failed: %s", e, extra={"event": "wal_compaction_failed"}, exc_info=e)
+
+    def set_snapshot_source(self, source: Callable[[], list[Task]]) -> None:
+        self._snapshot_source = source
+
+    # 4. Recovery - rebuild the registry as it was at the last durable record:
+    def replay(self) -> dict[str, Task]:
+        jobs: dict[str, Task] = {}
+        for record in self._read_lines(SNAPSHOT_FILE):
+            if isinstance(record, dict):
+                continue    # The {"covers": n} header.
+            task = decode_task(record)
+            jobs[task.t_id] = task
+        covered = self._covered()
+        names = [os.path.basename(self._segment_path(n)) for n in self._segments() if n > covered]
+        for record in (r for name in names + [WAL_FILE] for r in self._read_lines(name)):
+            match record[0]:
+                case "E":
+                    task = decode_task(record[1])
+                    jobs[task.t_id] = task
+                case "S":
+                    task = jobs.get(record[1])
+                    if task is not None:
+                        task.status, task.attempts = TaskStatus(record[2]), record[3]
+                case "D":
+                    jobs.pop(record[1], None)
+                case "C":
+                    jobs.clear()
+        return jobs
+
+    def _read_lines(self, name: str) -> Iterable[list]:
+        path = os.path.join(self.directory, name)
+        if not os.path.exists(path):
+            return
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    # Torn final line from a crash mid-write - everything before it is intact.
+                    return
+
+    # Cuts a torn final line (crash mid-write) off wal.log, so new appends start on a clean line:
+    def _repair_tail(self) -> None:
+        path = os.path.join(self.directory, WAL_FILE)
+        if not os.path.exists(path):
+            return
+        valid = 0
+        with open(path, "r+b") as f:
+            for line in f:
+                try:
+                    json.loads(line)
+                except ValueError:
+                    break
+                if not line.endswith(b"\n"):
+                    break   # (Parses, but the write was cut off before its newline.)
+                valid += len(line)
+            if valid < f.seek(0, os.SEEK_END):
+                log.warning("Truncating torn WAL tail (%d bytes)", f.tell() - valid, extra={"event": "wal_tail_truncated"})
+                f.truncate(valid)
+                os.fsync(f.fileno())
+
+    # Segment number the snapshot covers up to (0 = none, or a snapshot from before segments existed):
+    def _covered(self) -> int:
+        for record in self._read_lines(SNAPSHOT_FILE):
+            return record.get("covers", 0) if isinstance(record, dict) else 0
+        return 0
+
+    def _segments(self) -> list[int]:
+        return sorted(int(m.group(1)) for m in map(SEGMENT_PATTERN.fullmatch, os.listdir(self.directory)) if m)
+
+    def _segment_path(self, n: int) -> str:
+        return os.path.join(self.directory, f"wal-{n}.log")
+
+    # Makes renames/creates in the WAL directory durable (no-op where directories can't be opened, e.g. Windows):
+    def _fsync_directory(self) -> None:
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+    # 5. Flush whatever is buffered and stop the writer:
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            self._wake.notify()
+            self._cond.notify_all()
+        self._writer.join()
+        if self._compactor is not None:
+            self._compactor.join()
+        self._file.close()
@@ -0,0 +1,148 @@
+import json
+import logging
+import queue as std_queue
+import sys
+import zlib
+from logging.handlers import QueueHandler, QueueListener
+from typing import Optional
+
+from enums.TaskType import TaskType
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Structured logging, replacing the print() calls Worker/Queue used to make on every status change.
+print() is a synchronous write to stdout under the stream's lock, so under load every worker thread ended up queueing
+on that one lock (and on whatever was reading the pipe). Now:
+- Log calls in the worker thread only build a LogRecord and put it on a bounded in-memory queue (_NonBlockingHandler).
+  If the queue is full the record is dropped and counted (dropped_records()) - a worker never waits for the log sink.
+- One background thread (QueueListener) formats records as JSON lines and writes them to stdout.
+- Task lifecycle events go through task_log(), one logger per TaskType ("pyqueue.task.SMS", ...), so levels can be set
+  per type (PYQUEUE_TYPE_LOG_LEVEL) and INFO/DEBUG events can be sampled per type (PYQUEUE_LOG_SAMPLE). Sampling is by
+  task ID, so a sampled Task has its whole lifecycle logged rather than random lines of it. Warnings and errors are never
+  sampled out. Both checks happen before a LogRecord is even created.
+
+Nothing is configured until configure_logging() is called (main.py does it at startup). Without it - benchmarks, scripts
+using Queue directly - the loggers fall back to Python's defaults (warnings and up to stderr).
+"""
+
+ROOT: str = "pyqueue"
+# Attributes every LogRecord has - anything else on a record came in through extra= and goes into the JSON as a field:
+_RECORD_ATTRS: frozenset[str] = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+_task_loggers: dict[TaskType, logging.Logger] = {t: logging.getLogger(f"{ROOT}.task.{t.value}") for t in TaskType}
+_sample_cutoffs: dict[TaskType, int] = {}   # TaskType -> crc32 cutoff (rate * 2^32); types not listed log everything.
+_handler: Optional["_NonBlockingHandler"] = None
+_listener: Optional[QueueListener] = None
+_settings: Optional[tuple] = None
+
+class JsonFormatter(logging.Formatter):
+    """
+    One JSON object per line: ts, level, logger, msg, plus any extra= fields (task_id, type, event, ...).
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "ts": round(record.created, 6),
+            "level": record.levelname,
+            "logger": record.name,
+            "msg": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+        if record.exc_info:
+            entry["exc"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+class _NonBlockingHandler(QueueHandler):
+    """
+    QueueHandler that never blocks the caller: put on a bounded queue, drop + count when it's full.
+    """
+    def __init__(self, maxsize: int) -> None:
+        # SimpleQueue (C, no Condition) is several times cheaper per put than queue.Queue; the bound is checked by hand.
+        super().__init__(std_queue.SimpleQueue())
+        self.maxsize = maxsize
+        self.dropped: int = 0
+
+    def handle(self, record: logging.LogRecord) -> bool:
+        # Skips the per-handler lock Handler.handle() takes - the queue is thread-safe on its own.
+        if self.filter(record):
+            self.enqueue(record)
+            return True
+        return False
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        # (Check-then-put can overshoot maxsize by a record per thread, and the increment is racy - both fine for a bound.)
+        if self.queue.qsize() >= self.maxsize:
+            self.dropped += 1
+        else:
+            self.queue.put(record)
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The default pre-formats the message in the caller's thread so records can be pickled. Ours never leave the
+        # process, so formatting is left entirely to the listener thread.
+        return record
+
+def configure_logging(level: str = "INFO", type_levels: Optional[dict[TaskType, str]] = None,
+                      sample: Optional[dict[TaskType, float]] = None, buffer: int = 10_000, background: bool = True) -> None:
+    """
+    Routes the "pyqueue" loggers to JSON lines on stdout. background=False writes directly instead of through the queue +
+    listener thread (used in process-lane children, which run one Task at a time and exit without a chance to flush).
+    """
+    global _handler, _listener, _settings
+    stop_logging()
+    root = logging.getLogger(ROOT)
+    root.setLevel(level.upper())
+    root.propagate = False
+    for t, logger in _task_loggers.items():
+        logger.setLevel((type_levels or {}).get(t, logging.NOTSET))    # NOTSET = inherit PYQUEUE_LOG_LEVEL.
+    _sample_cutoffs.clear()
+    _sample_cutoffs.update({t: int(rate * 2 ** 32) for t, rate in (sample or {}).items() if rate < 1.0})
+
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(JsonFormatter())
+    if background:
+        _handler = _NonBlockingHandler(buffer)
+        _listener = QueueListener(_handler.queue, stream)
+        _listener.start()
+        root.handlers[:] = [_handler]
+    else:
+        root.handlers[:] = [stream]
+    _settings = (level, type_levels, sample, buffer)
+
+def stop_logging() -> None:
+    """
+    Flushes whatever is still queued and stops the listener thread (no-op if configure_logging() wasn't called).
+    """
+    global _handler, _listener
+    if _listener is not None:
+        _listener.stop()
+    logging.getLogger(ROOT).handlers.clear()
+    _handler = _listener = None
+
+# What configure_logging() was last called with, so the process lane can repeat it in its children (None = not configured):
+def current_settings() -> Optional[tuple]:
+    return _settings
+
+def dropped_records() -> int:
+    return _handler.dropped if _handler is not None else 0
+
+def task_log(level: int, event: str, task: Task, msg: str, *args, exc_info=None, **fields) -> None:
+    """
+    Logs one lifecycle event of `task` ("started", "completed", "retrying", ...) on its TaskType's logger.
+    """
+    t_type = task.t_type
+    logger = _task_loggers[t_type]
+    if not logger.isEnabledFor(level):
+        return
+    cutoff = _sample_cutoffs.get(t_type)
+    if cutoff is not None and level < logging.WARNING and zlib.crc32(task.t_id.encode()) >= cutoff:
+        return
+    # makeRecord() + handle() is what logger.log() does minus findCaller()'s stack walk (source lines aren't logged anyway):
+    if isinstance(exc_info, BaseException):
+        exc_info = (type(exc_info), exc_info, exc_info.__traceback__)
+    record = logger.makeRecord(logger.name, level, "", 0, msg, args, exc_info)
+    record.event, record.task_id, record.type, record.attempt = event, task.t_id, t_type.value, task.attempts
+    if fields:
+        record.__dict__.update(fields)
+    logger.handle(record)
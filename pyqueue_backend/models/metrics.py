@@ -0,0 +1,180 @@
+from bisect import bisect_left
+from threading import Lock, Thread, current_thread, local
+from typing import Iterable, Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+
+"""
+2026-10-17-NOTE:
+Instrumentation for GET /metrics (Prometheus text exposition format, version 0.0.4). Hand-rolled instead of pulling in
+prometheus_client: all we need is counters and fixed-bucket histograms, and keeping them as plain dicts/lists lets the
+hot paths record without any extra indirection.
+- Counters for status transitions and enqueues are bumped by Queue while it already holds Queue.lock (no extra locking).
+- Histograms (queue wait / execution / end-to-end per TaskType) and worker error counters are recorded from every lane
+  thread. Instead of one lock that all workers would queue up on, each thread records into its own _Shard (threading.local)
+  with no locking at all; render() adds the shards up. Shards of threads that have exited (the autoscaler retires idle
+  workers) are folded into one "retired" shard at scrape time, so the shard list doesn't grow with thread churn.
+- Gauges (depth, workers, ...) and counters other components already keep (admission rejections, throttling) aren't
+  duplicated here - Queue reads them from their owners at scrape time and passes them to render().
+- Transition keys use the enums' string values: TaskStatus is a plain Enum whose hash is a Python-level call, and the
+  tuple key would pay for it twice per transition.
+See benchmarks/bench_metrics.py for the overhead numbers.
+"""
+
+# Seconds. Covers the zero-duration test handlers up to TAKESLONG's 10s plus queueing on top.
+DEFAULT_BUCKETS: tuple[float, ...] = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+                                      10.0, 30.0, 60.0, 300.0)
+
+class Histogram:
+    """
+    Fixed-bucket histogram. counts[i] = observations in (bounds[i-1], bounds[i]]; the last slot is +Inf.
+    Not thread-safe - only ever written by the thread that owns its _Shard.
+    """
+    __slots__ = ("bounds", "counts", "total", "count")
+
+    def __init__(self, bounds: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.bounds = bounds
+        self.counts: list[int] = [0] * (len(bounds) + 1)
+        self.total: float = 0.0
+        self.count: int = 0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += value
+        self.count += 1
+
+    def merge(self, other: "Histogram") -> None:
+        for i, n in enumerate(other.counts):
+            self.counts[i] += n
+        self.total += other.total
+        self.count += other.count
+
+    # Prometheus lines for this histogram (cumulative buckets):
+    def render(self, name: str, labels: str) -> Iterable[str]:
+        cumulative = 0
+        for bound, n in zip(self.bounds, self.counts):
+            cumulative += n
+            yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+        yield f'{name}_bucket{{{labels},le="+Inf"}} {self.count}'
+        yield f"{name}_sum{{{labels}}} {self.total}"
+        yield f"{name}_count{{{labels}}} {self.count}"
+
+class _Shard:
+    """
+    One thread's histograms + error counters.
+    """
+    __slots__ = ("thread", "queue_wait", "execution", "end_to_end", "worker_errors")
+
+    def __init__(self, thread: Optional[Thread], buckets: tuple[float, ...]) -> None:
+        self.thread = thread
+        self.queue_wait: dict[TaskType, Histogram] = {t: Histogram(buckets) for t in TaskType}
+        self.execution: dict[TaskType, Histogram] = {t: Histogram(buckets) for t in TaskType}
+        self.end_to_end: dict[TaskType, Histogram] = {t: Histogram(buckets) for t in TaskType}
+        self.worker_errors: dict[tuple[TaskType, str], int] = {}
+
+    def merge(self, other: "_Shard") -> None:
+        for mine, theirs in ((self.queue_wait, other.queue_wait), (self.execution, other.execution),
+                             (self.end_to_end, other.end_to_end)):
+            for t, hist in theirs.items():
+                mine[t].merge(hist)
+        for key, n in other.worker_errors.items():
+            self.worker_errors[key] = self.worker_errors.get(key, 0) + n
+
+class Metrics:
+    """
+    Counters + per-type histograms for one Queue.
+    """
+
+    # 0. Constructor:
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        self.buckets = buckets
+        # Guarded by Queue.lock (Queue bumps these inside its own critical sections):
+        self.enqueued: dict[TaskType, int] = {t: 0 for t in TaskType}
+        self.transitions: dict[tuple[str, str, str], int] = {}
+        # Per-thread shards (the list itself is guarded by self._lock):
+        self._local = local()
+        self._lock: Lock = Lock()
+        self._shards: list[_Shard] = []
+        self._retired: _Shard = _Shard(None, buckets)
+
+    def _shard(self) -> _Shard:
+        try:
+            return self._local.shard
+        except AttributeError:
+            shard = self._local.shard = _Shard(current_thread(), self.buckets)
+            with self._lock:
+                self._shards.append(shard)
+            return shard
+
+    # 1. Counters (caller holds Queue.lock):
+    def transition(self, t_type: TaskType, old: TaskStatus, new: TaskStatus) -> None:
+        key = (t_type._value_, old._value_, new._value_)
+        self.transitions[key] = self.transitions.get(key, 0) + 1
+
+    # 2. Timings, in seconds (any thread):
+    def observe_wait(self, t_type: TaskType, seconds: float) -> None:
+        self._shard().queue_wait[t_type].observe(seconds)
+
+    def observe_execution(self, t_type: TaskType, seconds: float) -> None:
+        self._shard().execution[t_type].observe(seconds)
+
+    def observe_end_to_end(self, t_type: TaskType, seconds: float) -> None:
+        self._shard().end_to_end[t_type].observe(seconds)
+
+    # Worker-side failures by kind ("runtime", "unexpected", "cancelled"):
+    def worker_error(self, t_type: TaskType, kind: str) -> None:
+        errors = self._shard().worker_errors
+        key = (t_type, kind)
+        errors[key] = errors.get(key, 0) + 1
+
+    # Sum of every shard (folds shards of exited threads into _retired on the way):
+    def _merged(self) -> _Shard:
+        total = _Shard(None, self.buckets)
+        with self._lock:
+            live: list[_Shard] = []
+            for shard in self._shards:
+                if shard.thread.is_alive():
+                    live.append(shard)
+                else:
+                    self._retired.merge(shard)
+            self._shards = live
+            total.merge(self._retired)
+            for shard in live:
+                total.merge(shard)
+        return total
+
+    # 3. Text exposition. `collected` = metric name -> (type, help, {label string or "": value}), read at scrape time:
+    def render(self, collected: Optional[dict[str, tuple[str, str, dict[str, float]]]] = None,
+               enqueued: Optional[dict[TaskType, int]] = None,
+               transitions: Optional[dict[tuple[str, str, str], int]] = None) -> str:
+        lines: list[str] = []
+
+        def header(name: str, kind: str, help_text: str) -> None:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {kind}")
+
+        header("pyqueue_tasks_enqueued_total", "counter", "New tasks accepted by enqueue.")
+        for t, n in (enqueued if enqueued is not None else self.enqueued).items():
+            lines.append(f'pyqueue_tasks_enqueued_total{{type="{t.value}"}} {n}')
+        header("pyqueue_task_transitions_total", "counter", "Task status changes.")
+        for (t, old, new), n in sorted((transitions if transitions is not None else self.transitions).items()):
+            lines.append(f'pyqueue_task_transitions_total{{type="{t}",from="{old}",to="{new}"}} {n}')
+        merged = self._merged()
+        header("pyqueue_worker_errors_total", "counter", "Exceptions raised out of task handlers, by kind.")
+        for (t, kind), n in sorted(merged.worker_errors.items(), key=lambda kv: (kv[0][0].value, kv[0][1])):
+            lines.append(f'pyqueue_worker_errors_total{{type="{t.value}",kind="{kind}"}} {n}')
+        for name, help_text, hists in (
+            ("pyqueue_queue_wait_seconds", "Time from ready to started.", merged.queue_wait),
+            ("pyqueue_execution_seconds", "Time spent running one attempt.", merged.execution),
+            ("pyqueue_end_to_end_seconds", "Time from creation to a final status.", merged.end_to_end),
+        ):
+            header(name, "histogram", help_text)
+            for t, hist in hists.items():
+                if hist.count:
+                    lines.extend(hist.render(name, f'type="{t.value}"'))
+        for name, (kind, help_text, values) in (collected or {}).items():
+            header(name, kind, help_text)
+            for labels, value in values.items():
+                lines.append(f"{name}{{{labels}}} {value}" if labels else f"{name} {value}")
+        return "\n".join(lines) + "\n"
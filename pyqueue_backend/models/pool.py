@@ -0,0 +1,158 @@
+import datetime
+import logging
+import math
+import time
+from collections import deque
+from threading import Event, Lock, Thread, current_thread
+from typing import Callable, Optional
+
+from models.config import QueueConfig
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Resizable worker pool + autoscaler (replaces the fixed list of worker threads Queue started in its constructor).
+- Growing: a controller thread wakes every scale_interval and estimates how long the current backlog would take to drain
+  (depth * avg task time / workers). If that's over target_wait (or there's a backlog and nobody is idle), it adds workers.
+- Shrinking: workers pull with a timeout of idle_timeout. A worker that times out while the pool is above min_workers
+  releases itself, so idle capacity gives itself back without the controller having to pick a victim.
+Every resize is recorded (bounded history) so it can be read back through GET /api/pool.
+"""
+
+log = logging.getLogger("pyqueue.queue")
+EWMA_ALPHA: float = 0.2
+RESIZE_HISTORY: int = 100
+
+class WorkerPool:
+    """
+    Owns the worker threads. Threads loop on pull() -> execute() and never see the Scheduler directly.
+    """
+
+    # 0. Constructor:
+    def __init__(self, pull: Callable[[Optional[float]], Optional[Task]], execute: Callable[[Task], None],
+                 depth: Callable[[], int], config: QueueConfig, drained: Callable[[], bool] = lambda: False) -> None:
+        self._pull = pull
+        self._drained = drained     # 2026-10-17: True once pull() can never return work again (closed + empty).
+        self._execute = execute
+        self._depth = depth
+        self.config = config
+        self._lock: Lock = Lock()
+        self._threads: set[Thread] = set()
+        self._busy: int = 0
+        self._avg_task_seconds: Optional[float] = None
+        self._next_id: int = 0
+        self._stopping: Event = Event()
+        self.resize_events: deque[dict] = deque(maxlen=RESIZE_HISTORY)
+
+        with self._lock:
+            self._spawn(config.min_workers, "startup")
+        self._controller: Thread = Thread(target=self._control_loop, name="pyqueue-autoscaler", daemon=True)
+        self._controller.start()
+
+    # 1. Worker thread body:
+    def _worker_loop(self) -> None:
+        while True:
+            task = self._pull(self.config.idle_timeout)
+            if task is None:
+                # 2026-10-17: Closed and drained - pull() would return None right away from now on, so a worker at
+                # min_workers that went round again would spin until shutdown() (a whole drain grace period):
+                if self._stopping.is_set() or self._drained():
+                    return
+                with self._lock:
+                    if len(self._threads) > self.config.min_workers:
+                        self._retire("idle")
+                        return
+                continue
+
+            with self._lock:
+                self._busy += 1
+            try:
+                self._execute(task)
+            finally:
+                with self._lock:
+                    self._busy -= 1
+
+    # 2. Autoscaler (controller thread body):
+    def _control_loop(self) -> None:
+        while not self._stopping.wait(self.config.scale_interval):
+            depth = self._depth()
+            if depth == 0:
+                continue
+            with self._lock:
+                size = len(self._threads)
+                idle = size - self._busy
+                if size >= self.config.max_workers:
+                    continue
+                if self._avg_task_seconds is None:
+                    # No latency observed yet - size purely on depth (one worker per queued task beyond the idle ones).
+                    wanted = size + max(0, depth - idle)
+                else:
+                    drain_seconds = depth * self._avg_task_seconds / size
+                    if drain_seconds <= self.config.target_wait and idle > 0:
+                        continue
+                    wanted = math.ceil(depth * self._avg_task_seconds / self.config.target_wait)
+                wanted = min(self.config.max_workers, max(wanted, size + 1 if idle == 0 else size))
+                if wanted > size:
+                    self._spawn(wanted - size, f"backlog depth={depth}")
+
+    # 3. Feed back how long a task took (drives the drain-time estimate above):
+    def record_latency(self, seconds: float) -> None:
+        with self._lock:
+            prev = self._avg_task_seconds
+            self._avg_task_seconds = seconds if prev is None else prev + EWMA_ALPHA * (seconds - prev)
+
+    # 4. Stop: controller exits, workers exit once pull() returns None (i.e. once the Scheduler is closed and drained):
+    # (2026-10-17: With a deadline - a drain that ran out of time - threads still busy after it are left behind; they're daemons.)
+    def shutdown(self, deadline: Optional[float] = None) -> None:
+        self._stopping.set()
+        self._controller.join()
+        while True:
+            with self._lock:
+                threads = list(self._threads)
+            if not threads:
+                return
+            for thread in threads:
+                thread.join(None if deadline is None else max(0.0, deadline - time.monotonic()))
+                if thread.is_alive():
+                    return
+                with self._lock:
+                    self._threads.discard(thread)
+
+    # Helper methods (callers must hold self._lock):
+    def _spawn(self, count: int, reason: str) -> None:
+        before = len(self._threads)
+        for _ in range(count):
+            thread = Thread(target=self._worker_loop, name=f"pyqueue-worker-{self._next_id}", daemon=True)
+            self._next_id += 1
+            self._threads.add(thread)
+            thread.start()
+        self._record_resize(before, len(self._threads), reason)
+
+    def _retire(self, reason: str) -> None:
+        before = len(self._threads)
+        self._threads.discard(current_thread())
+        self._record_resize(before, len(self._threads), reason)
+
+    def _record_resize(self, before: int, after: int, reason: str) -> None:
+        if before == after:
+            return
+        self.resize_events.append({
+            "at": datetime.datetime.now().isoformat(), "from_size": before, "to_size": after, "reason": reason,
+        })
+        if reason != "startup":
+            log.info("Worker pool resized %d -> %d (%s)", before, after, reason,
+                     extra={"event": "pool_resized", "from_size": before, "to_size": after, "reason": reason})
+
+    # Snapshot for the API:
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._threads)
+            return {
+                "size": size,
+                "busy": self._busy,
+                "idle": size - self._busy,
+                "min_workers": self.config.min_workers,
+                "max_workers": self.config.max_workers,
+                "avg_task_seconds": self._avg_task_seconds,
+                "resize_events": list(self.resize_events),
+            }
@@ -0,0 +1,230 @@
+import logging
+import multiprocessing
+import queue as std_queue
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from threading import BoundedSemaphore, Lock, Thread
+from typing import TYPE_CHECKING, Callable, Optional
+
+from enums.TaskStatus import TaskStatus
+from models.cancel import CancelToken, NEVER_CANCELLED
+from models.handlers import HandlerRegistry
+from models.log import configure_logging, current_settings
+from models.metrics import Metrics
+from models.task import Task
+
+if TYPE_CHECKING:
+    from models.queue import Queue, WorkerFactory
+
+"""
+2026-10-17-NOTE:
+Process-pool execution lane for CPU-bound TaskTypes (PYQUEUE_BACKENDS="REPORT=process,DATACLEANUP=process").
+Every thread-backed Task shares one CPython process, so CPU-heavy handlers are capped at one core by the GIL. Tasks routed
+here run in a pool of warm worker processes instead.
+
+How it fits with the rest of Queue:
+- The same worker_factory from main.py is used - it's pickled *by reference* into each child at startup (so it has to be a
+  module-level function, which main.worker_factory is). In the child, the factory gets a _ChildQueue stand-in instead of
+  the real Queue, so Worker runs completely unchanged; its retry call (queue.retry(task)) just sets a flag.
+  (2026-10-17: The handler registry travels the same way - see models/handlers.py - so its functions must be module-level too.)
+- Results come back through ONE shared multiprocessing queue (the "result channel"). Each finished attempt is a single
+  compact tuple carrying every field the parent cares about (status, attempts, retry flag), instead of an IPC round trip
+  per field. A collector thread in the parent drains whatever has piled up and applies the whole batch under a single
+  acquisition of Queue.lock (Queue.apply_results()).
+- A dispatcher thread pulls from the Scheduler's "process" lane, but only when a process slot is free - so queued
+  process-lane Tasks stay in the Scheduler (priority + fairness still apply) rather than piling up inside the executor.
+"""
+
+log = logging.getLogger("pyqueue.queue")
+LANE: str = "process"
+_STOP = None    # Sentinel posted on the result channel to stop the collector.
+
+# Child-process side:
+_result_channel = None
+_worker_factory: Optional["WorkerFactory"] = None
+_handlers: HandlerRegistry = HandlerRegistry()
+
+class _ChildQueue:
+    """
+    Stand-in for Queue inside a child process - Worker only ever calls retry() on it (and set_status()).
+    """
+    # Worker's error counters land in a child-local Metrics and stay there (only timings/transitions reach GET /metrics):
+    metrics: Metrics = Metrics()
+
+    def __init__(self) -> None:
+        self.requeue: bool = False
+        self.handlers: HandlerRegistry = _handlers
+
+    def retry(self, task: Task) -> None:
+        # The parent applies the backoff delay when it re-enqueues (Queue.retry()).
+        self.requeue = True
+
+    def cancel_token(self, task: Task) -> CancelToken:
+        # Cancellation can't reach a child process - a cancelled Task's result is ignored by the parent instead.
+        return NEVER_CANCELLED
+
+    def set_status(self, task: Task, status: TaskStatus) -> None:
+        # The parent journals the final status when the result comes back through the channel.
+        task.status = status
+
+def _init_child(result_channel, worker_factory: "WorkerFactory", log_settings: Optional[tuple],
+                handlers: HandlerRegistry) -> None:
+    global _result_channel, _worker_factory, _handlers
+    _result_channel = result_channel
+    _worker_factory = worker_factory
+    _handlers = handlers
+    # Spawned children start with logging unconfigured - repeat the parent's setup (written directly, no listener thread):
+    if log_settings is not None:
+        level, type_levels, sample, buffer = log_settings
+        configure_logging(level, type_levels, sample, buffer, background=False)
+
+def _warm() -> None:
+    pass
+
+def _run_in_child(task: Task) -> None:
+    proxy = _ChildQueue()
+    try:
+        _worker_factory(task, proxy)()
+    except Exception as e:
+        log.error("Worker raised in child process while running task %s: %s", task.t_id, e, extra={"task_id": task.t_id},
+                  exc_info=e)
+        # 2026-10-17: Failed for good (like Queue.fail_escaped()) - FAILED with retries left and no retry would never finish:
+        task.status = TaskStatus.FAILED
+        task.attempts = max(task.attempts, task.max_retries)
+    _result_channel.put((task.t_id, task.status, task.attempts, proxy.requeue))
+
+# Parent-process side:
+class ProcessBackend:
+    """
+    Warm ProcessPoolExecutor + dispatcher thread (Scheduler -> pool) + collector thread (result channel -> jobs registry).
+    """
+
+    # 0. Constructor:
+    def __init__(self, queue: "Queue", worker_factory: "WorkerFactory", processes: int,
+                 on_finished: Optional[Callable[[Task, float], None]] = None,
+                 handlers: Optional[HandlerRegistry] = None) -> None:
+        self.queue = queue
+        self.on_finished = on_finished
+        self._ctx = multiprocessing.get_context("spawn")    # spawn, not fork: the parent is multi-threaded by the time this starts.
+        self._results = self._ctx.Queue()
+        self._processes = processes
+        self._initargs = (self._results, worker_factory, current_settings(), handlers or HandlerRegistry())
+        self._executor: ProcessPoolExecutor = self._new_executor()
+        self._slots: BoundedSemaphore = BoundedSemaphore(processes)
+        self._inflight: dict[str, tuple[Task, float]] = {}
+        self._inflight_lock: Lock = Lock()
+
+        self._dispatcher: Thread = Thread(target=self._dispatch_loop, name="pyqueue-process-dispatcher", daemon=True)
+        self._collector: Thread = Thread(target=self._collect_loop, name="pyqueue-process-collector", daemon=True)
+        self._dispatcher.start()
+        self._collector.start()
+
+    # 1. Scheduler -> process pool (one slot per process, so at most `processes` Tasks are ever in flight):
+    def _dispatch_loop(self) -> None:
+        while True:
+            self._slots.acquire()
+            task = self.queue.scheduler.pop(lane=LANE)
+            if task is None:
+                self._slots.release()
+                return
+            # The attempt count is only bumped in the child (by Worker.run) and comes back with the result.
+            self.queue.metrics.observe_wait(task.t_type, time.perf_counter() - task.enqueued_at)
+            self.queue.set_status(task, TaskStatus.INPROGRESS)
+            with self._inflight_lock:
+                self._inflight[task.t_id] = (task, time.perf_counter())
+            try:
+                future = self._executor.submit(_run_in_child, task)
+            except BrokenProcessPool:
+                # 2026-10-17: A child died and took the pool down with it (_on_done failed every Task it held) - without a
+                # fresh pool, no process-lane Task (retries of those included) would ever run again:
+                log.warning("Process pool broken - starting a new one", extra={"event": "process_pool_restarted"})
+                self._executor.shutdown(wait=False)
+                self._executor = self._new_executor()
+                future = self._executor.submit(_run_in_child, task)
+            future.add_done_callback(lambda f, t=task: self._on_done(f, t))
+
+    def _new_executor(self) -> ProcessPoolExecutor:
+        executor = ProcessPoolExecutor(max_workers=self._processes, mp_context=self._ctx, initializer=_init_child,
+                                       initargs=self._initargs)
+        # Keep the workers warm: start every process now instead of on the first CPU-bound Task.
+        for _ in range(self._processes):
+            executor.submit(_warm)
+        return executor
+
+    def _on_done(self, future: Future, task: Task) -> None:
+        # 2026-10-17: Never started - shutdown(cancel_futures=True) dropped it from the executor's queue. Nothing will come back
+        # through the result channel, so undo the dispatch here and leave it QUEUED for the handoff (exception() would raise):
+        if future.cancelled():
+            with self._inflight_lock:
+                entry = self._inflight.pop(task.t_id, None)
+            if entry is not None:
+                self.queue.set_status(task, TaskStatus.QUEUED)
+                self._slots.release()
+                self.queue.scheduler.done(task.t_type)
+            return
+        # Normal completions report through the result channel; only a crashed child (BrokenProcessPool etc.) lands here.
+        error = future.exception()
+        if error is not None:
+            log.error("Child process failed while running task %s: %s", task.t_id, error, extra={"task_id": task.t_id})
+            # 2026-10-17: Counts as a failed attempt - retried while it has retries left (it used to just stay FAILED):
+            attempts = task.attempts + 1
+            self._results.put((task.t_id, TaskStatus.FAILED, attempts, attempts < task.max_retries))
+
+    # 2. Result channel -> jobs registry, in batches:
+    def _collect_loop(self) -> None:
+        while True:
+            batch = [self._results.get()]
+            while True:
+                try:
+                    batch.append(self._results.get_nowait())
+                except std_queue.Empty:
+                    break
+
+            finished: list[tuple[Task, float, bool]] = []
+            updates: list[tuple[Task, TaskStatus, int]] = []
+            with self._inflight_lock:
+                for result in batch:
+                    if result is _STOP:
+                        continue
+                    t_id, status, attempts, requeue = result
+                    entry = self._inflight.pop(t_id, None)
+                    if entry is None:
+                        continue
+                    task, started = entry
+                    updates.append((task, status, attempts))
+                    finished.append((task, started, requeue))
+            # Apply the whole batch under a single acquisition of the registry lock:
+            self.queue.apply_results(updates)
+
+            now = time.perf_counter()
+            for task, started, requeue in finished:
+                self._slots.release()
+                if self.on_finished is not None:
+                    self.on_finished(task, now - started)
+                if requeue:
+                    try:
+                        self.queue.retry(task)
+                    except RuntimeError as e:
+                        log.warning("Could not re-enqueue task %s: %s", task.t_id, e, extra={"task_id": task.t_id})
+            if _STOP in batch:
+                return
+
+    # 3. Shutdown (the Scheduler is already closed by Queue.shutdown()). 2026-10-17: With a deadline (a drain that ran out of
+    # time), children still running a Task after it are terminated - Queue hands that Task off to the next process:
+    def shutdown(self, deadline: Optional[float] = None) -> None:
+        if deadline is None:
+            self._dispatcher.join()
+            self._executor.shutdown(wait=True)
+        else:
+            with self._inflight_lock:
+                busy = bool(self._inflight)
+            if not busy:
+                self._dispatcher.join(max(0.0, deadline - time.monotonic()))  # (Busy: it's parked on a slot - leave it.)
+            processes = list((self._executor._processes or {}).values())
+            self._executor.shutdown(wait=not busy, cancel_futures=True)
+            if busy:
+                for process in processes:
+                    process.terminate()
+        self._results.put(_STOP)
+        self._collector.join()
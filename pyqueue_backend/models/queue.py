@@ -1,8 +1,36 @@
-from concurrent.futures import ThreadPoolExecutor
-from threading import Lock
+import logging
+import math
+import os
+import secrets
+import time
+from collections import Counter
+from threading import Event, Lock, Thread
 from typing import Optional, Callable
 
+from models.async_backend import AsyncBackend, AsyncWorkerFactory, LANE as ASYNC_LANE
+from models.broker import Broker, BrokerConsumer, open_broker
+from models.cancel import CancelToken, NEVER_CANCELLED
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.config import QueueConfig
+from models.dag import DependencyError, DependencyGraph
+from models.dedup import DedupCache, content_key
+from models.events import EventBus
+from models.handoff import claim_handoffs, read_handoff, release_handoff, write_handoff
+from models.handlers import HandlerRegistry
+from models.journal import WriteAheadLog
+from models.log import dropped_records
+from models.metrics import Metrics
+from models.pool import WorkerPool
+from models.registry import JobRegistry
+from models.retention import RetentionIndex, TaskArchive, is_terminal
+from models.retry import RetryPolicy
+from models.process_backend import ProcessBackend, LANE as PROCESS_LANE
+from models.scheduler import Scheduler, DEFAULT_LANE
 from models.task import Task
+from models.timer import TimerQueue
+
+log = logging.getLogger("pyqueue.queue")
 
 # 2026-02-01-NOTE: Adding this to fix circular dependency that I masked earlier w/ a local import in enqueue():
 WorkerFactory = Callable[[Task, "Queue"], Callable[[], None]]
@@ -11,7 +39,10 @@ WorkerFactory = Callable[[Task, "Queue"], Callable[[], None]]
 The arguments within Callable is the input [Task, "Queue"] ("Queue" is forward ref) and output Callable[[], None].
 (NOTE: The output being Callable[[], none] means the return type is another function that takes no arguments and returns nothing).
 This maps well to ThreadPoolExecutor because self.executor.submit(runnable) expects runnable: Callable[[], Any]. 
+(2026-10-17: The executor is gone - see the Scheduler note in the Queue class - but worker threads still just call runnable()).
 """
+# 2026-10-17: Same idea for a micro-batch of Tasks handed to one batch handler (see models/handlers.py):
+BatchWorkerFactory = Callable[[list[Task], "Queue"], Callable[[], None]]
 
 """
 Avoid using async def, FastAPI background tasks, asyncio.Queue, and so on for now.
@@ -51,6 +82,20 @@ NOTE: Don't forget to save a snapshot of my post-GoQueue translation project sta
 documentation. I didn't do this with SpringQueuePro, and it's been a pain combing back through
 old commits to write the architectural evolution document
 """
+# 2026-10-17: Raised by enqueue()/enqueue_many() when admission control turns new work away (the API maps it to 429):
+class QueueFullError(RuntimeError):
+    def __init__(self, retry_after: int) -> None:
+        super().__init__(f"queue is full - retry in {retry_after}s")
+        self.retry_after = retry_after  # Rough seconds until there's room again (Retry-After header).
+
+# 2026-10-17: New Tasks refused while the Queue drains for shutdown (see shutdown()) - the API maps it to 503 + Retry-After:
+class QueueDrainingError(QueueFullError):
+    def __init__(self, retry_after: int) -> None:
+        RuntimeError.__init__(self, f"queue is shutting down - retry in {retry_after}s")
+        self.retry_after = retry_after
+
+UNWIND_SECONDS: float = 1.0     # After a drain's grace period: how long cancelled attempts get to unwind before shutdown moves on.
+
 # DEBUG: Can add type hints for parameters but maybe leave the return type hints until after refactoring.
 class Queue:
     """
@@ -58,30 +103,185 @@ class Queue:
     It owns:
     - Task Registry
     - Worker execution lifecycle
-    - Thread pool
+    - Scheduler (ready queues) + worker threads
+    """
+
+    """
+    2026-10-17-NOTE:
+    The ThreadPoolExecutor was replaced with a Scheduler (models/scheduler.py) + a pool of worker threads that pull from it.
+    executor.submit() put every Task into the executor's internal FIFO the moment it was enqueued, so dispatch order could never
+    take priority or TaskType into account. Now enqueue() only registers + pushes, and each worker thread (models/pool.py) loops on scheduler.pop().
     """
 
     # 0. CONSTRUCTOR - Equivalent of SpringQueue's QueueService.java's constructor:
-    def __init__(self, worker_factory: WorkerFactory) -> None:
-        self.executor: ThreadPoolExecutor = ThreadPoolExecutor(max_workers=3)   # TO-DO:+DEBUG: Eventually change max_workers to be configurable (like I did in SpringQueuePro -- later).
-        self.jobs: dict[str, Task] = {}  # This will be the task registry (equivalent of ConcurrentHashMap<String, Task> in SpringQueue).
+    def __init__(self, worker_factory: WorkerFactory, config: Optional[QueueConfig] = None,
+                 async_worker_factory: Optional[AsyncWorkerFactory] = None, broker: Optional[Broker] = None,
+                 handlers: Optional[HandlerRegistry] = None,
+                 batch_worker_factory: Optional[BatchWorkerFactory] = None) -> None:
+        self.config: QueueConfig = config or QueueConfig()
+        self.scheduler: Scheduler = Scheduler(self.config.type_weights, lanes=self.config.backends,
+                                              max_depth=self.config.max_depth, type_max_depth=self.config.type_max_depth)
+        # 2026-10-17: Per-type rate limits / concurrency caps (adjustable later through set_type_limits()):
+        for t in TaskType:
+            if t in self.config.type_rate_limit or t in self.config.type_max_concurrency:
+                self.scheduler.set_limits(t, self.config.type_rate_limit.get(t), self.config.type_burst.get(t),
+                                          self.config.type_max_concurrency.get(t))
+        self.jobs: JobRegistry = JobRegistry(self.config.registry_shards)  # This will be the task registry (equivalent of ConcurrentHashMap<String, Task> in SpringQueue).
+        # ^ 2026-10-17: Was a plain dict - now a JobRegistry with status/type/creation-order indexes (see models/registry.py).
         self.lock: Lock = Lock()  # Lock to protect shared state (there's no RWLock in Python. This and the {} above are queue.py's ConcurrentHashMap...)
+        # ^ 2026-10-17: JobRegistry is lock-striped now (closer to ConcurrentHashMap after all), so plain registry reads don't
+        # take self.lock anymore. self.lock still wraps every registry *mutation*, because it's what keeps the WAL, the event
+        # feed, retention and the metrics counters in the same order as the registry changes.
         self.worker_factory = worker_factory
+        # 2026-10-17: Real per-type handlers (see models/handlers.py). Workers look them up here; the thread lane also batches
+        # Tasks of a batch handler's type together and runs them through batch_worker_factory:
+        self.handlers: HandlerRegistry = handlers or HandlerRegistry()
+        self.batch_worker_factory: Optional[BatchWorkerFactory] = batch_worker_factory
+        if batch_worker_factory is None and any(self.scheduler.lane_of(t) == DEFAULT_LANE for t in self.handlers.batched()):
+            raise RuntimeError("handlers has batch handlers for thread-lane task types but no batch_worker_factory was given")
+        # 2026-10-17: Retry backoff per TaskType + the timer thread that holds Tasks until their run_at (delayed retries and
+        # Tasks scheduled for later). See models/retry.py and models/timer.py:
+        self.retry_policies: dict[TaskType, RetryPolicy] = {
+            t: RetryPolicy(
+                base_delay=self.config.type_retry_base_delay.get(t, self.config.retry_base_delay),
+                max_delay=self.config.type_retry_max_delay.get(t, self.config.retry_max_delay),
+                jitter=self.config.retry_jitter,
+            ) for t in TaskType
+        }
+        self.timers: TimerQueue = TimerQueue(self._dispatch)
+        # 2026-10-17: Idempotency keys / content-hash de-duplication for new Tasks (see models/dedup.py):
+        self.dedup: DedupCache = DedupCache(self.config.dedup_cache_size, self.config.dedup_ttl)
+        # 2026-10-17: Cancellation handles of running attempts, t_id -> CancelToken (see models/cancel.py):
+        self._handles: dict[str, CancelToken] = {}
+        self._handles_lock: Lock = Lock()
+        # 2026-10-17: Counters + latency histograms for GET /metrics (see models/metrics.py):
+        self.metrics: Metrics = Metrics()
+        # 2026-10-17: Registry change feed for GET /api/events (see models/events.py). Published to under self.lock:
+        self.events: EventBus = EventBus(self.config.event_history)
+        self._epoch: str = secrets.token_hex(4)     # 2026-10-17: Tells registry_version()s of different runs apart.
+        # 2026-10-17: Retention policy for finished Tasks (see models/retention.py). Count limits are enforced inline on
+        # every status change; a sweeper thread handles the TTL while nothing else is happening:
+        self.retention: RetentionIndex = RetentionIndex(self.config.retention_max_terminal, self.config.retention_ttl)
+        self.archive: Optional[TaskArchive] = TaskArchive(self.config.archive_path) if self.config.archive_path else None
+        # 2026-10-17: Tasks waiting on other Tasks to complete (see models/dag.py). Only touched under self.lock:
+        self.graph: DependencyGraph = DependencyGraph()
+        self._stopping: Event = Event()
+        self._draining: Event = Event()     # 2026-10-17: Set by shutdown() when it drains instead of running the backlog.
+        self._drain_retry_after: int = 1    # (Retry-After for the Tasks refused meanwhile - roughly when the next process is up.)
+        self._sweeper: Optional[Thread] = None
+        if self.retention.ttl is not None:
+            self._sweeper = Thread(target=self._sweep_loop, name="pyqueue-retention", daemon=True)
+            self._sweeper.start()
+        # 2026-10-17: Optional write-ahead log (PYQUEUE_WAL_DIR) - see models/journal.py. Created before any execution lane
+        # starts because every lane reports status changes through set_status(), which journals them:
+        self.wal: Optional[WriteAheadLog] = None
+        if self.config.wal_dir:
+            self.wal = WriteAheadLog(self.config.wal_dir, self.config.wal_flush_interval, self.config.wal_compact_every)
+            self.wal.set_snapshot_source(self._wal_snapshot)
+        # 2026-10-17: The old TO-DO ("change max_workers to be configurable") is done - pool bounds come from QueueConfig and
+        # WorkerPool autoscales between them (see models/pool.py):
+        self.pool: WorkerPool = WorkerPool(
+            pull=lambda timeout: self.scheduler.pop(timeout, DEFAULT_LANE), execute=self._execute,
+            depth=lambda: self.scheduler.runnable_depth(DEFAULT_LANE), config=self.config,
+            drained=lambda: self.scheduler.drained(DEFAULT_LANE),
+        )
+        # 2026-10-17: TaskTypes mapped to "process" in PYQUEUE_BACKENDS skip the thread pool and run in warm child processes:
+        self.process_backend: Optional[ProcessBackend] = None
+        if PROCESS_LANE in self.config.backends.values():
+            self.process_backend = ProcessBackend(
+                self, worker_factory, self.config.process_workers, on_finished=self._finished,
+                handlers=self.handlers.subset({t for t, lane in self.config.backends.items() if lane == PROCESS_LANE}),
+            )
+        # 2026-10-17: ...and TaskTypes mapped to "async" run as coroutines on a dedicated event loop thread:
+        self.async_backend: Optional[AsyncBackend] = None
+        if ASYNC_LANE in self.config.backends.values():
+            if async_worker_factory is None:
+                raise RuntimeError("PYQUEUE_BACKENDS routes task types to 'async' but no async_worker_factory was given")
+            self.async_backend = AsyncBackend(
+                self, async_worker_factory, self.config.async_concurrency, on_finished=self._finished,
+            )
+        # 2026-10-17: Optional shared broker (PYQUEUE_BROKER_URL, or passed in) - see models/broker.py. With one, new Tasks and
+        # the API's registry reads go to the broker, and a consumer thread leases Tasks into the Scheduler; self.jobs then only
+        # holds the Tasks this process has leased. Started last - leased Tasks go straight to the lanes set up above:
+        self.broker: Optional[Broker] = broker
+        if self.broker is None and self.config.broker_url:
+            self.broker = open_broker(self.config.broker_url)
+        self.consumer: Optional[BrokerConsumer] = None
+        if self.broker is not None:
+            self.consumer = BrokerConsumer(
+                self.broker, accept=self._accept_leased, lost=self._lost_leases, prefetch=self.config.broker_prefetch,
+                visibility=self.config.broker_visibility, poll_interval=self.config.broker_poll_interval,
+            )
 
     # 1. Enqueue a task: Translating - public void enqueue(Task t) {...}:
-    def enqueue(self, task: Task) -> None:
+    def enqueue(self, task: Task, idempotency_key: Optional[str] = None, dedup: bool = True) -> str:
         """
         Registers a Task and submits it for execution.
         Assumes the task is already fully initialized.
+        2026-10-17: Returns the ID the request maps to - task.t_id, or the ID of the Task already enqueued under the same
+        idempotency key / content hash (in which case `task` is dropped). dedup=False skips that check.
         """
         #from system.worker import Worker    # TO-DO: This will be lifted out of here when FastAPI Dependency Injection is layered in.
 
+        if task.attempts == 0 and self.broker is None and self._draining.is_set():
+            raise QueueDrainingError(self._drain_retry_after)
+        # 2026-10-17: A Task with depends_on waits for its parents (checked on the first enqueue only - see models/dag.py):
+        gated = bool(task.depends_on) and task.attempts == 0
+        if gated:
+            self._check_dependencies([task])    # Raises DependencyError.
+        key = self._dedup_key(task, idempotency_key) if dedup else None
+        if key is not None:
+            existing = self.dedup.claim(key, task.t_id)
+            if existing is not None:
+                return existing
+        # 2026-10-17: With a broker, the Task goes there instead (admission control / timers apply where it's leased):
+        if self.broker is not None:
+            try:
+                self._submit([task])
+            except Exception:
+                if key is not None:
+                    self.dedup.release(key, task.t_id)
+                raise
+            return task.t_id
+        # 2026-10-17: Admission control only applies to new work that is ready to run - a retry re-enqueue was already
+        # admitted once (rejecting it would just lose the Task), and a delayed Task doesn't occupy the ready queue until it
+        # is due (same for a Task waiting on its dependencies). Raises QueueFullError if there's no room:
+        delayed = task.run_at > time.time()
+        admitted = task.attempts == 0 and not delayed and not gated and self.scheduler.limited
+        if admitted:
+            try:
+                self._admit({task.t_type: 1})
+            except QueueFullError:
+                if key is not None:
+                    self.dedup.release(key, task.t_id)  # Rejected - a retry of this request must not count as a duplicate.
+                raise
         # 2026-01-31: Original Lock and release effect replaced with context manager - lock lifts when all lines are executed (basically just shortens code):
         with self.lock:
-            self.jobs[task.t_id] = task
+            if task.status == TaskStatus.CANCELLED:
+                return task.t_id    # Cancelled (or deleted) while its failed attempt was wrapping up - don't bring it back.
+            self.jobs.add(task)
+            seq = self.wal.log_enqueue(task) if self.wal is not None else 0
+            self.events.publish("enqueued", task)
+            if not task.attempts:
+                self.metrics.enqueued[task.t_type] += 1
+            if self.retention.enabled:
+                self.retention.update(task)
+            held = gated and self._hold(task)
 
-        runnable = self.worker_factory(task, self)
-        self.executor.submit(runnable)
+        # Fresh enqueues (attempts == 0) wait for group commit so they survive a crash once accepted. Retry re-enqueues
+        # come from worker threads / the event loop and don't wait (a lost retry record just means the attempt re-runs).
+        if seq and self.config.wal_sync_enqueue and task.attempts == 0:
+            self.wal.wait_durable(seq)
+        if held:
+            return task.t_id    # Blocked on its parents (-> _release_ready()), or cancelled because one can't complete.
+        if self._draining.is_set():
+            return task.t_id    # A retry while draining - it stays in the registry and is handed off.
+        if delayed:
+            self.timers.schedule(task)  # -> _dispatch() at task.run_at
+            return task.t_id
+        task.enqueued_at = time.perf_counter()
+        self.scheduler.push(task, admitted=admitted)
+        return task.t_id
         # Earlier stage legacy code (code structure directly from the SpringQueue and GoQueue translation phase):
         """
         task.status = TaskStatus.QUEUED
@@ -96,16 +296,102 @@ class Queue:
             self.lock.release()
         """
 
+    # 1b. 2026-10-17: Bulk enqueue - same as enqueue() for every Task, but one registry lock acquisition, one WAL group
+    # commit wait and one Scheduler push for the whole batch (POST /api/enqueue/batch):
+    # Returns one ID per input Task, in order (the existing Task's ID for duplicates, like enqueue()):
+    # 2026-10-17: A Task's depends_on may name Tasks earlier in the same batch (POST /api/workflows sends parents first).
+    def enqueue_many(self, tasks: list[Task], idempotency_keys: Optional[list[Optional[str]]] = None) -> list[str]:
+        if self.broker is None and self._draining.is_set():
+            raise QueueDrainingError(self._drain_retry_after)
+        if any(t.depends_on and t.attempts == 0 for t in tasks):
+            self._check_dependencies(tasks)     # Raises DependencyError.
+        ids = [t.t_id for t in tasks]
+        claimed: list[tuple[object, str]] = []
+        fresh: list[Task] = []
+        duplicates: dict[str, str] = {}
+        for i, task in enumerate(tasks):
+            if task.depends_on and duplicates:
+                # A parent in this batch was a duplicate - depend on the Task it maps to instead:
+                task.depends_on = tuple(duplicates.get(p, p) for p in task.depends_on)
+            key = self._dedup_key(task, idempotency_keys[i] if idempotency_keys else None)
+            if key is not None:
+                existing = self.dedup.claim(key, task.t_id)     # (Also catches duplicates within the batch itself.)
+                if existing is not None:
+                    ids[i] = duplicates[task.t_id] = existing
+                    continue
+                claimed.append((key, task.t_id))
+            fresh.append(task)
+        tasks = fresh
+        if not tasks:
+            return ids
+        if self.broker is not None:
+            try:
+                self._submit(tasks)
+            except Exception:
+                for key, t_id in claimed:
+                    self.dedup.release(key, t_id)
+                raise
+            return ids
+        gated = [t for t in tasks if t.depends_on and t.attempts == 0]
+        free = [t for t in tasks if not (t.depends_on and t.attempts == 0)] if gated else tasks
+        now = time.time()
+        delayed = [t for t in free if t.run_at > now]
+        ready = [t for t in free if t.run_at <= now] if delayed else free
+        admitted = self.scheduler.limited
+        if admitted and ready:
+            try:
+                self._admit(Counter(t.t_type for t in ready))   # All or nothing - a batch is never partially accepted.
+            except QueueFullError:
+                for key, t_id in claimed:
+                    self.dedup.release(key, t_id)
+                raise
+        with self.lock:
+            for task in tasks:
+                self.jobs.add(task)
+                self.events.publish("enqueued", task)
+                self.metrics.enqueued[task.t_type] += 1
+            seq = self.wal.log_enqueue_many(tasks) if self.wal is not None else 0
+            unblocked = [t for t in gated if not self._hold(t)]
+
+        if seq and self.config.wal_sync_enqueue:
+            self.wal.wait_durable(seq)
+        self._release_ready(unblocked)
+        if delayed:
+            self.timers.schedule_many(delayed)
+        now = time.perf_counter()
+        for task in ready:
+            task.enqueued_at = now
+        if ready:
+            self.scheduler.push_many(ready, admitted=admitted)
+        return ids
+
     # 2. Clear all jobs: Translating - public void clear() {...}:
     def clear(self) -> None:
+        # 2026-10-17: Unfinished Tasks are cancelled too - they used to keep running (and retrying) after being cleared.
+        if self.broker is not None:
+            self.broker.clear()     # (Other processes find out their leases are gone at their next heartbeat.)
         with self.lock:
+            pending = [t for t in self.jobs.values() if not is_terminal(t)]
+            for task in pending:
+                self.metrics.transition(task.t_type, task.status, TaskStatus.CANCELLED)
+                task.status = TaskStatus.CANCELLED
             self.jobs.clear()
+            self.retention.clear()
+            self.graph.clear()
+            if self.wal is not None:
+                self.wal.log_clear()
+            self.events.publish("cleared")
+        for task in pending:
+            self._stop(task)
+            if self.consumer is not None:
+                self.consumer.done(task.t_id)
 
     # 3. Get all jobs (snapshot): Translating - public Task[] getJobs() {...}:
     def get_jobs(self) -> list[Task]:
-        # Returns a snapshot of all tracked tasks:
-        with self.lock:
-            return list(self.jobs.values())
+        # Returns a snapshot of all tracked tasks (2026-10-17: copied shard by shard - writers keep going meanwhile):
+        if self.broker is not None:
+            return self.broker.page()[0]
+        return self.jobs.values()
         # Earlier stage legacy code:
         """
         self.lock.acquire()
@@ -122,25 +408,641 @@ class Queue:
         return all_tasks
         """
 
+    # 2026-10-17: The WAL compactor's snapshot (models/journal.py) - taken under self.lock, so no enqueue, delete or clear
+    # lands halfway through it. Encoding and writing it happen on the compactor thread, outside the lock:
+    def _wal_snapshot(self) -> list[Task]:
+        with self.lock:
+            return self.jobs.values()
+
+    # 3b. 2026-10-17: Filtered, cursor-paginated read backed by the registry indexes - O(log n + page), not O(total jobs).
+    # Returns (page, next_cursor, total matching). next_cursor is None on the last page.
+    def query_jobs(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+                   after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int], int]:
+        registry = self._registry()
+        page, next_cursor = registry.page(status, t_type, after, limit)
+        return page, next_cursor, registry.count(status, t_type)
+
+    # 3c. 2026-10-17: Filtered snapshot + the event sequence number it is consistent with (GET /api/events starts with this,
+    # then streams every event after that seq):
+    def snapshot_jobs(self, status: Optional[TaskStatus] = None,
+                      t_type: Optional[TaskType] = None) -> tuple[list[Task], int]:
+        with self.lock:
+            page, _ = self._registry().page(status, t_type)
+            return page, self.events.last_seq   # (With a broker, the events that follow are only this process's.)
+
     # 4. Get job by ID: Translating - public Task getJobById(String id) {...}:
     def get_job_by_id(self, t_id: str) -> Optional[Task]:
-        with self.lock:
-            return self.jobs.get(t_id)
+        return self._registry().get(t_id)     # (No lock - or a copy from the broker.)
 
     # 5. Delete job: Translating - public boolean deleteJob(String id) {...}:
     def delete_job(self, t_id: str) -> bool:
+        if self.broker is not None:
+            if not self.broker.delete(t_id):
+                return False
+            local = self.jobs.get(t_id)     # Leased by this process - stop it here.
+            if local is not None:
+                self._cancel(local)
+                self._forget(local)
+            return True
         with self.lock:
-            if t_id in self.jobs:
-                del self.jobs[t_id]
-                return True
-            return False
+            task = self.jobs.remove(t_id)
+            if task is None:
+                return False
+            self.retention.discard(t_id)
+            if self.wal is not None:
+                self.wal.log_delete(t_id)
+            self.events.publish("deleted", task)
+            # 2026-10-17: A deleted Task used to keep running anyway - cancel it (no status event, it's gone from the registry):
+            finished = is_terminal(task)
+            if not finished:
+                self.metrics.transition(task.t_type, task.status, TaskStatus.CANCELLED)
+                task.status = TaskStatus.CANCELLED
+                self._doom_dependents(task)
+        if not finished:
+            self._stop(task)
+        return True
+
+    # 5b. 2026-10-17: Cancel a Task that hasn't finished (POST /api/jobs/{id}/cancel). A queued Task is dropped from the
+    # Scheduler right away; a running one is signalled through its CancelToken. Returns False if it had already finished.
+    def cancel_job(self, task: Task) -> bool:
+        if self.broker is not None:
+            if not self.broker.cancel(task.t_id):
+                return False
+            task.status = TaskStatus.CANCELLED  # (`task` is the broker's copy the API got - the response shows it.)
+            local = self.jobs.get(task.t_id)
+            if local is not None:
+                self._cancel(local)
+                self._forget(local)
+            return True
+        return self._cancel(task)
+
+    def _cancel(self, task: Task) -> bool:
+        with self.lock:
+            if is_terminal(task):
+                return False
+            self._mark_cancelled(task)
+        self._stop(task)
+        return True
+
+    # Caller holds self.lock. Tasks blocked behind `task` are cancelled with it (they could never run):
+    def _mark_cancelled(self, task: Task) -> None:
+        old_status = task.status
+        task.status = TaskStatus.CANCELLED
+        self.jobs.move(task, old_status)
+        if self.wal is not None:
+            self.wal.log_status(task)
+        self.events.publish("status", task, old_status)
+        self._observe_transition(task, old_status)
+        if self.retention.enabled:
+            self.retention.update(task)
+        self._doom_dependents(task)
+
+    def _stop(self, task: Task) -> None:
+        # Queued: out of the Scheduler now (frees its depth immediately). Waiting on the timer: dropped by _dispatch() when
+        # due. Running: signal the attempt.
+        self.scheduler.discard(task)
+        with self._handles_lock:
+            token = self._handles.get(task.t_id)
+        if token is not None:
+            token.cancel()
+
+    # 6. 2026-10-17: Single entry point for status changes (Worker, AsyncWorker and the process lane all call this):
+    def set_status(self, task: Task, status: TaskStatus) -> None:
+        evicted: list[Task] = []
+        with self.lock:
+            old_status = task.status
+            if old_status == TaskStatus.CANCELLED:
+                return  # 2026-10-17: Cancellation is final - a cancelled attempt's late "COMPLETED"/"FAILED" is ignored.
+            task.status = status
+            self.jobs.move(task, old_status)
+            if self.wal is not None:
+                self.wal.log_status(task)
+            self.events.publish("status", task, old_status)
+            self._observe_transition(task, old_status)
+            if self.retention.enabled:
+                self.retention.update(task)
+                evicted = self._evict_due()
+            released = self._settle_dependents(task) if self.graph else []
+        self._archive(evicted)
+        self._release_ready(released)
+        if self.broker is not None:
+            self._write_through(task)
+
+    # Same, for a batch of (task, status, attempts) results applied under one lock acquisition (process lane collector):
+    def apply_results(self, results: list[tuple[Task, TaskStatus, int]]) -> None:
+        evicted: list[Task] = []
+        released: list[Task] = []
+        with self.lock:
+            for task, status, attempts in results:
+                old_status = task.status
+                if old_status == TaskStatus.CANCELLED:
+                    continue
+                task.status, task.attempts = status, attempts
+                self.jobs.move(task, old_status)
+                if self.wal is not None:
+                    self.wal.log_status(task)
+                self.events.publish("status", task, old_status)
+                self._observe_transition(task, old_status)
+                if self.retention.enabled:
+                    self.retention.update(task)
+                if self.graph:
+                    released += self._settle_dependents(task)
+            if self.retention.enabled:
+                evicted = self._evict_due()
+        self._archive(evicted)
+        self._release_ready(released)
+        if self.broker is not None:
+            for task, _, _ in results:
+                if task.status != TaskStatus.CANCELLED:
+                    self._write_through(task)
+
+    # 2026-10-17: Metrics for a status change (caller holds self.lock) - end-to-end latency once the Task is final:
+    def _observe_transition(self, task: Task, old_status: TaskStatus) -> None:
+        self.metrics.transition(task.t_type, old_status, task.status)
+        if is_terminal(task):
+            self.metrics.observe_end_to_end(task.t_type, time.time() - task.created_us / 1_000_000)
+
+    # 7. 2026-10-17: Crash recovery - rebuild the registry from the WAL and re-dispatch everything that hadn't finished.
+    def recover(self) -> int:
+        """
+        Called once from main.py's lifespan before the app takes traffic. "Unfinished" means QUEUED, INPROGRESS (the attempt
+        was cut off by the crash and is run again), or FAILED with retries left (it was waiting for its retry).
+        Returns how many Tasks were re-dispatched.
+        """
+        if self.wal is None:
+            return 0
+        recovered = self.wal.replay()
+        unfinished = [t for t in recovered.values() if not is_terminal(t)]
+        with self.lock:
+            for task in sorted(recovered.values(), key=lambda t: t.created_us):
+                self.jobs.add(task)
+                if self.retention.enabled:
+                    self.retention.update(task)     # (Finished Tasks restart their TTL - the WAL doesn't keep finish times.)
+        self._redispatch(unfinished)
+        log.info("Recovered %d tasks from the WAL (%d re-dispatched)", len(recovered), len(unfinished),
+                 extra={"event": "wal_recovered", "recovered": len(recovered), "redispatched": len(unfinished)})
+        return len(unfinished)
+
+    # 2026-10-17: Fast restart, the other half of a draining shutdown() - called from main.py's lifespan (after recover())
+    # before the app takes traffic. Claims the handoff files in PYQUEUE_HANDOFF_DIR (see models/handoff.py) and runs their
+    # Tasks. Returns how many Tasks were loaded:
+    def load_handoff(self) -> int:
+        if not self.config.handoff_dir:
+            return 0
+        loaded = 0
+        for path in claim_handoffs(self.config.handoff_dir):
+            tasks = read_handoff(path)
+            if self.broker is not None:
+                self._submit(tasks)
+            else:
+                tasks = self._adopt(tasks)
+            release_handoff(path)
+            loaded += len(tasks)
+            log.info("Loaded %d tasks from handoff file %s", len(tasks), path,
+                     extra={"event": "handoff_loaded", "path": path, "tasks": len(tasks)})
+        return loaded
+
+    # Registers handed-off Tasks and dispatches them. Tasks the WAL already recovered are skipped, and so are dependencies
+    # on parents that completed before the handoff (they aren't coming back). Returns the Tasks that were new:
+    def _adopt(self, tasks: list[Task]) -> list[Task]:
+        tasks = sorted((t for t in tasks if self.jobs.get(t.t_id) is None), key=lambda t: t.created_us)
+        ids = {t.t_id for t in tasks}
+        seq = 0
+        with self.lock:
+            for task in tasks:
+                if task.depends_on:
+                    task.depends_on = tuple(p for p in task.depends_on if p in ids or self.jobs.get(p) is not None) or None
+                self.jobs.add(task)
+                self.events.publish("enqueued", task)
+                if self.retention.enabled:
+                    self.retention.update(task)
+            if self.wal is not None:
+                seq = self.wal.log_enqueue_many(tasks)
+        if seq:
+            self.wal.wait_durable(seq)  # (The handoff file is deleted next - the WAL is their only copy after that.)
+        self._redispatch(tasks)
+        return tasks
+
+    # Unfinished Tasks from before a restart (WAL recovery / handoff) back into execution, oldest first:
+    def _redispatch(self, tasks: list[Task]) -> None:
+        for task in sorted(tasks, key=lambda t: t.created_us):
+            if task.status == TaskStatus.INPROGRESS:
+                self.set_status(task, TaskStatus.QUEUED)    # Its attempt was cut off - it runs again.
+            if task.depends_on and task.attempts == 0:
+                with self.lock:
+                    if self._hold(task):
+                        continue    # Its parents came back first (created earlier) - it waits for them again.
+            if task.run_at > time.time():
+                self.timers.schedule(task)  # A retry that was still backing off (or a Task scheduled for later).
+            else:
+                self._dispatch(task)
 
     # Helper methods:
     def get_job_count(self) -> int:
+        if self.broker is not None:
+            return self.broker.count()
+        return len(self.jobs)   # Sum of the shards' sizes - no lock.
+
+    # 2026-10-17: Dependencies (see models/dag.py). Every parent must already be enqueued - earlier in `tasks`, or in the
+    # registry (a finished parent that retention has evicted counts as unknown):
+    def _check_dependencies(self, tasks: list[Task]) -> None:
+        if self.broker is not None:
+            raise DependencyError("task dependencies aren't supported with a broker (PYQUEUE_BROKER_URL)")
+        earlier: set[str] = set()
+        for task in tasks:
+            for parent in task.depends_on or () if task.attempts == 0 else ():
+                if parent not in earlier and self.jobs.get(parent) is None:
+                    raise DependencyError(f"unknown dependency {parent} for task {task.t_id}")
+            earlier.add(task.t_id)
+
+    # Caller holds self.lock. Blocks a newly registered Task on its unfinished parents, or cancels it if one of them can
+    # never complete (failed for good, cancelled, deleted). Returns False if it can run right away:
+    def _hold(self, task: Task) -> bool:
+        pending: list[str] = []
+        for t_id in dict.fromkeys(task.depends_on):
+            parent = self.jobs.get(t_id)
+            if parent is None or (parent.status != TaskStatus.COMPLETED and is_terminal(parent)):
+                self._mark_cancelled(task)
+                return True
+            if parent.status != TaskStatus.COMPLETED:
+                pending.append(t_id)
+        if not pending:
+            return False
+        self.graph.block(task, pending)
+        return True
+
+    # Caller holds self.lock, right after `task` changed status. Returns the dependents it released (only once it completed):
+    def _settle_dependents(self, task: Task) -> list[Task]:
+        if task.status == TaskStatus.COMPLETED:
+            return self.graph.release(task.t_id)
+        if is_terminal(task):
+            self._doom_dependents(task)
+        return []   # (A failed attempt with retries left changes nothing yet.)
+
+    # Caller holds self.lock:
+    def _doom_dependents(self, task: Task) -> None:
+        if not self.graph:
+            return
+        self.graph.discard(task.t_id)
+        for child in self.graph.fail(task.t_id):
+            self._mark_cancelled(child)
+
+    # Released dependents go to the Scheduler (or the timer, if they're also scheduled for later) - called outside self.lock:
+    def _release_ready(self, tasks: list[Task]) -> None:
+        now = time.time()
+        for task in tasks:
+            if task.run_at > now:
+                self.timers.schedule(task)
+            else:
+                self._dispatch(task)
+
+    # 2026-10-17: Opaque version of everything the job routes can show, for GET /api/jobs ETags. Every registry change
+    # publishes an event, so the event seq moves whenever a response could differ. None with a broker - other processes
+    # change it without this one seeing an event:
+    def registry_version(self) -> Optional[str]:
+        if self.broker is not None:
+            return None
+        return f"{self._epoch}-{self.events.last_seq}"
+
+    # Where the API's registry reads go - the broker if there is one (same page()/count()/get() as JobRegistry):
+    def _registry(self) -> Broker | JobRegistry:
+        return self.broker if self.broker is not None else self.jobs
+
+    # 2026-10-17: Broker mode (see models/broker.py) - new Tasks go to the broker, for whichever consumer leases them first:
+    def _submit(self, tasks: list[Task]) -> None:
+        self.broker.submit(tasks)
+        with self.lock:
+            for task in tasks:
+                self.events.publish("enqueued", task)
+                self.metrics.enqueued[task.t_type] += 1
+        self.consumer.wake()    # (This process's consumer polls now rather than at its next poll interval.)
+
+    # Consumer callback - Tasks leased by this process join the local registry and Scheduler:
+    def _accept_leased(self, tasks: list[Task]) -> None:
+        with self.lock:
+            for task in tasks:
+                self.jobs.add(task)
+        for task in tasks:
+            if task.status == TaskStatus.INPROGRESS:
+                self.set_status(task, TaskStatus.QUEUED)    # Its lease expired mid-attempt (its process died) - run it again.
+            self._dispatch(task)
+
+    # Consumer callback - leases this process lost (cancelled/deleted elsewhere, or expired and taken by another consumer):
+    def _lost_leases(self, t_ids: list[str]) -> None:
+        for t_id in t_ids:
+            task = self.jobs.get(t_id)
+            if task is not None:
+                log.info("Lost the lease on task %s", t_id, extra={"event": "lease_lost", "task_id": t_id})
+                self._forget(task)
+                self._stop(task)
+
+    # A leased Task's status change goes to the broker too; once it's final the lease is acked and the Task leaves self.jobs.
+    # A rejected write means the lease is gone - the attempt is stopped and its result dropped:
+    def _write_through(self, task: Task) -> None:
+        final = is_terminal(task)
+        try:
+            held = (self.broker.ack if final else self.broker.save)(self.consumer.consumer, task)
+        except Exception as e:
+            # Can't tell whether the write landed. Carry on - if it didn't, the lease expires and the Task runs again
+            # elsewhere (at-least-once).
+            log.warning("Broker write for task %s failed: %s", task.t_id, e, extra={"event": "broker_error", "task_id": task.t_id})
+            held = True
+        if final or not held:
+            self._forget(task)
+        if not held:
+            self._stop(task)
+
+    # Retry in broker mode - the Task goes back to the broker with its run_at, for any consumer:
+    def _release(self, task: Task) -> None:
+        try:
+            self.broker.release(self.consumer.consumer, task)
+        except Exception as e:
+            log.warning("Broker release of task %s failed: %s", task.t_id, e, extra={"event": "broker_error", "task_id": task.t_id})
+        self._forget(task)
+
+    def _forget(self, task: Task) -> None:
+        with self.lock:
+            if self.jobs.get(task.t_id) is task:
+                self.jobs.remove(task.t_id)
+        self.consumer.done(task.t_id)
+
+    # 2026-10-17: Cancellation handles - every lane brackets an attempt with start_attempt()/end_attempt(), and Worker
+    # picks its token up with cancel_token(). start_attempt() returns None if the Task was cancelled before it started:
+    def start_attempt(self, task: Task) -> Optional[CancelToken]:
+        token = CancelToken()
+        with self._handles_lock:
+            self._handles[task.t_id] = token
+        # Registered *before* checking the status: a concurrent cancel_job() either sees this token or we see CANCELLED.
+        if task.status == TaskStatus.CANCELLED:
+            self.end_attempt(task)
+            return None
+        self.metrics.observe_wait(task.t_type, time.perf_counter() - task.enqueued_at)
+        return token
+
+    def end_attempt(self, task: Task) -> None:
+        with self._handles_lock:
+            self._handles.pop(task.t_id, None)
+
+    def cancel_token(self, task: Task) -> CancelToken:
+        with self._handles_lock:
+            return self._handles.get(task.t_id, NEVER_CANCELLED)
+
+    # Worker pool callback - run one Task pulled from the Scheduler and feed its runtime back to the Scheduler + autoscaler:
+    def _execute(self, task: Task) -> None:
+        spec = self.handlers.get(task.t_type)
+        if spec is not None and spec.batched and self.batch_worker_factory is not None:
+            self._execute_batch([task] + self.scheduler.pop_more(task.t_type, spec.batch_size - 1, spec.max_wait))
+            return
+        if self.start_attempt(task) is None:
+            self.scheduler.done(task.t_type)
+            return
+        runnable = self.worker_factory(task, self)
+        started = time.perf_counter()
+        try:
+            runnable()
+        except Exception as e:
+            # ThreadPoolExecutor used to swallow these into the discarded Future; don't let one kill the worker thread.
+            log.error("Worker raised while running task %s: %s", task.t_id, e, extra={"task_id": task.t_id}, exc_info=e)
+            self.fail_escaped(task)
+        finally:
+            self.end_attempt(task)
+        elapsed = time.perf_counter() - started
+        self._finished(task, elapsed)
+        self.pool.record_latency(elapsed)
+
+    # 2026-10-17: Same, for a micro-batch (same TaskType) run through one batch handler call. Each Task still gets its own
+    # attempt/cancel handle and its own done(); the batch's runtime is split evenly between them for the runtime feedback:
+    def _execute_batch(self, tasks: list[Task]) -> None:
+        batch = []
+        for task in tasks:
+            if self.start_attempt(task) is None:
+                self.scheduler.done(task.t_type)
+            else:
+                batch.append(task)
+        if not batch:
+            return
+        runnable = self.batch_worker_factory(batch, self)
+        started = time.perf_counter()
+        try:
+            runnable()
+        except Exception as e:
+            log.error("Batch worker raised while running %d %s tasks: %s", len(batch), batch[0].t_type.value, e, exc_info=e)
+            for task in batch:
+                self.fail_escaped(task)
+        finally:
+            for task in batch:
+                self.end_attempt(task)
+        share = (time.perf_counter() - started) / len(batch)
+        for task in batch:
+            self._finished(task, share)
+        self.pool.record_latency(share)
+
+    # 2026-10-17: An exception escaped the worker itself (Worker.run settles everything raised inside it), so nothing
+    # finished or retried this attempt. Fail the Task for good - left QUEUED/INPROGRESS it would never finish, its
+    # dependents would stay blocked, and recover()/the shutdown handoff would run it again:
+    def fail_escaped(self, task: Task) -> None:
+        if task.status in (TaskStatus.QUEUED, TaskStatus.INPROGRESS):
+            task.attempts = max(task.attempts, task.max_retries)
+            self.set_status(task, TaskStatus.FAILED)
+
+    # Every lane reports a finished attempt here - runtime feedback + frees the type's concurrency slot:
+    def _finished(self, task: Task, elapsed: float) -> None:
+        self.metrics.observe_execution(task.t_type, elapsed)
+        self.scheduler.record_runtime(task.t_type, elapsed)
+        self.scheduler.done(task.t_type)
+
+    # 2026-10-17: De-duplication key for a new Task - the client's idempotency key, else a content hash if its type is in
+    # PYQUEUE_DEDUP_TYPES, else None (no de-duplication). Retry re-enqueues are never de-duplicated:
+    def _dedup_key(self, task: Task, idempotency_key: Optional[str]) -> Optional[object]:
+        if task.attempts:
+            return None
+        if idempotency_key is not None:
+            return idempotency_key
+        if task.t_type in self.config.dedup_types:
+            return content_key(task.t_type, task.payload)
+        return None
+
+    # 2026-10-17: Retry a failed attempt after its type's backoff delay (Worker, AsyncWorker and the process lane call this
+    # instead of enqueue()):
+    def retry(self, task: Task) -> None:
+        if task.status == TaskStatus.CANCELLED:
+            return
+        task.run_at = time.time() + self.retry_policies[task.t_type].delay(task.attempts)
+        if self.broker is not None:
+            self._release(task)
+            return
+        self.enqueue(task)
+
+    # Hand a due Task to the Scheduler (called directly, or by the timer thread once task.run_at has passed):
+    def _dispatch(self, task: Task) -> None:
+        if task.status == TaskStatus.CANCELLED or self._draining.is_set():
+            return  # (Draining: it stays in the registry and is handed off.)
+        task.enqueued_at = time.perf_counter()
+        self.scheduler.push(task)
+
+    # 2026-10-17: Admission control - reserve room in the Scheduler or raise QueueFullError ("block" mode waits first):
+    def _admit(self, counts: dict[TaskType, int]) -> None:
+        timeout = self.config.admission_timeout if self.config.admission_mode == "block" else 0
+        if not self.scheduler.admit(counts, timeout):
+            # Retry-After estimate: how long the pool needs to work off this many Tasks of these types.
+            cost = max(self.scheduler.cost_of(t) for t in counts)
+            workers = max(1, self.pool.stats()["size"])
+            raise QueueFullError(max(1, math.ceil(cost * sum(counts.values()) / workers)))
+
+    # 2026-10-17: Retention - evict everything the policy says is due (caller holds self.lock). Evicted Tasks are journaled
+    # as deletes (so recovery doesn't bring them back) and announced on the event stream; returns them for _archive():
+    def _evict_due(self) -> list[Task]:
+        evicted: list[Task] = []
+        for t_id in self.retention.expired():
+            task = self.jobs.remove(t_id)
+            if task is None:
+                continue
+            evicted.append(task)
+            if self.wal is not None:
+                self.wal.log_delete(t_id)
+            self.events.publish("evicted", task)
+        return evicted
+
+    # Disk I/O for the archive happens outside self.lock:
+    def _archive(self, evicted: list[Task]) -> None:
+        if evicted and self.archive is not None:
+            self.archive.write(evicted)
+
+    def evict_expired(self) -> int:
+        with self.lock:
+            evicted = self._evict_due()
+        self._archive(evicted)
+        return len(evicted)
+
+    def _sweep_loop(self) -> None:
+        while not self._stopping.wait(self.config.retention_sweep_interval):
+            self.evict_expired()
+
+    def get_registry_stats(self) -> dict:
+        broker = None
+        if self.broker is not None:
+            broker = self.broker.stats() | {"held": self.consumer.held()}
+        registry = self._registry()
+        by_status = {s.value: registry.count(s) for s in TaskStatus}    # (Outside self.lock - the counts lock themselves.)
         with self.lock:
-            return len(self.jobs)
+            return {
+                "size": self.get_job_count(),
+                "by_status": by_status,
+                "retained": len(self.retention),
+                "max_terminal": self.retention.max_terminal,
+                "ttl_seconds": self.retention.ttl,
+                "evicted": dict(self.retention.evicted),
+                "archived": self.archive.archived if self.archive is not None else 0,
+                "deduplicated": self.dedup.hits,
+                "shards": self.config.registry_shards,
+                "broker": broker,
+            }
+
+    # 2026-10-17: Per-type throttling - current limits + dispatch/throughput/throttle counters (GET/PUT /api/limits):
+    def get_limit_stats(self) -> list[dict]:
+        return self.scheduler.limit_stats()
+
+    def set_type_limits(self, t_type: TaskType, rate: Optional[float] = None, burst: Optional[float] = None,
+                        max_concurrency: Optional[int] = None) -> None:
+        self.scheduler.set_limits(t_type, rate, burst, max_concurrency)
+
+    def get_pool_stats(self) -> dict:
+        stats = self.pool.stats()
+        stats["queue_depth"] = self.scheduler.depth()
+        stats["delayed"] = self.timers.pending()
+        stats["blocked"] = len(self.graph)
+        stats["max_depth"] = self.scheduler.max_depth
+        stats["rejected"] = sum(self.scheduler.rejected.values())
+        return stats
+
+    # 2026-10-17: GET /metrics - the Metrics counters/histograms plus gauges read from their owners right now:
+    def render_metrics(self) -> str:
+        with self.lock:
+            enqueued = dict(self.metrics.enqueued)
+            transitions = dict(self.metrics.transitions)
+        by_status = {f'status="{s.value}"': self._registry().count(status=s) for s in TaskStatus}
+        limits = self.scheduler.limit_stats()
+        pool = self.pool.stats()
+        collected: dict[str, tuple[str, str, dict[str, float]]] = {
+            "pyqueue_queue_depth": ("gauge", "Tasks waiting in the ready queues.",
+                                    {f'type="{t.value}"': n for t, n in self.scheduler.depth_by_type().items()}),
+            "pyqueue_tasks_delayed": ("gauge", "Tasks waiting for their run_at.", {"": self.timers.pending()}),
+            "pyqueue_tasks_running": ("gauge", "Attempts in progress, all lanes.",
+                                      {f'type="{s["t_type"].value}"': s["running"] for s in limits}),
+            "pyqueue_registry_tasks": ("gauge", "Tasks in the job registry.", by_status),
+            "pyqueue_workers": ("gauge", "Thread-lane worker threads.", {'state="busy"': pool["busy"], 'state="idle"': pool["idle"]}),
+            "pyqueue_tasks_rejected_total": ("counter", "New tasks turned away by admission control.",
+                                             {f'type="{t.value}"': n for t, n in self.scheduler.rejected.items()}),
+            "pyqueue_tasks_throttled_total": ("counter", "Times a type hit its rate limit / concurrency cap with tasks queued.",
+                                              {f'type="{s["t_type"].value}"': s["throttled"] for s in limits}),
+            "pyqueue_log_records_dropped_total": ("counter", "Log records dropped because the log buffer was full.",
+                                                  {"": dropped_records()}),
+        }
+        if self.async_backend is not None:
+            collected["pyqueue_async_in_flight"] = ("gauge", "Coroutines running on the async lane.", {"": self.async_backend.in_flight()})
+        return self.metrics.render(collected, enqueued, transitions)
 
     # Shutdown method:
-    def shutdown(self) -> None:
+    def shutdown(self, grace: Optional[float] = None) -> None:
         #print("Seems like this should just be a stub for now?")
-        self.executor.shutdown(wait = True)
+        # Same semantics as the old executor.shutdown(wait = True): stop accepting work, let queued work finish, join workers.
+        # 2026-10-17: ...unless there's a grace period (the argument, else PYQUEUE_DRAIN_GRACE). Then it drains: new Tasks are
+        # refused, queued ones aren't started, running attempts get `grace` seconds to finish (the rest are cancelled), and
+        # every unfinished Task is handed off to the next process (see models/handoff.py) - seconds instead of the backlog.
+        grace = self.config.drain_grace if grace is None else grace
+        deadline = None
+        if grace is not None:
+            self._drain_retry_after = max(1, math.ceil(grace))
+            self._draining.set()
+        if self.consumer is not None:
+            self.consumer.stop()    # 2026-10-17: No new leases - what's already leased runs to completion and is acked below.
+        self.timers.close()
+        if grace is not None:
+            self.scheduler.take_all()
+        self.scheduler.close()
+        if grace is not None and not self.scheduler.wait_idle(grace):
+            self._cancel_running()
+            deadline = time.monotonic() + UNWIND_SECONDS
+        self._stopping.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        self.pool.shutdown(deadline)
+        if self.process_backend is not None:
+            self.process_backend.shutdown(deadline)
+        if self.async_backend is not None:
+            self.async_backend.shutdown(deadline)
+        if grace is not None:
+            self._hand_off()
+        if self.wal is not None:
+            self.wal.close()
+        if self.archive is not None:
+            self.archive.close()
+        if self.broker is not None:
+            self.broker.close()
+
+    # 2026-10-17: Drain ran out of time - stop the attempts still running (thread/async lanes; process-lane children are
+    # terminated by ProcessBackend.shutdown()). Their Tasks are handed off and run again after the restart:
+    def _cancel_running(self) -> None:
+        with self._handles_lock:
+            tokens = list(self._handles.values())
+        for token in tokens:
+            token.cancel()
+        log.warning("Drain grace period over - cancelled %d running attempts", len(tokens),
+                    extra={"event": "drain_timeout", "cancelled": len(tokens)})
+
+    # Every unfinished Task goes to the next process: back to the broker (whoever leases it next), else into a handoff file.
+    # With only a WAL they're already safe - recover() re-runs them:
+    def _hand_off(self) -> None:
+        unfinished = [t for t in self.jobs.values() if not is_terminal(t)]
+        if self.broker is not None:
+            for task in unfinished:
+                self._release(task)
+            log.info("Released %d unfinished tasks back to the broker", len(unfinished),
+                     extra={"event": "handoff_written", "tasks": len(unfinished)})
+        elif self.config.handoff_dir and unfinished:
+            path = write_handoff(self.config.handoff_dir, unfinished)
+            log.info("Handed off %d unfinished tasks to %s", len(unfinished), path,
+                     extra={"event": "handoff_written", "path": path, "tasks": len(unfinished)})
+        elif unfinished and self.wal is None:
+            log.warning("Drained with nowhere to hand off to - %d unfinished tasks dropped", len(unfinished),
+                        extra={"event": "handoff_dropped", "tasks": len(unfinished)})
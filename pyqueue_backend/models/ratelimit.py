@@ -0,0 +1,64 @@
+import math
+from typing import Optional
+
+"""
+2026-10-17-NOTE:
+Per-TaskType throttling primitives used by the Scheduler. SMS/EMAIL handlers call providers with strict rate limits, and
+before this nothing stopped a backlog of them from being fired off as fast as the workers could pull.
+- TokenBucket: `rate` Tasks/second with bursts of up to `burst`. Refilled lazily from the timestamp of the last look,
+  so an idle bucket costs nothing and there's no refill thread.
+- RateMeter: exponentially-decaying events/second (~`window` seconds of memory). O(1) per event, no sample buffer.
+Neither is thread-safe on its own - the Scheduler only touches them while holding its lock.
+"""
+
+class TokenBucket:
+    """
+    Token bucket. Timestamps are whatever clock the caller passes in (the Scheduler uses time.monotonic()).
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, now: float = 0.0) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst if burst is not None else rate)
+        self._tokens: float = self.burst    # Starts full.
+        self._last: float = now
+
+    def _refill(self, now: float) -> None:
+        if now > self._last:
+            self._tokens = min(self.burst, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+
+    # Tokens available right now (may be fractional):
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self._tokens
+
+    def try_take(self, now: float) -> bool:
+        self._refill(now)
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    # Seconds until try_take() would succeed:
+    def wait_time(self, now: float) -> float:
+        self._refill(now)
+        return 0.0 if self._tokens >= 1.0 else (1.0 - self._tokens) / self.rate
+
+class RateMeter:
+    """
+    Decaying event rate (events/second).
+    """
+
+    def __init__(self, window: float = 10.0) -> None:
+        self.window = window
+        self._rate: float = 0.0
+        self._last: Optional[float] = None
+
+    def mark(self, now: float) -> None:
+        self._rate = self.rate(now) + 1.0 / self.window
+        self._last = now
+
+    def rate(self, now: float) -> float:
+        if self._last is None:
+            return 0.0
+        return self._rate * math.exp(-(now - self._last) / self.window)
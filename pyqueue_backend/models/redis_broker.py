@@ -0,0 +1,365 @@
+import hashlib
+import socket
+import time
+from threading import Lock
+from typing import Optional
+from urllib.parse import parse_qs, unquote, urlparse
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.broker import Broker, DONE, LEASED, READY
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Broker on a Redis-protocol server (PYQUEUE_BROKER_URL=redis://[:password@]host:6379/0[?prefix=pyqueue]) - for several
+nodes. Works with Redis 5+ and the servers that speak its protocol (Valkey, KeyDB, ...). See models/broker.py for the
+lease/ack model.
+Talks RESP over a plain socket (_Connection below - a few dozen lines, so no client library to install). Every operation
+that reads and then writes is a Lua script, so it's atomic on the server with one round trip, and scripts are sent once
+and then called by SHA (EVALSHA).
+Keys (all under the prefix, one prefix per deployment):
+- <p>:t:<id>                  hash per Task (its fields + seq, state, consumer, lease_until)
+- <p>:seq                     creation counter (seq = page() cursor)
+- <p>:ready                   ready Tasks, score = seq - priority * 2^40 (ZPOPMIN = highest priority, then oldest -
+                              exact while |priority| < 4096, which is plenty)
+- <p>:delayed / <p>:leases    run_at / lease expiry per Task
+- <p>:held:<consumer>         IDs a consumer holds (heartbeat renews these)
+- <p>:idx, <p>:idx:s:<status>, <p>:idx:t:<type>, <p>:idx:st:<status>:<type>   creation-order indexes for page()/count()
+Scripts take the prefix as an argument instead of declaring keys, so this needs a single Redis, not Redis Cluster.
+"""
+
+_FIELDS: tuple[str, ...] = ("seq", "payload", "type", "status", "attempts", "max_retries", "created_us", "priority", "run_at")
+
+class RedisError(RuntimeError):
+    pass
+
+class _Connection:
+    """
+    Minimal RESP2 client: one socket, one command at a time. Reconnects on the next call after a network error, and
+    (re)loads `scripts` on every connect.
+    """
+    def __init__(self, host: str, port: int, db: int, password: Optional[str], scripts: list[str],
+                 timeout: float = 10.0) -> None:
+        self.address = (host, port)
+        self.db = db
+        self.password = password
+        self.scripts = scripts
+        self.timeout = timeout
+        self._sock: Optional[socket.socket] = None
+        self._file = None
+
+    def _connect(self) -> None:
+        self._sock = socket.create_connection(self.address, self.timeout)
+        self._sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self._file = self._sock.makefile("rb")
+        if self.password:
+            self._command("AUTH", self.password)
+        if self.db:
+            self._command("SELECT", self.db)
+        for source in self.scripts:
+            self._command("SCRIPT", "LOAD", source)
+
+    def call(self, *args):
+        if self._sock is None:
+            self._connect()
+        try:
+            return self._command(*args)
+        except OSError:
+            self.close()
+            raise
+
+    def _command(self, *args):
+        out = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            out.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        self._sock.sendall(b"".join(out))
+        return self._read()
+
+    def _read(self):
+        line = self._file.readline()
+        if not line:
+            raise ConnectionError("connection closed by the server")
+        kind, rest = line[:1], line[1:-2]
+        if kind == b"+":
+            return rest.decode()
+        if kind == b"-":
+            raise RedisError(rest.decode())
+        if kind == b":":
+            return int(rest)
+        if kind == b"$":
+            n = int(rest)
+            return None if n < 0 else self._file.read(n + 2)[:-2].decode()
+        if kind == b"*":
+            n = int(rest)
+            return None if n < 0 else [self._read() for _ in range(n)]
+        raise RedisError(f"unexpected reply {line!r}")
+
+    def close(self) -> None:
+        if self._sock is not None:
+            self._sock.close()
+        self._sock = self._file = None
+
+# Shared by every script: ARGV[1] is the key prefix.
+_PRELUDE: str = """
+local P = ARGV[1]
+local function tkey(id) return P .. ':t:' .. id end
+local function record(id)
+  local f = redis.call('HMGET', tkey(id), 'seq', 'payload', 'type', 'status', 'attempts', 'max_retries', 'created_us', 'priority', 'run_at')
+  table.insert(f, 1, id)
+  return f
+end
+local function index_add(id, status, ttype, seq)
+  redis.call('ZADD', P .. ':idx', seq, id)
+  redis.call('ZADD', P .. ':idx:s:' .. status, seq, id)
+  redis.call('ZADD', P .. ':idx:t:' .. ttype, seq, id)
+  redis.call('ZADD', P .. ':idx:st:' .. status .. ':' .. ttype, seq, id)
+end
+local function index_move(id, old, new, ttype, seq)
+  if old == new then return end
+  redis.call('ZREM', P .. ':idx:s:' .. old, id)
+  redis.call('ZREM', P .. ':idx:st:' .. old .. ':' .. ttype, id)
+  redis.call('ZADD', P .. ':idx:s:' .. new, seq, id)
+  redis.call('ZADD', P .. ':idx:st:' .. new .. ':' .. ttype, seq, id)
+end
+local function make_ready(id, now)
+  local f = redis.call('HMGET', tkey(id), 'priority', 'seq', 'run_at')
+  redis.call('HSET', tkey(id), 'state', 'ready', 'consumer', '', 'lease_until', '')
+  if tonumber(f[3]) > now then
+    redis.call('ZADD', P .. ':delayed', f[3], id)
+  else
+    redis.call('ZADD', P .. ':ready', tonumber(f[2]) - tonumber(f[1]) * 1099511627776, id)
+  end
+end
+local function unlink(id, consumer)
+  redis.call('ZREM', P .. ':ready', id)
+  redis.call('ZREM', P .. ':delayed', id)
+  redis.call('ZREM', P .. ':leases', id)
+  if consumer and consumer ~= '' then redis.call('SREM', P .. ':held:' .. consumer, id) end
+end
+"""
+
+_SCRIPTS: dict[str, str] = {
+    # ARGV: prefix, now, then 9 values per Task (id + _FIELDS[1:])
+    "submit": """
+local now = tonumber(ARGV[2])
+for i = 3, #ARGV, 9 do
+  local id = ARGV[i]
+  local seq = redis.call('INCR', P .. ':seq')
+  redis.call('HSET', tkey(id), 'seq', seq, 'payload', ARGV[i + 1], 'type', ARGV[i + 2], 'status', ARGV[i + 3],
+    'attempts', ARGV[i + 4], 'max_retries', ARGV[i + 5], 'created_us', ARGV[i + 6], 'priority', ARGV[i + 7], 'run_at', ARGV[i + 8])
+  index_add(id, ARGV[i + 3], ARGV[i + 2], seq)
+  make_ready(id, now)
+end
+return 1
+""",
+    # ARGV: prefix, now, consumer, lease expiry, limit
+    "lease": """
+local now, consumer, expires = tonumber(ARGV[2]), ARGV[3], ARGV[4]
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', P .. ':leases', '-inf', '(' .. ARGV[2])) do
+  unlink(id, redis.call('HGET', tkey(id), 'consumer'))
+  make_ready(id, now)
+  redis.call('HINCRBY', P .. ':stats', 'redelivered', 1)
+end
+for _, id in ipairs(redis.call('ZRANGEBYSCORE', P .. ':delayed', '-inf', ARGV[2])) do
+  redis.call('ZREM', P .. ':delayed', id)
+  make_ready(id, now)
+end
+local popped = redis.call('ZPOPMIN', P .. ':ready', ARGV[5])
+local out = {}
+if #popped > 0 then redis.call('SADD', P .. ':consumers', consumer) end
+for i = 1, #popped, 2 do
+  local id = popped[i]
+  redis.call('HSET', tkey(id), 'state', 'leased', 'consumer', consumer, 'lease_until', expires)
+  redis.call('ZADD', P .. ':leases', expires, id)
+  redis.call('SADD', P .. ':held:' .. consumer, id)
+  out[#out + 1] = record(id)
+end
+return out
+""",
+    # ARGV: prefix, consumer, lease expiry
+    "heartbeat": """
+local ids = redis.call('SMEMBERS', P .. ':held:' .. ARGV[2])
+for _, id in ipairs(ids) do
+  redis.call('ZADD', P .. ':leases', 'XX', ARGV[3], id)
+  redis.call('HSET', tkey(id), 'lease_until', ARGV[3])
+end
+return ids
+""",
+    # ARGV: prefix, now, consumer, id, status, attempts, run_at, new state (leased = save, done = ack, ready = release)
+    "write": """
+local consumer, id, status, state = ARGV[3], ARGV[4], ARGV[5], ARGV[8]
+local cur = redis.call('HMGET', tkey(id), 'state', 'consumer', 'status', 'type', 'seq')
+if cur[1] ~= 'leased' or cur[2] ~= consumer then return 0 end
+redis.call('HSET', tkey(id), 'status', status, 'attempts', ARGV[6], 'run_at', ARGV[7])
+index_move(id, cur[3], status, cur[4], cur[5])
+if state == 'leased' then return 1 end
+unlink(id, consumer)
+if state == 'ready' then
+  make_ready(id, tonumber(ARGV[2]))
+else
+  redis.call('HSET', tkey(id), 'state', 'done', 'consumer', '', 'lease_until', '')
+end
+return 1
+""",
+    # ARGV: prefix, id
+    "cancel": """
+local id = ARGV[2]
+local cur = redis.call('HMGET', tkey(id), 'status', 'attempts', 'max_retries', 'type', 'seq', 'consumer')
+if not cur[1] then return 0 end
+if cur[1] == 'COMPLETED' or cur[1] == 'CANCELLED' or (cur[1] == 'FAILED' and tonumber(cur[2]) >= tonumber(cur[3])) then
+  return 0
+end
+index_move(id, cur[1], 'CANCELLED', cur[4], cur[5])
+unlink(id, cur[6])
+redis.call('HSET', tkey(id), 'status', 'CANCELLED', 'state', 'done', 'consumer', '', 'lease_until', '')
+return 1
+""",
+    # ARGV: prefix, id
+    "delete": """
+local id = ARGV[2]
+local cur = redis.call('HMGET', tkey(id), 'status', 'type', 'consumer')
+if not cur[1] then return 0 end
+redis.call('ZREM', P .. ':idx', id)
+redis.call('ZREM', P .. ':idx:s:' .. cur[1], id)
+redis.call('ZREM', P .. ':idx:t:' .. cur[2], id)
+redis.call('ZREM', P .. ':idx:st:' .. cur[1] .. ':' .. cur[2], id)
+unlink(id, cur[3])
+redis.call('DEL', tkey(id))
+return 1
+""",
+    # ARGV: prefix, then every index key to drop (the seq counter is kept, so cursors never go backwards)
+    "clear": """
+for _, id in ipairs(redis.call('ZRANGE', P .. ':idx', 0, -1)) do redis.call('DEL', tkey(id)) end
+for _, c in ipairs(redis.call('SMEMBERS', P .. ':consumers')) do redis.call('DEL', P .. ':held:' .. c) end
+redis.call('DEL', P .. ':ready', P .. ':delayed', P .. ':leases', P .. ':consumers', P .. ':idx')
+for i = 2, #ARGV do redis.call('DEL', ARGV[i]) end
+return 1
+""",
+    # ARGV: prefix, index key, min score ('-inf' or '(<cursor>'), limit (0 = all)
+    "page": """
+local ids
+if tonumber(ARGV[4]) > 0 then
+  ids = redis.call('ZRANGEBYSCORE', ARGV[2], ARGV[3], '+inf', 'LIMIT', 0, ARGV[4])
+else
+  ids = redis.call('ZRANGEBYSCORE', ARGV[2], ARGV[3], '+inf')
+end
+local out = {}
+for i, id in ipairs(ids) do out[i] = record(id) end
+return out
+""",
+}
+
+def _task(row: list) -> Task:
+    t_id, _, payload, t_type, status, attempts, max_retries, created_us, priority, run_at = row
+    return Task(t_id=t_id, payload=payload, t_type=TaskType(t_type), status=TaskStatus(status), attempts=int(attempts),
+                max_retries=int(max_retries), created_us=int(created_us), priority=int(priority), run_at=float(run_at))
+
+class RedisBroker(Broker):
+    """
+    Broker on a Redis-protocol server. One connection per broker, used under a lock.
+    """
+
+    # 0. Constructor:
+    def __init__(self, url: str) -> None:
+        parsed = urlparse(url)
+        db = int(parsed.path.lstrip("/") or 0)
+        password = unquote(parsed.password) if parsed.password else None
+        self.prefix: str = parse_qs(parsed.query).get("prefix", ["pyqueue"])[0]
+        self._scripts: dict[str, tuple[str, str]] = {
+            name: (hashlib.sha1((_PRELUDE + body).encode()).hexdigest(), _PRELUDE + body) for name, body in _SCRIPTS.items()
+        }
+        self._conn = _Connection(parsed.hostname or "localhost", parsed.port or 6379, db, password,
+                                 scripts=[source for _, source in self._scripts.values()])
+        self._lock: Lock = Lock()
+
+    def _eval(self, name: str, *args):
+        sha, source = self._scripts[name]
+        with self._lock:
+            try:
+                return self._conn.call("EVALSHA", sha, 0, self.prefix, *args)
+            except RedisError as e:
+                if not str(e).startswith("NOSCRIPT"):
+                    raise
+                # Script cache flushed since we connected (SCRIPT FLUSH, failover) - EVAL caches it again:
+                return self._conn.call("EVAL", source, 0, self.prefix, *args)
+
+    def _call(self, *args):
+        with self._lock:
+            return self._conn.call(*args)
+
+    def _index(self, status: Optional[TaskStatus], t_type: Optional[TaskType]) -> str:
+        if status is not None and t_type is not None:
+            return f"{self.prefix}:idx:st:{status.value}:{t_type.value}"
+        if status is not None:
+            return f"{self.prefix}:idx:s:{status.value}"
+        if t_type is not None:
+            return f"{self.prefix}:idx:t:{t_type.value}"
+        return f"{self.prefix}:idx"
+
+    def submit(self, tasks: list[Task]) -> None:
+        args: list = []
+        for t in tasks:
+            args += [t.t_id, t.payload, t.t_type.value, t.status.value, t.attempts, t.max_retries, t.created_us, t.priority,
+                     repr(t.run_at)]
+        self._eval("submit", repr(time.time()), *args)
+
+    def lease(self, consumer: str, limit: int, visibility: float) -> list[Task]:
+        now = time.time()
+        return [_task(r) for r in self._eval("lease", repr(now), consumer, repr(now + visibility), limit)]
+
+    def heartbeat(self, consumer: str, visibility: float) -> set[str]:
+        return set(self._eval("heartbeat", consumer, repr(time.time() + visibility)))
+
+    def save(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, LEASED)
+
+    def ack(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, DONE)
+
+    def release(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, READY)
+
+    def _write(self, consumer: str, task: Task, state: str) -> bool:
+        return self._eval("write", repr(time.time()), consumer, task.t_id, task.status.value, task.attempts,
+                          repr(task.run_at), state) == 1
+
+    def cancel(self, t_id: str) -> bool:
+        return self._eval("cancel", t_id) == 1
+
+    def delete(self, t_id: str) -> bool:
+        return self._eval("delete", t_id) == 1
+
+    def clear(self) -> None:
+        keys = [self._index(s, None) for s in TaskStatus] + [self._index(None, t) for t in TaskType]
+        keys += [self._index(s, t) for s in TaskStatus for t in TaskType]
+        self._eval("clear", *keys)
+
+    def get(self, t_id: str) -> Optional[Task]:
+        row = self._call("HMGET", f"{self.prefix}:t:{t_id}", *_FIELDS)
+        return _task([t_id, *row]) if row[0] is not None else None
+
+    def page(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int]]:
+        start = "-inf" if after is None else f"({after}"
+        rows = self._eval("page", self._index(status, t_type), start, limit + 1 if limit is not None else 0)
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            return [_task(r) for r in rows], int(rows[-1][1])
+        return [_task(r) for r in rows], None
+
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        return self._call("ZCARD", self._index(status, t_type))
+
+    def stats(self) -> dict[str, int]:
+        p = self.prefix
+        ready = self._call("ZCARD", f"{p}:ready") + self._call("ZCARD", f"{p}:delayed")
+        leased = self._call("ZCARD", f"{p}:leases")
+        total = self._call("ZCARD", f"{p}:idx")
+        redelivered = int(self._call("HGET", f"{p}:stats", "redelivered") or 0)
+        return {READY: ready, LEASED: leased, DONE: total - ready - leased, "redelivered": redelivered}
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
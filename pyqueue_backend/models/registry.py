@@ -0,0 +1,313 @@
+import bisect
+import itertools
+import os
+from threading import Lock
+from typing import Iterator, Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Indexed task registry (replaces the plain dict that used to be Queue.jobs).
+GET /api/jobs used to copy the entire dict under the lock and then linearly filter + map every Task, so one dashboard poll
+cost O(total jobs). With hundreds of thousands of retained Tasks that's the dominant cost of the API.
+
+Every Task gets a registration sequence number (monotonic, so it follows created_at order). The registry keeps sorted
+lists of those sequence numbers for every filter combination the API supports:
+    (None, None)    - all Tasks
+    (status, None)  - per TaskStatus
+    (None, t_type)  - per TaskType
+    (status, t_type)
+so a filtered page is one bisect to the cursor + a slice: O(log n + page size), no matter how big the registry is.
+The sorted lists are "blocked" (_SortedSeqs: a list of sorted chunks of at most ~2*CHUNK numbers, plus each chunk's max),
+so inserting or removing anywhere only shifts one small chunk - a flat list would memmove half the index every time an
+old QUEUED Task completes. New Tasks always get the highest sequence number, so registering is an append.
+
+2026-10-17-NOTE (sharding):
+Every registry read used to go through Queue.lock too, so a dashboard copying the whole registry held up every enqueue
+and status change behind it, and every worker's status change held up GET /api/jobs/{id}. The registry now locks itself:
+Tasks are spread over N shards by hash(t_id) (PYQUEUE_REGISTRY_SHARDS), each a _Shard (the old single-lock registry -
+dict + indexes) with its own small lock. A lookup or mutation touches one shard; whole-registry reads go shard by shard,
+so a writer is only ever held up by the one shard being copied, never by the whole copy.
+- Sequence numbers are counter * N + shard index: they still sort in registration order across shards, and the shard a
+  cursor value belongs to is just seq % N.
+- page() asks every shard for its first `limit` entries after the cursor and keeps the `limit` smallest - O(N * limit),
+  independent of registry size. count() and len() add up the shards' counters (O(N), no locks - one int read each), and
+  get() is a single dict read without a lock.
+- Whole-registry reads (values(), page(), count()) are per-shard snapshots, not one atomic snapshot: a Task registered
+  or moved while they run may or may not show up. Queue still mutates the registry under Queue.lock (that lock orders the
+  WAL, the event feed and retention), so a reader that needs a snapshot consistent with those takes Queue.lock as well
+  (Queue.snapshot_jobs()).
+- 2026-10-17: All shards share one seq -> Task dict (each shard only ever writes its own seqs, under its own lock, and a
+  single dict read/write is atomic). page() used to look every seq up in its own shard's dict (a Python-level
+  `by_seq[seq % n]` per Task), which made a striped read several times slower than a 1-shard one; with one dict the
+  lookup is a C-level map() over dict.get for any N. The default is one stripe per CPU (capped at 16).
+"""
+
+IndexKey = tuple[Optional[TaskStatus], Optional[TaskType]]
+CHUNK: int = 512
+DEFAULT_SHARDS: int = min(16, os.cpu_count() or 1)
+
+class _SortedSeqs:
+    """
+    Minimal blocked sorted list of ints (same idea as sortedcontainers.SortedList, without the dependency).
+    """
+    def __init__(self) -> None:
+        self._chunks: list[list[int]] = []
+        self._maxes: list[int] = []
+        self._len: int = 0
+
+    def add(self, value: int) -> None:
+        self._len += 1
+        if not self._chunks:
+            self._chunks.append([value])
+            self._maxes.append(value)
+            return
+        i = bisect.bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            i -= 1
+            self._chunks[i].append(value)   # Fast path: new largest value (every fresh registration).
+        else:
+            bisect.insort(self._chunks[i], value)
+        chunk = self._chunks[i]
+        self._maxes[i] = chunk[-1]
+        if len(chunk) > 2 * CHUNK:
+            self._chunks[i:i + 1] = [chunk[:CHUNK], chunk[CHUNK:]]
+            self._maxes[i:i + 1] = [chunk[CHUNK - 1], chunk[-1]]
+
+    def discard(self, value: int) -> None:
+        i = bisect.bisect_left(self._maxes, value)
+        if i == len(self._maxes):
+            return
+        chunk = self._chunks[i]
+        j = bisect.bisect_left(chunk, value)
+        if j == len(chunk) or chunk[j] != value:
+            return
+        del chunk[j]
+        self._len -= 1
+        if chunk:
+            self._maxes[i] = chunk[-1]
+        else:
+            del self._chunks[i]
+            del self._maxes[i]
+
+    def after(self, after: Optional[int], limit: Optional[int]) -> tuple[list[int], bool]:
+        """
+        Up to `limit` values greater than `after` (all of them if after is None), and whether more remain past those.
+        """
+        i = 0 if after is None else bisect.bisect_right(self._maxes, after)
+        if i == len(self._chunks):
+            return [], False
+        j = 0 if after is None else bisect.bisect_right(self._chunks[i], after)
+        out: list[int] = []
+        while i < len(self._chunks):
+            chunk = self._chunks[i]
+            if limit is not None and len(out) + len(chunk) - j >= limit:
+                end = j + (limit - len(out))
+                out.extend(chunk[j:end])
+                return out, end < len(chunk) or i + 1 < len(self._chunks)
+            out.extend(chunk[j:])
+            i, j = i + 1, 0
+        return out, False
+
+    def __len__(self) -> int:
+        return self._len
+
+class _Shard:
+    """
+    t_id -> Task map plus ordered secondary indexes by status, type and creation order (one shard of JobRegistry - not
+    thread-safe on its own, JobRegistry holds `lock` around every call).
+    """
+
+    # 0. Constructor:
+    def __init__(self, by_seq: dict[int, Task]) -> None:
+        self.lock: Lock = Lock()
+        self._jobs: dict[str, Task] = {}
+        self._seq_of: dict[str, int] = {}
+        self.by_seq: dict[int, Task] = by_seq  # Shared by every shard (read without a lock by JobRegistry.page()).
+        self._indexes: dict[IndexKey, _SortedSeqs] = {}
+
+    # 1. Register under `seq` (idempotent for a Task that's already registered - retries re-enqueue the same object):
+    def add(self, task: Task, seq: int) -> None:
+        existing = self._jobs.get(task.t_id)
+        if existing is task:
+            return
+        if existing is not None:
+            self.remove(task.t_id)
+        self._jobs[task.t_id] = task
+        self._seq_of[task.t_id] = seq
+        self.by_seq[seq] = task
+        for key in self._keys(task.status, task.t_type):
+            self._index(key).add(seq)
+
+    # 2. Unregister:
+    def remove(self, t_id: str) -> Optional[Task]:
+        task = self._jobs.pop(t_id, None)
+        if task is None:
+            return None
+        seq = self._seq_of.pop(t_id)
+        del self.by_seq[seq]
+        for key in self._keys(task.status, task.t_type):
+            self._discard(key, seq)
+        return task
+
+    def clear(self) -> None:
+        for seq in self._seq_of.values():   # (Only this shard's seqs - the other shards share by_seq.)
+            del self.by_seq[seq]
+        self._jobs.clear()
+        self._seq_of.clear()
+        self._indexes.clear()
+
+    # 3. Keep the status indexes in sync (task.status has already been set to its new value):
+    def move(self, task: Task, old_status: TaskStatus) -> None:
+        seq = self._seq_of.get(task.t_id)
+        if seq is None or old_status == task.status or self._jobs.get(task.t_id) is not task:
+            return
+        for key in ((old_status, None), (old_status, task.t_type)):
+            self._discard(key, seq)
+        for key in ((task.status, None), (task.status, task.t_type)):
+            self._index(key).add(seq)
+
+    # 4. Sequence numbers of one filtered page in creation order (`after` = cursor), and whether more remain past them:
+    def page(self, status: Optional[TaskStatus], t_type: Optional[TaskType],
+             after: Optional[int], limit: Optional[int]) -> tuple[list[int], bool]:
+        index = self._indexes.get((status, t_type))
+        if index is None:
+            return [], False
+        return index.after(after, limit)
+
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        return len(self._indexes.get((status, t_type), ()))
+
+    def get(self, t_id: str) -> Optional[Task]:
+        return self._jobs.get(t_id)
+
+    def task_at(self, seq: int) -> Optional[Task]:
+        return self.by_seq.get(seq)
+
+    # Tasks in sequence order (_jobs is only ever appended to with this shard's new highest seq, so dict order is sorted):
+    def tasks(self) -> list[Task]:
+        return list(self._jobs.values())
+
+    def __len__(self) -> int:
+        return len(self._jobs)
+
+    # Helper methods:
+    @staticmethod
+    def _keys(status: TaskStatus, t_type: TaskType) -> tuple[IndexKey, ...]:
+        return (None, None), (status, None), (None, t_type), (status, t_type)
+
+    def _index(self, key: IndexKey) -> _SortedSeqs:
+        index = self._indexes.get(key)
+        if index is None:
+            index = self._indexes[key] = _SortedSeqs()
+        return index
+
+    def _discard(self, key: IndexKey, seq: int) -> None:
+        index = self._indexes.get(key)
+        if index is not None:
+            index.discard(seq)
+
+class JobRegistry:
+    """
+    Thread-safe t_id -> Task registry with status/type/creation-order indexes, striped over `shards` locks.
+    """
+
+    # 0. Constructor:
+    def __init__(self, shards: int = DEFAULT_SHARDS) -> None:
+        self._by_seq: dict[int, Task] = {}
+        self._shards: list[_Shard] = [_Shard(self._by_seq) for _ in range(shards)]
+        self._n: int = shards
+        self._counter = itertools.count()   # next() is atomic, so registering needs no lock beyond the Task's shard.
+
+    def _shard(self, t_id: str) -> _Shard:
+        return self._shards[hash(t_id) % self._n]
+
+    # 1. Register (idempotent for a Task that's already registered - retries re-enqueue the same object):
+    def add(self, task: Task) -> None:
+        i = hash(task.t_id) % self._n
+        shard = self._shards[i]
+        with shard.lock:
+            # Drawn under the shard lock, so within a shard seqs are registered in increasing order (see _Shard.tasks()):
+            shard.add(task, next(self._counter) * self._n + i)
+
+    # 2. Unregister:
+    def remove(self, t_id: str) -> Optional[Task]:
+        shard = self._shard(t_id)
+        with shard.lock:
+            return shard.remove(t_id)
+
+    def clear(self) -> None:
+        for shard in self._shards:
+            with shard.lock:
+                shard.clear()
+
+    # 3. Keep the status indexes in sync (task.status has already been set to its new value):
+    def move(self, task: Task, old_status: TaskStatus) -> None:
+        shard = self._shard(task.t_id)
+        with shard.lock:
+            shard.move(task, old_status)
+
+    # 4. One page of Tasks in creation order, optionally filtered. `after` is the cursor returned by the previous page:
+    def page(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int]]:
+        """
+        Each shard is asked for ~2x its fair share of the page (limit * 2 / N). A shard whose share ran out below the
+        page's cut-off (the limit-th smallest seq seen so far) might hold more entries that belong on the page, so only
+        those are asked again - usually none are, and a page costs N small reads instead of N full pages.
+        """
+        share = limit if limit is None or self._n == 1 else -(-limit * 2 // self._n)
+        runs: list[list[int]] = [[] for _ in self._shards]
+        cursors: list[Optional[int]] = [after] * self._n
+        has_more: list[bool] = [True] * self._n
+        pending = range(self._n)
+        while True:
+            for i in pending:
+                shard = self._shards[i]
+                with shard.lock:
+                    seqs, has_more[i] = shard.page(status, t_type, cursors[i], share)
+                if seqs:
+                    runs[i] += seqs
+                    cursors[i] = seqs[-1]
+            # Sorting the concatenated runs is a merge of already-sorted runs for timsort (C, no heapq.merge generator):
+            merged = sorted(itertools.chain.from_iterable(runs)) if self._n > 1 else runs[0]
+            if limit is None:
+                break
+            cutoff = merged[limit - 1] if len(merged) >= limit else None
+            pending = [i for i in range(self._n) if has_more[i] and (cutoff is None or cursors[i] < cutoff)]
+            if not pending:
+                break
+        more = any(has_more)
+        if limit is not None and len(merged) > limit:
+            merged, more = merged[:limit], True
+        # No shard lock for single dict lookups (each atomic on its own), and no Python-level call per Task:
+        tasks = [task for task in map(self._by_seq.get, merged) if task is not None]    # (None: removed since read.)
+        return tasks, merged[-1] if merged and more else None
+
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        return sum(shard.count(status, t_type) for shard in self._shards)
+
+    # Dict-style access (Queue.jobs used to be a dict). A point lookup is one dict read, atomic on its own - so, like
+    # ConcurrentHashMap.get(), it takes no lock at all (the hottest read, GET /api/jobs/{id}, never waits on a writer):
+    def get(self, t_id: str) -> Optional[Task]:
+        return self._shard(t_id).get(t_id)
+
+    # Every Task, copied one shard at a time. Shard by shard, NOT creation order across shards - merging 16 runs costs 10x
+    # the copy itself, and the callers (WAL compaction, tooling) don't care. page() is the ordered read:
+    def values(self) -> list[Task]:
+        out: list[Task] = []
+        for shard in self._shards:
+            with shard.lock:
+                out += shard.tasks()
+        return out
+
+    def __contains__(self, t_id: str) -> bool:
+        return self.get(t_id) is not None
+
+    def __len__(self) -> int:
+        return sum(len(shard) for shard in self._shards)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter([t.t_id for t in self.values()])
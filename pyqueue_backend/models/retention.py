@@ -0,0 +1,114 @@
+import gzip
+import json
+import os
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Optional
+
+from enums.TaskStatus import TaskStatus
+from models.journal import encode_task
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Retention policy for finished Tasks. Before this, nothing ever left Queue.jobs unless someone called DELETE /api/jobs/{id}
+or /api/clear, so COMPLETED/FAILED Tasks piled up forever and memory grew without bound.
+
+"Terminal" = COMPLETED, CANCELLED, or FAILED with no retries left (a FAILED Task with retries left is about to be re-enqueued).
+RetentionIndex keeps every terminal Task in the order it became terminal (an OrderedDict t_id -> monotonic timestamp).
+Because the TTL is the same for every Task, that order *is* expiry order, so:
+- tracking / untracking a Task is O(1) (append / pop by key - a retried or deleted Task just drops out),
+- the next Task to expire (by age or by count) is always the first entry, so eviction is O(evicted), never a scan.
+Like JobRegistry, it isn't thread-safe on its own - Queue only touches it while holding Queue.lock.
+
+Evicted Tasks can optionally be spilled to TaskArchive: gzip'd JSON lines (same compact record format as the WAL), appended
+outside Queue.lock.
+"""
+
+def is_terminal(task: Task) -> bool:
+    return task.status in (TaskStatus.COMPLETED, TaskStatus.CANCELLED) or (
+        task.status == TaskStatus.FAILED and task.attempts >= task.max_retries
+    )
+
+class RetentionIndex:
+    """
+    Terminal Tasks in expiry order + eviction counters.
+    """
+
+    # 0. Constructor (max_terminal / ttl of None mean "no limit"):
+    def __init__(self, max_terminal: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        self.max_terminal = max_terminal
+        self.ttl = ttl
+        self._terminal: OrderedDict[str, float] = OrderedDict()
+        self.evicted: dict[str, int] = {"count": 0, "ttl": 0}     # Eviction totals by reason.
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_terminal is not None or self.ttl is not None
+
+    # 1. Keep the index in sync with a Task's status (call after every status change / re-enqueue):
+    def update(self, task: Task) -> None:
+        if is_terminal(task):
+            if task.t_id not in self._terminal:
+                self._terminal[task.t_id] = time.monotonic()
+        else:
+            self._terminal.pop(task.t_id, None)
+
+    def discard(self, t_id: str) -> None:
+        self._terminal.pop(t_id, None)
+
+    def clear(self) -> None:
+        self._terminal.clear()
+
+    # 2. IDs that are due for eviction right now (over the count limit first, then expired), removed from the index:
+    def expired(self, now: Optional[float] = None) -> list[str]:
+        out: list[str] = []
+        if self.max_terminal is not None:
+            while len(self._terminal) > self.max_terminal:
+                out.append(self._terminal.popitem(last=False)[0])
+            self.evicted["count"] += len(out)
+        if self.ttl is not None and self._terminal:
+            cutoff = (time.monotonic() if now is None else now) - self.ttl
+            aged = 0
+            while self._terminal:
+                t_id, at = next(iter(self._terminal.items()))
+                if at > cutoff:
+                    break
+                self._terminal.popitem(last=False)
+                out.append(t_id)
+                aged += 1
+            self.evicted["ttl"] += aged
+        return out
+
+    def __len__(self) -> int:
+        return len(self._terminal)
+
+class TaskArchive:
+    """
+    Append-only gzip'd JSON-lines file of evicted Tasks (one encode_task() record per line; read back with gzip.open()).
+    """
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._lock: Lock = Lock()
+        self._file = gzip.open(path, "ab")  # Each open appends a new gzip member - gzip.open() reads them as one stream.
+        self.archived: int = 0
+
+    def write(self, tasks: list[Task]) -> None:
+        if not tasks:
+            return
+        data = b"".join(json.dumps(encode_task(t), separators=(",", ":")).encode() + b"\n" for t in tasks)
+        with self._lock:
+            if self._file.closed:
+                return
+            self._file.write(data)
+            self._file.flush()
+            self.archived += len(tasks)
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
@@ -0,0 +1,22 @@
+import random
+from dataclasses import dataclass
+
+"""
+2026-10-17-NOTE:
+Retry backoff. Worker used to call queue.enqueue(task) the moment an attempt failed, so FAIL/FAILABS Tasks went straight
+back into the ready queue and spun through worker slots in a tight loop. Now a failed attempt is retried after
+    min(max_delay, base_delay * multiplier ** (attempts - 1))
+minus a random share of up to `jitter` of that (so Tasks that failed together don't all come back in the same instant).
+Policies are per TaskType (QueueConfig.type_retry_base_delay / type_retry_max_delay override the defaults).
+"""
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    base_delay: float = 1.0     # Seconds before the first retry.
+    max_delay: float = 30.0     # Cap on any single delay.
+    multiplier: float = 2.0
+    jitter: float = 0.5     # 0 = exact exponential delays, 1 = "full jitter" (anywhere between 0 and the delay).
+
+    def delay(self, attempts: int) -> float:
+        delay = min(self.max_delay, self.base_delay * self.multiplier ** max(0, attempts - 1))
+        return delay * (1.0 - self.jitter * random.random())
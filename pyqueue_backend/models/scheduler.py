@@ -0,0 +1,424 @@
+import heapq
+import itertools
+import time
+from threading import Condition, Lock
+from typing import Optional
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.ratelimit import RateMeter, TokenBucket
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Before this file existed, Queue.enqueue() handed every Task straight to ThreadPoolExecutor.submit(), which meant
+dispatch order was whatever the executor's internal FIFO said it was. A burst of TAKESLONG jobs would sit in front of
+every SMS job that arrived after it, and there was no way to express "this one first".
+
+The Scheduler sits between enqueue() and the workers. Workers now *pull* from it instead of being pushed into the
+executor's opaque queue:
+- Each TaskType has its own heap-backed ready queue, ordered by (priority DESC, arrival ASC).
+- Across TaskTypes, dispatch is weighted-fair using stride scheduling: every type carries a "pass" value, the non-empty
+type with the lowest pass is served next, and serving it advances its pass by (cost / weight). Cost is the type's observed
+runtime (an EWMA fed back by Queue after each run), so fairness is in *worker time* and not in dispatch count: one 10s
+TAKESLONG job "pays" for ten 1s SMS jobs. A type with weight 4 gets ~4x the worker time of a type with weight 1.
+- A type that was idle re-joins at the current virtual time, so it can't bank credit while empty and then starve everyone.
+- Every TaskType belongs to a "lane" (the execution backend that consumes it, e.g. "thread" or "process"). Each lane has its
+own Condition over the one shared Lock, so a push only wakes consumers of that lane and pop(lane=...) only ever sees its types.
+
+2026-10-17: Admission control. With max_depth / type_max_depth set, new work has to be admitted first (admit()): it
+reserves room for the Tasks under the same lock that guards the heaps, so concurrent producers can never overshoot a limit
+between "check" and "push". A reservation is turned into a real entry by push(..., admitted=True). Producers that are
+allowed to wait block on a separate _space Condition, which pop() only signals when somebody is actually waiting.
+
+2026-10-17: Cancellation. discard() takes a queued Task out right away (its depth / admission room is freed immediately)
+without an O(n) heap removal: heap entries are small lists, and discarding just blanks the entry's Task slot - pop() skips
+blank entries when it reaches them. Per-type live counts (_count) are what "is this type non-empty" means now, since a
+heap may still hold blank entries.
+
+2026-10-17: Per-type rate limits (token buckets, see models/ratelimit.py) and concurrency caps. A type that is over its
+limit is simply skipped by pop() - its Tasks stay parked in their heap, no worker thread is tied up waiting on them, and
+the other types in the lane keep being served. If *everything* queued in a lane is over its limit, pop() waits on the
+lane Condition until the earliest bucket has a token again (or a capped type gets a done() back). Limits can be changed
+at runtime with set_limits(). Per type we also count dispatches, throughput, and how often it hit its limit with work waiting.
+
+2026-10-17: Micro-batching (see models/handlers.py). pop_more() lets the worker that just popped a Task take more of the same
+type in one go. Each extra Task is accounted exactly like a pop() (stride pass, tokens, concurrency slot - so done() once per
+Task), and collection stops early at the type's rate limit / concurrency cap.
+"""
+
+DEFAULT_COST: float = 1.0  # Cost (seconds) charged for a type before any runtime has been observed for it.
+EWMA_ALPHA: float = 0.2
+DEFAULT_LANE: str = "thread"
+
+class Scheduler:
+    """
+    Priority-aware, weighted-fair ready queue for Tasks (one heap per TaskType).
+    Thread-safe: push() from producers, pop() from worker threads.
+    """
+
+    # 0. Constructor:
+    def __init__(self, weights: Optional[dict[TaskType, int]] = None, lanes: Optional[dict[TaskType, str]] = None,
+                 max_depth: Optional[int] = None, type_max_depth: Optional[dict[TaskType, int]] = None) -> None:
+        weights = weights or {}
+        lanes = lanes or {}
+        self._heaps: dict[TaskType, list[list]] = {t: [] for t in TaskType}   # Entries: [-priority, seq, Task or None].
+        self._count: dict[TaskType, int] = {t: 0 for t in TaskType}     # Live (non-discarded) entries per type.
+        self._entries: dict[str, list] = {}     # t_id -> its heap entry, for discard().
+        self._weights: dict[TaskType, int] = {t: max(1, weights.get(t, 1)) for t in TaskType}
+        self._pass: dict[TaskType, float] = {t: 0.0 for t in TaskType}
+        self._cost: dict[TaskType, float] = {}   # EWMA runtime per type (only types that have completed at least once).
+        self._vtime: float = 0.0    # Pass value of the most recently served type (the scheduler's "virtual clock").
+        self._seq = itertools.count()   # Tie-breaker so equal priorities stay FIFO (and Tasks never get compared).
+        self._lane_of: dict[TaskType, str] = {t: lanes.get(t, DEFAULT_LANE) for t in TaskType}
+        self._lane_types: dict[str, tuple[TaskType, ...]] = {DEFAULT_LANE: ()}
+        for t, lane in self._lane_of.items():
+            self._lane_types[lane] = self._lane_types.get(lane, ()) + (t,)
+        self._lane_size: dict[str, int] = {lane: 0 for lane in self._lane_types}
+        self._closed: bool = False
+        self._lock: Lock = Lock()
+        self._conds: dict[str, Condition] = {lane: Condition(self._lock) for lane in self._lane_types}
+        # Admission control (None = unlimited):
+        self.max_depth: Optional[int] = max_depth
+        self.type_max_depth: dict[TaskType, int] = dict(type_max_depth or {})
+        self._size: int = 0     # Tasks in all heaps.
+        self._reserved: dict[TaskType, int] = {t: 0 for t in TaskType}
+        self._reserved_total: int = 0
+        self._space: Condition = Condition(self._lock)
+        self._space_waiters: int = 0
+        self._idle: Condition = Condition(self._lock)   # 2026-10-17: wait_idle() - notified by done() once closed.
+        self.rejected: dict[TaskType, int] = {t: 0 for t in TaskType}
+        # Throttling (types without an entry are unlimited):
+        self._buckets: dict[TaskType, TokenBucket] = {}
+        self._max_running: dict[TaskType, int] = {}
+        self._running: dict[TaskType, int] = {t: 0 for t in TaskType}   # Popped and not done() yet.
+        self._parked: set[TaskType] = set()     # Types currently skipped because of their limit.
+        self.throttled: dict[TaskType, int] = {t: 0 for t in TaskType}  # Times a type hit its limit with Tasks queued.
+        self.dispatched: dict[TaskType, int] = {t: 0 for t in TaskType}
+        self._throughput: dict[TaskType, RateMeter] = {t: RateMeter() for t in TaskType}
+
+    # 1. Add a Task to its type's ready queue:
+    def push(self, task: Task, admitted: bool = False) -> None:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._push_locked(task, admitted)
+            self._conds[self._lane_of[task.t_type]].notify()
+
+    # 1b. Add many Tasks under one lock acquisition (bulk enqueue):
+    def push_many(self, tasks: list[Task], admitted: bool = False) -> None:
+        woken: dict[str, int] = {}
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            for task in tasks:
+                self._push_locked(task, admitted)
+                lane = self._lane_of[task.t_type]
+                woken[lane] = woken.get(lane, 0) + 1
+            for lane, count in woken.items():
+                self._conds[lane].notify(count)
+
+    def _push_locked(self, task: Task, admitted: bool) -> None:
+        t_type = task.t_type
+        if admitted:
+            self._reserved[t_type] -= 1
+            self._reserved_total -= 1
+        if not self._count[t_type]:
+            self._pass[t_type] = max(self._pass[t_type], self._vtime)
+        entry = [-task.priority, next(self._seq), task]
+        heapq.heappush(self._heaps[t_type], entry)
+        self._entries[task.t_id] = entry
+        self._count[t_type] += 1
+        self._lane_size[self._lane_of[t_type]] += 1
+        self._size += 1
+
+    # 2. Take the next Task for a lane (blocks until one is ready, the timeout expires, or the scheduler is closed and drained).
+    # Every Task returned here must be handed back with done() once its attempt is over:
+    def pop(self, timeout: Optional[float] = None, lane: str = DEFAULT_LANE) -> Optional[Task]:
+        cond = self._conds[lane]
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with cond:
+            while True:
+                while self._lane_size[lane] == 0:
+                    if self._closed:
+                        return None
+                    if not cond.wait(timeout):
+                        return None
+                now = time.monotonic()
+                t_type = self._next_type(lane, now)
+                if t_type is None:
+                    # Everything queued here is over its limit. Park until a token is due / a capped type frees a slot.
+                    # (Once closed, keep waiting past the timeout - the parked Tasks still have to drain.)
+                    wait = self._throttle_wait(lane, now)
+                    if deadline is not None and not self._closed:
+                        if now >= deadline:
+                            return None
+                        wait = deadline - now if wait is None else min(wait, deadline - now)
+                    cond.wait(wait)
+                    continue
+                task = self._take(t_type, now)
+                if task is not None:
+                    return task
+
+    # 2d. 2026-10-17: Micro-batching - right after pop() returned a Task of `t_type`, take up to `limit` more of that type,
+    # waiting up to `wait` seconds for them to arrive. Returns early when the type hits its limits or the scheduler closes:
+    def pop_more(self, t_type: TaskType, limit: int, wait: float = 0.0) -> list[Task]:
+        lane = self._lane_of[t_type]
+        cond = self._conds[lane]
+        deadline = time.monotonic() + wait
+        tasks: list[Task] = []
+        with cond:
+            while len(tasks) < limit:
+                now = time.monotonic()
+                if self._over_limit(t_type, now):
+                    break
+                if self._count[t_type]:
+                    task = self._take(t_type, now)
+                    if task is not None:
+                        tasks.append(task)
+                    continue
+                if self._closed or now >= deadline:
+                    break
+                if self._next_type(lane, now) is not None:
+                    cond.notify()   # Woken by another type's push - pass the wakeup on to a worker that will take it.
+                cond.wait(deadline - now)
+        return tasks
+
+    # Caller holds self._lock and has seen `t_type` non-empty. Takes its next Task and accounts for the dispatch (None if
+    # that Task turned out to be cancelled):
+    def _take(self, t_type: TaskType, now: float) -> Optional[Task]:
+        heap = self._heaps[t_type]
+        task = heapq.heappop(heap)[2]
+        while task is None:     # Skip entries blanked by discard().
+            task = heapq.heappop(heap)[2]
+        self._unlink(task)
+        if task.status is TaskStatus.CANCELLED:
+            # Cancelled after it was pushed but discard() didn't find it (cancel raced the push) - drop it here.
+            if self._space_waiters:
+                self._space.notify_all()
+            return None
+        self._vtime = self._pass[t_type]
+        self._pass[t_type] += self._cost.get(t_type, DEFAULT_COST) / self._weights[t_type]
+        bucket = self._buckets.get(t_type)
+        if bucket is not None:
+            bucket.try_take(now)
+        self._parked.discard(t_type)
+        self._running[t_type] += 1
+        self.dispatched[t_type] += 1
+        if self._space_waiters:
+            self._space.notify_all()
+        return task
+
+    # Lowest-pass non-empty type of the lane that is within its limits (None = nothing can run right now):
+    def _next_type(self, lane: str, now: float) -> Optional[TaskType]:
+        best: Optional[TaskType] = None
+        for t in self._lane_types[lane]:
+            if not self._count[t]:
+                continue
+            if self._over_limit(t, now):
+                if t not in self._parked:
+                    self._parked.add(t)
+                    self.throttled[t] += 1
+                continue
+            if best is None or self._pass[t] < self._pass[best]:
+                best = t
+        return best
+
+    def _over_limit(self, t_type: TaskType, now: float) -> bool:
+        cap = self._max_running.get(t_type)
+        if cap is not None and self._running[t_type] >= cap:
+            return True
+        bucket = self._buckets.get(t_type)
+        return bucket is not None and bucket.available(now) < 1.0
+
+    # Seconds until the first rate-limited type in the lane gets a token back (None = only capped types are waiting):
+    def _throttle_wait(self, lane: str, now: float) -> Optional[float]:
+        waits = [self._buckets[t].wait_time(now) for t in self._lane_types[lane] if self._count[t] and t in self._buckets
+                 and self._running[t] < self._max_running.get(t, self._running[t] + 1)]
+        return min(waits) if waits else None
+
+    # 2c. An attempt of a popped Task is over (whatever its outcome) - frees its concurrency slot:
+    def done(self, t_type: TaskType) -> None:
+        with self._lock:
+            self._running[t_type] -= 1
+            if t_type in self._max_running and self._count[t_type]:
+                self._conds[self._lane_of[t_type]].notify()
+            if self._closed:
+                self._idle.notify_all()
+    # 2a. Take a queued Task back out (cancellation). Returns False if it wasn't queued here:
+    def discard(self, task: Task) -> bool:
+        with self._lock:
+            entry = self._entries.get(task.t_id)
+            if entry is None or entry[2] is not task:
+                return False
+            entry[2] = None
+            self._unlink(task)
+            if not self._count[task.t_type]:
+                self._heaps[task.t_type].clear()    # Only blank entries left - drop them now.
+            if self._space_waiters:
+                self._space.notify_all()
+            return True
+
+    def _unlink(self, task: Task) -> None:
+        lane = self._lane_of[task.t_type]
+        self._entries.pop(task.t_id, None)
+        self._count[task.t_type] -= 1
+        self._lane_size[lane] -= 1
+        self._size -= 1
+        if self._closed and not self._lane_size[lane]:
+            self._conds[lane].notify_all()  # Drained - release consumers still parked on a throttled type.
+
+    # 2b. Admission control - reserve room for `counts` new Tasks per type, all or nothing. Waits up to `timeout` seconds
+    # for room (0 = don't wait, None = wait forever); returns False (and counts a rejection) if it never fits:
+    def admit(self, counts: dict[TaskType, int], timeout: Optional[float] = 0) -> bool:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._lock:
+            while not self._fits(counts):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if self._closed or (remaining is not None and remaining <= 0) or not self._could_ever_fit(counts):
+                    for t, n in counts.items():
+                        self.rejected[t] += n
+                    return False
+                self._space_waiters += 1
+                try:
+                    self._space.wait(remaining)
+                finally:
+                    self._space_waiters -= 1
+            for t, n in counts.items():
+                self._reserved[t] += n
+                self._reserved_total += n
+            return True
+
+    # Give back a reservation that won't be pushed after all:
+    def release(self, counts: dict[TaskType, int]) -> None:
+        with self._lock:
+            for t, n in counts.items():
+                self._reserved[t] -= n
+                self._reserved_total -= n
+            if self._space_waiters:
+                self._space.notify_all()
+
+    @property
+    def limited(self) -> bool:
+        return self.max_depth is not None or bool(self.type_max_depth)
+
+    def _fits(self, counts: dict[TaskType, int]) -> bool:
+        if self.max_depth is not None and self._size + self._reserved_total + sum(counts.values()) > self.max_depth:
+            return False
+        for t, n in counts.items():
+            limit = self.type_max_depth.get(t)
+            if limit is not None and self._count[t] + self._reserved[t] + n > limit:
+                return False
+        return True
+
+    def _could_ever_fit(self, counts: dict[TaskType, int]) -> bool:
+        # A batch bigger than the limit itself would wait forever - reject it right away.
+        if self.max_depth is not None and sum(counts.values()) > self.max_depth:
+            return False
+        return all(n <= self.type_max_depth.get(t, n) for t, n in counts.items())
+
+    # 3. Feed back how long a Task of this type actually ran (keeps the per-type cost estimate current):
+    def record_runtime(self, t_type: TaskType, seconds: float) -> None:
+        with self._lock:
+            prev = self._cost.get(t_type)
+            self._cost[t_type] = seconds if prev is None else prev + EWMA_ALPHA * (seconds - prev)
+            self._throughput[t_type].mark(time.monotonic())
+
+    # 4. Stop accepting work. Workers keep popping until the ready queues are drained, then pop() returns None:
+    def close(self) -> None:
+        with self._lock:
+            self._closed = True
+            for cond in self._conds.values():
+                cond.notify_all()
+            self._space.notify_all()
+
+    # Closed with nothing left queued in `lane` - pop(lane=lane) will only ever return None from now on:
+    def drained(self, lane: str = DEFAULT_LANE) -> bool:
+        with self._lock:
+            return self._closed and not self._lane_size[lane]
+
+    # 4b. 2026-10-17: Drain (Queue.shutdown() with a grace period) - take every queued Task out at once, so workers stop
+    # picking up new work. They stay QUEUED in the registry and are handed off instead:
+    def take_all(self) -> list[Task]:
+        with self._lock:
+            tasks = [entry[2] for heap in self._heaps.values() for entry in heap if entry[2] is not None]
+            for heap in self._heaps.values():
+                heap.clear()
+            self._entries.clear()
+            self._count = {t: 0 for t in TaskType}
+            self._lane_size = {lane: 0 for lane in self._lane_types}
+            self._size = 0
+            if self._space_waiters:
+                self._space.notify_all()
+        return tasks
+
+    # 4c. Wait (once closed) until no popped Task is still running - False if the timeout ran out first:
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        with self._lock:
+            return self._idle.wait_for(lambda: not any(self._running.values()), timeout)
+
+    # Helper methods:
+    def depth(self, lane: Optional[str] = None) -> int:
+        with self._lock:
+            return self._size if lane is None else self._lane_size[lane]
+
+    def depth_by_type(self) -> dict[TaskType, int]:
+        with self._lock:
+            return dict(self._count)
+
+    def cost_of(self, t_type: TaskType) -> float:
+        with self._lock:
+            return self._cost.get(t_type, DEFAULT_COST)
+
+    def lane_of(self, t_type: TaskType) -> str:
+        return self._lane_of[t_type]
+
+    def set_weight(self, t_type: TaskType, weight: int) -> None:
+        with self._lock:
+            self._weights[t_type] = max(1, weight)
+
+    # 2026-10-17: Replace a type's throttling limits at runtime (None = unlimited). A fresh bucket starts full:
+    def set_limits(self, t_type: TaskType, rate: Optional[float] = None, burst: Optional[float] = None,
+                   max_concurrency: Optional[int] = None) -> None:
+        with self._lock:
+            if rate is None:
+                self._buckets.pop(t_type, None)
+            else:
+                self._buckets[t_type] = TokenBucket(rate, burst, time.monotonic())
+            if max_concurrency is None:
+                self._max_running.pop(t_type, None)
+            else:
+                self._max_running[t_type] = max_concurrency
+            self._conds[self._lane_of[t_type]].notify_all()    # Looser limits may let parked Tasks run now.
+
+    # Queued Tasks of a lane that could start right now (what the autoscaler sizes the pool for - parked Tasks don't count):
+    def runnable_depth(self, lane: str = DEFAULT_LANE) -> int:
+        now = time.monotonic()
+        with self._lock:
+            total = 0
+            for t in self._lane_types[lane]:
+                n = self._count[t]
+                cap = self._max_running.get(t)
+                if cap is not None:
+                    n = min(n, max(0, cap - self._running[t]))
+                bucket = self._buckets.get(t)
+                if bucket is not None:
+                    n = min(n, int(bucket.available(now)))
+                total += n
+            return total
+
+    def limit_stats(self) -> list[dict]:
+        now = time.monotonic()
+        with self._lock:
+            return [{
+                "t_type": t,
+                "rate": self._buckets[t].rate if t in self._buckets else None,
+                "burst": self._buckets[t].burst if t in self._buckets else None,
+                "max_concurrency": self._max_running.get(t),
+                "queued": self._count[t],
+                "running": self._running[t],
+                "parked": self._count[t] > 0 and self._over_limit(t, now),
+                "dispatched": self.dispatched[t],
+                "throttled": self.throttled[t],
+                "throughput": round(self._throughput[t].rate(now), 3),
+            } for t in TaskType]
@@ -0,0 +1,199 @@
+import sqlite3
+import time
+from threading import Lock
+from typing import Optional
+from urllib.parse import urlparse
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.broker import Broker, DONE, LEASED, READY
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+Broker on a single SQLite file (PYQUEUE_BROKER_URL=sqlite:///var/lib/pyqueue/broker.db for an absolute
+path, sqlite://broker.db for one relative to the working directory) - for several processes on one
+host (uvicorn --workers N, or a few queue processes next to each other) with nothing else to run. See models/broker.py
+for the lease/ack model.
+- One row per Task. `seq` (AUTOINCREMENT, never reused) is the creation order and the page() cursor.
+- Partial indexes cover exactly the hot queries: ready Tasks by (priority DESC, seq), leases by expiry.
+- A lease is one write transaction (BEGIN IMMEDIATE): expired leases go back to ready, then UPDATE ... RETURNING claims
+  the next `limit` due rows. Consumers check with a plain read first and skip the write lock when nothing is due, so
+  idle consumers polling don't fight over it.
+- WAL journal mode, so the API's reads never wait for a consumer's write. synchronous=NORMAL: a committed enqueue survives
+  a process crash; on power loss the last few transactions can be lost (same trade-off as PYQUEUE_WAL_FLUSH_INTERVAL).
+Needs SQLite 3.35+ for RETURNING (check python -c "import sqlite3; print(sqlite3.sqlite_version)").
+"""
+
+_COLUMNS: str = "seq, id, payload, type, status, attempts, max_retries, created_us, priority, run_at"
+_TERMINAL: str = "(status IN ('COMPLETED', 'CANCELLED') OR (status = 'FAILED' AND attempts >= max_retries))"
+_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS tasks (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    payload TEXT NOT NULL,
+    type TEXT NOT NULL,
+    status TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    max_retries INTEGER NOT NULL,
+    created_us INTEGER NOT NULL,
+    priority INTEGER NOT NULL,
+    run_at REAL NOT NULL,
+    state TEXT NOT NULL,
+    consumer TEXT,
+    lease_until REAL
+);
+CREATE INDEX IF NOT EXISTS tasks_ready ON tasks (priority DESC, seq) WHERE state = 'ready';
+CREATE INDEX IF NOT EXISTS tasks_leases ON tasks (lease_until) WHERE state = 'leased';
+CREATE INDEX IF NOT EXISTS tasks_consumer ON tasks (consumer) WHERE state = 'leased';
+CREATE INDEX IF NOT EXISTS tasks_status ON tasks (status, seq);
+CREATE INDEX IF NOT EXISTS tasks_type ON tasks (type, seq);
+CREATE INDEX IF NOT EXISTS tasks_status_type ON tasks (status, type, seq);
+"""
+
+def _task(row: tuple) -> Task:
+    _, t_id, payload, t_type, status, attempts, max_retries, created_us, priority, run_at = row
+    return Task(t_id=t_id, payload=payload, t_type=TaskType(t_type), status=TaskStatus(status), attempts=attempts,
+                max_retries=max_retries, created_us=created_us, priority=priority, run_at=run_at)
+
+def _filters(status: Optional[TaskStatus], t_type: Optional[TaskType]) -> tuple[list[str], list]:
+    where, args = [], []
+    if status is not None:
+        where.append("status = ?")
+        args.append(status.value)
+    if t_type is not None:
+        where.append("type = ?")
+        args.append(t_type.value)
+    return where, args
+
+class SQLiteBroker(Broker):
+    """
+    Broker on one SQLite file, shared by every process that opens it. One connection per broker, used under a lock.
+    """
+
+    # 0. Constructor:
+    def __init__(self, url: str) -> None:
+        parsed = urlparse(url)
+        self.path = parsed.netloc + parsed.path    # sqlite:///abs/path.db -> /abs/path.db, sqlite://rel.db -> rel.db
+        self._lock: Lock = Lock()
+        self._db = sqlite3.connect(self.path, timeout=10.0, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode = WAL")
+        self._db.execute("PRAGMA synchronous = NORMAL")
+        with self._lock:
+            self._db.executescript(_SCHEMA)
+
+    def submit(self, tasks: list[Task]) -> None:
+        rows = [(t.t_id, t.payload, t.t_type.value, t.status.value, t.attempts, t.max_retries, t.created_us, t.priority,
+                 t.run_at, READY) for t in tasks]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.executemany(
+                    "INSERT INTO tasks (id, payload, type, status, attempts, max_retries, created_us, priority, run_at, state)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+
+    def lease(self, consumer: str, limit: int, visibility: float) -> list[Task]:
+        now = time.time()
+        with self._lock:
+            # Cheap read first - most polls find nothing, and shouldn't take the database's write lock to learn that:
+            due = self._db.execute(
+                "SELECT EXISTS (SELECT 1 FROM tasks WHERE state = 'ready' AND run_at <= ?)"
+                " OR EXISTS (SELECT 1 FROM tasks WHERE state = 'leased' AND lease_until < ?)", (now, now)).fetchone()[0]
+            if not due:
+                return []
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute(
+                    "UPDATE tasks SET state = 'ready', consumer = NULL, lease_until = NULL"
+                    " WHERE state = 'leased' AND lease_until < ?", (now,))
+                rows = self._db.execute(
+                    f"UPDATE tasks SET state = 'leased', consumer = ?, lease_until = ? WHERE seq IN ("
+                    f"  SELECT seq FROM tasks WHERE state = 'ready' AND run_at <= ? ORDER BY priority DESC, seq LIMIT ?"
+                    f") RETURNING {_COLUMNS}", (consumer, now + visibility, now, limit)).fetchall()
+                self._db.execute("COMMIT")
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+        return [_task(r) for r in sorted(rows, key=lambda r: (-r[8], r[0]))]   # (RETURNING order isn't defined.)
+
+    def heartbeat(self, consumer: str, visibility: float) -> set[str]:
+        with self._lock:
+            self._db.execute("UPDATE tasks SET lease_until = ? WHERE state = 'leased' AND consumer = ?",
+                             (time.time() + visibility, consumer))
+            return {r[0] for r in self._db.execute(
+                "SELECT id FROM tasks WHERE state = 'leased' AND consumer = ?", (consumer,))}
+
+    def save(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, LEASED)
+
+    def ack(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, DONE)
+
+    def release(self, consumer: str, task: Task) -> bool:
+        return self._write(consumer, task, READY)
+
+    def _write(self, consumer: str, task: Task, state: str) -> bool:
+        keep = state == LEASED
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE tasks SET status = ?, attempts = ?, run_at = ?, state = ?,"
+                " consumer = CASE WHEN ? THEN consumer END, lease_until = CASE WHEN ? THEN lease_until END"
+                " WHERE id = ? AND state = 'leased' AND consumer = ?",
+                (task.status.value, task.attempts, task.run_at, state, keep, keep, task.t_id, consumer))
+            return cur.rowcount > 0
+
+    def cancel(self, t_id: str) -> bool:
+        with self._lock:
+            cur = self._db.execute(
+                f"UPDATE tasks SET status = 'CANCELLED', state = 'done', consumer = NULL, lease_until = NULL"
+                f" WHERE id = ? AND NOT {_TERMINAL}", (t_id,))
+            return cur.rowcount > 0
+
+    def delete(self, t_id: str) -> bool:
+        with self._lock:
+            return self._db.execute("DELETE FROM tasks WHERE id = ?", (t_id,)).rowcount > 0
+
+    def clear(self) -> None:
+        with self._lock:
+            self._db.execute("DELETE FROM tasks")
+
+    def get(self, t_id: str) -> Optional[Task]:
+        with self._lock:
+            row = self._db.execute(f"SELECT {_COLUMNS} FROM tasks WHERE id = ?", (t_id,)).fetchone()
+        return _task(row) if row is not None else None
+
+    def page(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None,
+             after: Optional[int] = None, limit: Optional[int] = None) -> tuple[list[Task], Optional[int]]:
+        where, args = _filters(status, t_type)
+        if after is not None:
+            where.append("seq > ?")
+            args.append(after)
+        sql = f"SELECT {_COLUMNS} FROM tasks" + (" WHERE " + " AND ".join(where) if where else "") + " ORDER BY seq"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit + 1)  # One extra row says whether there's a next page.
+        with self._lock:
+            rows = self._db.execute(sql, args).fetchall()
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            return [_task(r) for r in rows], rows[-1][0]
+        return [_task(r) for r in rows], None
+
+    def count(self, status: Optional[TaskStatus] = None, t_type: Optional[TaskType] = None) -> int:
+        where, args = _filters(status, t_type)
+        with self._lock:
+            return self._db.execute(
+                "SELECT COUNT(*) FROM tasks" + (" WHERE " + " AND ".join(where) if where else ""), args).fetchone()[0]
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            counts = dict(self._db.execute("SELECT state, COUNT(*) FROM tasks GROUP BY state").fetchall())
+        return {s: counts.get(s, 0) for s in (READY, LEASED, DONE)}
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -1,10 +1,41 @@
 import datetime
 import time
 from dataclasses import dataclass
+from typing import Optional
 from enums.TaskStatus import TaskStatus
 from enums.TaskType import TaskType
+from models.ids import new_id
 
-@dataclass
+"""
+2026-10-17-NOTE:
+Task is now a slotted dataclass with an integer timestamp. With millions of retained Tasks, the per-instance __dict__ and
+the datetime object were most of each Task's footprint (see benchmarks/bench_task_memory.py for the before/after):
+- slots=True: attributes live in fixed slots, no per-instance __dict__.
+- created_us (epoch microseconds, an int) replaces the stored datetime; created_at is still there as a read-only property
+  returning the same naive local datetime as before, so task_to_response() / the API contract / the WAL format don't change.
+- Task.create() shares one string object between Tasks with identical payloads (bounded table, see intern_payload()).
+"""
+
+PAYLOAD_INTERN_SIZE: int = 4096
+_payloads: dict[str, str] = {}
+
+def intern_payload(payload: str) -> str:
+    """
+    Returns a previously seen, equal payload string if there is one (so N Tasks with the same payload hold one string).
+    The table is just dropped when it fills up - unlike sys.intern(), it can't grow without bound on unique payloads.
+    """
+    shared = _payloads.get(payload)
+    if shared is not None:
+        return shared
+    if len(_payloads) >= PAYLOAD_INTERN_SIZE:
+        _payloads.clear()
+    _payloads[payload] = payload
+    return payload
+
+def to_epoch_us(dt: datetime.datetime) -> int:
+    return int(dt.replace(microsecond=0).timestamp()) * 1_000_000 + dt.microsecond
+
+@dataclass(slots=True)
 class Task:
     t_id: str
     payload: str
@@ -12,7 +43,15 @@ class Task:
     status: TaskStatus
     attempts: int
     max_retries: int
-    created_at: datetime.datetime
+    created_us: int     # 2026-10-17: Creation time as epoch microseconds (was created_at: datetime.datetime - see created_at below).
+    priority: int = 0   # Higher runs first within a TaskType (see models/scheduler.py).
+    run_at: float = 0.0     # 2026-10-17: Epoch seconds before which the Task must not start (0 = right away) - see models/timer.py.
+    enqueued_at: float = 0.0    # time.perf_counter() stamp set by Queue.enqueue() - used to measure queue-wait.
+    depends_on: Optional[tuple[str, ...]] = None    # 2026-10-17: IDs of Tasks that must complete first (see models/dag.py).
+
+    @property
+    def created_at(self) -> datetime.datetime:
+        return datetime.datetime.fromtimestamp(self.created_us // 1_000_000).replace(microsecond=self.created_us % 1_000_000)
 
     """
     2026-01-31-NOTE:
@@ -26,15 +65,19 @@ class Task:
     so Task won't yet exist as a fully bound name -- that's why you need to do "Task", that's the workaround basically).
     """
     @classmethod
-    def create(cls, payload: str, t_type: TaskType) -> "Task":
+    def create(cls, payload: str, t_type: TaskType, priority: int = 0, run_at: float = 0.0,
+               depends_on: Optional[tuple[str, ...]] = None) -> "Task":
         return cls(
-            t_id=f"Task-{time.perf_counter_ns()}",
-            payload=payload,
+            t_id=new_id(),   # 2026-10-17: Was f"Task-{time.perf_counter_ns()}" - unique across processes now (see models/ids.py).
+            payload=intern_payload(payload),
             t_type=t_type,
             status=TaskStatus.QUEUED,
             attempts=0,
             max_retries=3,
-            created_at=datetime.datetime.now(),
+            created_us=time.time_ns() // 1_000,
+            priority=priority,
+            run_at=run_at,
+            depends_on=depends_on or None,
         )
 
 # Phase 1-2 (pre-@dataclass introduction) legacy code:
@@ -0,0 +1,83 @@
+import heapq
+import itertools
+import logging
+import time
+from threading import Condition, Thread
+from typing import Callable
+
+from models.task import Task
+
+"""
+2026-10-17-NOTE:
+One thread that holds every Task whose run_at is in the future (delayed retries and Tasks scheduled for later) and hands
+each one to `dispatch` once it is due. Pending Tasks are just entries in a heap ordered by run_at - no threading.Timer per
+Task - so 100k pending retries cost a heap of 100k tuples and one sleeping thread. Scheduling is O(log n); the thread only
+wakes for the earliest deadline (and when a new Task goes in front of it), then releases everything that's due at once.
+(A hierarchical timer wheel would make scheduling O(1), but at these sizes heapq's C implementation is cheaper than a
+wheel written in Python.)
+run_at is wall-clock time (time.time()) because it is persisted in the WAL and has to mean the same thing after a restart.
+"""
+
+log = logging.getLogger("pyqueue.queue")
+
+class TimerQueue:
+    """
+    Delay queue: schedule(task) now, dispatch(task) at task.run_at.
+    """
+
+    # 0. Constructor:
+    def __init__(self, dispatch: Callable[[Task], None]) -> None:
+        self._dispatch = dispatch
+        self._heap: list[tuple[float, int, Task]] = []
+        self._seq = itertools.count()
+        self._cond: Condition = Condition()
+        self._closed: bool = False
+        self._thread: Thread = Thread(target=self._run, name="pyqueue-timer", daemon=True)
+        self._thread.start()
+
+    # 1. Schedule a Task for dispatch at task.run_at:
+    def schedule(self, task: Task) -> None:
+        self.schedule_many([task])
+
+    def schedule_many(self, tasks: list[Task]) -> None:
+        with self._cond:
+            head = self._heap[0][0] if self._heap else None
+            for task in tasks:
+                heapq.heappush(self._heap, (task.run_at, next(self._seq), task))
+            if head is None or self._heap[0][0] < head:
+                self._cond.notify()     # New earliest deadline - the timer thread has to re-arm.
+
+    # 2. Timer thread:
+    def _run(self) -> None:
+        while True:
+            due: list[Task] = []
+            with self._cond:
+                while not self._closed:
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    wait = self._heap[0][0] - time.time()
+                    if wait <= 0:
+                        break
+                    self._cond.wait(wait)
+                if self._closed:
+                    return
+                now = time.time()
+                while self._heap and self._heap[0][0] <= now:
+                    due.append(heapq.heappop(self._heap)[2])
+            for task in due:
+                try:
+                    self._dispatch(task)
+                except Exception as e:
+                    log.warning("Could not dispatch delayed task %s: %s", task.t_id, e, extra={"task_id": task.t_id})
+
+    def pending(self) -> int:
+        with self._cond:
+            return len(self._heap)
+
+    # 3. Stop the timer thread (Tasks still pending stay in the registry / WAL, they just aren't dispatched):
+    def close(self) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
@@ -0,0 +1,25 @@
+from typing import Optional
+from pydantic import BaseModel, Field
+
+from enums.TaskType import TaskType
+
+"""
+2026-10-17: API-facing view of per-type throttling (GET/PUT /api/limits). Built from Scheduler.limit_stats() like
+PoolStatusResponse is built from WorkerPool.stats().
+"""
+class TypeLimitsRequest(BaseModel):
+    rate: Optional[float] = Field(default=None, gt=0)   # Tasks started per second (None = unlimited).
+    burst: Optional[float] = Field(default=None, ge=1)  # Bucket size (None = one second's worth of `rate`).
+    max_concurrency: Optional[int] = Field(default=None, ge=1)  # Tasks of the type running at once (None = unlimited).
+
+class TypeLimitsResponse(BaseModel):
+    t_type: TaskType
+    rate: Optional[float]
+    burst: Optional[float]
+    max_concurrency: Optional[int]
+    queued: int
+    running: int
+    parked: bool    # Has queued Tasks that are held back by a limit right now.
+    dispatched: int     # Tasks started so far.
+    throttled: int  # Times the type hit its limit with Tasks waiting.
+    throughput: float   # Attempts finished per second (decaying ~10s average).
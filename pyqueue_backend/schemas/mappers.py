@@ -1,6 +1,43 @@
 
+import datetime
+import json
+from typing import Iterable, Iterator
+
+from models.events import JobEvent
 from models.task import Task
-from schemas.task import TaskResponse
+from schemas.task import TaskResponse, JobEventResponse
+
+try:
+    import orjson
+except ImportError:     # Optional (pip install orjson) - the stdlib encoder produces the same JSON, only slower.
+    orjson = None
+
+"""
+2026-10-17-NOTE:
+Fast path for job lists (GET /api/jobs, the /api/events snapshot). Going through task_to_response() meant one TaskResponse
+per Task, isoformat() on every created_at, then FastAPI validating the whole list again against response_model - every
+poll, for Tasks that mostly hadn't changed. task_to_json() instead returns the Task's TaskResponse as JSON bytes, cached:
+- The cache is keyed by Task ID and stamped with the fields that change after creation (status, attempts, priority,
+  run_at, depends_on - rewritten when a parent was a duplicate or didn't survive a handoff), so an entry is rebuilt exactly when the Task's state changed - no invalidation calls needed, and a broker's
+  fresh copy of an unchanged Task still hits.
+- Bounded like the payload table in models/task.py: dropped when it fills up (RESPONSE_CACHE_SIZE, configure_response_cache).
+- Encoded with orjson if it's installed, else json.dumps (same output).
+encode_tasks() then streams a list as JSON array chunks, so a 100k-Task response never exists as one big string.
+"""
+
+RESPONSE_CACHE_SIZE: int = 100_000
+STREAM_CHUNK: int = 1000    # Tasks per chunk yielded by encode_tasks().
+_json_cache: dict[str, tuple[tuple, bytes]] = {}
+
+def configure_response_cache(size: int) -> None:
+    global RESPONSE_CACHE_SIZE
+    RESPONSE_CACHE_SIZE = size
+    _json_cache.clear()
+
+def _dumps(obj: dict) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode()
 
 def task_to_response(task: Task) -> TaskResponse:
     return TaskResponse(
@@ -10,5 +47,59 @@ def task_to_response(task: Task) -> TaskResponse:
         status=task.status.value,
         attempts=task.attempts,
         max_retries=task.max_retries,
-        created_at=task.created_at.isoformat()
+        created_at=task.created_at.isoformat(),
+        priority=task.priority,
+        run_at=datetime.datetime.fromtimestamp(task.run_at).isoformat() if task.run_at else None,
+        depends_on=list(task.depends_on) if task.depends_on else None,
+    )
+
+# 2026-10-17: task_to_response(task), as JSON bytes (see the NOTE above):
+def task_to_json(task: Task) -> bytes:
+    stamp = (task.status, task.attempts, task.priority, task.run_at, task.depends_on)
+    cached = _json_cache.get(task.t_id)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+    body = _dumps({
+        "id": task.t_id,
+        "payload": task.payload,
+        "type": task.t_type.value,
+        "status": task.status.value,
+        "attempts": task.attempts,
+        "max_retries": task.max_retries,
+        "created_at": task.created_at.isoformat(),
+        "priority": task.priority,
+        "run_at": datetime.datetime.fromtimestamp(task.run_at).isoformat() if task.run_at else None,
+        "depends_on": list(task.depends_on) if task.depends_on else None,
+    })
+    if RESPONSE_CACHE_SIZE:
+        if len(_json_cache) >= RESPONSE_CACHE_SIZE:
+            _json_cache.clear()
+        _json_cache[task.t_id] = (stamp, body)
+    return body
+
+# A list of Tasks as a JSON array, in chunks of STREAM_CHUNK Tasks:
+def encode_tasks(tasks: Iterable[Task]) -> Iterator[bytes]:
+    sep = b"["
+    chunk: list[bytes] = []
+    for task in tasks:
+        chunk.append(task_to_json(task))
+        if len(chunk) == STREAM_CHUNK:
+            yield sep + b",".join(chunk)
+            sep, chunk = b",", []
+    if chunk or sep == b"[":
+        yield sep + b",".join(chunk) + b"]"
+    else:
+        yield b"]"
+
+# 2026-10-17: Same mapping for a JobEvent, using the status/attempts captured when the event was published:
+def event_to_response(event: JobEvent) -> JobEventResponse:
+    task = event.task
+    if task is None:
+        return JobEventResponse(seq=event.seq, kind=event.kind)
+    body = None
+    if event.kind not in ("deleted", "evicted"):
+        body = task_to_response(task).model_copy(update={"status": event.status.value, "attempts": event.attempts})
+    return JobEventResponse(
+        seq=event.seq, kind=event.kind, id=task.t_id, task=body,
+        old_status=event.old_status.value if event.old_status is not None else None,
     )
@@ -0,0 +1,26 @@
+from typing import Optional
+from pydantic import BaseModel
+
+"""
+2026-10-17: API-facing view of the worker pool (GET /api/pool). Like TaskResponse, this is a DTO only -
+WorkerPool.stats() builds a plain dict and the route validates it into this shape.
+"""
+class PoolResizeEvent(BaseModel):
+    at: str     # ISO-8601 timestamp
+    from_size: int
+    to_size: int
+    reason: str
+
+class PoolStatusResponse(BaseModel):
+    size: int
+    busy: int
+    idle: int
+    min_workers: int
+    max_workers: int
+    queue_depth: int
+    avg_task_seconds: Optional[float]
+    resize_events: list[PoolResizeEvent]
+    delayed: int = 0    # 2026-10-17: Tasks waiting for their run_at (backing-off retries + scheduled Tasks).
+    blocked: int = 0    # 2026-10-17: Tasks waiting for the Tasks they depend on to complete.
+    max_depth: Optional[int] = None     # 2026-10-17: Admission control - global queue depth limit (None = unlimited)...
+    rejected: int = 0   # ...and how many new Tasks have been turned away so far.
@@ -0,0 +1,18 @@
+from typing import Optional
+from pydantic import BaseModel
+
+"""
+2026-10-17: API-facing view of the job registry and its retention policy (GET /api/registry).
+Built from Queue.get_registry_stats() the same way PoolStatusResponse is built from WorkerPool.stats().
+"""
+class RegistryStatusResponse(BaseModel):
+    size: int   # Tasks currently registered.
+    by_status: dict[str, int]   # 2026-10-17: ...per TaskStatus (FAILED includes Tasks still waiting for a retry).
+    retained: int   # Finished Tasks tracked for eviction (COMPLETED, CANCELLED, or FAILED with no retries left) - 0 unless retention is on.
+    max_terminal: Optional[int]
+    ttl_seconds: Optional[float]
+    evicted: dict[str, int]     # Evictions so far by reason ("count" / "ttl").
+    archived: int   # Evicted Tasks written to the archive file.
+    deduplicated: int = 0   # 2026-10-17: Enqueue requests answered with an existing Task's ID (idempotency key / content hash).
+    shards: int = 1     # 2026-10-17: Lock stripes the registry is split over (PYQUEUE_REGISTRY_SHARDS).
+    broker: Optional[dict[str, int]] = None     # 2026-10-17: With PYQUEUE_BROKER_URL - Tasks per broker state + leases held here.
@@ -1,3 +1,5 @@
+from typing import Optional
+
 from pydantic import BaseModel
 
 """
@@ -27,6 +29,29 @@ class TaskResponse(BaseModel):
     attempts: int
     max_retries: int
     created_at: str
+    priority: int = 0
+    run_at: Optional[str] = None    # 2026-10-17: ISO-8601 time the Task is held until (scheduled Tasks / retries backing off).
+    depends_on: Optional[list[str]] = None  # 2026-10-17: IDs of the Tasks that must complete before this one starts.
+
+# 2026-10-17: Response for POST /api/enqueue/batch - IDs come back in the same order the tasks were sent.
+class EnqueueBatchResponse(BaseModel):
+    count: int
+    ids: list[str]
+    duplicates: int = 0     # 2026-10-17: How many of `ids` are existing Tasks (idempotency key / content-hash hits).
+
+# 2026-10-17: Response for POST /api/workflows - the task ID each workflow key was enqueued as.
+class WorkflowResponse(BaseModel):
+    count: int
+    ids: dict[str, str]
+
+# 2026-10-17: One delta on the GET /api/events stream. `task` carries the state as of this event ("enqueued"/"status"),
+# `id` is set for every per-task event, old_status lets status-filtered clients drop Tasks that left their filter.
+class JobEventResponse(BaseModel):
+    seq: int
+    kind: str
+    id: Optional[str] = None
+    task: Optional[TaskResponse] = None
+    old_status: Optional[str] = None
 
 """
 2026-02-02-NOTE: For later documentation:
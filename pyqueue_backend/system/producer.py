@@ -1,14 +1,24 @@
-from typing import Optional
-from fastapi import APIRouter, Query, HTTPException, Depends, Request
-from pydantic import BaseModel
+import asyncio
+import datetime
+import json
+from typing import AsyncIterator, Optional
+from fastapi import APIRouter, Query, HTTPException, Depends, Header, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, TypeAdapter, ValidationError
 # Custom imports:
-from models.queue import Queue
+from models.queue import Queue, QueueFullError, QueueDrainingError
+from models.dag import DependencyError, topological_order
 from enums.TaskType import TaskType
 from enums.TaskStatus import TaskStatus
+from models.events import JobEvent
 from models.task import Task
 
-from schemas.mappers import task_to_response
-from schemas.task import TaskResponse
+from schemas.mappers import task_to_response, event_to_response, encode_tasks, STREAM_CHUNK
+from schemas.task import TaskResponse, EnqueueBatchResponse, WorkflowResponse
+from schemas.pool import PoolStatusResponse
+from schemas.registry import RegistryStatusResponse
+from schemas.limits import TypeLimitsRequest, TypeLimitsResponse
 
 """
 This producer.py file would certainly be more closely modeled after ProducerController.java than producer.go.
@@ -41,16 +51,145 @@ def require_queue() -> Queue:
 class EnqueueRequest(BaseModel):
     payload: str
     t_type: TaskType
+    priority: int = 0   # 2026-10-17: Optional - higher runs first among queued Tasks of the same type (see models/scheduler.py).
+    run_at: Optional[datetime.datetime] = None  # 2026-10-17: Optional - don't start before this (ISO-8601 or epoch seconds).
+    idempotency_key: Optional[str] = None   # 2026-10-17: Optional - repeats of the same key get the original Task's ID back.
+    depends_on: list[str] = []  # 2026-10-17: Optional - IDs of Tasks that must complete before this one starts.
+
+    def to_task(self, depends_on: Optional[list[str]] = None) -> Task:
+        return Task.create(self.payload, self.t_type, self.priority, self.run_at.timestamp() if self.run_at else 0.0,
+                           tuple(self.depends_on if depends_on is None else depends_on))
+
+# 2026-10-17: Admission control - a full queue (see PYQUEUE_MAX_DEPTH / PYQUEUE_TYPE_MAX_DEPTH) becomes 429 + Retry-After
+# (503 while the Queue drains for shutdown):
+def _queue_full(e: QueueFullError) -> HTTPException:
+    status = 503 if isinstance(e, QueueDrainingError) else 429
+    return HTTPException(status_code=status, detail=str(e), headers={"Retry-After": str(e.retry_after)})
 
 # 0. Translating routes. NOTE: In my ProducerController.java, the methods were all "handle_enqueue" and named like that (because I was translating directly from Go and copied its wording conventions).
 
 # 1. Translating - @PostMapping("/enqueue") ... public ResponseEntity<Map<String, String>> handleEnqueue(@RequestBody EnqueueRequest req) {...}:
 @router.post("/enqueue", response_model=dict[str,str])
-def enqueue(req: EnqueueRequest, q: Queue = Depends(get_queue)) -> dict[str, str]:
+def enqueue(req: EnqueueRequest, q: Queue = Depends(get_queue),
+            idempotency_key: Optional[str] = Header(default=None)) -> dict[str, str]:
     #created_at = datetime.datetime.now() #.strftime("%Y-%m-%d %H:%M:%S")  # Translating what I did w/ LocalDateTime.now().format(DateTimeFormatter.ofPattern("yyyy-MM-dd HH:mm:ss"));
-    task = Task.create(req.payload, req.t_type)
-    q.enqueue(task)
-    return { "message": f"Job {task.t_id} (Payload: {task.payload}, Type: {task.t_type}) enqueued!" }
+    task = req.to_task()
+    try:
+        # 2026-10-17: Idempotency key from the body or the standard Idempotency-Key header (body wins):
+        t_id = q.enqueue(task, req.idempotency_key or idempotency_key)
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    if t_id != task.t_id:
+        return { "message": f"Duplicate request - Job {t_id} was already enqueued.", "id": t_id }
+    return { "message": f"Job {task.t_id} (Payload: {task.payload}, Type: {task.t_type}) enqueued!", "id": t_id }
+
+# 1b. 2026-10-17: Bulk enqueue - POST /api/enqueue/batch
+"""
+Producers that emit thousands of tasks at once were paying full per-request FastAPI/pydantic overhead, one Queue.lock
+acquisition and one dispatch per task. This accepts either:
+- a JSON array of EnqueueRequest objects (Content-Type: application/json), or
+- NDJSON, one EnqueueRequest per line (Content-Type: application/x-ndjson), read incrementally off the request stream.
+Everything is validated first (a bad item rejects the whole batch with 422, nothing gets enqueued), then all Tasks are
+registered and dispatched with one Queue.enqueue_many() call. IDs come back in input order.
+It's an async def (unlike the other routes) so it can read the body as a stream; the blocking enqueue_many() call
+(which may wait on WAL group commit) is pushed onto the threadpool so it never stalls the event loop.
+"""
+NDJSON_CONTENT_TYPES: tuple[str, ...] = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+_batch_adapter = TypeAdapter(list[EnqueueRequest])
+
+def _validation_detail(e: ValidationError) -> list:
+    return json.loads(e.json(include_url=False))
+
+async def _read_ndjson(request: Request) -> list[EnqueueRequest]:
+    reqs: list[EnqueueRequest] = []
+    pending = b""
+    line_no = 0
+
+    def parse(line: bytes) -> None:
+        if line.strip():
+            try:
+                reqs.append(EnqueueRequest.model_validate_json(line))
+            except ValidationError as e:
+                raise HTTPException(status_code=422, detail={"line": line_no, "errors": _validation_detail(e)})
+
+    async for chunk in request.stream():
+        pending += chunk
+        *lines, pending = pending.split(b"\n")
+        for line in lines:
+            line_no += 1
+            parse(line)
+    line_no += 1
+    parse(pending)
+    return reqs
+
+@router.post("/enqueue/batch", response_model=EnqueueBatchResponse, openapi_extra={
+    "requestBody": {"required": True, "content": {
+        "application/json": {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/EnqueueRequest"}}},
+        "application/x-ndjson": {"schema": {"type": "string", "description": "One EnqueueRequest JSON object per line"}},
+    }},
+})
+async def enqueue_batch(request: Request, q: Queue = Depends(get_queue)) -> EnqueueBatchResponse:
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    if content_type in NDJSON_CONTENT_TYPES:
+        reqs = await _read_ndjson(request)
+    else:
+        try:
+            reqs = _batch_adapter.validate_json(await request.body())
+        except ValidationError as e:
+            raise HTTPException(status_code=422, detail=_validation_detail(e))
+
+    tasks = [r.to_task() for r in reqs]
+    try:
+        ids = await run_in_threadpool(q.enqueue_many, tasks, [r.idempotency_key for r in reqs])
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return EnqueueBatchResponse(count=len(tasks), ids=ids, duplicates=sum(i != t.t_id for i, t in zip(ids, tasks)))
+
+# 1c. 2026-10-17: Workflows - POST /api/workflows
+"""
+A DAG of tasks in one request, instead of the client enqueueing each stage and polling for the previous one to finish:
+    {"tasks": [{"key": "clean", "payload": "...", "t_type": "DATACLEANUP"},
+               {"key": "report", "payload": "...", "t_type": "REPORT", "depends_on": ["clean"]},
+               {"key": "mail", "payload": "...", "t_type": "NEWSLETTER", "depends_on": ["report"]}]}
+`depends_on` entries are other nodes' keys, or IDs of Tasks that are already enqueued. Every node is enqueued at once
+(parents first, one Queue.enqueue_many() call) and starts the moment everything it depends on has completed; nodes that
+don't depend on each other run in parallel. A node whose dependency fails for good (retries used up) or is cancelled is
+cancelled too. Returns key -> task ID. Duplicate keys, cycles and unknown IDs are rejected with 400, before anything is enqueued.
+"""
+class WorkflowNode(EnqueueRequest):
+    key: str
+
+class WorkflowRequest(BaseModel):
+    tasks: list[WorkflowNode]
+
+@router.post("/workflows", response_model=WorkflowResponse)
+def enqueue_workflow(req: WorkflowRequest, q: Queue = Depends(get_queue)) -> WorkflowResponse:
+    index: dict[str, int] = {}
+    for i, node in enumerate(req.tasks):
+        if node.key in index:
+            raise HTTPException(status_code=400, detail=f"Duplicate workflow key {node.key!r}")
+        index[node.key] = i
+    try:
+        order = topological_order([[index[d] for d in node.depends_on if d in index] for node in req.tasks])
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    # Parents first, so each node's keys can be swapped for its parents' (already generated) task IDs:
+    tasks: dict[int, Task] = {}
+    for i in order:
+        node = req.tasks[i]
+        tasks[i] = node.to_task([tasks[index[d]].t_id if d in index else d for d in node.depends_on])
+    try:
+        ids = q.enqueue_many([tasks[i] for i in order], [req.tasks[i].idempotency_key for i in order])
+    except QueueFullError as e:
+        raise _queue_full(e)
+    except DependencyError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return WorkflowResponse(count=len(ids), ids={req.tasks[i].key: t_id for i, t_id in zip(order, ids)})
 
 # 2. Translating - @GetMapping("/jobs") ... public ResponseEntity<List<Task>> handleListJobs(@RequestParam(required = false) String status) {...}:
 """
@@ -58,8 +197,78 @@ NOTE(S)-TO-SELF:
 - Query parameters in FastAPI are just function parameters, and for optional params you'd just do Optional[T] (or T | None) and then Query(...)
 - [@RequestParam(required = false) String status] becomes [status: Optional[str] = Query(default = None)]
 """
+"""
+2026-10-17-NOTE:
+GET /api/jobs now reads through the registry's indexes (Queue.query_jobs) instead of copying + scanning every Task:
+- ?status=FAILED and/or ?type=EMAIL pick the matching index directly.
+- ?limit=N returns one page (in creation order); the cursor for the next page comes back in the X-Next-Cursor header
+  (absent on the last page) and is passed back as ?cursor=... . The cursor is a position in creation order, so it stays
+  stable while Tasks are added, deleted or change status in between page requests.
+- X-Total-Count carries the number of Tasks matching the filters.
+Without ?limit the response is still the full (filtered) list - the body shape never changed, so the dashboard keeps working.
+2026-10-17: The body is now built from cached per-Task JSON (schemas/mappers.task_to_json) instead of TaskResponse models,
+streamed in chunks once it's longer than STREAM_CHUNK Tasks. Responses carry ETag: W/"<registry version>" (unless a broker
+is configured - see Queue.registry_version) with Cache-Control: no-cache, so a poll with If-None-Match gets 304 Not
+Modified, without reading the registry, when nothing has changed since.
+"""
+MAX_PAGE_SIZE: int = 1000
+
+def _parse_filters(status: Optional[str], t_type: Optional[str]) -> tuple[Optional[TaskStatus], Optional[TaskType]]:
+    status_enum: Optional[TaskStatus] = None
+    if status is not None:
+        try:
+            status_enum = TaskStatus[status.upper()]
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Invalid status filter")
+    type_enum: Optional[TaskType] = None
+    if t_type is not None:
+        try:
+            type_enum = TaskType[t_type.upper()]
+        except KeyError:
+            raise HTTPException(status_code=400, detail="Invalid type filter")
+    return status_enum, type_enum
+
+def _etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
 @router.get("/jobs", response_model=list[TaskResponse])
-def get_jobs(status: Optional[str] = Query(default = None), q: Queue = Depends(get_queue)) -> list[TaskResponse]:
+def get_jobs(
+    request: Request,
+    status: Optional[str] = Query(default = None),
+    t_type: Optional[str] = Query(default = None, alias = "type"),
+    limit: Optional[int] = Query(default = None, ge = 1, le = MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(default = None),
+    q: Queue = Depends(get_queue),
+) -> Response:
+    status_enum, type_enum = _parse_filters(status, t_type)
+    after: Optional[int] = None
+    if cursor is not None:
+        try:
+            after = int(cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    headers = {"Cache-Control": "no-cache"}
+    # Version read *before* the registry: a change in between makes the body newer than its ETag (next poll re-fetches),
+    # never older.
+    version = q.registry_version()
+    if version is not None:
+        headers["ETag"] = f'W/"{version}"'
+        if _etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+            return Response(status_code=304, headers=headers)
+
+    page, next_cursor, total = q.query_jobs(status_enum, type_enum, after, limit)
+    headers["X-Total-Count"] = str(total)
+    if next_cursor is not None:
+        headers["X-Next-Cursor"] = str(next_cursor)
+    if len(page) > STREAM_CHUNK:
+        return StreamingResponse(encode_tasks(page), media_type="application/json", headers=headers)
+    return Response(b"".join(encode_tasks(page)), media_type="application/json", headers=headers)
+    # Previous version (full copy of the registry + linear filter on every call):
+    """
     all_jobs = q.get_jobs()
     status_enum: Optional[TaskStatus] = None
     if status is not None:
@@ -73,6 +282,7 @@ def get_jobs(status: Optional[str] = Query(default = None), q: Queue = Depends(g
         for t in all_jobs
         if status_enum is None or t.status == status_enum
     ]
+    """
     # Old code (refactored to the more verbose but safer version above because the list calculations inside do some dangerous tight coupling):
     """
     all_jobs = q.get_jobs()
@@ -96,10 +306,23 @@ def retry_job(job_id: str, q: Queue = Depends(get_queue)) -> TaskResponse:
         raise HTTPException(status_code=404, detail=f"Job {job_id} not found. Could not be retried.")
     if task.status != TaskStatus.FAILED:
         raise HTTPException(status_code=400, detail=f"Job {job_id} is not a failed Task. Can only retry failed Tasks.")
-    task_clone = Task.create(task.payload, task.t_type)
-    q.enqueue(task_clone)
+    task_clone = Task.create(task.payload, task.t_type, task.priority)
+    try:
+        q.enqueue(task_clone, dedup=False)  # An explicit retry is meant to run the same work again.
+    except QueueFullError as e:
+        raise _queue_full(e)
     return task_to_response(task_clone)
 
+# 4b. 2026-10-17: Cancel a Task that hasn't finished - queued ones never start, running ones are interrupted (models/cancel.py):
+@router.post("/jobs/{job_id}/cancel", response_model=TaskResponse)
+def cancel_job(job_id: str, q: Queue = Depends(get_queue)) -> TaskResponse:
+    task = q.get_job_by_id(job_id)
+    if task is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found. Could not be cancelled.")
+    if not q.cancel_job(task):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} has already finished. Could not be cancelled.")
+    return task_to_response(task)
+
 # 5. Translating @DeleteMapping("/jobs/{id}") ... public ResponseEntity<?> handleDeleteJobById(@PathVariable String id) {...}
 @router.delete("/jobs/{job_id}", response_model=dict[str,str])
 def delete_job(job_id: str, q: Queue = Depends(get_queue)) -> dict[str, str]:
@@ -113,3 +336,90 @@ def delete_job(job_id: str, q: Queue = Depends(get_queue)) -> dict[str, str]:
 def clear_queue(q: Queue = Depends(get_queue)) -> dict[str, str]:
     q.clear()
     return { "message": "All jobs in the queue cleared!" }
+
+# 7. 2026-10-17: Worker pool status (current size, busy/idle split, queue depth and recent autoscaler resizes):
+@router.get("/pool", response_model=PoolStatusResponse)
+def get_pool(q: Queue = Depends(get_queue)) -> PoolStatusResponse:
+    return PoolStatusResponse(**q.get_pool_stats())
+
+# 7b. 2026-10-17: Registry size + retention policy and eviction counters (see models/retention.py):
+@router.get("/registry", response_model=RegistryStatusResponse)
+def get_registry(q: Queue = Depends(get_queue)) -> RegistryStatusResponse:
+    return RegistryStatusResponse(**q.get_registry_stats())
+
+# 7c. 2026-10-17: Per-type rate limits / concurrency caps + throughput and throttle counters (see models/ratelimit.py):
+@router.get("/limits", response_model=list[TypeLimitsResponse])
+def get_limits(q: Queue = Depends(get_queue)) -> list[TypeLimitsResponse]:
+    return [TypeLimitsResponse(**s) for s in q.get_limit_stats()]
+
+# Replaces the type's limits (omitted fields = unlimited); takes effect for the next dispatch:
+@router.put("/limits/{t_type}", response_model=TypeLimitsResponse)
+def set_limits(t_type: str, req: TypeLimitsRequest, q: Queue = Depends(get_queue)) -> TypeLimitsResponse:
+    _, type_enum = _parse_filters(None, t_type)
+    q.set_type_limits(type_enum, req.rate, req.burst, req.max_concurrency)
+    return next(TypeLimitsResponse(**s) for s in q.get_limit_stats() if s["t_type"] == type_enum)
+
+# 8. 2026-10-17: Live job updates - GET /api/events (Server-Sent Events)
+"""
+Replaces dashboard polling of /api/jobs. Same ?status= / ?type= filters as GET /api/jobs. The stream starts with one
+"snapshot" event (the filtered job list, consistent with the event seq in its id: field), then one "job" event per change
+after that: enqueued, status (with old_status), deleted, evicted (retention policy) or cleared. Every event has an `id:` = its sequence number,
+so when the connection drops the browser's EventSource reconnects with Last-Event-ID (or pass ?since=<seq>) and only gets
+what it missed - unless that has already fallen out of the event history (PYQUEUE_EVENT_HISTORY), in which case it gets a
+fresh snapshot. A comment line goes out every HEARTBEAT_SECONDS so proxies don't close an idle stream.
+"""
+HEARTBEAT_SECONDS: float = 15.0
+
+def _sse(event: str, seq: int, data: str) -> str:
+    return f"id: {seq}\nevent: {event}\ndata: {data}\n\n"
+
+def _matches(event: JobEvent, status: Optional[TaskStatus], t_type: Optional[TaskType]) -> bool:
+    if event.task is None:
+        return True     # "cleared" concerns every filter.
+    if t_type is not None and event.task.t_type != t_type:
+        return False
+    # A status-filtered client needs to hear about Tasks entering *and* leaving that status:
+    return status is None or event.kind in ("deleted", "evicted") or status in (event.status, event.old_status)
+
+@router.get("/events", response_class=StreamingResponse)
+async def job_events(
+    request: Request,
+    status: Optional[str] = Query(default = None),
+    t_type: Optional[str] = Query(default = None, alias = "type"),
+    since: Optional[int] = Query(default = None, ge = 0),
+    last_event_id: Optional[str] = Header(default = None),
+    q: Queue = Depends(get_queue),
+) -> StreamingResponse:
+    status_enum, type_enum = _parse_filters(status, t_type)
+    if since is None and last_event_id is not None and last_event_id.isdigit():
+        since = int(last_event_id)
+
+    async def stream() -> AsyncIterator[str]:
+        # Subscribe before the snapshot/backlog read, so nothing published in between is missed:
+        sub = q.events.subscribe(asyncio.get_running_loop())
+        try:
+            last = since
+            while True:
+                events = q.events.since(last) if last is not None else None
+                if events is None:
+                    # First connect, or resumed from too far back - (re)send the full filtered list:
+                    tasks, last = await run_in_threadpool(q.snapshot_jobs, status_enum, type_enum)
+                    body = b"".join(encode_tasks(tasks)).decode()
+                    yield _sse("snapshot", last, body)
+                    continue
+                for event in events:
+                    if _matches(event, status_enum, type_enum):
+                        yield _sse("job", event.seq, event_to_response(event).model_dump_json())
+                if events:
+                    last = events[-1].seq
+                try:
+                    await asyncio.wait_for(sub.wait(), HEARTBEAT_SECONDS)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keepalive\n\n"
+        finally:
+            q.events.unsubscribe(sub)
+
+    return StreamingResponse(stream(), media_type="text/event-stream",
+                             headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"})
@@ -1,6 +1,12 @@
+import asyncio
+import inspect
+import logging
 import random
-import time
+from typing import Any, Optional
 
+from models.cancel import TaskCancelled
+from models.handlers import HandlerSpec
+from models.log import task_log
 from models.task import Task
 from models.queue import Queue
 from enums.TaskStatus import TaskStatus
@@ -40,6 +46,7 @@ class Worker:
     def __init__(self, task: Task, queue: Queue) -> None:
         self.task: Task = task    # The unit of work being processed.
         self.queue: Queue = queue  # Coordination service (for retries / re-enqueue)
+        self.cancel_token = queue.cancel_token(task)    # 2026-10-17: Set by POST /api/jobs/{id}/cancel (see models/cancel.py).
 
     # 1. Entry point for Executor: Translating - public void run() {...}:
     def run(self) -> None:
@@ -47,21 +54,44 @@ class Worker:
         Executor entrypoint. Mutates task state and then delegates execution logic.
         """
         try:
-            self.task.attempts = self.task.attempts + 1
-            self.task.status = TaskStatus.INPROGRESS
-            print(f"[Worker] Processing Task {self.task.t_id} (Attempt {self.task.attempts}, Type: {self.task.t_type})")
+            self._begin_attempt()
             self._handle_task_type(self.task)
 
+        except TaskCancelled:
+            task_log(logging.INFO, "cancelled", self.task, "Task %s cancelled", self.task.t_id)
+            self.queue.metrics.worker_error(self.task.t_type, "cancelled")
+
         except RuntimeError as e:
-            print(f"[Worker] Runtime error in task {self.task.t_id}: {e}")
-            self.task.status = TaskStatus.FAILED
+            task_log(logging.ERROR, "error", self.task, "Runtime error in task %s: %s", self.task.t_id, e, kind="runtime")
+            self.queue.metrics.worker_error(self.task.t_type, "runtime")
+            self._fail_permanently(self.task)
 
         except Exception as e:
-            print(f"[Worker] Unexpected failure in task {self.task.t_id}: {e}")
-            self.task.status = TaskStatus.FAILED
+            task_log(logging.ERROR, "error", self.task, "Unexpected failure in task %s: %s", self.task.t_id, e, kind="unexpected",
+                     exc_info=e)
+            self.queue.metrics.worker_error(self.task.t_type, "unexpected")
+            self._fail_permanently(self.task)
+
+    # 2026-10-17: Status changes go through queue.set_status() (not task.status = ...) so Queue can journal them:
+    def _begin_attempt(self) -> None:
+        self.cancel_token.raise_if_cancelled()
+        self.task.attempts = self.task.attempts + 1
+        self.queue.set_status(self.task, TaskStatus.INPROGRESS)
+        task_log(logging.INFO, "started", self.task, "Processing Task %s", self.task.t_id)
 
     # 2. Dispatch based on task type: Translating - private void handleTaskType(Task t) throws InterruptedException {...}:
     def _handle_task_type(self, task: Task) -> None:
+        # 2026-10-17: A registered handler (see models/handlers.py) replaces the simulated work below for its type:
+        spec = self.queue.handlers.get(task.t_type)
+        if spec is not None:
+            try:
+                error = _call_handler(spec, task)
+            except TaskCancelled:
+                raise
+            except Exception as e:
+                error = e
+            self._settle(task, error)
+            return
         match task.t_type:
             case TaskType.FAIL:
                 self._handle_fail_type(task)
@@ -88,8 +118,8 @@ class Worker:
         random_float = random.uniform(0, 1)
         if random_float <= success_chance:
             self._sleep_ms(2000)
-            task.status = TaskStatus.COMPLETED
-            print(f"[Worker] Task {task.t_id} (Type: {task.t_type}) - 0.25 success rate on retry) completed")
+            self.queue.set_status(task, TaskStatus.COMPLETED)
+            task_log(logging.INFO, "completed", task, "Task %s completed (0.25 success rate on retry)", task.t_id)
         else:
             self._sleep_ms(1000)
             self._retry_or_fail(task)
@@ -112,20 +142,197 @@ class Worker:
     def _simulate_work(self, task: Task, duration_ms: int) -> None:
         # DEBUG: Not sure if I should enforce a "private" equivalence here?
         self._sleep_ms(duration_ms)
-        task.status = TaskStatus.COMPLETED
-        print(f"[Worker] Task {task.t_id} (Type: {task.t_type}) complete")
+        self._complete(task)
 
     # Helper Method(s):
+    def _complete(self, task: Task) -> None:
+        self.queue.set_status(task, TaskStatus.COMPLETED)
+        task_log(logging.INFO, "completed", task, "Task %s complete", task.t_id)
+
+    # 2026-10-17: Outcome of a handler call for one Task - None completes it, an exception fails it (retried per max_retries):
+    def _settle(self, task: Task, error: Optional[BaseException]) -> None:
+        if error is None:
+            self._complete(task)
+            return
+        task_log(logging.ERROR, "error", task, "Handler failed task %s: %s", task.t_id, error, kind="handler", exc_info=error)
+        self.queue.metrics.worker_error(task.t_type, "handler")
+        self._retry_or_fail(task)
+
     # Shared retry logic for _handle_fail_type and _handle_absolute_fail:
     def _retry_or_fail(self, task: Task) -> None:
-        task.status = TaskStatus.FAILED
+        self.queue.set_status(task, TaskStatus.FAILED)
         if task.attempts < task.max_retries:
-            print(f"[Worker] Task {task.t_id} (Type: {task.t_type}) failed! Retrying...")
-            self.queue.enqueue(task)
+            task_log(logging.WARNING, "retrying", task, "Task %s failed! Retrying...", task.t_id)
+            self.queue.retry(task)  # 2026-10-17: Was queue.enqueue(task) - retries now back off first (see models/retry.py).
         else:
-            print(f"[Worker] Task {task.t_id} (Type: {task.t_type}) failed permanently!")
+            task_log(logging.ERROR, "failed", task, "Task %s failed permanently!", task.t_id)
+
+    # 2026-10-17: The worker itself raised (not a handler) - FAILED with no retry, same as always, but with attempts raised
+    # to max_retries so it counts as final. Left as a FAILED attempt with retries left, nothing would ever retry it, so the
+    # Task would never finish and its dependents would stay blocked:
+    def _fail_permanently(self, task: Task) -> None:
+        task.attempts = max(task.attempts, task.max_retries)
+        self.queue.set_status(task, TaskStatus.FAILED)
 
     # Sleep method (/1000 conversion needed to bridge gap between Java and Python):
+    # 2026-10-17: Waits on the cancel token instead of time.sleep(), so a cancel interrupts the attempt right away:
+    def _sleep_ms(self, ms: int) -> None:
+        if self.cancel_token.sleep(ms / 1000):
+            raise TaskCancelled()
+
+# 2026-10-17: Calls a handler for one Task (a batch handler gets a batch of one) - returns None or that Task's exception:
+def _call_handler(spec: HandlerSpec, task: Task) -> Optional[BaseException]:
+    if not spec.batched:
+        spec.fn(task)
+        return None
+    return _batch_errors([task], spec.fn([task]))[0]
+
+# A batch handler's return value -> one entry (None or an exception) per Task:
+def _batch_errors(tasks: list[Task], result: Any) -> list[Optional[BaseException]]:
+    if result is None:
+        return [None] * len(tasks)
+    errors = list(result)
+    if len(errors) != len(tasks):
+        raise RuntimeError(f"batch handler returned {len(errors)} results for {len(tasks)} tasks")
+    return errors
+
+
+"""
+2026-10-17-NOTE:
+BatchWorker runs a micro-batch of same-type Tasks (collected by Queue._execute, see models/handlers.py) through one call
+of that type's batch handler. Each Task keeps its own attempt: attempts + INPROGRESS before the call, then COMPLETED or
+FAILED (+ retry) from its own entry in the result - a failure only costs the Tasks it belongs to. A cancel can't interrupt
+the call; Tasks cancelled before it are left out, and ones cancelled during it keep CANCELLED (set_status ignores them).
+"""
+class BatchWorker(Worker):
+    """
+    One execution attempt of each Task in a batch, through one handler call.
+    """
+
+    # 0. Constructor:
+    def __init__(self, tasks: list[Task], queue: Queue) -> None:
+        self.tasks: list[Task] = tasks
+        self.queue: Queue = queue
+        self.spec: HandlerSpec = queue.handlers.get(tasks[0].t_type)
+
+    # 1. Entry point (same shape as Worker.run):
+    def run(self) -> None:
+        started = []
+        for task in self.tasks:
+            if self.queue.cancel_token(task).cancelled:
+                task_log(logging.INFO, "cancelled", task, "Task %s cancelled", task.t_id)
+                self.queue.metrics.worker_error(task.t_type, "cancelled")
+                continue
+            task.attempts = task.attempts + 1
+            self.queue.set_status(task, TaskStatus.INPROGRESS)
+            task_log(logging.INFO, "started", task, "Processing Task %s (batch of %d)", task.t_id, len(self.tasks))
+            started.append(task)
+        if not started:
+            return
+        try:
+            errors = _batch_errors(started, self.spec.fn(started))
+        except Exception as e:
+            errors = [e] * len(started)     # Raising fails the whole batch.
+        for task, error in zip(started, errors):
+            self._settle(task, error)
+
+
+"""
+2026-10-17-NOTE:
+AsyncWorker is the asyncio twin of Worker for TaskTypes routed to the "async" lane (see models/async_backend.py).
+Same lifecycle and the exact same retry/fail rules (_begin_attempt, _complete, _retry_or_fail and _fail_permanently are inherited) -
+the only difference is that waiting is `await asyncio.sleep(...)` on the event loop instead of time.sleep() on a thread.
+The match below deliberately mirrors Worker._handle_task_type line-for-line so the two stay easy to compare.
+"""
+class AsyncWorker(Worker):
+    """
+    One execution attempt of a Task as a coroutine. Thousands of these can be in flight on one event loop thread.
+    """
+
+    # 1. Entry point for the async lane (same shape as Worker.run):
+    async def run(self) -> None:
+        try:
+            self._begin_attempt()
+            await self._handle_task_type_async(self.task)
+
+        except (TaskCancelled, asyncio.CancelledError):
+            # (The async lane cancels the coroutine itself, so this usually arrives as CancelledError at an await.)
+            task_log(logging.INFO, "cancelled", self.task, "Task %s cancelled", self.task.t_id)
+            self.queue.metrics.worker_error(self.task.t_type, "cancelled")
+
+        except RuntimeError as e:
+            task_log(logging.ERROR, "error", self.task, "Runtime error in task %s: %s", self.task.t_id, e, kind="runtime")
+            self.queue.metrics.worker_error(self.task.t_type, "runtime")
+            self._fail_permanently(self.task)
+
+        except Exception as e:
+            task_log(logging.ERROR, "error", self.task, "Unexpected failure in task %s: %s", self.task.t_id, e, kind="unexpected",
+                     exc_info=e)
+            self.queue.metrics.worker_error(self.task.t_type, "unexpected")
+            self._fail_permanently(self.task)
+
+    # 2. Dispatch based on task type:
+    async def _handle_task_type_async(self, task: Task) -> None:
+        spec = self.queue.handlers.get(task.t_type)
+        if spec is not None:
+            try:
+                arg = [task] if spec.batched else task
+                if inspect.iscoroutinefunction(spec.fn):
+                    result = await spec.fn(arg)
+                else:
+                    # 2026-10-17: A plain function would block the event loop - every coroutine on it - for its whole run:
+                    result = await asyncio.to_thread(spec.fn, arg)
+                    if inspect.isawaitable(result):
+                        result = await result   # (A plain function that hands back a coroutine.)
+                error = _batch_errors([task], result)[0] if spec.batched else None
+            except TaskCancelled:
+                raise
+            except Exception as e:
+                error = e
+            self._settle(task, error)
+            return
+        match task.t_type:
+            case TaskType.FAIL:
+                await self._handle_fail_type_async(task)
+            case TaskType.FAILABS:
+                await self._handle_absolute_fail_async(task)
+            case TaskType.EMAIL:
+                await self._simulate_work_async(task, 2000)
+            case TaskType.REPORT:
+                await self._simulate_work_async(task, 5000)
+            case TaskType.DATACLEANUP:
+                await self._simulate_work_async(task, 3000)
+            case TaskType.SMS:
+                await self._simulate_work_async(task, 1000)
+            case TaskType.NEWSLETTER:
+                await self._simulate_work_async(task, 4000)
+            case TaskType.TAKESLONG:
+                await self._simulate_work_async(task, 10000)
+            case _:
+                await self._simulate_work_async(task, 2000)
+
+    # 3. Fail-with-retry:
+    async def _handle_fail_type_async(self, task: Task) -> None:
+        success_chance: float = 0.25
+        random_float = random.uniform(0, 1)
+        if random_float <= success_chance:
+            await self._sleep_ms_async(2000)
+            self.queue.set_status(task, TaskStatus.COMPLETED)
+            task_log(logging.INFO, "completed", task, "Task %s completed (0.25 success rate on retry)", task.t_id)
+        else:
+            await self._sleep_ms_async(1000)
+            self._retry_or_fail(task)
+
+    # 4. Absolute fail:
+    async def _handle_absolute_fail_async(self, task: Task) -> None:
+        await self._sleep_ms_async(1000)
+        self._retry_or_fail(task)
+
+    # 5. Simulated work:
+    async def _simulate_work_async(self, task: Task, duration_ms: int) -> None:
+        await self._sleep_ms_async(duration_ms)
+        self._complete(task)
+
     @staticmethod
-    def _sleep_ms(ms: int) -> None:
-        time.sleep(ms / 1000)
+    async def _sleep_ms_async(ms: int) -> None:
+        await asyncio.sleep(ms / 1000)
@@ -0,0 +1,58 @@
+import time
+from typing import Callable, Optional
+
+import pytest
+from fastapi import FastAPI
+
+from models.config import QueueConfig
+from models.handlers import HandlerRegistry
+from models.queue import Queue
+from models.task import Task
+from system.producer import router
+from system.worker import AsyncWorker, BatchWorker, Worker
+
+"""
+2026-10-17-NOTE:
+Shared fixtures. Tests build Queue directly (no lifespan, no .env) with a small pool and near-instant retry backoff, and
+register fast handlers for the types they run - the built-in simulated work sleeps for seconds.
+"""
+
+def worker_factory(task: Task, queue: Queue):
+    return Worker(task, queue).run
+
+def async_worker_factory(task: Task, queue: Queue):
+    return AsyncWorker(task, queue).run
+
+def batch_worker_factory(tasks: list[Task], queue: Queue):
+    return BatchWorker(tasks, queue).run
+
+def wait_until(condition: Callable[[], bool], timeout: float = 5.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+@pytest.fixture
+def make_queue():
+    queues: list[Queue] = []
+    def make(handlers: Optional[HandlerRegistry] = None, worker_factory=worker_factory, **config) -> Queue:
+        config = {"min_workers": 2, "max_workers": 2, "retry_base_delay": 0.01, "retry_max_delay": 0.01,
+                  "retry_jitter": 0.0, **config}
+        queue = Queue(worker_factory=worker_factory, config=QueueConfig(**config), handlers=handlers,
+                      async_worker_factory=async_worker_factory, batch_worker_factory=batch_worker_factory)
+        queues.append(queue)
+        return queue
+    yield make
+    for queue in queues:
+        queue.shutdown(0)
+
+@pytest.fixture
+def make_app():
+    def make(queue: Queue) -> FastAPI:
+        app = FastAPI()
+        app.include_router(router)
+        app.state.queue = queue
+        return app
+    return make
@@ -0,0 +1,89 @@
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.queue import QueueFullError
+from models.task import Task
+
+from tests.conftest import wait_until
+
+# One worker, held up by a gated SMS Task - whatever is enqueued after it stays queued (and counts towards max_depth):
+def gated_queue(make_queue, **config):
+    gate = threading.Event()
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: gate.wait(5))
+    handlers.register(TaskType.EMAIL, lambda task: None)
+    q = make_queue(handlers, min_workers=1, max_workers=1, **config)
+    blocker = Task.create("gate", TaskType.SMS)
+    q.enqueue(blocker)
+    assert wait_until(lambda: blocker.status == TaskStatus.INPROGRESS)
+    return q, gate
+
+def wal_text(directory: Path) -> str:
+    return "".join(p.read_text() for p in directory.iterdir() if p.is_file())
+
+def test_rejected_request_is_429_and_leaves_nothing_behind(make_queue, make_app, tmp_path):
+    q, gate = gated_queue(make_queue, max_depth=1, wal_dir=str(tmp_path))
+    client = TestClient(make_app(q))
+    assert client.post("/api/enqueue", json={"payload": "fits", "t_type": "EMAIL"}).status_code == 200
+    before = len(q.jobs)
+
+    r = client.post("/api/enqueue", json={"payload": "rejected", "t_type": "EMAIL"}, headers={"Idempotency-Key": "k1"})
+    assert r.status_code == 429 and int(r.headers["Retry-After"]) >= 1
+    assert len(q.jobs) == before and q.scheduler.depth() == 1
+    assert q.get_pool_stats()["rejected"] >= 1
+
+    # Room again: the same key is accepted as a new request, not answered as a duplicate of the rejected one:
+    gate.set()
+    assert wait_until(lambda: q.scheduler.depth() == 0)
+    r = client.post("/api/enqueue", json={"payload": "accepted", "t_type": "EMAIL"}, headers={"Idempotency-Key": "k1"})
+    assert r.status_code == 200 and r.json()["id"] in q.jobs
+    q.shutdown()
+    assert '"rejected"' not in wal_text(tmp_path) and '"accepted"' in wal_text(tmp_path)
+
+def test_draining_queue_answers_503(make_queue, make_app):
+    q = make_queue()
+    client = TestClient(make_app(q))
+    q.shutdown(grace=0)
+    r = client.post("/api/enqueue", json={"payload": "late", "t_type": "EMAIL"})
+    assert r.status_code == 503 and "Retry-After" in r.headers
+
+def test_batch_is_all_or_nothing_and_gives_its_reservation_back(make_queue):
+    q, gate = gated_queue(make_queue, type_max_depth={TaskType.EMAIL: 2})
+    with pytest.raises(QueueFullError):
+        q.enqueue_many([Task.create(str(i), TaskType.EMAIL) for i in range(3)], ["a", "b", "c"])
+    assert len(q.jobs) == 1 and q.scheduler.depth() == 0
+
+    # Nothing of the rejected batch is still reserved or claimed - two of the same keys fit right away:
+    fresh = [Task.create(str(i), TaskType.EMAIL) for i in range(2)]
+    assert q.enqueue_many(fresh, ["a", "b"]) == [t.t_id for t in fresh]
+    assert q.scheduler.depth() == 2
+    gate.set()
+
+def test_blocking_admission_times_out(make_queue):
+    q, gate = gated_queue(make_queue, max_depth=1, admission_mode="block", admission_timeout=0.2)
+    q.enqueue(Task.create("fits", TaskType.EMAIL))
+    started = time.monotonic()
+    with pytest.raises(QueueFullError):
+        q.enqueue(Task.create("waits", TaskType.EMAIL))
+    assert 0.15 <= time.monotonic() - started < 2
+    gate.set()
+
+def test_blocking_admission_lets_the_producer_in_once_there_is_room(make_queue):
+    q, gate = gated_queue(make_queue, max_depth=1, admission_mode="block", admission_timeout=5)
+    q.enqueue(Task.create("fits", TaskType.EMAIL))
+    waiting = Task.create("waits", TaskType.EMAIL)
+    producer = threading.Thread(target=q.enqueue, args=(waiting,))
+    producer.start()
+    time.sleep(0.05)
+    assert producer.is_alive()
+    gate.set()  # The worker moves on and pops "fits" - room for one.
+    producer.join(5)
+    assert not producer.is_alive()
+    assert wait_until(lambda: waiting.status == TaskStatus.COMPLETED)
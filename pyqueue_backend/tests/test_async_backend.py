@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.task import Task
+from system.worker import AsyncWorker
+
+from tests.conftest import wait_until
+
+def async_handlers() -> HandlerRegistry:
+    handlers = HandlerRegistry()
+    @handlers.register(TaskType.EMAIL)
+    async def send(task: Task) -> None:
+        await asyncio.sleep(0.01)
+    return handlers
+
+def running(queue, t_type: TaskType) -> int:
+    return next(s["running"] for s in queue.scheduler.limit_stats() if s["t_type"] == t_type)
+
+def test_async_lane_runs_coroutine_handlers(make_queue):
+    q = make_queue(async_handlers(), backends={TaskType.EMAIL: "async"})
+    task = Task.create("a", TaskType.EMAIL)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+    assert wait_until(lambda: q.async_backend.in_flight() == 0 and running(q, TaskType.EMAIL) == 0)
+
+def test_attempt_cancelled_before_its_coroutine_starts_gives_its_slot_back(make_queue):
+    q = make_queue(async_handlers(), backends={TaskType.EMAIL: "async"}, async_concurrency=1)
+    start_attempt = q.start_attempt
+    def cancelled_on_start(task):
+        token = start_attempt(task)
+        if token is not None and task.payload == "doomed":
+            token.cancel()  # Lands between start_attempt() and bind_future() - the future is cancelled up front.
+        return token
+    q.start_attempt = cancelled_on_start
+    gate = threading.Event()
+    q.async_backend.loop.call_soon_threadsafe(gate.wait)    # Loop busy: none of these coroutines can start yet.
+    try:
+        doomed = [Task.create("doomed", TaskType.EMAIL) for _ in range(3)]
+        q.enqueue_many(doomed)
+        # All three went through the single slot without a single coroutine step - so each was released on cancel:
+        assert wait_until(lambda: q.scheduler.runnable_depth("async") == 0)
+        assert wait_until(lambda: q.async_backend.in_flight() == 0 and running(q, TaskType.EMAIL) == 0)
+        assert q.cancel_token(doomed[0]).cancelled is False     # Handle dropped (NEVER_CANCELLED comes back).
+    finally:
+        gate.set()
+
+    task = Task.create("ok", TaskType.EMAIL)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+
+def test_worker_error_on_the_async_lane_fails_the_task_without_retrying(make_queue):
+    attempts = []
+    class RaisingAsyncWorker(AsyncWorker):
+        async def _handle_task_type_async(self, task: Task) -> None:
+            attempts.append(task.attempts)
+            raise RuntimeError("lane blew up")
+    q = make_queue(async_handlers(), backends={TaskType.EMAIL: "async"})
+    q.async_backend.async_worker_factory = lambda task, queue: RaisingAsyncWorker(task, queue).run
+    task = Task.create("a", TaskType.EMAIL)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.FAILED and task.attempts == task.max_retries)
+    assert wait_until(lambda: q.async_backend.in_flight() == 0)
+    assert attempts == [1]
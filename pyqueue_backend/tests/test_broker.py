@@ -0,0 +1,35 @@
+import pytest
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.broker import Broker, MemoryBroker
+from models.redis_broker import RedisBroker
+from models.sqlite_broker import SQLiteBroker
+from models.task import Task
+
+@pytest.mark.parametrize("cls", [MemoryBroker, SQLiteBroker, RedisBroker])
+def test_brokers_implement_the_whole_interface(cls):
+    assert not cls.__abstractmethods__
+
+def test_incomplete_broker_cannot_be_created():
+    class Partial(Broker):
+        def submit(self, tasks: list[Task]) -> None:
+            pass
+    with pytest.raises(TypeError):
+        Partial()
+
+@pytest.mark.parametrize("open_broker", [lambda tmp: MemoryBroker(), lambda tmp: SQLiteBroker(f"sqlite://{tmp}/broker.db")],
+                         ids=["memory", "sqlite"])
+def test_lease_ack_round_trip(open_broker, tmp_path):
+    broker = open_broker(tmp_path)
+    task = Task.create("payload", TaskType.EMAIL)
+    broker.submit([task])
+    leased = broker.lease("a", 10, 30.0)
+    assert [t.t_id for t in leased] == [task.t_id]
+    assert broker.lease("b", 10, 30.0) == []     # Held by "a" until its lease expires.
+
+    leased[0].status = TaskStatus.COMPLETED
+    assert not broker.ack("b", leased[0])
+    assert broker.ack("a", leased[0])
+    assert broker.get(task.t_id).status == TaskStatus.COMPLETED
+    broker.close()
@@ -0,0 +1,94 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def blocking_handlers(ran: list[str], gate: threading.Event) -> HandlerRegistry:
+    """EMAIL runs once `gate` is set; SMS runs right away. Both record each payload as it starts."""
+    def blocked(task: Task) -> None:
+        ran.append(task.payload)
+        gate.wait(5)
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, blocked)
+    handlers.register(TaskType.SMS, lambda task: ran.append(task.payload))
+    return handlers
+
+def test_cancel_queued_task(make_queue, make_app):
+    ran: list[str] = []
+    gate = threading.Event()
+    q = make_queue(blocking_handlers(ran, gate), min_workers=1, max_workers=1)
+    busy = Task.create("busy", TaskType.EMAIL)
+    queued = Task.create("queued", TaskType.SMS)
+    q.enqueue_many([busy, queued])
+    assert wait_until(lambda: busy.status == TaskStatus.INPROGRESS)
+
+    resp = TestClient(make_app(q)).post(f"/api/jobs/{queued.t_id}/cancel")
+    assert resp.status_code == 200 and resp.json()["status"] == "CANCELLED"
+    assert q.get_pool_stats()["queue_depth"] == 0    # Out of the Scheduler right away.
+    gate.set()
+    assert wait_until(lambda: busy.status == TaskStatus.COMPLETED)
+    assert ran == ["busy"] and queued.status == TaskStatus.CANCELLED
+
+def test_cancel_delayed_task(make_queue):
+    ran: list[str] = []
+    q = make_queue(blocking_handlers(ran, threading.Event()))
+    delayed = Task.create("delayed", TaskType.SMS, run_at=time.time() + 0.2)
+    q.enqueue(delayed)
+
+    assert q.cancel_job(delayed)
+    time.sleep(0.4)     # Past run_at - the timer fires and drops it.
+    assert delayed.status == TaskStatus.CANCELLED and ran == []
+
+def test_cancel_running_task_interrupts_its_sleep(make_queue, make_app):
+    q = make_queue()
+    task = Task.create("long", TaskType.TAKESLONG)   # No handler - the simulated work sleeps 10s through the cancel token.
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.INPROGRESS)
+
+    started = time.monotonic()
+    resp = TestClient(make_app(q)).post(f"/api/jobs/{task.t_id}/cancel")
+    assert resp.status_code == 200 and resp.json()["status"] == "CANCELLED"
+    assert wait_until(lambda: q.get_pool_stats()["busy"] == 0, timeout=2)
+    assert time.monotonic() - started < 2
+    assert task.status == TaskStatus.CANCELLED and task.attempts == 1
+
+def test_cancel_batched_tasks(make_queue):
+    batches: list[list[str]] = []
+    gate = threading.Event()
+    def handler(tasks: list[Task]) -> None:
+        batches.append([t.payload for t in tasks])
+        gate.wait(5)
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, handler, batch_size=4)
+    q = make_queue(handlers, min_workers=1, max_workers=1)
+    first = Task.create("first", TaskType.EMAIL)
+    q.enqueue(first)
+    assert wait_until(lambda: first.status == TaskStatus.INPROGRESS)
+    rest = [Task.create(name, TaskType.EMAIL) for name in ("b", "c", "d")]
+    q.enqueue_many(rest)
+
+    assert q.cancel_job(first)      # Mid-call: the call finishes, but the Task stays CANCELLED.
+    assert q.cancel_job(rest[1])    # Still queued: left out of the next batch.
+    gate.set()
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in (rest[0], rest[2])))
+    assert batches == [["first"], ["b", "d"]]
+    assert first.status == TaskStatus.CANCELLED and rest[1].status == TaskStatus.CANCELLED
+
+def test_cancel_finished_task_is_409(make_queue, make_app):
+    q = make_queue(blocking_handlers([], threading.Event()))
+    task = Task.create("done", TaskType.SMS)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+
+    client = TestClient(make_app(q))
+    resp = client.post(f"/api/jobs/{task.t_id}/cancel")
+    assert resp.status_code == 409
+    assert task.status == TaskStatus.COMPLETED
+    assert client.post("/api/jobs/Task-missing/cancel").status_code == 404
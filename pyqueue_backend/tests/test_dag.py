@@ -0,0 +1,195 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.dag import DependencyError, topological_order
+from models.handlers import HandlerRegistry
+from models.task import Task
+from system.worker import Worker
+
+from tests.conftest import wait_until
+
+class RaisingWorker(Worker):
+    """Raises out of the task-type dispatch itself (not through a handler) for FAIL Tasks."""
+    calls: list[str] = []
+
+    def _handle_task_type(self, task: Task) -> None:
+        if task.t_type == TaskType.FAIL:
+            RaisingWorker.calls.append(task.t_id)
+            raise RuntimeError("lane blew up")
+        self._complete(task)
+
+def test_parent_raising_out_of_worker_fails_and_cancels_dependents(make_queue):
+    RaisingWorker.calls.clear()
+    q = make_queue(worker_factory=lambda task, queue: RaisingWorker(task, queue).run)
+    parent = Task.create("parent", TaskType.FAIL)
+    child = Task.create("child", TaskType.EMAIL, depends_on=(parent.t_id,))
+    q.enqueue_many([parent, child])
+
+    assert wait_until(lambda: child.status == TaskStatus.CANCELLED)
+    assert parent.status == TaskStatus.FAILED
+    assert RaisingWorker.calls == [parent.t_id]    # Not retried (a worker error always failed the Task outright)...
+    assert parent.attempts == parent.max_retries     # ...and marked final, so its dependents don't wait on a retry.
+    assert q.get_pool_stats()["blocked"] == 0
+
+def test_parent_escaping_the_worker_is_failed_for_good(make_queue):
+    def factory(task, queue):
+        if task.t_type == TaskType.FAIL:
+            def run() -> None:
+                raise ValueError("worker never settled the task")
+            return run
+        return Worker(task, queue).run
+    q = make_queue(worker_factory=factory)
+    parent = Task.create("parent", TaskType.FAIL)
+    child = Task.create("child", TaskType.EMAIL, depends_on=(parent.t_id,))
+    q.enqueue_many([parent, child])
+
+    assert wait_until(lambda: child.status == TaskStatus.CANCELLED)
+    assert parent.status == TaskStatus.FAILED
+    assert q.get_pool_stats()["blocked"] == 0
+
+def recording_handlers(ran: list[str], failing: tuple[TaskType, ...] = ()) -> HandlerRegistry:
+    """EMAIL/SMS/REPORT handlers that record each payload as it runs; `failing` types always raise."""
+    def handler(task: Task) -> None:
+        ran.append(task.payload)
+        if task.t_type in failing:
+            raise RuntimeError("handler failed")
+    handlers = HandlerRegistry()
+    for t_type in (TaskType.EMAIL, TaskType.SMS, TaskType.REPORT):
+        handlers.register(t_type, handler)
+    return handlers
+
+def test_dependents_run_after_their_parents(make_queue):
+    ran: list[str] = []
+    q = make_queue(recording_handlers(ran))
+    a = Task.create("a", TaskType.EMAIL)
+    b = Task.create("b", TaskType.SMS, depends_on=(a.t_id,))
+    c = Task.create("c", TaskType.REPORT, depends_on=(a.t_id, b.t_id))
+    q.enqueue_many([a, b, c])
+
+    assert wait_until(lambda: c.status == TaskStatus.COMPLETED)
+    assert ran == ["a", "b", "c"]
+    assert q.get_pool_stats()["blocked"] == 0
+
+def test_parent_failing_for_good_cancels_dependents_transitively(make_queue):
+    ran: list[str] = []
+    q = make_queue(recording_handlers(ran, failing=(TaskType.EMAIL,)))
+    parent = Task.create("parent", TaskType.EMAIL)
+    child = Task.create("child", TaskType.SMS, depends_on=(parent.t_id,))
+    grandchild = Task.create("grandchild", TaskType.REPORT, depends_on=(child.t_id,))
+    q.enqueue_many([parent, child, grandchild])
+
+    assert wait_until(lambda: grandchild.status == TaskStatus.CANCELLED)
+    assert parent.status == TaskStatus.FAILED and parent.attempts == parent.max_retries
+    assert child.status == TaskStatus.CANCELLED
+    assert ran == ["parent"] * parent.max_retries   # Neither dependent ever ran.
+
+def test_cancelled_parent_cancels_dependents(make_queue):
+    q = make_queue(recording_handlers([]))
+    parent = Task.create("parent", TaskType.EMAIL, run_at=time.time() + 60)
+    child = Task.create("child", TaskType.SMS, depends_on=(parent.t_id,))
+    q.enqueue_many([parent, child])
+    assert q.get_pool_stats()["blocked"] == 1
+
+    assert q.cancel_job(parent)
+    assert child.status == TaskStatus.CANCELLED
+    assert q.get_pool_stats()["blocked"] == 0
+
+def test_depending_on_a_failed_task_cancels_right_away(make_queue):
+    q = make_queue(recording_handlers([], failing=(TaskType.EMAIL,)))
+    parent = Task.create("parent", TaskType.EMAIL)
+    q.enqueue(parent)
+    assert wait_until(lambda: parent.attempts == parent.max_retries and parent.status == TaskStatus.FAILED)
+
+    child = Task.create("child", TaskType.SMS, depends_on=(parent.t_id,))
+    q.enqueue(child)
+    assert child.status == TaskStatus.CANCELLED
+
+def test_unknown_dependency_is_rejected(make_queue):
+    q = make_queue(recording_handlers([]))
+    with pytest.raises(DependencyError):
+        q.enqueue(Task.create("orphan", TaskType.EMAIL, depends_on=("Task-missing",)))
+    # A batch is all or nothing - the valid first Task isn't enqueued either:
+    ok = Task.create("ok", TaskType.EMAIL)
+    with pytest.raises(DependencyError):
+        q.enqueue_many([ok, Task.create("orphan", TaskType.SMS, depends_on=(ok.t_id, "Task-missing"))])
+    assert q.get_job_count() == 0
+
+def test_topological_order_rejects_cycles():
+    assert topological_order([[], [0], [0, 1]]) == [0, 1, 2]
+    assert topological_order([[2], [], [1]]) == [1, 2, 0]
+    with pytest.raises(DependencyError):
+        topological_order([[1], [2], [0]])
+    with pytest.raises(DependencyError):
+        topological_order([[0]])
+
+def delayed_chain(ran_at: float) -> tuple[Task, Task]:
+    parent = Task.create("parent", TaskType.EMAIL, run_at=ran_at)
+    return parent, Task.create("child", TaskType.SMS, depends_on=(parent.t_id,))
+
+def test_held_tasks_survive_wal_replay(make_queue, tmp_path):
+    parent, child = delayed_chain(time.time() + 0.5)
+    q = make_queue(recording_handlers([]), wal_dir=str(tmp_path))
+    q.enqueue_many([parent, child])
+    q.shutdown(0)   # (Nothing to hand off to but the WAL.)
+
+    ran: list[str] = []
+    restarted = make_queue(recording_handlers(ran), wal_dir=str(tmp_path))
+    assert restarted.recover() == 2
+    recovered = restarted.get_job_by_id(child.t_id)
+    assert recovered.status == TaskStatus.QUEUED and restarted.graph.is_blocked(child.t_id)
+
+    assert wait_until(lambda: recovered.status == TaskStatus.COMPLETED)
+    assert ran == ["parent", "child"]
+
+def test_held_tasks_survive_handoff(make_queue, tmp_path):
+    parent, child = delayed_chain(time.time() + 0.5)
+    q = make_queue(recording_handlers([]), handoff_dir=str(tmp_path))
+    q.enqueue_many([parent, child])
+    q.shutdown(0)
+    assert len(list(tmp_path.iterdir())) == 1
+
+    ran: list[str] = []
+    restarted = make_queue(recording_handlers(ran), handoff_dir=str(tmp_path))
+    assert restarted.load_handoff() == 2
+    assert list(tmp_path.iterdir()) == []
+    recovered = restarted.get_job_by_id(child.t_id)
+    assert recovered.depends_on == (parent.t_id,) and restarted.graph.is_blocked(child.t_id)
+
+    assert wait_until(lambda: recovered.status == TaskStatus.COMPLETED)
+    assert ran == ["parent", "child"]
+
+def test_workflow_route(make_queue, make_app):
+    ran: list[str] = []
+    q = make_queue(recording_handlers(ran))
+    client = TestClient(make_app(q))
+    # Listed out of order on purpose - the route sorts parents first:
+    resp = client.post("/api/workflows", json={"tasks": [
+        {"key": "report", "payload": "report", "t_type": "REPORT", "depends_on": ["fetch", "clean"]},
+        {"key": "clean", "payload": "clean", "t_type": "SMS", "depends_on": ["fetch"]},
+        {"key": "fetch", "payload": "fetch", "t_type": "EMAIL"},
+    ]})
+    assert resp.status_code == 200
+    body = resp.json()
+    assert body["count"] == 3 and set(body["ids"]) == {"fetch", "clean", "report"}
+    report = q.get_job_by_id(body["ids"]["report"])
+    assert set(report.depends_on) == {body["ids"]["fetch"], body["ids"]["clean"]}
+
+    assert wait_until(lambda: report.status == TaskStatus.COMPLETED)
+    assert ran == ["fetch", "clean", "report"]
+
+@pytest.mark.parametrize("tasks, detail", [
+    ([{"key": "a", "payload": "a", "t_type": "EMAIL", "depends_on": ["b"]},
+      {"key": "b", "payload": "b", "t_type": "EMAIL", "depends_on": ["a"]}], "cycle"),
+    ([{"key": "a", "payload": "a", "t_type": "EMAIL"},
+      {"key": "a", "payload": "b", "t_type": "EMAIL"}], "Duplicate workflow key"),
+    ([{"key": "a", "payload": "a", "t_type": "EMAIL", "depends_on": ["Task-missing"]}], "unknown dependency"),
+])
+def test_workflow_route_rejects_bad_graphs(make_queue, make_app, tasks, detail):
+    q = make_queue(recording_handlers([]))
+    resp = TestClient(make_app(q)).post("/api/workflows", json={"tasks": tasks})
+    assert resp.status_code == 400 and detail in resp.json()["detail"]
+    assert q.get_job_count() == 0
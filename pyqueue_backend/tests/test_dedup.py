@@ -0,0 +1,82 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from enums.TaskType import TaskType
+from models.dedup import DedupCache, content_key
+from models.handlers import HandlerRegistry
+from models.task import Task
+
+def test_claim_returns_the_first_holder_of_a_key():
+    cache = DedupCache()
+    assert cache.claim("k", "Task-1") is None
+    assert cache.claim("k", "Task-2") == "Task-1"
+    assert cache.hits == 1 and len(cache) == 1
+
+def test_release_only_undoes_its_own_claim():
+    cache = DedupCache()
+    cache.claim("k", "Task-1")
+    cache.release("k", "Task-2")
+    assert cache.claim("k", "Task-3") == "Task-1"
+    cache.release("k", "Task-1")
+    assert cache.claim("k", "Task-3") is None
+
+def test_entries_expire_after_the_ttl_and_the_cache_stays_bounded():
+    cache = DedupCache(max_size=3, ttl=0.05)
+    cache.claim("k", "Task-1")
+    time.sleep(0.06)
+    assert cache.claim("k", "Task-2") is None
+    for i in range(5):
+        cache.claim(i, f"Task-{i}")
+    assert len(cache) == 3 and cache.claim(0, "again") is None     # The oldest ones were evicted first.
+
+def test_content_key_depends_on_type_and_payload():
+    assert content_key(TaskType.SMS, "hi") == content_key(TaskType.SMS, "hi")
+    assert content_key(TaskType.SMS, "hi") != content_key(TaskType.EMAIL, "hi")
+    assert content_key(TaskType.SMS, "hi") != content_key(TaskType.SMS, "ho")
+
+def fast_handlers() -> HandlerRegistry:
+    handlers = HandlerRegistry()
+    for t_type in (TaskType.SMS, TaskType.EMAIL):
+        handlers.register(t_type, lambda task: None)
+    return handlers
+
+def test_duplicate_key_returns_the_original_id(make_queue, make_app):
+    q = make_queue(fast_handlers())
+    client = TestClient(make_app(q))
+    first = client.post("/api/enqueue", json={"payload": "a", "t_type": "SMS"}, headers={"Idempotency-Key": "k1"}).json()
+    second = client.post("/api/enqueue", json={"payload": "b", "t_type": "SMS", "idempotency_key": "k1"}).json()
+    assert second["id"] == first["id"] and second["message"].startswith("Duplicate request")
+    assert len(q.jobs) == 1
+
+def test_duplicates_inside_one_batch_share_an_id(make_queue):
+    q = make_queue(fast_handlers())
+    tasks = [Task.create(str(i), TaskType.SMS) for i in range(4)]
+    ids = q.enqueue_many(tasks, ["k1", "k2", "k1", None])
+    assert ids == [tasks[0].t_id, tasks[1].t_id, tasks[0].t_id, tasks[3].t_id]
+    assert len(q.jobs) == 3
+
+def test_concurrent_duplicates_create_one_task(make_queue):
+    q = make_queue(fast_handlers())
+    barrier = threading.Barrier(8)
+    ids = []
+    def produce() -> None:
+        batch = [Task.create("x", TaskType.SMS) for _ in range(2)]
+        barrier.wait()
+        ids.extend(q.enqueue_many(batch, ["same", "same"]))
+    threads = [threading.Thread(target=produce) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(set(ids)) == 1 and len(ids) == 16 and len(q.jobs) == 1
+
+def test_content_hash_types_and_ttl_expiry(make_queue):
+    q = make_queue(fast_handlers(), dedup_types={TaskType.SMS}, dedup_ttl=0.1)
+    first = q.enqueue(Task.create("hi", TaskType.SMS))
+    assert q.enqueue(Task.create("hi", TaskType.SMS)) == first
+    assert q.enqueue(Task.create("hi", TaskType.EMAIL)) != first    # Not a content-hash type.
+    assert q.enqueue(Task.create("other", TaskType.SMS)) != first
+    time.sleep(0.12)
+    assert q.enqueue(Task.create("hi", TaskType.SMS)) != first
@@ -0,0 +1,103 @@
+import asyncio
+import json
+import time
+
+import pytest
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.events import EventBus
+from models.handlers import HandlerRegistry
+from models.task import Task
+from system import producer
+
+from tests.conftest import wait_until
+
+def test_subscriber_sees_a_task_s_whole_lifecycle(make_queue):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: None)
+    q = make_queue(handlers)
+    start = q.events.last_seq
+    task = Task.create("hi", TaskType.SMS)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+    events = [e for e in q.events.since(start) if e.task is task]
+    assert [(e.kind, e.status, e.old_status) for e in events] == [
+        ("enqueued", TaskStatus.QUEUED, None),
+        ("status", TaskStatus.INPROGRESS, TaskStatus.QUEUED),
+        ("status", TaskStatus.COMPLETED, TaskStatus.INPROGRESS),
+    ]
+    assert [e.seq for e in events] == sorted(e.seq for e in events)
+
+def test_history_is_bounded_and_too_old_resumes_get_none():
+    bus = EventBus(history=10)
+    for _ in range(25):
+        bus.publish("cleared")
+    assert bus.since(0) is None     # Trimmed - the client needs a fresh snapshot.
+    assert [e.seq for e in bus.since(20)] == [21, 22, 23, 24, 25]
+
+def test_slow_subscriber_gets_one_wakeup_and_never_blocks_publishers():
+    bus = EventBus()
+    loop = asyncio.new_event_loop()     # Never run - a subscriber that doesn't keep up at all.
+    try:
+        sub = bus.subscribe(loop)
+        started = time.perf_counter()
+        for _ in range(10_000):
+            bus.publish("cleared")
+        assert time.perf_counter() - started < 1.0
+        assert sub.pending and len(loop._ready) == 1    # One coalesced wakeup, not 10k queued callbacks.
+        loop.run_until_complete(asyncio.wait_for(sub.wait(), 1))
+        assert len(bus.since(0)) == 10_000  # It reads the whole burst from the history in one go.
+    finally:
+        loop.close()
+
+def test_subscriber_whose_loop_closed_is_dropped():
+    bus = EventBus()
+    loop = asyncio.new_event_loop()
+    bus.subscribe(loop)
+    loop.close()    # e.g. the app shut down without the stream's finally running.
+    bus.publish("cleared")
+    assert not bus._subscribers
+
+class FakeRequest:
+    def __init__(self) -> None:
+        self.disconnected = False
+
+    async def is_disconnected(self) -> bool:
+        return self.disconnected
+
+def parse_sse(chunk: str) -> tuple[str, int, dict]:
+    fields = dict(line.split(": ", 1) for line in chunk.strip().split("\n"))
+    return fields["event"], int(fields["id"]), json.loads(fields["data"])
+
+def test_sse_stream_sends_a_snapshot_then_job_events_and_unsubscribes_on_disconnect(make_queue, monkeypatch):
+    monkeypatch.setattr(producer, "HEARTBEAT_SECONDS", 0.05)
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: None)
+    q = make_queue(handlers)
+    existing = Task.create("old", TaskType.SMS)
+    q.enqueue(existing)
+    request = FakeRequest()
+
+    async def session() -> list[str]:
+        response = await producer.job_events(request, status=None, t_type=None, since=None, last_event_id=None, q=q)
+        body = response.body_iterator
+        chunks = [await body.__anext__()]
+        task = Task.create("new", TaskType.SMS)
+        await asyncio.to_thread(q.enqueue, task)
+        while '"COMPLETED"' not in chunks[-1] or task.t_id not in chunks[-1]:
+            chunks.append(await asyncio.wait_for(body.__anext__(), 5))
+        assert len(q.events._subscribers) == 1
+        request.disconnected = True     # Noticed at the next heartbeat - the stream ends.
+        with pytest.raises(StopAsyncIteration):
+            while True:
+                await asyncio.wait_for(body.__anext__(), 5)
+        return chunks
+
+    chunks = asyncio.run(session())
+    kind, seq, body = parse_sse(chunks[0])
+    assert kind == "snapshot" and any(t["id"] == existing.t_id for t in body)
+    jobs = [parse_sse(c) for c in chunks[1:] if not c.startswith(":")]
+    assert all(kind == "job" for kind, _, _ in jobs) and [s for _, s, _ in jobs] == sorted(s for _, s, _ in jobs)
+    assert [e["kind"] for _, _, e in jobs if e["id"] != existing.t_id][:1] == ["enqueued"]
+    assert not q.events._subscribers
@@ -0,0 +1,107 @@
+import asyncio
+import threading
+
+import pytest
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def test_register_directly_or_as_a_decorator():
+    handlers = HandlerRegistry()
+    def send_sms(task: Task) -> None: ...
+    assert handlers.register(TaskType.SMS, send_sms) is send_sms
+
+    @handlers.register(TaskType.EMAIL, batch_size=10, max_wait_ms=20)
+    def send_emails(tasks: list[Task]) -> None: ...
+
+    assert TaskType.SMS in handlers and TaskType.REPORT not in handlers
+    assert handlers.get(TaskType.EMAIL).fn is send_emails and handlers.get(TaskType.EMAIL).max_wait == 0.02
+    assert set(handlers.batched()) == {TaskType.EMAIL}
+    assert TaskType.EMAIL not in handlers.subset({TaskType.SMS}) and TaskType.SMS in handlers.subset({TaskType.SMS})
+
+@pytest.mark.parametrize("batch_size, max_wait_ms", [(0, 0), (1, -1)])
+def test_register_rejects_bad_batch_settings(batch_size, max_wait_ms):
+    with pytest.raises(ValueError):
+        HandlerRegistry().register(TaskType.SMS, lambda task: None, batch_size, max_wait_ms)
+
+def test_unbatched_handler_gets_one_task_per_call(make_queue):
+    handlers = HandlerRegistry()
+    calls = []
+    handlers.register(TaskType.SMS, calls.append)
+    q = make_queue(handlers)
+    tasks = [Task.create(str(i), TaskType.SMS) for i in range(3)]
+    q.enqueue_many(tasks)
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks))
+    assert sorted(calls, key=lambda t: t.payload) == tasks
+
+# One worker, held up by a gated SMS Task, so the EMAIL Tasks pile up in the Scheduler before any is popped:
+def gated_queue(make_queue, handlers: HandlerRegistry):
+    gate = threading.Event()
+    handlers.register(TaskType.SMS, lambda task: gate.wait(5))
+    q = make_queue(handlers, min_workers=1, max_workers=1)
+    blocker = Task.create("gate", TaskType.SMS, priority=10)
+    q.enqueue(blocker)
+    assert wait_until(lambda: blocker.status == TaskStatus.INPROGRESS)
+    return q, gate
+
+def test_pop_more_groups_queued_tasks_of_the_type_into_batches(make_queue):
+    handlers = HandlerRegistry()
+    batches = []
+    handlers.register(TaskType.EMAIL, lambda tasks: batches.append(list(tasks)), batch_size=4)
+    q, gate = gated_queue(make_queue, handlers)
+    tasks = [Task.create(str(i), TaskType.EMAIL) for i in range(6)]
+    q.enqueue_many(tasks)
+    gate.set()
+
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks))
+    assert [len(b) for b in batches] == [4, 2]
+    assert [t for b in batches for t in b] == tasks     # FIFO within the type, split at batch_size.
+    assert all(t.attempts == 1 for t in tasks)
+
+def test_partial_batch_failure_only_fails_its_own_tasks(make_queue):
+    handlers = HandlerRegistry()
+    def send_emails(tasks: list[Task]):
+        return [ValueError("bounced") if t.payload == "bad" else None for t in tasks]
+    handlers.register(TaskType.EMAIL, send_emails, batch_size=8)
+    q, gate = gated_queue(make_queue, handlers)
+    good = [Task.create("good", TaskType.EMAIL) for _ in range(3)]
+    bad = Task.create("bad", TaskType.EMAIL)
+    q.enqueue_many(good[:2] + [bad] + good[2:])
+    gate.set()
+
+    assert wait_until(lambda: bad.status == TaskStatus.FAILED and bad.attempts == bad.max_retries)
+    assert all(t.status == TaskStatus.COMPLETED and t.attempts == 1 for t in good)
+
+def test_raising_batch_handler_fails_the_whole_batch(make_queue):
+    handlers = HandlerRegistry()
+    def send_emails(tasks: list[Task]):
+        raise ConnectionError("smtp down")
+    handlers.register(TaskType.EMAIL, send_emails, batch_size=8)
+    q, gate = gated_queue(make_queue, handlers)
+    tasks = [Task.create(str(i), TaskType.EMAIL) for i in range(3)]
+    q.enqueue_many(tasks)
+    gate.set()
+    assert wait_until(lambda: all(t.status == TaskStatus.FAILED and t.attempts == t.max_retries for t in tasks))
+
+def test_sync_handler_on_the_async_lane_does_not_block_the_loop(make_queue):
+    handlers = HandlerRegistry()
+    release = threading.Event()
+    handlers.register(TaskType.EMAIL, lambda task: release.wait(5))     # Plain, blocking function.
+    @handlers.register(TaskType.SMS)
+    async def send_sms(task: Task) -> None:
+        await asyncio.sleep(0)
+    q = make_queue(handlers, backends={TaskType.EMAIL: "async", TaskType.SMS: "async"})
+    slow, fast = Task.create("slow", TaskType.EMAIL), Task.create("fast", TaskType.SMS)
+    q.enqueue(slow)
+    assert wait_until(lambda: slow.status == TaskStatus.INPROGRESS)
+    q.enqueue(fast)
+    try:
+        assert wait_until(lambda: fast.status == TaskStatus.COMPLETED, timeout=2)
+        assert slow.status == TaskStatus.INPROGRESS
+    finally:
+        release.set()
+    assert wait_until(lambda: slow.status == TaskStatus.COMPLETED)
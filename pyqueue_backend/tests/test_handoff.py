@@ -0,0 +1,69 @@
+import os
+import subprocess
+import sys
+import time
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.handoff import claim_handoffs, read_handoff, release_handoff, write_handoff
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def slow_handlers(ran: list[str]) -> HandlerRegistry:
+    def handler(task: Task) -> None:
+        ran.append(task.payload)
+        time.sleep(0.05)
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, handler)
+    return handlers
+
+def test_drain_hands_off_and_the_next_queue_loads_it(make_queue, tmp_path):
+    ran: list[str] = []
+    q = make_queue(slow_handlers(ran), min_workers=1, max_workers=1, handoff_dir=str(tmp_path))
+    tasks = [Task.create(f"t{i}", TaskType.EMAIL) for i in range(20)]
+    later = Task.create("later", TaskType.EMAIL, run_at=time.time() + 60)
+    q.enqueue_many(tasks + [later])
+    assert wait_until(lambda: tasks[0].status == TaskStatus.INPROGRESS)
+
+    q.shutdown(grace=1.0)
+    assert tasks[0].status == TaskStatus.COMPLETED     # The running attempt got to finish...
+    handed_off = [t for t in tasks if t.status != TaskStatus.COMPLETED]
+    assert handed_off       # ...the backlog didn't.
+    (path,) = tmp_path.iterdir()
+    assert {t.t_id for t in read_handoff(str(path))} == {t.t_id for t in handed_off} | {later.t_id}
+
+    restarted = make_queue(slow_handlers(ran), handoff_dir=str(tmp_path))
+    assert restarted.load_handoff() == len(handed_off) + 1
+    assert list(tmp_path.iterdir()) == []
+    assert wait_until(lambda: all(restarted.get_job_by_id(t.t_id).status == TaskStatus.COMPLETED for t in handed_off))
+    assert restarted.get_job_by_id(later.t_id).run_at == later.run_at
+    assert sorted(ran) == sorted(t.payload for t in tasks)    # Each Task ran exactly once across both processes.
+
+CLAIM_AND_EXIT = """
+import sys
+from models.handoff import claim_handoffs
+print(len(claim_handoffs(sys.argv[1])))
+"""  # Claims the files and exits without loading them (a pod that died mid-startup).
+
+def test_claim_left_by_a_dead_process_is_picked_up(tmp_path):
+    task = Task.create("orphan", TaskType.EMAIL)
+    path = write_handoff(str(tmp_path), [task])
+    child = subprocess.run([sys.executable, "-c", CLAIM_AND_EXIT, str(tmp_path)], capture_output=True, text=True,
+                           cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))), check=True)
+    assert child.stdout.strip() == "1" and os.listdir(tmp_path) == [os.path.basename(path) + ".claimed"]
+
+    (claimed,) = claim_handoffs(str(tmp_path))
+    assert claimed == path + ".claimed"
+    assert [t.t_id for t in read_handoff(claimed)] == [task.t_id]
+    release_handoff(claimed)
+    assert list(tmp_path.iterdir()) == []
+
+def test_live_claims_are_left_alone(tmp_path):
+    path = write_handoff(str(tmp_path), [Task.create("live", TaskType.EMAIL)])
+    (claimed,) = claim_handoffs(str(tmp_path))   # Held until it's released - as if by another process still loading it.
+
+    assert claim_handoffs(str(tmp_path)) == []
+    assert os.listdir(tmp_path) == [os.path.basename(path) + ".claimed"]
+    release_handoff(claimed)
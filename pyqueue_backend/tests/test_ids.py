@@ -0,0 +1,34 @@
+from threading import Thread
+
+from models import ids
+from models.ids import PREFIX, id_time_ms, new_id
+
+def seq(t_id: str) -> int:
+    return int(t_id[-6:], 16)
+
+def test_sequence_restarts_every_millisecond():
+    batch = [new_id() for _ in range(20_000)]
+    assert batch == sorted(batch) and len(set(batch)) == len(batch)
+    assert all(len(t_id) == len(PREFIX) + 24 for t_id in batch)
+    firsts = [b for a, b in zip(batch, batch[1:]) if id_time_ms(a) != id_time_ms(b)]
+    assert firsts and all(seq(t_id) == 0 for t_id in firsts)
+
+def test_exhausted_sequence_waits_for_the_next_millisecond(monkeypatch):
+    monkeypatch.setattr(ids, "_SEQ_MASK", 3)
+    batch = [new_id() for _ in range(50)]
+    assert batch == sorted(batch) and len(set(batch)) == 50     # Never wraps back below an earlier ID.
+    assert max(map(seq, batch)) <= 3
+    assert len({id_time_ms(t_id) for t_id in batch}) >= 50 // 4
+
+def test_ids_are_unique_across_threads():
+    results: list[list[str]] = [[] for _ in range(8)]
+    def generate(out: list[str]) -> None:
+        out.extend(new_id() for _ in range(20_000))
+    threads = [Thread(target=generate, args=(out,)) for out in results]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    everything = [t_id for out in results for t_id in out]
+    assert len(set(everything)) == len(everything)
+    assert all(out == sorted(out) for out in results)
@@ -0,0 +1,96 @@
+import json
+import os
+import time
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.journal import SNAPSHOT_FILE, WAL_FILE, WriteAheadLog, decode_task, encode_task
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def replay(directory) -> dict[str, Task]:
+    wal = WriteAheadLog(str(directory))
+    try:
+        return wal.replay()
+    finally:
+        wal.close()
+
+def test_task_record_round_trip():
+    parent = Task.create("parent", TaskType.EMAIL)
+    task = Task.create("payload", TaskType.REPORT, priority=5, run_at=time.time() + 30, depends_on=(parent.t_id,))
+    task.status, task.attempts = TaskStatus.FAILED, 2
+    decoded = decode_task(json.loads(json.dumps(encode_task(task))))
+    assert decoded == task
+    assert decode_task(encode_task(parent)).depends_on is None
+
+def test_replay_applies_every_record_kind(tmp_path):
+    a, b, c = (Task.create(name, TaskType.EMAIL) for name in "abc")
+    wal = WriteAheadLog(str(tmp_path))
+    wal.log_enqueue(a)
+    wal.log_clear()
+    seq = wal.log_enqueue_many([b, c])
+    b.status, b.attempts = TaskStatus.COMPLETED, 1
+    wal.log_status(b)
+    wal.log_delete(c.t_id)
+    wal.wait_durable(seq)
+    wal.close()
+
+    jobs = replay(tmp_path)
+    assert list(jobs) == [b.t_id]
+    assert jobs[b.t_id].status == TaskStatus.COMPLETED and jobs[b.t_id].attempts == 1
+
+def test_torn_tail_is_truncated_before_appending(tmp_path):
+    a, b = Task.create("a", TaskType.EMAIL), Task.create("b", TaskType.EMAIL)
+    wal = WriteAheadLog(str(tmp_path))
+    wal.wait_durable(wal.log_enqueue(a))
+    wal.close()
+    path = tmp_path / WAL_FILE
+    intact = path.stat().st_size
+    with open(path, "ab") as f:
+        f.write(b'["S","' + a.t_id.encode() + b'","COMPL')     # Crash mid-write.
+
+    wal = WriteAheadLog(str(tmp_path))
+    assert path.stat().st_size == intact
+    wal.wait_durable(wal.log_enqueue(b))
+    wal.close()
+    jobs = replay(tmp_path)
+    assert set(jobs) == {a.t_id, b.t_id}     # b's record didn't land behind the garbage.
+    assert jobs[a.t_id].status == TaskStatus.QUEUED
+
+def test_line_without_newline_is_torn(tmp_path):
+    (tmp_path / WAL_FILE).write_bytes(b'["C"]')
+    WriteAheadLog(str(tmp_path)).close()
+    assert (tmp_path / WAL_FILE).read_bytes() == b""
+
+def test_compaction_then_recover(make_queue, tmp_path):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, lambda task: None)
+    q = make_queue(handlers, wal_dir=str(tmp_path), wal_compact_every=20)
+    tasks = [Task.create(f"t{i}", TaskType.EMAIL) for i in range(50)]
+    for task in tasks:
+        q.enqueue(task)
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks))
+    later = Task.create("later", TaskType.EMAIL, run_at=time.time() + 60)
+    q.enqueue(later)
+    q.shutdown()
+
+    assert (tmp_path / SNAPSHOT_FILE).exists()
+    assert not [n for n in os.listdir(tmp_path) if n.startswith("wal-")]   # Compacted segments are deleted.
+    restarted = make_queue(handlers, wal_dir=str(tmp_path))
+    assert restarted.recover() == 1
+    assert restarted.get_job_count() == 51
+    assert all(restarted.get_job_by_id(t.t_id).status == TaskStatus.COMPLETED for t in tasks)
+    assert restarted.get_job_by_id(later.t_id).status == TaskStatus.QUEUED
+
+def test_replay_skips_segments_the_snapshot_covers(tmp_path):
+    # A crash after the snapshot was replaced but before the segments it covers were deleted:
+    a = Task.create("a", TaskType.EMAIL)
+    stale = Task.create("stale", TaskType.EMAIL)
+    (tmp_path / SNAPSHOT_FILE).write_text(json.dumps({"covers": 2}) + "\n" + json.dumps(encode_task(a)) + "\n")
+    (tmp_path / "wal-2.log").write_text(json.dumps(["E", encode_task(stale)]) + "\n")
+    (tmp_path / "wal-3.log").write_text(json.dumps(["S", a.t_id, "COMPLETED", 1]) + "\n")
+
+    jobs = replay(tmp_path)
+    assert list(jobs) == [a.t_id] and jobs[a.t_id].status == TaskStatus.COMPLETED
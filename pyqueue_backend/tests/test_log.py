@@ -0,0 +1,82 @@
+import json
+import logging
+
+import pytest
+
+from enums.TaskType import TaskType
+from models import log
+from models.task import Task
+
+@pytest.fixture
+def json_lines(capsys):
+    def configure(**kwargs) -> None:
+        log.configure_logging(background=False, **kwargs)
+    def read() -> list[dict]:
+        return [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    yield configure, read
+    log.configure_logging()     # Back to plain settings (no per-type levels / sampling), then unhook from stdout:
+    log.stop_logging()
+    root = logging.getLogger(log.ROOT)
+    root.setLevel(logging.NOTSET)
+    root.propagate = True
+
+def test_task_events_carry_the_task_fields(json_lines):
+    configure, read = json_lines
+    configure()
+    task = Task.create("hi", TaskType.SMS)
+    task.attempts = 2
+    log.task_log(logging.INFO, "completed", task, "Task %s complete", task.t_id, kind="handler")
+    (entry,) = read()
+    assert entry["level"] == "INFO" and entry["logger"] == "pyqueue.task.SMS"
+    assert entry["msg"] == f"Task {task.t_id} complete"
+    assert (entry["event"], entry["task_id"], entry["type"], entry["attempt"], entry["kind"]) == (
+        "completed", task.t_id, "SMS", 2, "handler")
+    assert isinstance(entry["ts"], float)
+    assert not {"args", "levelno", "pathname", "thread"} & set(entry)   # Only extra= fields beyond the four basics.
+
+def test_exceptions_are_formatted_into_exc(json_lines):
+    configure, read = json_lines
+    configure()
+    task = Task.create("hi", TaskType.EMAIL)
+    try:
+        raise ValueError("bounced")
+    except ValueError as e:
+        log.task_log(logging.ERROR, "error", task, "failed", exc_info=e)
+    (entry,) = read()
+    assert entry["level"] == "ERROR" and "ValueError: bounced" in entry["exc"]
+
+def test_extra_fields_on_plain_loggers(json_lines):
+    configure, read = json_lines
+    configure()
+    logging.getLogger("pyqueue.queue").warning("resized", extra={"event": "pool_resized", "from_size": 1, "to_size": 4})
+    (entry,) = read()
+    assert (entry["event"], entry["from_size"], entry["to_size"]) == ("pool_resized", 1, 4)
+
+def test_per_type_levels(json_lines):
+    configure, read = json_lines
+    configure(level="INFO", type_levels={TaskType.SMS: "WARNING"})
+    sms, email = Task.create("a", TaskType.SMS), Task.create("b", TaskType.EMAIL)
+    log.task_log(logging.INFO, "started", sms, "started")
+    log.task_log(logging.WARNING, "retrying", sms, "retrying")
+    log.task_log(logging.INFO, "started", email, "started")
+    assert [(e["type"], e["event"]) for e in read()] == [("SMS", "retrying"), ("EMAIL", "started")]
+
+def test_sampling_keeps_or_drops_a_task_s_whole_lifecycle_but_never_warnings(json_lines):
+    configure, read = json_lines
+    configure(sample={TaskType.SMS: 0.5})
+    tasks = [Task.create(str(i), TaskType.SMS) for i in range(200)]
+    for task in tasks:
+        for event in ("started", "completed"):
+            log.task_log(logging.INFO, event, task, event)
+        log.task_log(logging.ERROR, "failed", task, "failed")
+    entries = read()
+    info = [e["task_id"] for e in entries if e["level"] == "INFO"]
+    assert all(info.count(t_id) == 2 for t_id in set(info))     # Both lines of a sampled Task, or neither.
+    assert 40 < len(set(info)) < 160
+    assert sum(e["level"] == "ERROR" for e in entries) == 200
+
+def test_full_buffer_drops_and_counts_instead_of_blocking():
+    handler = log._NonBlockingHandler(maxsize=2)
+    for i in range(5):
+        handler.handle(logging.LogRecord("pyqueue", logging.INFO, "", 0, str(i), None, None))
+    assert handler.queue.qsize() == 2 and handler.dropped == 3
@@ -0,0 +1,22 @@
+import json
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.task import Task
+from schemas.mappers import task_to_json, task_to_response
+
+def test_cached_json_matches_the_response_model():
+    task = Task.create("payload", TaskType.EMAIL, priority=2)
+    assert json.loads(task_to_json(task)) == task_to_response(task).model_dump(mode="json")
+
+def test_cached_json_follows_every_mutable_field():
+    parent, dup = Task.create("parent", TaskType.EMAIL), Task.create("dup", TaskType.EMAIL)
+    task = Task.create("child", TaskType.SMS, depends_on=(dup.t_id,))
+    assert json.loads(task_to_json(task))["depends_on"] == [dup.t_id]
+
+    task.depends_on = (parent.t_id,)    # enqueue_many() pointing it at the Task its duplicate parent maps to.
+    assert json.loads(task_to_json(task))["depends_on"] == [parent.t_id]
+    task.depends_on = None  # _adopt() dropping a parent that finished before the handoff.
+    assert json.loads(task_to_json(task))["depends_on"] is None
+    task.status, task.attempts, task.priority = TaskStatus.FAILED, 1, 7
+    assert json.loads(task_to_json(task)) == task_to_response(task).model_dump(mode="json")
@@ -0,0 +1,70 @@
+import threading
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.metrics import Histogram, Metrics
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def samples(text: str) -> dict[str, float]:
+    out = {}
+    for line in text.splitlines():
+        if line and not line.startswith("#"):
+            name, value = line.rsplit(" ", 1)
+            out[name] = float(value)
+    return out
+
+def test_histogram_buckets_are_cumulative():
+    hist = Histogram((0.1, 1.0))
+    for value in (0.05, 0.1, 0.5, 3.0):
+        hist.observe(value)
+    assert list(hist.render("x", 'type="SMS"')) == [
+        'x_bucket{type="SMS",le="0.1"} 2', 'x_bucket{type="SMS",le="1.0"} 3', 'x_bucket{type="SMS",le="+Inf"} 4',
+        'x_sum{type="SMS"} 3.65', 'x_count{type="SMS"} 4',
+    ]
+
+def test_render_adds_up_every_thread_s_shard_including_exited_threads():
+    metrics = Metrics()
+    def record(n: int) -> None:
+        for _ in range(n):
+            metrics.observe_execution(TaskType.SMS, 0.002)
+            metrics.worker_error(TaskType.SMS, "runtime")
+    threads = [threading.Thread(target=record, args=(100,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    record(5)   # This (still alive) thread's own shard.
+
+    first = samples(metrics.render())
+    assert first['pyqueue_execution_seconds_count{type="SMS"}'] == 805
+    assert first['pyqueue_execution_seconds_bucket{type="SMS",le="0.0025"}'] == 805
+    assert first['pyqueue_worker_errors_total{type="SMS",kind="runtime"}'] == 805
+    assert len(metrics._shards) == 1    # Exited threads' shards were folded into the retired one...
+    assert samples(metrics.render()) == first   # ...without being counted twice on the next scrape.
+
+def test_render_includes_counters_and_collected_gauges():
+    metrics = Metrics()
+    metrics.enqueued[TaskType.EMAIL] = 3
+    metrics.transition(TaskType.EMAIL, TaskStatus.QUEUED, TaskStatus.INPROGRESS)
+    text = metrics.render({"pyqueue_queue_depth": ("gauge", "Queued tasks.", {"": 7, 'lane="thread"': 7})})
+    assert "# TYPE pyqueue_queue_depth gauge" in text
+    values = samples(text)
+    assert values['pyqueue_tasks_enqueued_total{type="EMAIL"}'] == 3
+    assert values['pyqueue_task_transitions_total{type="EMAIL",from="QUEUED",to="INPROGRESS"}'] == 1
+    assert values["pyqueue_queue_depth"] == 7 and values['pyqueue_queue_depth{lane="thread"}'] == 7
+
+def test_queue_metrics_cover_work_done_on_pool_threads(make_queue):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: None)
+    q = make_queue(handlers, min_workers=3, max_workers=3)
+    tasks = [Task.create(str(i), TaskType.SMS) for i in range(20)]
+    q.enqueue_many(tasks)
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks))
+    values = samples(q.render_metrics())
+    assert values['pyqueue_tasks_enqueued_total{type="SMS"}'] == 20
+    assert wait_until(lambda: samples(q.render_metrics())['pyqueue_execution_seconds_count{type="SMS"}'] == 20)
+    assert values['pyqueue_queue_wait_seconds_count{type="SMS"}'] == 20
+    assert values['pyqueue_task_transitions_total{type="SMS",from="INPROGRESS",to="COMPLETED"}'] == 20
@@ -0,0 +1,59 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def sleeping_handlers(seconds: float) -> HandlerRegistry:
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, lambda task: time.sleep(seconds))
+    return handlers
+
+def count_pops(queue) -> list[int]:
+    calls = [0]
+    pop = queue.scheduler.pop
+    def counted(*args, **kwargs):
+        calls[0] += 1
+        return pop(*args, **kwargs)
+    queue.scheduler.pop = counted
+    return calls
+
+def test_idle_workers_exit_instead_of_spinning_during_a_drain(make_queue, tmp_path):
+    q = make_queue(sleeping_handlers(0.3), min_workers=4, max_workers=4, handoff_dir=str(tmp_path))
+    task = Task.create("slow", TaskType.EMAIL)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.INPROGRESS)
+    calls = count_pops(q)
+
+    q.shutdown(grace=2.0)
+    assert task.status == TaskStatus.COMPLETED
+    assert calls[0] < 20    # One last pop per worker - not a busy loop for the whole attempt.
+
+def test_pool_grows_under_backlog_and_shrinks_back_when_idle(make_queue, make_app):
+    gate = threading.Event()
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, lambda task: gate.wait(5))
+    q = make_queue(handlers, min_workers=1, max_workers=4, scale_interval=0.02, idle_timeout=0.2)
+    client = TestClient(make_app(q))
+    tasks = [Task.create(str(i), TaskType.EMAIL) for i in range(6)]
+    q.enqueue_many(tasks)
+
+    assert wait_until(lambda: q.pool.stats()["busy"] == 4)
+    pool = client.get("/api/pool").json()
+    assert (pool["size"], pool["busy"], pool["idle"], pool["queue_depth"]) == (4, 4, 0, 2)
+    assert (pool["min_workers"], pool["max_workers"]) == (1, 4)     # Capped at max_workers despite the backlog.
+
+    gate.set()
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks))
+    assert wait_until(lambda: q.pool.stats()["size"] == 1)
+    pool = client.get("/api/pool").json()
+    assert (pool["size"], pool["busy"], pool["queue_depth"]) == (1, 0, 0)
+    reasons = [e["reason"] for e in pool["resize_events"]]
+    assert reasons[0] == "startup" and any(r.startswith("backlog") for r in reasons) and reasons.count("idle") == 3
+    assert pool["avg_task_seconds"] is not None
@@ -0,0 +1,88 @@
+import os
+import time
+from concurrent.futures import Future
+from pathlib import Path
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.task import Task
+
+from tests.conftest import wait_until
+
+# Process-lane handlers are pickled by reference into the children, so they live at module level:
+def build_report(task: Task) -> None:
+    pass
+
+def record_pid(task: Task) -> None:
+    Path(task.payload).write_text(str(os.getpid()))
+
+def always_fail(task: Task) -> None:
+    raise ValueError("bad input")
+
+def process_queue(make_queue, **config):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.REPORT, build_report)
+    return make_queue(handlers, backends={TaskType.REPORT: "process"}, process_workers=1, **config)
+
+def running(queue, t_type: TaskType) -> int:
+    return next(s["running"] for s in queue.scheduler.limit_stats() if s["t_type"] == t_type)
+
+def test_task_runs_in_a_child_and_reports_back_through_the_result_channel(make_queue, tmp_path):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.REPORT, record_pid)
+    q = make_queue(handlers, backends={TaskType.REPORT: "process"}, process_workers=1)
+    tasks = [Task.create(str(tmp_path / f"pid-{i}"), TaskType.REPORT) for i in range(3)]
+    q.enqueue_many(tasks)
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks), timeout=30)
+    assert all(t.attempts == 1 for t in tasks)   # The attempt count bumped in the child came back with the result.
+    pids = {int(Path(t.payload).read_text()) for t in tasks}
+    assert len(pids) == 1 and os.getpid() not in pids     # One warm child ran them all.
+    assert wait_until(lambda: not q.process_backend._inflight and running(q, TaskType.REPORT) == 0)
+
+def test_failing_handler_in_a_child_is_retried_until_max_retries(make_queue):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.REPORT, always_fail)
+    q = make_queue(handlers, backends={TaskType.REPORT: "process"}, process_workers=1)
+    task = Task.create("r", TaskType.REPORT)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.FAILED and task.attempts == task.max_retries, timeout=30)
+    time.sleep(0.1)
+    assert task.attempts == task.max_retries    # ...and not re-run after that.
+
+def test_future_cancelled_before_it_ran_leaves_its_task_queued(make_queue):
+    q = process_queue(make_queue)
+    backend = q.process_backend
+    submit = backend._executor.submit
+    def cancelled_submit(fn, *args):
+        future = Future()
+        future.cancel()     # What shutdown(cancel_futures=True) does to a call still waiting in the executor.
+        return future
+    backend._executor.submit = cancelled_submit
+
+    task = Task.create("r", TaskType.REPORT)
+    q.enqueue(task)
+    assert wait_until(lambda: q.scheduler.runnable_depth("process") == 0 and running(q, TaskType.REPORT) == 0)
+    assert task.status == TaskStatus.QUEUED and task.attempts == 0
+    assert not backend._inflight
+
+    # Its process slot came back (process_workers=1):
+    backend._executor.submit = submit
+    other = Task.create("r", TaskType.REPORT)
+    q.enqueue(other)
+    assert wait_until(lambda: other.status == TaskStatus.COMPLETED, timeout=30)
+
+def crash_once(task: Task) -> None:
+    marker = Path(task.payload)
+    if not marker.exists():
+        marker.touch()
+        os._exit(1)     # The child dies mid-task (segfault, OOM kill...).
+
+def test_crashed_child_counts_as_a_failed_attempt_and_is_retried(make_queue, tmp_path):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.REPORT, crash_once)
+    q = make_queue(handlers, backends={TaskType.REPORT: "process"}, process_workers=1)
+    task = Task.create(str(tmp_path / "crashed"), TaskType.REPORT)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED, timeout=30)
+    assert task.attempts == 2
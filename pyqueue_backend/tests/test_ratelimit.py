@@ -0,0 +1,86 @@
+import threading
+import time
+
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.ratelimit import RateMeter, TokenBucket
+from models.scheduler import Scheduler
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def test_token_bucket_starts_full_and_refills_at_rate():
+    bucket = TokenBucket(rate=2.0, burst=3, now=0.0)
+    assert [bucket.try_take(0.0) for _ in range(4)] == [True, True, True, False]
+    assert bucket.wait_time(0.0) == 0.5
+    assert bucket.available(0.25) == 0.5 and not bucket.try_take(0.25)
+    assert bucket.try_take(0.5)
+    assert bucket.available(100.0) == 3    # Never above burst.
+
+def test_rate_meter_decays():
+    meter = RateMeter(window=10.0)
+    for _ in range(10):
+        meter.mark(0.0)
+    assert abs(meter.rate(0.0) - 1.0) < 1e-9
+    assert 0.3 < meter.rate(10.0) < 0.4
+
+def test_rate_limited_type_is_parked_until_its_next_token():
+    s = Scheduler()
+    s.set_limits(TaskType.SMS, rate=4.0, burst=1)
+    s.push_many([Task.create(str(i), TaskType.SMS) for i in range(2)])
+    assert s.pop(timeout=0) is not None
+    assert s.pop(timeout=0) is None     # Parked - no token yet.
+    started = time.monotonic()
+    assert s.pop(timeout=2) is not None
+    assert 0.15 <= time.monotonic() - started < 1.0
+
+def test_parked_type_does_not_hold_up_the_rest_of_the_lane():
+    s = Scheduler()
+    s.set_limits(TaskType.SMS, rate=0.01, burst=1)
+    sms = [Task.create(str(i), TaskType.SMS) for i in range(2)]
+    email = Task.create("e", TaskType.EMAIL)
+    s.push_many(sms + [email])
+    popped = [s.pop(timeout=0), s.pop(timeout=0)]
+    assert sms[0] in popped and email in popped
+    assert s.pop(timeout=0) is None
+
+def test_concurrency_cap_is_released_by_done():
+    s = Scheduler()
+    s.set_limits(TaskType.SMS, max_concurrency=1)
+    s.push_many([Task.create(str(i), TaskType.SMS) for i in range(2)])
+    first = s.pop(timeout=0)
+    result = []
+    consumer = threading.Thread(target=lambda: result.append(s.pop(timeout=5)))
+    consumer.start()
+    time.sleep(0.05)
+    assert consumer.is_alive()  # At the cap - waiting, not busy-looping through the timeout.
+    s.done(first.t_type)
+    consumer.join(2)
+    assert not consumer.is_alive() and result[0] is not None
+
+def test_limits_can_be_changed_live_through_the_api(make_queue, make_app):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.EMAIL, lambda task: None)
+    q = make_queue(handlers)
+    client = TestClient(make_app(q))
+    r = client.put("/api/limits/EMAIL", json={"rate": 0.1, "burst": 1})
+    assert r.status_code == 200 and r.json()["rate"] == 0.1 and r.json()["max_concurrency"] is None
+
+    tasks = [Task.create(str(i), TaskType.EMAIL) for i in range(3)]
+    q.enqueue_many(tasks)
+    assert wait_until(lambda: tasks[0].status == TaskStatus.COMPLETED)
+    time.sleep(0.05)
+    stats = next(s for s in client.get("/api/limits").json() if s["t_type"] == "EMAIL")
+    assert stats["parked"] and stats["queued"] == 2 and stats["dispatched"] == 1
+
+    # Lifting the limit lets the parked Tasks go right away:
+    assert client.put("/api/limits/EMAIL", json={}).json()["rate"] is None
+    assert wait_until(lambda: all(t.status == TaskStatus.COMPLETED for t in tasks), timeout=2)
+
+def test_limits_are_validated(make_queue, make_app):
+    client = TestClient(make_app(make_queue()))
+    assert client.put("/api/limits/EMAIL", json={"rate": 0}).status_code == 422
+    assert client.put("/api/limits/EMAIL", json={"max_concurrency": 0}).status_code == 422
@@ -0,0 +1,83 @@
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.registry import JobRegistry
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def handlers() -> HandlerRegistry:
+    def fail(task: Task) -> None:
+        raise RuntimeError("handler failed")
+    registry = HandlerRegistry()
+    registry.register(TaskType.EMAIL, lambda task: None)
+    registry.register(TaskType.FAIL, fail)
+    return registry
+
+def test_registry_stats_count_every_status(make_queue, make_app):
+    q = make_queue(handlers(), retry_base_delay=60, retry_max_delay=60)     # A failed attempt waits a minute for its retry.
+    done = Task.create("done", TaskType.EMAIL)
+    retrying = Task.create("retrying", TaskType.FAIL)
+    later = Task.create("later", TaskType.EMAIL, run_at=time.time() + 60)
+    q.enqueue_many([done, retrying, later])
+    assert wait_until(lambda: done.status == TaskStatus.COMPLETED and retrying.status == TaskStatus.FAILED)
+    q.cancel_job(later)
+
+    body = TestClient(make_app(q)).get("/api/registry").json()
+    assert body["size"] == 3
+    assert body["by_status"] == {"QUEUED": 0, "INPROGRESS": 0, "COMPLETED": 1, "FAILED": 1, "CANCELLED": 1}
+    assert body["retained"] == 0    # Retention is off.
+
+def test_retained_counts_finished_tasks_only(make_queue):
+    q = make_queue(handlers(), retention_max_terminal=10, retry_base_delay=60, retry_max_delay=60)
+    done = Task.create("done", TaskType.EMAIL)
+    retrying = Task.create("retrying", TaskType.FAIL)
+    q.enqueue_many([done, retrying])
+    assert wait_until(lambda: done.status == TaskStatus.COMPLETED and retrying.status == TaskStatus.FAILED)
+
+    stats = q.get_registry_stats()
+    assert stats["retained"] == 1   # The FAILED Task still has retries left.
+    assert stats["by_status"]["FAILED"] == 1
+
+@pytest.mark.parametrize("shards", [1, 4])
+def test_pages_follow_creation_order_with_filters(shards):
+    registry = JobRegistry(shards)
+    tasks = [Task.create(f"t{i}", TaskType.EMAIL if i % 3 else TaskType.SMS) for i in range(500)]
+    for task in tasks:
+        registry.add(task)
+    for task in tasks[::5]:
+        old, task.status = task.status, TaskStatus.COMPLETED
+        registry.move(task, old)
+    registry.remove(tasks[10].t_id)
+
+    expected = [t for t in tasks if t.t_type == TaskType.EMAIL and t.status == TaskStatus.QUEUED and t is not tasks[10]]
+    seen, cursor = [], None
+    while True:
+        page, cursor = registry.page(TaskStatus.QUEUED, TaskType.EMAIL, cursor, 37)
+        seen += page
+        if cursor is None:
+            break
+    assert seen == expected
+    assert registry.page(TaskStatus.QUEUED, TaskType.EMAIL)[0] == expected
+    assert registry.count(TaskStatus.QUEUED, TaskType.EMAIL) == len(expected)
+    assert len(registry) == 499 and tasks[10].t_id not in registry
+
+def test_striped_registry_shares_one_lookup_table():
+    registry = JobRegistry(4)
+    tasks = [Task.create(f"t{i}", TaskType.EMAIL) for i in range(50)]
+    for task in tasks:
+        registry.add(task)
+    registry.add(tasks[0])  # Already registered - a no-op, not a second entry.
+    assert len(registry._by_seq) == 50
+    assert sorted(registry.values(), key=tasks.index) == tasks
+    assert registry.page()[0] == tasks
+
+    registry.remove(tasks[7].t_id)
+    assert tasks[7] not in registry.page()[0] and len(registry._by_seq) == 49
+    registry.clear()
+    assert registry._by_seq == {} and registry.page() == ([], None) and len(registry) == 0
@@ -0,0 +1,81 @@
+import gzip
+import json
+import time
+
+from fastapi.testclient import TestClient
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.journal import decode_task
+from models.retention import RetentionIndex, TaskArchive, is_terminal
+from models.task import Task
+
+from tests.conftest import wait_until
+
+def finished(status: TaskStatus, attempts: int = 1) -> Task:
+    task = Task.create("x", TaskType.SMS)
+    task.status, task.attempts = status, attempts
+    return task
+
+def test_terminal_means_done_for_good():
+    assert is_terminal(finished(TaskStatus.COMPLETED)) and is_terminal(finished(TaskStatus.CANCELLED))
+    assert is_terminal(finished(TaskStatus.FAILED, attempts=3))
+    assert not is_terminal(finished(TaskStatus.FAILED, attempts=1))    # About to be retried.
+    assert not is_terminal(finished(TaskStatus.INPROGRESS))
+
+def test_count_limit_evicts_oldest_first():
+    index = RetentionIndex(max_terminal=2)
+    tasks = [finished(TaskStatus.COMPLETED) for _ in range(4)]
+    for task in tasks:
+        index.update(task)
+    assert index.expired() == [tasks[0].t_id, tasks[1].t_id]
+    assert len(index) == 2 and index.evicted == {"count": 2, "ttl": 0}
+
+def test_ttl_evicts_by_age_and_requeued_tasks_drop_out():
+    index = RetentionIndex(ttl=10.0)
+    old, retried, young = (finished(TaskStatus.COMPLETED) for _ in range(3))
+    index.update(old)
+    index.update(retried)
+    retried.status = TaskStatus.QUEUED
+    index.update(retried)
+    index.update(young)
+    now = time.monotonic()
+    assert index.expired(now) == []
+    assert index.expired(now + 10.5) == [old.t_id, young.t_id]
+    assert index.evicted == {"count": 0, "ttl": 2}
+
+def test_archive_appends_gzip_members_readable_as_one_stream(tmp_path):
+    path = str(tmp_path / "archive" / "evicted.jsonl.gz")
+    first, second = finished(TaskStatus.COMPLETED), finished(TaskStatus.FAILED, attempts=3)
+    archive = TaskArchive(path)
+    archive.write([first])
+    archive.close()
+    archive = TaskArchive(path)     # Reopened (a restart) - appends a second gzip member.
+    archive.write([second])
+    archive.close()
+    with gzip.open(path, "rt") as f:
+        restored = [decode_task(json.loads(line)) for line in f]
+    assert [(t.t_id, t.status, t.attempts) for t in restored] == [
+        (first.t_id, TaskStatus.COMPLETED, 1), (second.t_id, TaskStatus.FAILED, 3),
+    ]
+
+def test_queue_evicts_finished_tasks_into_the_archive(make_queue, make_app, tmp_path):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: None)
+    path = str(tmp_path / "evicted.jsonl.gz")
+    q = make_queue(handlers, retention_max_terminal=2, archive_path=path)
+    start = q.events.last_seq
+    tasks = [Task.create(str(i), TaskType.SMS) for i in range(5)]
+    for task in tasks:
+        q.enqueue(task)
+        assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+
+    assert wait_until(lambda: len(q.jobs) == 2)
+    stats = TestClient(make_app(q)).get("/api/registry").json()
+    assert stats["size"] == 2 and stats["retained"] == 2
+    assert stats["evicted"]["count"] == 3 and stats["archived"] == 3
+    assert [e.task.t_id for e in q.events.since(start) if e.kind == "evicted"] == [t.t_id for t in tasks[:3]]
+    q.shutdown()
+    with gzip.open(path, "rt") as f:
+        assert [json.loads(line)[0] for line in f] == [t.t_id for t in tasks[:3]]
@@ -0,0 +1,79 @@
+import threading
+from collections import Counter
+
+import pytest
+
+from enums.TaskType import TaskType
+from models.scheduler import Scheduler
+from models.task import Task
+
+def tasks(t_type: TaskType, n: int, priority: int = 0) -> list[Task]:
+    return [Task.create(f"{t_type.value}-{i}", t_type, priority=priority) for i in range(n)]
+
+def drain(scheduler: Scheduler, n: int) -> list[Task]:
+    popped = []
+    for _ in range(n):
+        task = scheduler.pop(timeout=0)
+        scheduler.done(task.t_type)
+        popped.append(task)
+    return popped
+
+def test_higher_priority_first_then_fifo_within_a_type():
+    s = Scheduler()
+    low, high, mid, high2 = (Task.create(p, TaskType.SMS, priority=n) for p, n in
+                             [("low", 0), ("high", 5), ("mid", 1), ("high2", 5)])
+    s.push_many([low, high, mid, high2])
+    assert drain(s, 4) == [high, high2, mid, low]
+
+def test_weighted_fair_share_across_types():
+    s = Scheduler(weights={TaskType.SMS: 3, TaskType.EMAIL: 1})
+    s.push_many(tasks(TaskType.SMS, 20) + tasks(TaskType.EMAIL, 20))
+    counts = Counter(t.t_type for t in drain(s, 16))
+    assert counts == {TaskType.SMS: 12, TaskType.EMAIL: 4}
+
+def test_fairness_is_in_worker_time_not_dispatch_count():
+    s = Scheduler()
+    s.record_runtime(TaskType.REPORT, 4.0)
+    s.record_runtime(TaskType.SMS, 1.0)
+    s.push_many(tasks(TaskType.REPORT, 20) + tasks(TaskType.SMS, 20))
+    counts = Counter(t.t_type for t in drain(s, 10))
+    assert counts == {TaskType.SMS: 8, TaskType.REPORT: 2}
+
+def test_idle_type_rejoins_at_the_current_virtual_time():
+    s = Scheduler()
+    s.push_many(tasks(TaskType.SMS, 20))
+    drain(s, 10)
+    s.push_many(tasks(TaskType.EMAIL, 10))
+    # EMAIL banked no credit while it was empty - the two types take turns instead of EMAIL running 10 in a row:
+    counts = Counter(t.t_type for t in drain(s, 10))
+    assert counts[TaskType.SMS] >= 4 and counts[TaskType.EMAIL] <= 6
+
+def test_close_drains_what_is_queued_then_pop_returns_none():
+    s = Scheduler()
+    queued = tasks(TaskType.SMS, 2)
+    s.push_many(queued)
+    s.close()
+    with pytest.raises(RuntimeError):
+        s.push(Task.create("late", TaskType.SMS))
+    assert not s.drained()
+    assert drain(s, 2) == queued
+    assert s.drained()
+    assert s.pop(timeout=5) is None     # Right away, not after the timeout.
+
+def test_close_wakes_blocked_consumers():
+    s = Scheduler()
+    result = []
+    consumer = threading.Thread(target=lambda: result.append(s.pop()))
+    consumer.start()
+    s.close()
+    consumer.join(2)
+    assert not consumer.is_alive() and result == [None]
+
+def test_wait_idle_waits_for_popped_tasks_to_be_done():
+    s = Scheduler()
+    s.push(Task.create("a", TaskType.SMS))
+    task = s.pop(timeout=0)
+    s.close()
+    assert s.wait_idle(0.05) is False
+    threading.Timer(0.05, s.done, args=(task.t_type,)).start()
+    assert s.wait_idle(2) is True
@@ -0,0 +1,57 @@
+import dataclasses
+import datetime
+import time
+
+import pytest
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models import task as task_module
+from models.handlers import HandlerRegistry
+from models.task import Task, intern_payload, to_epoch_us
+
+from tests.conftest import wait_until
+
+def test_task_is_slotted():
+    task = Task.create("hi", TaskType.SMS)
+    assert not hasattr(task, "__dict__")
+    with pytest.raises(AttributeError):
+        task.colour = "blue"
+
+def test_created_us_is_epoch_microseconds_and_created_at_matches_it():
+    before = time.time_ns() // 1_000
+    task = Task.create("hi", TaskType.SMS)
+    assert before <= task.created_us <= time.time_ns() // 1_000
+    assert isinstance(task.created_at, datetime.datetime) and task.created_at.tzinfo is None
+    assert to_epoch_us(task.created_at) == task.created_us
+    assert abs(task.created_at - datetime.datetime.now()) < datetime.timedelta(seconds=5)
+
+def test_identical_payloads_share_one_string_and_the_table_is_bounded(monkeypatch):
+    monkeypatch.setattr(task_module, "PAYLOAD_INTERN_SIZE", 4)
+    monkeypatch.setattr(task_module, "_payloads", {})
+    a = Task.create("".join(["same ", "payload"]), TaskType.SMS)
+    b = Task.create("".join(["same ", "pay", "load"]), TaskType.EMAIL)
+    assert a.payload is b.payload
+    for i in range(10):
+        intern_payload(f"unique-{i}")
+    assert len(task_module._payloads) <= 4
+
+def test_every_field_survives_wal_replay(make_queue, tmp_path):
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, lambda task: None)
+    q = make_queue(handlers, wal_dir=str(tmp_path))
+    done = Task.create("done", TaskType.SMS, priority=3)
+    later = Task.create("later", TaskType.EMAIL, priority=-1, run_at=time.time() + 3600)
+    child = Task.create("child", TaskType.SMS, depends_on=(later.t_id,))
+    q.enqueue(done)
+    q.enqueue_many([later, child])
+    assert wait_until(lambda: done.status == TaskStatus.COMPLETED)
+    q.shutdown()
+
+    restarted = make_queue(handlers, wal_dir=str(tmp_path))
+    restarted.recover()
+    fields = [f.name for f in dataclasses.fields(Task) if f.name != "enqueued_at"]   # (A perf_counter stamp - per process.)
+    for original in (done, later, child):
+        replayed = restarted.jobs.get(original.t_id)
+        assert replayed is not original
+        assert [getattr(replayed, f) for f in fields] == [getattr(original, f) for f in fields]
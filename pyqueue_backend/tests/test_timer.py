@@ -0,0 +1,86 @@
+import random
+import time
+
+import pytest
+
+from enums.TaskStatus import TaskStatus
+from enums.TaskType import TaskType
+from models.handlers import HandlerRegistry
+from models.retry import RetryPolicy
+from models.task import Task
+from models.timer import TimerQueue
+
+from tests.conftest import wait_until
+
+def test_backoff_doubles_up_to_max_delay_without_jitter():
+    policy = RetryPolicy(base_delay=1.0, max_delay=5.0, multiplier=2.0, jitter=0.0)
+    assert [policy.delay(n) for n in range(1, 6)] == [1.0, 2.0, 4.0, 5.0, 5.0]
+
+@pytest.mark.parametrize("jitter", [0.5, 1.0])
+def test_jitter_only_ever_shortens_the_delay_by_up_to_its_share(jitter):
+    random.seed(7)
+    policy = RetryPolicy(base_delay=1.0, max_delay=30.0, jitter=jitter)
+    delays = [policy.delay(3) for _ in range(2000)]
+    assert all(4.0 * (1 - jitter) <= d <= 4.0 for d in delays)
+    assert max(delays) - min(delays) > 4.0 * jitter * 0.9     # Actually spread over the whole range.
+
+def test_timer_queue_dispatches_in_run_at_order_when_due():
+    dispatched = []
+    timers = TimerQueue(lambda task: dispatched.append((task.payload, time.time())))
+    try:
+        now = time.time()
+        late, soon = Task.create("late", TaskType.SMS, run_at=now + 0.2), Task.create("soon", TaskType.SMS, run_at=now + 0.1)
+        timers.schedule(late)
+        timers.schedule_many([soon, Task.create("overdue", TaskType.SMS, run_at=now - 1)])     # New head - re-arms.
+        assert wait_until(lambda: len(dispatched) == 3)
+        assert [p for p, _ in dispatched] == ["overdue", "soon", "late"]
+        assert dispatched[1][1] >= now + 0.1 and dispatched[2][1] >= now + 0.2
+        assert timers.pending() == 0
+    finally:
+        timers.close()
+
+def test_closed_timer_queue_keeps_its_tasks_pending():
+    dispatched = []
+    timers = TimerQueue(dispatched.append)
+    timers.schedule(Task.create("later", TaskType.SMS, run_at=time.time() + 0.1))
+    timers.close()
+    time.sleep(0.15)
+    assert dispatched == [] and timers.pending() == 1
+
+def recording_handlers(fail_first: int = 0) -> tuple[HandlerRegistry, list[float]]:
+    started: list[float] = []
+    def send(task: Task) -> None:
+        started.append(time.time())
+        if len(started) <= fail_first:
+            raise ConnectionError("try again")
+    handlers = HandlerRegistry()
+    handlers.register(TaskType.SMS, send)
+    return handlers, started
+
+def test_task_with_run_at_waits_for_it(make_queue):
+    handlers, started = recording_handlers()
+    q = make_queue(handlers)
+    task = Task.create("later", TaskType.SMS, run_at=time.time() + 0.3)
+    q.enqueue(task)
+    assert q.get_pool_stats()["delayed"] == 1 and task.status == TaskStatus.QUEUED
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+    assert started[0] >= task.run_at
+    assert q.get_pool_stats()["delayed"] == 0
+
+def test_failed_attempt_is_retried_after_its_backoff(make_queue):
+    handlers, started = recording_handlers(fail_first=1)
+    q = make_queue(handlers, retry_base_delay=0.2, retry_max_delay=0.2)
+    task = Task.create("flaky", TaskType.SMS)
+    q.enqueue(task)
+    assert wait_until(lambda: task.status == TaskStatus.COMPLETED)
+    assert task.attempts == 2 and started[1] - started[0] >= 0.2
+
+def test_cancelling_a_task_held_by_the_timer(make_queue):
+    handlers, started = recording_handlers()
+    q = make_queue(handlers)
+    task = Task.create("later", TaskType.SMS, run_at=time.time() + 0.2)
+    q.enqueue(task)
+    assert q.cancel_job(task)
+    time.sleep(0.3)
+    assert task.status == TaskStatus.CANCELLED and started == []
+    assert q.get_pool_stats()["delayed"] == 0 and q.scheduler.depth() == 0
@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react'
 import './App.css'
-import {getAllJobs, getJobById, enqueueJob, clearQueue} from './utility/api'
+import {getAllJobs, getJobById, enqueueJob, clearQueue, subscribeToJobs, applyJobEvent} from './utility/api'
 import type {Task} from './utility/types'
 import JobsList from './components/JobsList'
 import JobDisplay from './components/JobDisplay'
@@ -38,6 +38,21 @@ function App() {
     }
   }, [hideJobDisplay]);
 
+  /* 2026-10-17: Keep allJobs (and the job on display) live from the [GET /api/events] stream instead of re-fetching
+  the whole list after every action: */
+  useEffect(() => {
+    return subscribeToJobs(
+      (jobs) => setAllJobs(jobs),
+      (event) => {
+        setAllJobs(jobs => applyJobEvent(jobs, event));
+        setJobById(job => {
+          if(!job || (event.kind !== "cleared" && event.id !== job.id)) return job;
+          return event.kind === "status" || event.kind === "enqueued" ? event.task : null;
+        });
+      },
+    );
+  }, []);
+
   // function to invoke API fetch function "getAllJobs" ([GET /api/jobs]):
   const goGetAllJobs = async() => {
     setLoading(true);
@@ -93,7 +108,10 @@ function App() {
     } catch(err: any) {
       console.error("[goEnqueueJob]ERROR: SOMETHING BAD HAPPEN!!! => ", err);
     } finally {
-      await goGetAllJobs();
+      // (No re-fetch needed anymore - the new job arrives over the event stream.)
+      if(!hideJobsList) {
+        setHideJobsList(true);
+      }
       setLoading(false);
     }
   }
@@ -106,7 +124,6 @@ function App() {
     } catch(err: any) {
       console.error("[goClearQueue]ERROR: SOMETHING BAD HAPPEN!!! => ", err);
     } finally {
-      await goGetAllJobs();
       setJobById(null);
       setLoading(false);
     }
@@ -202,7 +219,7 @@ function App() {
 
           {/* Have the Specific Job Display "Highlight Area" goes here (nothing too fancy yet): */}
           <div id="jobDisplayBoxWrapper">
-            {hideJobDisplay && jobById && (<JobDisplay job={jobById} refreshJobs={goGetAllJobs} setLoading={setLoading} setJobById={setJobById}/>)}
+            {hideJobDisplay && jobById && (<JobDisplay job={jobById} refreshJobs={() => setHideJobsList(true)} setLoading={setLoading} setJobById={setJobById}/>)}
           </div>
         </div>
 
@@ -227,7 +244,8 @@ function App() {
           </div>
 
           <ul>
-            <li>Fixed worker pool (3 workers) with an in-memory task registry.</li>
+            <li>Autoscaling worker pool with an in-memory (optionally write-ahead-logged) task registry.</li>
+            <li>Live dashboard updates pushed over Server-Sent Events.</li>
             <li>Task execution times vary by task type to simulate real-world workloads.</li>
             <li>Retry behavior and execution metadata are exposed for inspection and learning.</li>
           </ul>
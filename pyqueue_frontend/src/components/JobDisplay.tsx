@@ -1,6 +1,6 @@
 // Guess this can be like a <div> where a **specific** job is displayed.
 import React, { type SetStateAction } from "react";
-import {deleteJob, retryJob} from "../utility/api";
+import {deleteJob, retryJob, cancelJob} from "../utility/api";
 import type {Task} from "../utility/types";
 
 interface JobDisplayProps {
@@ -47,6 +47,18 @@ const JobDisplay: React.FC<JobDisplayProps> = ({job, refreshJobs, setLoading, se
         }
     }
 
+    // 2026-10-17: Cancel a queued/running job (its new status arrives over the event stream):
+    const goCancelJob = async(id: string) => {
+        setLoading(true);
+        try {
+            await cancelJob(id);
+        } catch(err: any) {
+            console.error("[goCancelJob]ERROR: SOMETHING BAD HAPPEN!!!");
+        } finally {
+            setLoading(false);
+        }
+    }
+
     return(
         <div id="jobDisplayBox">
             <div id="jobDisplayBoxInfo">
@@ -69,6 +81,9 @@ const JobDisplay: React.FC<JobDisplayProps> = ({job, refreshJobs, setLoading, se
                 
                 {/* Want a button here that lets you retry this Job if it failed: */}
                 {job?.status == "FAILED" && <button onClick={()=>goRetryJob(job!.id)}>Retry this Job</button>}
+
+                {/* ...or cancel it while it's still queued or running: */}
+                {(job?.status == "QUEUED" || job?.status == "INPROGRESS") && <button onClick={()=>goCancelJob(job!.id)}>Cancel this Job</button>}
             </div>
         </div>
     );
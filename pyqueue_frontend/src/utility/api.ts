@@ -5,6 +5,8 @@
 // The backend is treated as the source of truth; this layer exists to translate UI-friendly
 // inputs into backend-valid request shapes and to expose backend responses verbatim.
 
+import type {Task} from "./types";
+
 const API_BASE = import.meta.env.VITE_API_BASE.replace(/\/+$/, "");
 
 /* 2026-02-02-NOTE:
@@ -108,6 +110,18 @@ export const retryJob = async (id: string) => {
   return result.json();
 };
 
+export const cancelJob = async (id: string) => {
+  const result = await fetch(`${API_BASE}/api/jobs/${id}/cancel`, {
+    method: "POST",
+  });
+
+  if (!result.ok) {
+    throw new Error(`ERROR: Failed to cancel job (ID: ${id}).`);
+  }
+
+  return result.json();
+};
+
 export const clearQueue = async () => {
   const result = await fetch(`${API_BASE}/api/clear`, {
     method: "POST",
@@ -119,3 +133,49 @@ export const clearQueue = async () => {
 
   return result.json();
 };
+
+// Live Updates:
+/* 2026-10-17-NOTE:
+Subscribes to [GET /api/events] (Server-Sent Events) instead of re-fetching /api/jobs after every action.
+The first message is a full snapshot of the job list; after that only deltas arrive. EventSource reconnects on its own
+and sends Last-Event-ID, so the backend only replays what was missed (or sends a fresh snapshot if it can't).
+Returns a function that closes the stream.
+*/
+export interface JobEvent {
+  seq: number;
+  kind: "enqueued" | "status" | "deleted" | "evicted" | "cleared";
+  id: string | null;
+  task: Task | null;
+  old_status: string | null;
+}
+
+export const subscribeToJobs = (
+  onSnapshot: (jobs: Task[]) => void,
+  onEvent: (event: JobEvent) => void,
+) => {
+  const source = new EventSource(`${API_BASE}/api/events`);
+  source.addEventListener("snapshot", (e) => onSnapshot(JSON.parse((e as MessageEvent).data)));
+  source.addEventListener("job", (e) => onEvent(JSON.parse((e as MessageEvent).data)));
+  source.onerror = () => console.error("[subscribeToJobs]ERROR: Job event stream interrupted (reconnecting).");
+  return () => source.close();
+};
+
+// Applies one JobEvent to a job list (new array, creation order preserved):
+export const applyJobEvent = (jobs: Task[], event: JobEvent): Task[] => {
+  switch (event.kind) {
+    case "cleared":
+      return [];
+    case "deleted":
+    case "evicted":
+      return jobs.filter((j) => j.id !== event.id);
+    default: {
+      const idx = jobs.findIndex((j) => j.id === event.id);
+      if (idx === -1) {
+        return [...jobs, event.task!];
+      }
+      const next = jobs.slice();
+      next[idx] = event.task!;
+      return next;
+    }
+  }
+};
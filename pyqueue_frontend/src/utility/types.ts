@@ -24,6 +24,9 @@ export interface Task {
   attempts: number;
   max_retries: number;
   created_at: string;  // ISO-8601 timestamp (PyQueue-specific)
+  priority: number;    // higher runs first within a task type
+  run_at: string | null;  // ISO-8601 time a scheduled task / backing-off retry is held until
+  depends_on?: string[] | null;  // IDs of the tasks that must complete before this one starts
 }
 
 // OLD /src/utility/types.ts content (this is what's in SpringQueue and GoQueue):